@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+公式密集型XLSX加载基准测试
+
+对比两种加载方式的耗时与峰值内存（RSS）：
+- legacy: 旧实现，openpyxl 加载两次（公式 + data_only），并逐单元格遍历两个工作表
+- single: 当前 XlsxParser.parse，单次加载 + 流式读取公式缓存值
+
+每种方式在独立子进程中运行，保证峰值RSS互不干扰。
+
+用法:
+    python benchmarks/bench_xlsx_formula_load.py --rows 20000 --cols 10
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def build_workbook(path: Path, rows: int, cols: int) -> None:
+    """生成一半数值、一半公式的工作簿，并为公式注入缓存值（模拟Excel保存的文件）。"""
+    import openpyxl
+    from openpyxl.utils import get_column_letter
+
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Data"
+    value_cols = max(1, cols // 2)
+    for row_idx in range(1, rows + 1):
+        for col_idx in range(1, cols + 1):
+            if col_idx <= value_cols:
+                worksheet.cell(row=row_idx, column=col_idx, value=row_idx * col_idx)
+            else:
+                ref = get_column_letter(col_idx - value_cols)
+                worksheet.cell(row=row_idx, column=col_idx, value=f"={ref}{row_idx}*2")
+
+    raw_path = path.with_suffix(".raw.xlsx")
+    workbook.save(raw_path)
+    with zipfile.ZipFile(raw_path) as zin, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename.startswith("xl/worksheets/sheet"):
+                data = data.replace(b"<v />", b"<v>42</v>")
+            zout.writestr(item, data)
+    raw_path.unlink()
+
+
+def run_legacy(path: str) -> int:
+    """旧实现：两次完整加载，逐单元格访问两个工作表并构建相同的 Sheet 对象。"""
+    import openpyxl
+    from src.models.table_model import Cell, Row, Sheet
+    from src.utils.style_parser import extract_style, extract_cell_value
+
+    workbook = openpyxl.load_workbook(path, data_only=False, keep_vba=False, keep_links=False)
+    data_only_workbook = openpyxl.load_workbook(path, data_only=True, keep_vba=False, keep_links=False)
+    sheets = []
+    for name in workbook.sheetnames:
+        worksheet = workbook[name]
+        data_worksheet = data_only_workbook[name]
+        max_row = worksheet.max_row or 0
+        max_col = worksheet.max_column or 0
+        rows = []
+        for row_idx in range(1, max_row + 1):
+            cells = []
+            for col_idx in range(1, max_col + 1):
+                cell = worksheet.cell(row=row_idx, column=col_idx)
+                data_cell = data_worksheet.cell(row=row_idx, column=col_idx)
+                style = extract_style(cell)
+                if cell.data_type == 'f' and cell.value:
+                    cells.append(Cell(value=data_cell.value, style=style, formula=str(cell.value)))
+                else:
+                    cells.append(Cell(value=extract_cell_value(cell), style=style))
+            rows.append(Row(cells=cells))
+        sheets.append(Sheet(name=name, rows=rows))
+    return sum(len(row.cells) for sheet in sheets for row in sheet.rows)
+
+
+def run_single(path: str) -> int:
+    """当前实现：XlsxParser.parse。"""
+    from src.parsers.xlsx_parser import XlsxParser
+
+    sheets = XlsxParser().parse(path)
+    return sum(len(row.cells) for sheet in sheets for row in sheet.rows)
+
+
+def measure(mode: str, path: str) -> dict:
+    """在当前进程中运行一种方式并返回耗时与峰值RSS。"""
+    runner = run_legacy if mode == "legacy" else run_single
+    start = time.perf_counter()
+    cells = runner(path)
+    elapsed = time.perf_counter() - start
+    # Linux 上 ru_maxrss 单位为KB，macOS 上为字节
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    return {"mode": mode, "cells": cells, "seconds": round(elapsed, 3), "peak_rss_mb": round(rss_mb, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="公式密集型XLSX加载基准测试")
+    parser.add_argument("--rows", type=int, default=20000, help="生成的行数")
+    parser.add_argument("--cols", type=int, default=10, help="生成的列数（一半为公式）")
+    parser.add_argument("--file", help="使用已有文件而不是生成测试文件")
+    parser.add_argument("--mode", choices=["legacy", "single"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.file)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.file
+        if path is None:
+            path = str(Path(tmp_dir) / "formulas.xlsx")
+            print(f"生成测试文件: {args.rows} 行 x {args.cols} 列")
+            build_workbook(Path(path), args.rows, args.cols)
+
+        results = {}
+        for mode in ("legacy", "single"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--file", path],
+                check=True, capture_output=True, text=True
+            ).stdout.strip().splitlines()[-1]
+            results[mode] = json.loads(output)
+            print(f"{mode:>7}: {results[mode]['seconds']:>8.3f}s  峰值RSS {results[mode]['peak_rss_mb']:>8.1f} MB  "
+                  f"({results[mode]['cells']} 个单元格)")
+
+        legacy, single = results["legacy"], results["single"]
+        print(f"耗时降低: {(1 - single['seconds'] / legacy['seconds']) * 100:.1f}%  "
+              f"峰值RSS降低: {(1 - single['peak_rss_mb'] / legacy['peak_rss_mb']) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
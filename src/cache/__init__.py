@@ -6,7 +6,12 @@ for improving performance of repeated table parsing operations.
 """
 
 from .cache_manager import CacheManager, get_cache_manager
-from .lru_cache import LRURowBlockCache
+from .lru_cache import LRURowBlockCache, get_row_block_cache
 from .disk_cache import DiskCache
+from .repair_cache import RepairCache, get_repair_cache
+from .row_index_cache import RowCheckpointIndex, RowIndexCache, get_row_index_cache
+from .sheet_cache import SheetCache, get_sheet_cache
 
-__all__ = ['CacheManager', 'get_cache_manager', 'LRURowBlockCache', 'DiskCache']
\ No newline at end of file
+__all__ = ['CacheManager', 'get_cache_manager', 'LRURowBlockCache', 'get_row_block_cache', 'DiskCache',
+           'RepairCache', 'get_repair_cache', 'RowCheckpointIndex', 'RowIndexCache',
+           'get_row_index_cache', 'SheetCache', 'get_sheet_cache']
\ No newline at end of file
@@ -15,12 +15,19 @@ import os
 
 # 缓存管理常量
 SMALL_FILE_THRESHOLD_BYTES = 1024 * 1024  # 1MB，小文件阈值，用于内容哈希
-HASH_PREFIX_LENGTH = 16  # 内容哈希前缀长度
 CACHE_KEY_LENGTH = 32    # 缓存键长度
+HASH_CHUNK_SIZE = 1024 * 1024  # 计算内容哈希时每次读取的字节数
+FINGERPRINT_MEMO_SIZE = 4096   # 最多记忆的文件指纹数量
+# 工作表名取自文件名的格式，按内容计算指纹时仍需计入文件名
+PATH_NAMED_SUFFIXES = frozenset({'.csv'})
+# 修改时间距今不足该值（纳秒）的文件不记忆指纹：同一时间刻度内再次写入且大小不变的修改无法从元数据察觉
+RACY_MTIME_WINDOW_NS = 2 * 1000 * 1000 * 1000
 
-from ..unified_config import get_cache_config
+from cachetools import LRUCache
+
+from ..unified_config import get_cache_config, get_config
 from .lru_cache import LRURowBlockCache
-from .disk_cache import DiskCache
+from .disk_cache import CACHE_FILE_ERRORS, DiskCache, load_cache_file
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +71,8 @@ class CacheManager:
                 cache_dir = str(Path(os.path.expanduser('~')) / 'mcp-sheet-parser')
             self.disk_cache = DiskCache(
                 cache_dir=cache_dir,
-                max_cache_size_mb=self.config.max_disk_cache_size_mb
+                max_cache_size_mb=self.config.max_disk_cache_size_mb,
+                cache_format=self.config.disk_cache_format
             )
             logger.info(f"Initialized disk cache at {cache_dir}")
 
@@ -97,40 +105,13 @@ class CacheManager:
         """
         计算文件的 SHA256 哈希值，用于生成缓存键。
 
-        包含文件大小、修改时间，小文件还包含内容哈希，确保缓存一致性。
-
         参数：
             file_path: 文件路径
 
         返回：
             文件的 SHA256 哈希值，或计算失败时的错误字符串
         """
-        try:
-            path = Path(file_path)
-            if not path.exists():
-                return f"missing:{file_path}"
-
-            # 包含文件大小和修改时间以加速比较
-            stat = path.stat()
-            # 使用高精度修改时间以提升缓存失效准确性
-            file_signature = f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
-
-            # 对于小文件，包含内容哈希以确保最大准确性
-            if stat.st_size < SMALL_FILE_THRESHOLD_BYTES:
-                try:
-                    with open(path, 'rb') as f:
-                        content = f.read()
-                    content_hash = hashlib.sha256(content).hexdigest()[:HASH_PREFIX_LENGTH]
-                    file_signature += f":{content_hash}"
-                except (OSError, MemoryError) as e:
-                    logger.warning(f"Failed to read file content for hash: {e}")
-                    # 仅回退到文件元数据
-
-            return hashlib.sha256(file_signature.encode()).hexdigest()[:CACHE_KEY_LENGTH]
-        except Exception as e:
-            logger.warning(f"Failed to calculate file hash for {file_path}: {e}")
-            # 返回唯一错误标识以避免缓存冲突
-            return f"error:{abs(hash(file_path))}:{int(time.time())}"
+        return calculate_file_fingerprint(file_path)
 
     def get(self, file_path: str, range_string: str | None = None,
             sheet_name: str | None = None) -> Any | None:
@@ -308,8 +289,6 @@ class CacheManager:
         返回：
             包含优化结果的字典
         """
-        import pickle  # 移到函数顶部，避免重复导入
-
         results = {
             'memory_cache_cleaned': 0,
             'disk_cache_cleaned': 0,
@@ -327,12 +306,12 @@ class CacheManager:
                 cache_files = list(self.disk_cache.cache_dir.glob('*.cache'))
                 for cache_file in cache_files:
                     try:
-                        with open(cache_file, 'rb') as f:
-                            cache_entry = pickle.load(f)
-                            if not self._is_cache_valid(cache_entry):
-                                cache_file.unlink()
-                                results['disk_cache_cleaned'] += 1
-                    except (pickle.PickleError, EOFError, OSError) as e:
+                        # 列式缓存文件只读取时间戳等元数据，不读取行
+                        cache_entry = load_cache_file(cache_file, include_rows=False)
+                        if not self._is_cache_valid(cache_entry):
+                            cache_file.unlink()
+                            results['disk_cache_cleaned'] += 1
+                    except CACHE_FILE_ERRORS as e:
                         # 移除损坏的缓存文件
                         try:
                             cache_file.unlink()
@@ -349,6 +328,80 @@ class CacheManager:
         return results
 
 
+# 文件指纹记忆：{(设备, inode, 大小, 修改时间, 是否按内容): 指纹}
+_fingerprint_memo = LRUCache(maxsize=FINGERPRINT_MEMO_SIZE)
+_fingerprint_memo_lock = threading.Lock()
+
+
+def calculate_file_fingerprint(file_path: str) -> str:
+    """
+    计算文件指纹（SHA256 前缀），供各类缓存作为键使用。
+
+    小文件（启用 strong_file_hash 配置时为所有文件）的指纹由扩展名和内容决定：内容相同的文件
+    不论路径都得到同一个指纹，共用各类缓存中的条目。CSV 等工作表名取自文件名的格式另计入文件名，
+    避免缓存的工作表名泄漏到同内容的其他文件。其余文件的指纹由设备、inode、大小和修改时间决定。
+    指纹按 (设备, inode, 大小, 修改时间) 记忆，文件未变化时再次计算只需一次 stat()，不再读取内容。
+
+    参数：
+        file_path: 文件路径
+
+    返回：
+        文件指纹；文件不存在时返回 "missing:" 前缀的标识，计算失败时返回唯一的 "error:" 标识
+    """
+    try:
+        path = Path(file_path)
+        try:
+            stat = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return f"missing:{file_path}"
+
+        by_content = stat.st_size < SMALL_FILE_THRESHOLD_BYTES or get_config().strong_file_hash
+        memo_key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, by_content)
+        with _fingerprint_memo_lock:
+            fingerprint = _fingerprint_memo.get(memo_key)
+        if fingerprint is not None:
+            return fingerprint
+
+        # 使用高精度修改时间以提升缓存失效准确性
+        file_signature = f"meta:{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+        if by_content:
+            try:
+                content_hash = _hash_file_content(path)
+                # 解析器按扩展名选择，扩展名不同的文件即使内容相同也不共用条目
+                file_signature = f"content:{path.suffix.lower()}:{stat.st_size}:{content_hash}"
+                if path.suffix.lower() in PATH_NAMED_SUFFIXES:
+                    file_signature += f":{path.name}"
+            except (OSError, MemoryError) as e:
+                logger.warning(f"Failed to read file content for hash: {e}")
+                # 仅回退到文件元数据
+
+        fingerprint = hashlib.sha256(file_signature.encode()).hexdigest()[:CACHE_KEY_LENGTH]
+        # 没有 inode 的文件系统无法区分文件，刚修改过的文件可能在同一时间刻度内再次被修改，都不记忆
+        if stat.st_ino and time.time_ns() - stat.st_mtime_ns >= RACY_MTIME_WINDOW_NS:
+            with _fingerprint_memo_lock:
+                _fingerprint_memo[memo_key] = fingerprint
+        return fingerprint
+    except Exception as e:
+        logger.warning(f"Failed to calculate file hash for {file_path}: {e}")
+        # 返回唯一错误标识以避免缓存冲突
+        return f"error:{abs(hash(file_path))}:{int(time.time())}"
+
+
+def _hash_file_content(path: Path) -> str:
+    """分块读取文件并返回内容的 SHA256 十六进制摘要。"""
+    content_hash = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def clear_fingerprint_memo() -> None:
+    """清空记忆的文件指纹。"""
+    with _fingerprint_memo_lock:
+        _fingerprint_memo.clear()
+
+
 # 全局缓存管理器实例（线程安全）
 _global_cache_manager = None
 _cache_manager_lock = threading.Lock()
@@ -0,0 +1,346 @@
+"""
+磁盘缓存的列式文件格式。
+
+CacheManager 缓存的解析结果中，data['rows'] 是由 {"value": 值, "style": 样式字典} 组成的行列表，
+按 pickle 保存时每个单元格都是一个字典，读取时必须整个反序列化。列式格式把单元格按列保存为 Arrow 表：
+每列的值按类型保存为整数、浮点数、布尔值或字典编码的字符串数组，样式字典去重后保存为单独的样式表，
+单元格只保存样式编号；条目的其余部分（时间戳、表头、元数据等）以JSON保存在 schema 元数据中。
+
+支持两种文件：Arrow IPC 文件（'arrow'）通过内存映射零拷贝读取；Parquet 文件（'parquet'）经过编码压缩、
+占用空间更小，读取时只解码需要的行组和列。两种文件都可以只读取一段行或部分列。
+"""
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ARROW_FORMAT = 'arrow'
+PARQUET_FORMAT = 'parquet'
+COLUMNAR_FORMATS = (ARROW_FORMAT, PARQUET_FORMAT)
+
+# 文件头魔数，用于区分列式文件与 pickle 文件
+ARROW_MAGIC = b'ARROW1'
+PARQUET_MAGIC = b'PAR1'
+
+# Parquet 行组的行数；读取一段行时只解码与之重叠的行组
+PARQUET_ROW_GROUP_SIZE = 4096
+
+# schema 元数据中保存条目其余部分、样式表和列编码信息的键
+METADATA_KEY = b'mcp_sheet_cache'
+
+# 每行单元格数的列名；第 i 列单元格的值和样式编号分别保存在 v{i} 和 s{i} 列中
+WIDTH_COLUMN = 'w'
+
+# 可按列保存的单元格值类型；类型混杂的列以JSON编码保存，读取后值的类型不变
+_SCALAR_TYPES = frozenset((str, int, float, bool))
+
+# 单元格字典允许的键（按顺序）
+_CELL_KEYS = (('value', 'style'), ('value',))
+
+
+def detect_columnar_format(path: Path) -> str | None:
+    """按文件头判断文件是否为列式缓存文件，返回 'arrow'、'parquet' 或 None（pickle 文件）。"""
+    with open(path, 'rb') as f:
+        header = f.read(len(ARROW_MAGIC))
+    if header == ARROW_MAGIC:
+        return ARROW_FORMAT
+    if header[:len(PARQUET_MAGIC)] == PARQUET_MAGIC:
+        return PARQUET_FORMAT
+    return None
+
+
+def write_columnar_entry(path: Path, entry: Any, file_format: str) -> bool:
+    """
+    把缓存条目按列式格式写入 path。
+
+    先写入临时文件再替换 path，正在内存映射旧文件的读取方不受影响。
+    条目不含 data['rows'] 行列表、单元格不是只含 value/style 的字典，或值、样式、其余字段
+    无法无损地保存为列或JSON时不写入并返回 False，由调用方改用 pickle；pyarrow 不可用时同样返回 False。
+
+    参数：
+        path: 缓存文件路径
+        entry: 缓存条目
+        file_format: 'arrow' 或 'parquet'
+
+    返回：
+        是否已写入
+
+    异常：
+        OSError、ValueError: 写入文件失败时抛出
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        logger.debug("pyarrow 不可用，磁盘缓存使用 pickle 格式")
+        return False
+
+    try:
+        table = _build_table(pa, entry)
+    except (TypeError, ValueError, OverflowError) as e:
+        logger.debug(f"缓存条目无法按列式格式保存: {e}")
+        return False
+    if table is None:
+        return False
+
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if file_format == PARQUET_FORMAT:
+            import pyarrow.parquet as pq
+            pq.write_table(table, str(temp_path), row_group_size=PARQUET_ROW_GROUP_SIZE)
+        else:
+            with pa.OSFile(str(temp_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return True
+
+
+def read_columnar_entry(path: Path, start_row: int = 0, max_rows: int | None = None,
+                        columns: Sequence[int] | None = None, include_rows: bool = True) -> dict[str, Any]:
+    """
+    读取列式缓存文件中的条目，只转换请求的行和列。
+
+    参数：
+        path: 缓存文件路径
+        start_row: data['rows'] 的起始行索引
+        max_rows: 最多读取的行数，为 None 时读取到最后一行
+        columns: 只保留这些列索引的单元格（可选），超出某行宽度的列在该行中被跳过
+        include_rows: 为 False 时只读取 schema 元数据，data['rows'] 为 None
+
+    返回：
+        缓存条目
+
+    异常：
+        OSError、ValueError、KeyError: 文件损坏时抛出
+    """
+    import pyarrow as pa
+
+    if detect_columnar_format(path) == PARQUET_FORMAT:
+        import pyarrow.parquet as pq
+        with pq.ParquetFile(str(path), memory_map=True) as parquet_file:
+            metadata = _load_metadata(parquet_file.schema_arrow)
+            rows = None
+            if include_rows:
+                start, end = _clamp_range(parquet_file.metadata.num_rows, start_row, max_rows)
+                column_indexes = _column_indexes(parquet_file.schema_arrow, columns)
+                table = _read_parquet_row_groups(parquet_file, _column_names(metadata, column_indexes), start, end)
+                rows = _table_to_rows(pa, table, metadata, column_indexes)
+    else:
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            metadata = _load_metadata(reader.schema)
+            rows = None
+            if include_rows:
+                # 内存映射的文件按零拷贝方式读取，只有切片后的行和列被转换为 Python 对象
+                table = reader.read_all()
+                start, end = _clamp_range(table.num_rows, start_row, max_rows)
+                column_indexes = _column_indexes(reader.schema, columns)
+                table = table.slice(start, end - start).select(_column_names(metadata, column_indexes))
+                rows = _table_to_rows(pa, table, metadata, column_indexes)
+
+    entry = metadata['entry']
+    entry['data']['rows'] = rows
+    return entry
+
+
+def _build_table(pa: Any, entry: Any) -> Any:
+    """把缓存条目转换为 Arrow 表，无法无损转换时返回 None。"""
+    data = entry.get('data') if isinstance(entry, dict) else None
+    rows = data.get('rows') if isinstance(data, dict) else None
+    if not isinstance(rows, list) or not all(type(row) is list for row in rows):
+        return None
+
+    cell_keys = None
+    width = max(map(len, rows), default=0)
+    values = [[None] * len(rows) for _ in range(width)]
+    style_refs = [[None] * len(rows) for _ in range(width)]
+    styles: list[dict[str, Any]] = []
+    # 同一样式字典实例只编码一次，内容相同的样式字典共用一个编号
+    style_ids: dict[int, int] = {}
+    style_ids_by_text: dict[str, int] = {}
+
+    for row_index, row in enumerate(rows):
+        for col, cell in enumerate(row):
+            if type(cell) is not dict:
+                return None
+            keys = tuple(cell)
+            if cell_keys is None:
+                if keys not in _CELL_KEYS:
+                    return None
+                cell_keys = keys
+            elif keys != cell_keys:
+                return None
+
+            value = cell['value']
+            if value is not None and type(value) not in _SCALAR_TYPES:
+                return None
+            values[col][row_index] = value
+
+            style = cell.get('style')
+            if style is None:
+                continue
+            style_id = style_ids.get(id(style))
+            if style_id is None:
+                if type(style) is not dict:
+                    return None
+                text = json.dumps(style, ensure_ascii=False, sort_keys=True)
+                style_id = style_ids_by_text.setdefault(text, len(styles))
+                if style_id == len(styles):
+                    styles.append(style)
+                style_ids[id(style)] = style_id
+            style_refs[col][row_index] = style_id
+
+    cell_keys = cell_keys or _CELL_KEYS[0]
+    has_styles = 'style' in cell_keys
+    names = [WIDTH_COLUMN]
+    arrays = [pa.array([len(row) for row in rows], pa.int32())]
+    json_columns = []
+    for col in range(width):
+        array, is_json = _encode_values(pa, values[col])
+        if is_json:
+            json_columns.append(col)
+        names.append(f'v{col}')
+        arrays.append(array)
+        if has_styles:
+            names.append(f's{col}')
+            arrays.append(pa.array(style_refs[col], pa.int32()))
+
+    metadata = {
+        'entry': {**entry, 'data': {**data, 'rows': None}},
+        'styles': styles,
+        'cell_keys': list(cell_keys),
+        'json_columns': json_columns,
+    }
+    text = json.dumps(metadata, ensure_ascii=False)
+    if json.loads(text) != metadata:
+        # 元组、非字符串键等JSON无法还原的内容
+        return None
+    table = pa.Table.from_arrays(arrays, names=names)
+    return table.replace_schema_metadata({METADATA_KEY: text.encode('utf-8')})
+
+
+def _encode_values(pa: Any, values: list[Any]) -> tuple[Any, bool]:
+    """
+    把一列单元格值编码为 Arrow 数组，返回 (数组, 是否为JSON编码)。
+
+    类型单一的列按类型保存，字符串列做字典编码；类型混杂或超出64位整数范围的列把每个值编码为JSON字符串。
+    """
+    kinds = {type(value) for value in values if value is not None}
+    if not kinds:
+        return pa.nulls(len(values)), False
+    if len(kinds) == 1:
+        kind = next(iter(kinds))
+        if kind is str:
+            return pa.array(values, pa.string()).dictionary_encode(), False
+        if kind is bool:
+            return pa.array(values, pa.bool_()), False
+        if kind is float:
+            return pa.array(values, pa.float64()), False
+        try:
+            return pa.array(values, pa.int64()), False
+        except (OverflowError, pa.ArrowInvalid):
+            pass
+    encoded = [None if value is None else json.dumps(value, ensure_ascii=False) for value in values]
+    return pa.array(encoded, pa.string()).dictionary_encode(), True
+
+
+def _load_metadata(schema: Any) -> dict[str, Any]:
+    """从 schema 元数据中读取条目其余部分、样式表和列编码信息。"""
+    return json.loads((schema.metadata or {})[METADATA_KEY])
+
+
+def _clamp_range(total_rows: int, start_row: int, max_rows: int | None) -> tuple[int, int]:
+    """把请求的行范围限制在 [0, total_rows) 内，返回 (起始行, 结束行)。"""
+    start = min(max(start_row, 0), total_rows)
+    end = total_rows if max_rows is None else min(start + max(max_rows, 0), total_rows)
+    return start, end
+
+
+def _column_indexes(schema: Any, columns: Sequence[int] | None) -> list[int]:
+    """返回要读取的列索引，忽略文件中不存在的列。"""
+    width = sum(1 for name in schema.names if name.startswith('v'))
+    if columns is None:
+        return list(range(width))
+    return [col for col in columns if 0 <= col < width]
+
+
+def _column_names(metadata: dict[str, Any], column_indexes: list[int]) -> list[str]:
+    """返回读取指定列所需的 Arrow 列名。"""
+    names = [WIDTH_COLUMN]
+    has_styles = 'style' in metadata['cell_keys']
+    for col in column_indexes:
+        names.append(f'v{col}')
+        if has_styles:
+            names.append(f's{col}')
+    return names
+
+
+def _read_parquet_row_groups(parquet_file: Any, names: list[str], start: int, end: int) -> Any:
+    """只读取与 [start, end) 重叠的行组和指定的列，返回这段行组成的表。"""
+    row_groups = []
+    first_row = offset = 0
+    for index in range(parquet_file.metadata.num_row_groups):
+        num_rows = parquet_file.metadata.row_group(index).num_rows
+        if offset < end and offset + num_rows > start:
+            if not row_groups:
+                first_row = offset
+            row_groups.append(index)
+        offset += num_rows
+    if not row_groups:
+        return parquet_file.schema_arrow.empty_table().select(names)
+    table = parquet_file.read_row_groups(row_groups, columns=names)
+    return table.slice(start - first_row, end - start)
+
+
+def _table_to_rows(pa: Any, table: Any, metadata: dict[str, Any], column_indexes: list[int]) -> list[list[dict]]:
+    """把 Arrow 表转换回单元格字典组成的行，同一样式编号的单元格共用一个样式字典。"""
+    styles = metadata['styles']
+    json_columns = set(metadata['json_columns'])
+    has_styles = 'style' in metadata['cell_keys']
+
+    columns = []
+    for col in column_indexes:
+        column_values = _decode_column(pa, table.column(f'v{col}'), col in json_columns)
+        column_styles = None
+        if has_styles:
+            column_styles = [None if style_id is None else styles[style_id]
+                             for style_id in table.column(f's{col}').to_pylist()]
+        columns.append((col, column_values, column_styles))
+
+    rows = []
+    for row_index, width in enumerate(table.column(WIDTH_COLUMN).to_pylist()):
+        if has_styles:
+            rows.append([{'value': column_values[row_index], 'style': column_styles[row_index]}
+                         for col, column_values, column_styles in columns if col < width])
+        else:
+            rows.append([{'value': column_values[row_index]}
+                         for col, column_values, _ in columns if col < width])
+    return rows
+
+
+def _decode_column(pa: Any, column: Any, is_json: bool) -> list[Any]:
+    """
+    把一列转换为 Python 值的列表。
+
+    字典编码的列读取整个切片时先转换字典，相同的字符串共用一个对象；只读取字典的一小部分时逐个转换。
+    """
+    values = []
+    for chunk in column.chunks:
+        if pa.types.is_dictionary(chunk.type) and len(chunk) >= len(chunk.dictionary):
+            dictionary = chunk.dictionary.to_pylist()
+            if is_json:
+                dictionary = [json.loads(value) for value in dictionary]
+            values.extend(None if index is None else dictionary[index] for index in chunk.indices.to_pylist())
+        elif is_json:
+            values.extend(None if value is None else json.loads(value) for value in chunk.to_pylist())
+        else:
+            values.extend(chunk.to_pylist())
+    return values
@@ -3,23 +3,49 @@
 
 本模块为获取的数据提供磁盘缓存能力，
 以减少重复请求时的获取开销。
+缓存文件默认按 pickle 保存；配置为 'arrow' 或 'parquet' 格式时，含行数据的条目按列式格式保存
+（见 columnar_format 模块），可以只读取一段行或部分列。读取时按文件头识别格式，两种文件可以共存。
 """
 
 import pickle
 import logging
+from collections.abc import Sequence
 from typing import Any
 from pathlib import Path
 import hashlib
 
+from .columnar_format import COLUMNAR_FORMATS, detect_columnar_format, read_columnar_entry, write_columnar_entry
+
 logger = logging.getLogger(__name__)
 
+# 读取缓存文件时表示文件已损坏的异常
+CACHE_FILE_ERRORS = (pickle.PickleError, EOFError, OSError, ValueError, KeyError)
+
+
+def load_cache_file(cache_file: Path, include_rows: bool = True) -> Any:
+    """
+    读取缓存文件中的值，按文件头识别 pickle 与列式格式。
+
+    参数：
+        cache_file: 缓存文件路径
+        include_rows: 为 False 时列式文件只读取行以外的部分，data['rows'] 为 None
+
+    异常：
+        CACHE_FILE_ERRORS 中的异常: 文件损坏或无法读取时抛出
+    """
+    if detect_columnar_format(cache_file):
+        return read_columnar_entry(cache_file, include_rows=include_rows)
+    with open(cache_file, 'rb') as f:
+        return pickle.load(f)
+
 
 class DiskCache:
     """基于磁盘的缓存管理类。"""
 
-    def __init__(self, cache_dir: str, max_cache_size_mb: float = 1024):
+    def __init__(self, cache_dir: str, max_cache_size_mb: float = 1024, cache_format: str = 'pickle'):
         self.cache_dir = Path(cache_dir)
         self.max_cache_size_mb = max_cache_size_mb
+        self.cache_format = cache_format
 
         # 确保缓存目录存在
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -35,25 +61,70 @@ class DiskCache:
         if not cache_file.exists():
             return None
         try:
-            with open(cache_file, 'rb') as f:
-                return pickle.load(f)
-        except (pickle.PickleError, EOFError, OSError) as e:
-            logger.warning(f"加载缓存文件 {cache_file.name} 失败: {e}")
-            # 移除损坏的缓存文件
-            try:
-                cache_file.unlink()
-            except OSError:
-                pass  # 无法删除文件时忽略
+            return load_cache_file(cache_file)
+        except CACHE_FILE_ERRORS as e:
+            self._remove_corrupted_file(cache_file, e)
+            return None
+
+    def get_rows(self, key: str, start_row: int = 0, max_rows: int | None = None,
+                 columns: Sequence[int] | None = None) -> list[list[Any]] | None:
+        """
+        读取缓存值 data['rows'] 中的一段行或部分列。
+
+        列式文件只转换请求的行和列；pickle 文件需要整个加载后再截取。
+
+        参数：
+            key: 缓存键
+            start_row: 起始行索引
+            max_rows: 最多读取的行数，为 None 时读取到最后一行
+            columns: 只保留这些列索引的单元格（可选），超出某行宽度的列在该行中被跳过
+
+        返回：
+            行列表；缓存不存在、已损坏或不含行列表时返回 None
+        """
+        cache_file = self._get_cache_file_path(key)
+        if not cache_file.exists():
+            return None
+        try:
+            if detect_columnar_format(cache_file):
+                return read_columnar_entry(cache_file, start_row, max_rows, columns)['data']['rows']
+            value = load_cache_file(cache_file)
+        except CACHE_FILE_ERRORS as e:
+            self._remove_corrupted_file(cache_file, e)
+            return None
+
+        data = value.get('data') if isinstance(value, dict) else None
+        rows = data.get('rows') if isinstance(data, dict) else None
+        if not isinstance(rows, list):
             return None
+        start_row = max(start_row, 0)
+        rows = rows[start_row:] if max_rows is None else rows[start_row:start_row + max(max_rows, 0)]
+        if columns is None:
+            return rows
+        return [[row[col] for col in columns if 0 <= col < len(row)] for row in rows]
+
+    def _remove_corrupted_file(self, cache_file: Path, error: Exception) -> None:
+        """记录加载失败并移除损坏的缓存文件。"""
+        logger.warning(f"加载缓存文件 {cache_file.name} 失败: {error}")
+        try:
+            cache_file.unlink()
+        except OSError:
+            pass  # 无法删除文件时忽略
 
     def set(self, key: str, value: Any) -> None:
-        """根据 key 缓存一个值。"""
+        """
+        根据 key 缓存一个值。
+
+        配置为列式格式时，含行数据的值按列式格式保存，其余的值仍按 pickle 保存。
+        """
         cache_file = self._get_cache_file_path(key)
         try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(value, f)
+            if self.cache_format not in COLUMNAR_FORMATS or \
+                    not write_columnar_entry(cache_file, value, self.cache_format):
+                with open(cache_file, 'wb') as f:
+                    pickle.dump(value, f)
             self._cleanup_cache()
-        except (pickle.PickleError, OSError) as e:
+        except (pickle.PickleError, OSError, ValueError) as e:
             logger.warning(f"保存缓存文件 {cache_file.name} 失败: {e}")
             # 尝试移除可能损坏的文件
             try:
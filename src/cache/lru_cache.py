@@ -1,19 +1,100 @@
 """
 用于行块缓存的 LRU 缓存。
+
+惰性工作表按固定行数把读取过的行分块保存在全局行块缓存中，键为 (文件指纹, 工作表, 块行数, 块序号)，
+文件内容或修改时间变化后旧块不会再被命中。缓存按估算的内存占用限制总大小，超出时淘汰最久未使用的块。
 """
 
+import sys
+import threading
+from collections.abc import Callable, Sequence
+from typing import Any
+
 from cachetools import LRUCache
 
+from ..unified_config import get_config
+
+# 估算行块内存占用时每个 Row 对象（含单元格列表）和每个 Cell 对象的固定开销（字节）
+ROW_OVERHEAD_BYTES = 120
+CELL_OVERHEAD_BYTES = 80
+
+
 class LRURowBlockCache:
-    def __init__(self, max_entries=100):
-        self.cache = LRUCache(maxsize=max_entries)
+    """
+    线程安全的 LRU 缓存。
+
+    默认按条目数量限制容量；指定 max_bytes 时改为按 getsizeof 估算的条目大小限制总占用，
+    大于 max_bytes 的单个条目不会被缓存。
+    """
+
+    def __init__(self, max_entries: int = 100, max_bytes: int | None = None,
+                 getsizeof: Callable[[Any], int] | None = None):
+        """
+        参数：
+            max_entries: 最多保留的条目数量（未指定 max_bytes 时生效）
+            max_bytes: 所有条目估算大小之和的上限（可选）
+            getsizeof: 估算单个条目大小的函数，默认每个条目计为1
+        """
+        if max_bytes is None:
+            self.cache = LRUCache(maxsize=max_entries)
+        else:
+            self.cache = LRUCache(maxsize=max_bytes, getsizeof=getsizeof)
+        self._lock = threading.Lock()
 
     def get(self, key):
-        return self.cache.get(key)
+        with self._lock:
+            return self.cache.get(key)
 
     def set(self, key, value):
-        self.cache[key] = value
+        with self._lock:
+            try:
+                self.cache[key] = value
+            except ValueError:
+                # 单个条目超出容量上限，不缓存
+                pass
 
     def clear(self):
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
+
+
+def estimate_row_block_size(rows: Sequence[Any]) -> int:
+    """
+    估算一块行占用的内存（字节）。
+
+    计入 Row/Cell 对象的固定开销和单元格值本身的大小；样式对象由多个单元格共享，不计入。
+    """
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += ROW_OVERHEAD_BYTES
+        for cell in row.cells:
+            size += CELL_OVERHEAD_BYTES + sys.getsizeof(cell.value)
+    return size
+
+
+# 全局行块缓存实例（线程安全）
+_global_row_block_cache = None
+_row_block_cache_lock = threading.Lock()
+
+
+def get_row_block_cache() -> LRURowBlockCache | None:
+    """获取全局行块缓存实例，容量按配置的 row_block_cache_size_mb 设置，配置为0时返回 None。"""
+    global _global_row_block_cache
+    if get_config().row_block_cache_size_mb == 0:
+        return None
+    if _global_row_block_cache is None:
+        with _row_block_cache_lock:
+            # 双重检查锁定模式
+            if _global_row_block_cache is None:
+                _global_row_block_cache = LRURowBlockCache(
+                    max_bytes=get_config().row_block_cache_size_mb * 1024 * 1024,
+                    getsizeof=estimate_row_block_size
+                )
+    return _global_row_block_cache
+
 
+def reset_row_block_cache() -> None:
+    """重置全局行块缓存实例，已缓存的行块随之释放。"""
+    global _global_row_block_cache
+    with _row_block_cache_lock:
+        _global_row_block_cache = None
@@ -0,0 +1,176 @@
+"""
+损坏文件修复缓存。
+
+openpyxl 无法加载的XLSX文件（如 styles.xml 中存在空的 fill）需要整包重写修复。
+本模块按文件指纹把修复后的副本保存在缓存目录（而不是用户文件旁边），
+并记住每个问题文件最终成功的加载方式，重复请求同一文件时直接使用可行的路径。
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from ..unified_config import get_config
+from .cache_manager import calculate_file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# 加载方式：(是否使用修复后的副本, 加载参数序号)
+LoadStrategy = tuple[bool, int]
+
+# 修复函数：repair(源文件路径, 目标文件路径) -> 实际写出的文件路径
+RepairFunction = Callable[[str, str], str]
+
+
+class RepairCache:
+    """
+    修复副本缓存与加载方式备忘。
+
+    修复副本以文件指纹命名，源文件内容或修改时间变化后不会再被命中；
+    超出 max_files 时按修改时间删除最旧的副本。加载方式备忘只保存在内存中，
+    以 (绝对路径, 修改时间, 大小) 为键，最多保留 max_strategies 条。
+    """
+
+    def __init__(self, cache_dir: str | Path, max_files: int = 32, max_strategies: int = 256):
+        """
+        参数：
+            cache_dir: 修复副本的存放目录
+            max_files: 最多保留的修复副本数量
+            max_strategies: 最多记住的文件加载方式数量
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_files = max_files
+        self.max_strategies = max_strategies
+        self._strategies: OrderedDict[tuple[str, int, int], LoadStrategy] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_repaired_file(self, file_path: str, repair: RepairFunction) -> str:
+        """
+        返回文件的修复副本路径，缓存中没有时调用 repair 生成。
+
+        repair 先写入同一目录下的临时文件，完成后再原子地替换为最终路径，
+        并发请求不会读到写了一半的副本。
+
+        参数：
+            file_path: 原始文件路径
+            repair: 修复函数，接收源文件路径和目标文件路径，返回实际写出的文件路径
+
+        返回：
+            修复后文件的路径
+        """
+        fingerprint = calculate_file_fingerprint(file_path)
+        suffix = Path(file_path).suffix
+        if fingerprint.startswith(("missing:", "error:")):
+            # 无法确定文件指纹时不复用副本
+            target = self.cache_dir / f"{uuid.uuid4().hex}{suffix}"
+        else:
+            target = self.cache_dir / f"{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}{suffix}"
+            if target.exists():
+                logger.info(f"使用缓存的修复文件: {target}")
+                return str(target)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            repaired_file = repair(file_path, str(temp_path))
+            if os.path.abspath(repaired_file) == os.path.abspath(temp_path):
+                os.replace(temp_path, target)
+                repaired_file = str(target)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        self._cleanup()
+        return repaired_file
+
+    def get_strategy(self, file_path: str) -> LoadStrategy | None:
+        """返回该文件上次成功的加载方式，未记录或文件已变化时返回 None。"""
+        key = self._make_key(file_path)
+        if key is None:
+            return None
+        with self._lock:
+            strategy = self._strategies.get(key)
+            if strategy is not None:
+                self._strategies.move_to_end(key)
+            return strategy
+
+    def remember_strategy(self, file_path: str, strategy: LoadStrategy) -> None:
+        """记录该文件成功的加载方式。"""
+        key = self._make_key(file_path)
+        if key is None:
+            return
+        with self._lock:
+            self._strategies[key] = strategy
+            self._strategies.move_to_end(key)
+            while len(self._strategies) > self.max_strategies:
+                self._strategies.popitem(last=False)
+
+    def forget_strategy(self, file_path: str) -> None:
+        """移除该文件的加载方式记录（记录的方式失效时调用）。"""
+        key = self._make_key(file_path)
+        if key is None:
+            return
+        with self._lock:
+            self._strategies.pop(key, None)
+
+    def clear(self) -> None:
+        """清除加载方式记录和所有修复副本。"""
+        with self._lock:
+            self._strategies.clear()
+        if not self.cache_dir.is_dir():
+            return
+        for repaired_file in self.cache_dir.iterdir():
+            try:
+                repaired_file.unlink()
+            except OSError:
+                # 忽略删除错误，继续删除其他文件
+                pass
+
+    @staticmethod
+    def _make_key(file_path: str) -> tuple[str, int, int] | None:
+        """生成加载方式备忘的键，文件不可访问时返回 None。"""
+        try:
+            stat = os.stat(file_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+    def _cleanup(self) -> None:
+        """修复副本超出数量上限时删除最旧的副本（其他请求正在写入的临时文件不计入）。"""
+        try:
+            repaired_files = sorted((f for f in self.cache_dir.iterdir() if f.is_file() and f.suffix != ".tmp"),
+                                    key=lambda f: f.stat().st_mtime)
+        except OSError:
+            return
+        for repaired_file in repaired_files[:max(0, len(repaired_files) - self.max_files)]:
+            try:
+                repaired_file.unlink()
+            except OSError:
+                continue
+
+
+# 全局修复缓存实例（线程安全）
+_global_repair_cache = None
+_repair_cache_lock = threading.Lock()
+
+
+def get_repair_cache() -> RepairCache:
+    """获取全局修复缓存实例，修复副本存放在配置的缓存目录下的 repaired 子目录。"""
+    global _global_repair_cache
+    if _global_repair_cache is None:
+        with _repair_cache_lock:
+            # 双重检查锁定模式
+            if _global_repair_cache is None:
+                _global_repair_cache = RepairCache(get_config().get_cache_dir() / "repaired")
+    return _global_repair_cache
+
+
+def reset_repair_cache() -> None:
+    """重置全局修复缓存实例（不删除已有的修复副本）。"""
+    global _global_repair_cache
+    with _repair_cache_lock:
+        _global_repair_cache = None
@@ -0,0 +1,161 @@
+"""
+行检查点索引缓存。
+
+CSV等按行顺序存储的文本文件无法直接定位到第N行。行检查点索引记录每隔固定行数的
+一条记录的起始字节偏移，读取任意行范围时先 seek() 到最近的检查点，再顺序跳过不足一个间隔的行。
+本模块按文件指纹把索引以JSON保存在缓存目录中，文件内容或修改时间变化后不会再被命中。
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..unified_config import get_config
+from .cache_manager import calculate_file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# 索引文件格式版本，格式变化时递增使旧索引失效
+ROW_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class RowCheckpointIndex:
+    """
+    稀疏行检查点索引。
+
+    offsets[i] 为第 i * interval 条记录（0基）的起始字节偏移，offsets[0] 恒为0；
+    total_rows 为文件的记录总数。
+    """
+    interval: int
+    offsets: tuple[int, ...]
+    total_rows: int
+
+    def locate(self, row_index: int) -> tuple[int, int]:
+        """返回 (不晚于 row_index 的最近检查点的字节偏移, 从该检查点还需跳过的记录数)。"""
+        checkpoint = min(row_index // self.interval, len(self.offsets) - 1)
+        return self.offsets[checkpoint], row_index - checkpoint * self.interval
+
+
+class RowIndexCache:
+    """
+    行检查点索引的磁盘缓存。
+
+    索引文件以 (文件指纹, 编码) 命名；超出 max_files 时按修改时间删除最旧的索引。
+    """
+
+    def __init__(self, cache_dir: str | Path, max_files: int = 256):
+        """
+        参数：
+            cache_dir: 索引文件的存放目录
+            max_files: 最多保留的索引文件数量
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_files = max_files
+
+    def get(self, file_path: str, encoding: str, interval: int) -> RowCheckpointIndex | None:
+        """
+        读取文件的行检查点索引。
+
+        参数：
+            file_path: 数据文件路径
+            encoding: 读取文件使用的编码
+            interval: 期望的检查点间隔，与已保存索引不一致时视为未命中
+
+        返回：
+            行检查点索引；未缓存、文件已变化或索引文件损坏时返回 None
+        """
+        index_file = self._get_index_file(file_path, encoding)
+        if index_file is None or not index_file.exists():
+            return None
+        try:
+            with open(index_file, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != ROW_INDEX_VERSION or data.get("interval") != interval:
+                return None
+            return RowCheckpointIndex(interval=interval, offsets=tuple(data["offsets"]),
+                                      total_rows=data["total_rows"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"加载行索引文件 {index_file.name} 失败: {e}")
+            try:
+                index_file.unlink()
+            except OSError:
+                pass  # 无法删除文件时忽略
+            return None
+
+    def set(self, file_path: str, encoding: str, index: RowCheckpointIndex) -> None:
+        """保存文件的行检查点索引，写入失败时只记录日志。"""
+        index_file = self._get_index_file(file_path, encoding)
+        if index_file is None:
+            return
+        data = {
+            "version": ROW_INDEX_VERSION,
+            "interval": index.interval,
+            "total_rows": index.total_rows,
+            "offsets": list(index.offsets),
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(index_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            self._cleanup()
+        except OSError as e:
+            logger.warning(f"保存行索引文件 {index_file.name} 失败: {e}")
+
+    def clear(self) -> None:
+        """删除所有索引文件。"""
+        if not self.cache_dir.is_dir():
+            return
+        for index_file in self.cache_dir.glob('*.json'):
+            try:
+                index_file.unlink()
+            except OSError:
+                # 忽略删除错误，继续删除其他文件
+                pass
+
+    def _get_index_file(self, file_path: str, encoding: str) -> Path | None:
+        """计算索引文件路径，无法确定文件指纹时返回 None。"""
+        fingerprint = calculate_file_fingerprint(file_path)
+        if fingerprint.startswith(("missing:", "error:")):
+            return None
+        key = hashlib.sha256(f"{fingerprint}|{encoding}".encode()).hexdigest()[:32]
+        return self.cache_dir / f"{key}.json"
+
+    def _cleanup(self) -> None:
+        """索引文件超出数量上限时删除最旧的索引。"""
+        try:
+            index_files = sorted((f for f in self.cache_dir.glob('*.json') if f.is_file()),
+                                 key=lambda f: f.stat().st_mtime)
+        except OSError:
+            return
+        for index_file in index_files[:max(0, len(index_files) - self.max_files)]:
+            try:
+                index_file.unlink()
+            except OSError:
+                continue
+
+
+# 全局行索引缓存实例（线程安全）
+_global_row_index_cache = None
+_row_index_cache_lock = threading.Lock()
+
+
+def get_row_index_cache() -> RowIndexCache:
+    """获取全局行索引缓存实例，索引文件存放在配置的缓存目录下的 row_index 子目录。"""
+    global _global_row_index_cache
+    if _global_row_index_cache is None:
+        with _row_index_cache_lock:
+            # 双重检查锁定模式
+            if _global_row_index_cache is None:
+                _global_row_index_cache = RowIndexCache(get_config().get_cache_dir() / "row_index")
+    return _global_row_index_cache
+
+
+def reset_row_index_cache() -> None:
+    """重置全局行索引缓存实例（不删除已有的索引文件）。"""
+    global _global_row_index_cache
+    with _row_index_cache_lock:
+        _global_row_index_cache = None
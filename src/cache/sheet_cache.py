@@ -0,0 +1,187 @@
+"""
+工作表模型缓存。
+
+同一文件在一次会话中常被先解析为JSON、再转换为HTML、再读取另一个范围，每次都要重新解析整个工作簿。
+本模块把解析器返回的工作表列表按 (文件指纹, 解析器类, 工作表名称) 保存在内存中，
+供 CoreService 的 parse_sheet、parse_sheet_optimized 与 convert_to_html 共用。
+缓存按估算的内存占用限制总大小，超出时淘汰最久未使用的条目；文件内容或修改时间变化后旧条目不会再被命中。
+"""
+
+import copy
+import sys
+import threading
+from collections.abc import Sequence
+from functools import partial
+from typing import Any
+
+from ..models.columnar_sheet import OBJECT_KIND, STRING_KIND, ColumnarSheet
+from ..models.sparse_sheet import SparseSheet
+from ..models.table_model import Chart, Sheet
+from ..unified_config import get_config
+from .cache_manager import calculate_file_fingerprint
+from .lru_cache import CELL_OVERHEAD_BYTES, ROW_OVERHEAD_BYTES, LRURowBlockCache, estimate_row_block_size
+
+# 估算列式工作表内存占用时每个单元格在值数组、有效位图和样式编号数组中的开销（字节）
+COLUMNAR_CELL_BYTES = 16
+
+
+class SheetCache:
+    """
+    线程安全的工作表模型缓存。
+
+    缓存保存的是工作表的浅拷贝，get 每次也返回新的浅拷贝：调用方转换出的稠密行和提取的图表
+    只保存在自己的拷贝上，不会使条目占用的内存超出估算值。行数据由各拷贝共享，调用方不应修改其内容。
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        参数：
+            max_bytes: 所有条目估算大小之和的上限
+        """
+        self._cache = LRURowBlockCache(max_bytes=max_bytes, getsizeof=estimate_sheets_size)
+
+    def get(self, file_path: str, parser_classes: Sequence[type],
+            sheet_name: str | None = None) -> list[Sheet] | None:
+        """
+        获取缓存的解析结果。
+
+        参数：
+            file_path: 文件路径
+            parser_classes: 可接受其解析结果的解析器类，按优先顺序查找
+            sheet_name: 工作表名称；为 None 时查找整个工作簿的解析结果
+
+        返回：
+            工作表列表；指定 sheet_name 时整个工作簿的解析结果中的同名工作表同样可用。未命中时返回 None
+        """
+        fingerprint = _get_fingerprint(file_path)
+        if fingerprint is None:
+            return None
+        for parser_class in parser_classes:
+            sheets = self._cache.get((fingerprint, parser_class, sheet_name))
+            if sheets is None and sheet_name is not None:
+                workbook_sheets = self._cache.get((fingerprint, parser_class, None))
+                if workbook_sheets is not None:
+                    sheets = [sheet for sheet in workbook_sheets if sheet.name == sheet_name] or None
+            if sheets is not None:
+                return [copy.copy(sheet) for sheet in sheets]
+        return None
+
+    def set(self, file_path: str, parser_class: type, sheet_name: str | None, sheets: list[Sheet]) -> None:
+        """
+        缓存解析结果，空列表不缓存。
+
+        尚未提取的图表不在此时提取：延迟提取函数引用着解析器加载的整个工作簿，缓存的拷贝改用
+        解析器类的 load_sheet_visuals 按文件路径重新提取。解析器类不支持按路径提取时不缓存。
+        """
+        if not sheets or not all(isinstance(sheet, Sheet) for sheet in sheets):
+            return
+        fingerprint = _get_fingerprint(file_path)
+        if fingerprint is None:
+            return
+        cached_sheets = []
+        for sheet in sheets:
+            cached_sheet = copy.copy(sheet)
+            if sheet.chart_loader is not None:
+                if not hasattr(parser_class, 'load_sheet_visuals'):
+                    return
+                cached_sheet.chart_loader = partial(_load_sheet_visuals, parser_class, file_path, sheet.name)
+            cached_sheets.append(cached_sheet)
+        self._cache.set((fingerprint, parser_class, sheet_name), cached_sheets)
+
+    def clear(self) -> None:
+        """清除所有条目。"""
+        self._cache.clear()
+
+
+def _load_sheet_visuals(parser_class: type, file_path: str, sheet_name: str) -> list[Chart]:
+    """缓存的工作表的延迟图表加载函数，按文件路径重新提取图表与图片。"""
+    return parser_class().load_sheet_visuals(file_path, sheet_name)
+
+
+def _get_fingerprint(file_path: str) -> str | None:
+    """返回文件指纹，文件不存在或无法计算指纹时返回 None。"""
+    fingerprint = calculate_file_fingerprint(file_path)
+    if fingerprint.startswith(("missing:", "error:")):
+        return None
+    return fingerprint
+
+
+def estimate_sheets_size(sheets: Sequence[Sheet]) -> int:
+    """
+    估算一组工作表占用的内存（字节）。
+
+    列式与稀疏工作表按其紧凑存储估算；已提取的图表与图片计入其数据、SVG和图片字节。
+    """
+    size = sys.getsizeof(sheets)
+    for sheet in sheets:
+        if isinstance(sheet, ColumnarSheet) and sheet._rows is None:
+            size += _estimate_columnar_size(sheet)
+        elif isinstance(sheet, SparseSheet) and sheet._rows is None:
+            size += _estimate_sparse_size(sheet)
+        else:
+            size += estimate_row_block_size(sheet.rows)
+        size += sum(_estimate_value_size(chart.chart_data) + _estimate_value_size(chart.svg_data)
+                    + sys.getsizeof(chart) for chart in sheet.charts)
+    return size
+
+
+def _estimate_value_size(value: Any) -> int:
+    """估算图表数据等嵌套的字典、列表、字符串和字节串占用的内存。"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_value_size(key) + _estimate_value_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_value_size(item) for item in value)
+    return size
+
+
+def _estimate_columnar_size(sheet: ColumnarSheet) -> int:
+    """估算列式工作表的内存占用，字符串列的字典只计一次。"""
+    size = estimate_row_block_size([sheet.header]) if sheet.header is not None else 0
+    for column in sheet.columns:
+        if column.kind == OBJECT_KIND:
+            size += len(column) * CELL_OVERHEAD_BYTES
+        else:
+            size += len(column) * COLUMNAR_CELL_BYTES
+        if column.kind == STRING_KIND:
+            size += sum(sys.getsizeof(value) for value in column.dictionary)
+    return size
+
+
+def _estimate_sparse_size(sheet: SparseSheet) -> int:
+    """估算稀疏工作表的内存占用，共享的行只计一次。"""
+    size = sys.getsizeof(sheet.sparse_rows)
+    seen_rows: set[int] = set()
+    for row in sheet.sparse_rows.values():
+        if id(row) in seen_rows:
+            continue
+        seen_rows.add(id(row))
+        size += ROW_OVERHEAD_BYTES + len(row.runs) * CELL_OVERHEAD_BYTES
+        size += sum(CELL_OVERHEAD_BYTES + sys.getsizeof(cell.value) for cell in row.cells.values())
+    return size
+
+
+# 全局工作表缓存实例（线程安全）
+_global_sheet_cache = None
+_sheet_cache_lock = threading.Lock()
+
+
+def get_sheet_cache() -> SheetCache | None:
+    """获取全局工作表缓存实例，容量按配置的 sheet_cache_size_mb 设置；缓存被禁用或容量为0时返回 None。"""
+    global _global_sheet_cache
+    config = get_config()
+    if not config.cache_enabled or config.sheet_cache_size_mb == 0:
+        return None
+    if _global_sheet_cache is None:
+        with _sheet_cache_lock:
+            # 双重检查锁定模式
+            if _global_sheet_cache is None:
+                _global_sheet_cache = SheetCache(max_bytes=config.sheet_cache_size_mb * 1024 * 1024)
+    return _global_sheet_cache
+
+
+def reset_sheet_cache() -> None:
+    """重置全局工作表缓存实例，已缓存的工作表随之释放。"""
+    global _global_sheet_cache
+    with _sheet_cache_lock:
+        _global_sheet_cache = None
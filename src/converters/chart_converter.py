@@ -37,7 +37,7 @@ class ChartConverter:
         生成叠加图表（带定位信息的图表）的 HTML。
         """
         position_calculator = create_position_calculator(sheet)
-        overlay_charts = [chart for chart in sheet.charts if chart.position is not None]
+        overlay_charts = [chart for chart in sheet.get_charts() if chart.position is not None]
         if not overlay_charts:
             return ""
 
@@ -6,12 +6,29 @@ from src.converters.cell_converter import CellConverter
 from src.converters.chart_converter import ChartConverter
 from src.converters.style_converter import StyleConverter
 from src.converters.table_structure_converter import TableStructureConverter
+from src.models.sparse_sheet import SparseSheet
 from src.models.table_model import Sheet
 from src.utils.html_utils import compact_html, create_html_element
 
 logger = logging.getLogger(__name__)
 
 
+def get_sheet_output_path(output_path: str, sheet_name: str, multiple_sheets: bool) -> Path:
+    """
+    获取工作表的输出文件路径：转换多个工作表时在文件名后追加工作表名称。
+    参数：
+        output_path: 输出文件路径模板。
+        sheet_name: 工作表名称。
+        multiple_sheets: 是否同时转换多个工作表。
+    返回：
+        该工作表的输出文件路径。
+    """
+    output_p = Path(output_path)
+    if not multiple_sheets:
+        return output_p
+    return output_p.parent / f"{output_p.stem}-{sheet_name}{output_p.suffix or '.html'}"
+
+
 class HTMLConverter:
     """将 Sheet 对象转换为 HTML 文件的转换器。"""
 
@@ -40,37 +57,53 @@ class HTMLConverter:
         返回：
             转换结果信息列表。
         """
-        results = []
-        output_p = Path(output_path)
-        base_name = output_p.stem
-        extension = output_p.suffix or '.html'
-
-        for i, sheet in enumerate(sheets):
-            if len(sheets) > 1:
-                sheet_output_path = output_p.parent / f"{base_name}-{sheet.name}{extension}"
-            else:
-                sheet_output_path = output_p
-            try:
-                html_content = self._generate_html(sheet)
-                sheet_output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(sheet_output_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                file_size = sheet_output_path.stat().st_size
-                results.append({
-                    "status": "success",
-                    "output_path": str(sheet_output_path.absolute()),
-                    "file_size": file_size,
-                    "file_size_kb": round(file_size / 1024, 2),
-                    "sheet_name": sheet.name,
-                    "rows_converted": len(sheet.rows),
-                    "cells_converted": sum(len(row.cells) for row in sheet.rows),
-                    "has_styles": any(any(cell.style for cell in row.cells) for row in sheet.rows),
-                    "has_merged_cells": len(sheet.merged_cells) > 0
-                })
-            except Exception as e:
-                logger.error(f"HTML conversion failed for sheet '{sheet.name}': {e}")
-                results.append({"status": "error", "sheet_name": sheet.name, "error": str(e)})
-        return results
+        multiple_sheets = len(sheets) > 1
+        return [
+            self.convert_sheet_to_file(sheet, get_sheet_output_path(output_path, sheet.name, multiple_sheets))
+            for sheet in sheets
+        ]
+
+    def convert_sheet_to_file(self, sheet: Sheet, sheet_output_path: Path) -> dict[str, Any]:
+        """
+        将单个 Sheet 对象转换为 HTML 文件。
+        参数：
+            sheet: Sheet 对象。
+            sheet_output_path: 该工作表的输出文件路径。
+        返回：
+            转换结果信息，失败时 status 为 "error"。
+        """
+        try:
+            html_content = self._generate_html(sheet)
+            sheet_output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(sheet_output_path, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+            file_size = sheet_output_path.stat().st_size
+            return {
+                "status": "success",
+                "output_path": str(sheet_output_path.absolute()),
+                "file_size": file_size,
+                "file_size_kb": round(file_size / 1024, 2),
+                "sheet_name": sheet.name,
+                **self._get_conversion_stats(sheet),
+                "has_merged_cells": len(sheet.merged_cells) > 0
+            }
+        except Exception as e:
+            logger.error(f"HTML conversion failed for sheet '{sheet.name}': {e}")
+            return {"status": "error", "sheet_name": sheet.name, "error": str(e)}
+
+    def _get_conversion_stats(self, sheet: Sheet) -> dict[str, Any]:
+        """统计转换的行数、单元格数以及是否有样式，稀疏工作表不展开空单元格。"""
+        if isinstance(sheet, SparseSheet):
+            return {
+                "rows_converted": sheet.get_total_rows(),
+                "cells_converted": sheet.count_cells(),
+                "has_styles": sheet.has_styles()
+            }
+        return {
+            "rows_converted": len(sheet.rows),
+            "cells_converted": sum(len(row.cells) for row in sheet.rows),
+            "has_styles": any(any(cell.style for cell in row.cells) for row in sheet.rows)
+        }
 
     def _generate_html(self, sheet: Sheet) -> str:
         """
@@ -90,7 +123,7 @@ class HTMLConverter:
         css_content = self.style_converter.generate_css(styles, sheet)
         table_html = self.table_converter.generate_table(sheet, styles, effective_header_rows)
         overlay_charts_html = self.chart_converter.generate_overlay_charts_html(sheet)
-        standalone_charts_html = self.chart_converter.generate_standalone_charts_html(sheet.charts)
+        standalone_charts_html = self.chart_converter.generate_standalone_charts_html(sheet.get_charts())
 
         # 根据是否检测到Excel标题来决定是否包含<h1>标签
         html_template = self._get_html_template(include_h1=not has_excel_title)
@@ -116,12 +149,14 @@ class HTMLConverter:
         参数：sheet: Sheet对象
         返回：检测到的表头行数
         """
-        if not sheet.rows or len(sheet.rows) < 2:
-            return min(1, len(sheet.rows))  # 如果只有0-1行，返回实际行数
+        total_rows = sheet.get_total_rows()
+        if total_rows < 2:
+            return min(1, total_rows)  # 如果只有0-1行，返回实际行数
 
         # 默认至少有1行表头
         header_rows = 1
-        max_check_rows = min(10, len(sheet.rows))  # 最多检查前10行
+        max_check_rows = min(10, total_rows)  # 最多检查前10行
+        check_rows = list(sheet.iter_rows(0, max_check_rows))
 
         # 检查合并单元格
         header_merged_cells = []
@@ -144,8 +179,7 @@ class HTMLConverter:
         header_row_styles = []
 
         # 收集前几行的样式特征
-        for i in range(min(max_check_rows, len(sheet.rows))):
-            row = sheet.rows[i]
+        for i, row in enumerate(check_rows):
             style_features = self._get_row_style_features(row)
             if i < header_rows:
                 header_row_styles.append(style_features)
@@ -154,8 +188,8 @@ class HTMLConverter:
 
         # 如果数据行样式与表头行显著不同，可能是多行表头
         if data_row_styles and header_row_styles:
-            for i in range(header_rows, min(max_check_rows, len(sheet.rows))):
-                if self._is_header_style(sheet.rows[i], header_row_styles, data_row_styles):
+            for i in range(header_rows, len(check_rows)):
+                if self._is_header_style(check_rows[i], header_row_styles, data_row_styles):
                     header_rows = i + 1
                 else:
                     break
@@ -176,11 +210,10 @@ class HTMLConverter:
         返回：
             bool: 如果检测到标题行返回True，否则返回False
         """
-        if not sheet.rows or not sheet.rows[0].cells:
+        first_row = next(iter(sheet.iter_rows(0, 1)), None)
+        if first_row is None or not first_row.cells:
             return False
 
-        first_row = sheet.rows[0]
-
         # 检查第一行的所有单元格
         for cell in first_row.cells:
             if cell.value and str(cell.value).strip() and cell.style:
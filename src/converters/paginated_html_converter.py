@@ -8,6 +8,7 @@ import logging
 from typing import Any
 
 from .html_converter import HTMLConverter
+from ..models.sparse_sheet import SparseSheet
 from ..models.table_model import Sheet
 
 logger = logging.getLogger(__name__)
@@ -42,7 +43,7 @@ class PaginatedHTMLConverter(HTMLConverter):
             HTML字符串
         """
         # 计算分页信息
-        total_rows = len(sheet.rows)
+        total_rows = sheet.get_total_rows()
         total_pages = (total_rows + self.page_size - 1) // self.page_size if total_rows > 0 else 1
         
         # 确保页码在有效范围内
@@ -78,19 +79,27 @@ class PaginatedHTMLConverter(HTMLConverter):
         返回：
             分页后的Sheet对象
         """
+        sheet_kwargs = dict(
+            merged_cells=sheet.merged_cells,  # 保留合并单元格信息
+            charts=sheet.get_charts(),  # 保留图表信息
+            column_widths=sheet.column_widths,  # 保留列宽信息
+            row_heights=sheet.row_heights,  # 保留行高信息
+            default_column_width=sheet.default_column_width,
+            default_row_height=sheet.default_row_height
+        )
+
+        if isinstance(sheet, SparseSheet):
+            # 稀疏工作表按行号截取保存的行，不展开空单元格
+            return sheet.slice_rows(start_row, end_row, **sheet_kwargs)
+
         # 获取当前页的行数据
-        paginated_rows = sheet.rows[start_row:end_row] if sheet.rows else []
+        paginated_rows = list(sheet.iter_rows(start_row, end_row - start_row))
         
         # 创建新的Sheet对象
         paginated_sheet = Sheet(
             name=sheet.name,
             rows=paginated_rows,
-            merged_cells=sheet.merged_cells,  # 保留合并单元格信息
-            charts=sheet.charts,  # 保留图表信息
-            column_widths=sheet.column_widths,  # 保留列宽信息
-            row_heights=sheet.row_heights,  # 保留行高信息
-            default_column_width=sheet.default_column_width,
-            default_row_height=sheet.default_row_height
+            **sheet_kwargs
         )
         
         return paginated_sheet
@@ -128,13 +137,12 @@ class PaginatedHTMLConverter(HTMLConverter):
                 "file_size": file_size,
                 "file_size_kb": round(file_size / 1024, 2),
                 "sheet_name": sheet.name,
-                "rows_converted": len(sheet.rows),
-                "cells_converted": sum(len(row.cells) for row in sheet.rows),
-                "has_styles": any(any(cell.style for cell in row.cells) for row in sheet.rows),
+                **self._get_conversion_stats(sheet),
                 "has_merged_cells": len(sheet.merged_cells) > 0,
                 "page_size": self.page_size,
                 "page_number": self.page_number,
-                "total_pages": (len(sheet.rows) + self.page_size - 1) // self.page_size if len(sheet.rows) > 0 else 1
+                "total_pages": (sheet.get_total_rows() + self.page_size - 1) // self.page_size
+                if sheet.get_total_rows() > 0 else 1
             }
 
         except Exception as e:
@@ -0,0 +1,79 @@
+"""
+多工作表并行转换模块
+
+将多工作表工作簿中每个工作表的“解析 + 渲染”作为独立任务提交到进程池。
+每个工作进程只解析自己负责的工作表（BaseParser.parse 的 sheet_name 参数），
+渲染后直接写出HTML文件，主进程只接收精简的转换结果信息，避免在进程间传递
+Sheet 对象或HTML文本。
+工作进程以 spawn 方式启动，不继承主进程运行时修改的配置：主进程的配置快照在每个工作进程启动时应用，
+解析器类也由主进程选定后传入。
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from src.converters.html_converter import HTMLConverter, get_sheet_output_path
+from src.parsers.factory import ParserFactory
+from src.unified_config import UnifiedConfig, set_config
+
+logger = logging.getLogger(__name__)
+
+
+def convert_sheets_in_parallel(file_path: str, sheet_names: list[str], output_path: str,
+                               max_workers: int, header_rows: int = 1,
+                               compact_mode: bool = False, config: UnifiedConfig | None = None,
+                               parser_class: type | None = None) -> list[dict[str, Any]]:
+    """
+    在进程池中并行解析并渲染多个工作表。
+
+    参数：
+        file_path: 源文件路径
+        sheet_names: 要转换的工作表名称（结果按此顺序返回），由主进程读取，工作进程不再读取
+        output_path: 输出文件路径模板，转换多个工作表时文件名追加工作表名称
+        max_workers: 最大进程数
+        header_rows: 表头行数
+        compact_mode: 是否使用紧凑模式
+        config: 在工作进程中应用的配置快照（可选），为 None 时工作进程使用默认配置
+        parser_class: 解析器类（可选），为 None 时工作进程按文件扩展名选择
+
+    返回：
+        与 HTMLConverter.convert_to_files 格式相同的转换结果列表
+
+    异常：
+        工作进程中解析失败的异常会原样抛出；进程池无法创建时抛出 OSError 等系统异常
+    """
+    multiple_sheets = len(sheet_names) > 1
+    # 使用 spawn 启动工作进程，避免在多线程的服务进程中 fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(sheet_names)), mp_context=context,
+                             initializer=_initialize_worker, initargs=(config,)) as executor:
+        futures = [
+            executor.submit(
+                _convert_sheet_job, file_path, sheet_name,
+                str(get_sheet_output_path(output_path, sheet_name, multiple_sheets)),
+                header_rows, compact_mode, parser_class
+            )
+            for sheet_name in sheet_names
+        ]
+        return [future.result() for future in futures]
+
+
+def _initialize_worker(config: UnifiedConfig | None) -> None:
+    """工作进程启动时应用主进程的配置快照。"""
+    if config is not None:
+        set_config(config)
+
+
+def _convert_sheet_job(file_path: str, sheet_name: str, sheet_output_path: str,
+                       header_rows: int, compact_mode: bool, parser_class: type | None = None) -> dict[str, Any]:
+    """工作进程任务：只解析指定工作表并写出HTML文件。"""
+    parser = parser_class() if parser_class is not None else ParserFactory.get_parser(file_path)
+    sheets = parser.parse(file_path, sheet_name)
+    if not sheets:
+        return {"status": "error", "sheet_name": sheet_name, "error": f"工作表 '{sheet_name}' 在文件中未找到。"}
+
+    converter = HTMLConverter(compact_mode=compact_mode, header_rows=header_rows)
+    return converter.convert_sheet_to_file(sheets[0], Path(sheet_output_path))
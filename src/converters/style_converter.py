@@ -2,6 +2,7 @@ import logging
 
 from src.constants import StyleConstants
 from src.font_manager import get_font_manager
+from src.models.sparse_sheet import SparseSheet
 from src.models.table_model import Sheet, Style
 from src.utils.color_utils import format_color
 
@@ -23,15 +24,17 @@ class StyleConverter:
         seen_style_keys = set()
         style_counter = 0
 
-        for row in sheet.rows:
-            for cell in row.cells:
-                if cell.style:
-                    style_key = self.get_style_key(cell.style)
-                    if style_key not in seen_style_keys:
-                        seen_style_keys.add(style_key)
-                        style_id = f"style_{style_counter}"
-                        styles[style_id] = cell.style
-                        style_counter += 1
+        # 稀疏工作表直接遍历保存的样式，不展开空单元格
+        cell_styles = sheet.iter_styles() if isinstance(sheet, SparseSheet) else \
+            (cell.style for row in sheet.rows for cell in row.cells)
+        for style in cell_styles:
+            if style:
+                style_key = self.get_style_key(style)
+                if style_key not in seen_style_keys:
+                    seen_style_keys.add(style_key)
+                    style_id = f"style_{style_counter}"
+                    styles[style_id] = style
+                    style_counter += 1
         return styles
 
     def get_style_key(self, style: Style) -> str:
@@ -1,5 +1,7 @@
+from collections.abc import Iterable
 from typing import Any
-from src.models.table_model import Sheet, Row
+from src.models.sparse_sheet import SparseSheet
+from src.models.table_model import Sheet, Row, Cell
 from src.utils.range_parser import parse_range_string
 from src.utils.html_utils import escape_html, create_html_element, create_table_cell
 
@@ -47,25 +49,27 @@ class TableStructureConverter:
         style_key_to_id_map = {self.style_converter.get_style_key(style_obj): style_id for style_id, style_obj in
                                styles.items()}
 
-        if header_rows > 0 and len(sheet.rows) > 0:
+        total_rows = sheet.get_total_rows()
+        if header_rows > 0 and total_rows > 0:
             table_parts.append('<thead>')
-            self._generate_rows_html(table_parts, sheet.rows[:header_rows], occupied_cells, merged_cells_map,
-                                     style_key_to_id_map, is_header=True)
+            self._generate_rows_html(table_parts, self._iter_table_rows(sheet, 0, header_rows, merged_cells_map),
+                                     occupied_cells, merged_cells_map, style_key_to_id_map, is_header=True)
             table_parts.append('</thead>')
-            if len(sheet.rows) > header_rows:
+            if total_rows > header_rows:
                 table_parts.append('<tbody>')
-                self._generate_rows_html(table_parts, sheet.rows[header_rows:], occupied_cells, merged_cells_map,
-                                         style_key_to_id_map, is_header=False, row_offset=header_rows)
+                self._generate_rows_html(table_parts, self._iter_table_rows(sheet, header_rows, None, merged_cells_map),
+                                         occupied_cells, merged_cells_map, style_key_to_id_map, is_header=False,
+                                         row_offset=header_rows)
                 table_parts.append('</tbody>')
             else:
                 # 即使没有数据行，也要添加空的tbody
                 table_parts.append('<tbody>')
                 table_parts.append('</tbody>')
         else:
-            if sheet.rows:  # 只有当有行时才添加tbody
+            if total_rows > 0:  # 只有当有行时才添加tbody
                 table_parts.append('<tbody>')
-                self._generate_rows_html(table_parts, sheet.rows, occupied_cells, merged_cells_map, style_key_to_id_map,
-                                         is_header=False)
+                self._generate_rows_html(table_parts, self._iter_table_rows(sheet, 0, None, merged_cells_map),
+                                         occupied_cells, merged_cells_map, style_key_to_id_map, is_header=False)
                 table_parts.append('</tbody>')
             else:
                 # 空表格也需要tbody
@@ -75,6 +79,31 @@ class TableStructureConverter:
         table_parts.append('</table>')
         return "\n".join(table_parts)
 
+    def _iter_table_rows(self, sheet: Sheet, start_row: int, max_rows: int | None,
+                         merged_cells_map: dict[tuple[int, int], dict[str, int]]) -> Iterable[Row]:
+        """
+        产出要渲染的行。
+
+        最后一个有内容的列之后的空单元格不会输出，稀疏工作表因此只产出各行保存的部分，
+        并补齐到该行最右侧合并区域的起始列。
+        """
+        if not isinstance(sheet, SparseSheet):
+            return sheet.iter_rows(start_row, max_rows)
+        merge_widths: dict[int, int] = {}
+        for row_idx, col_idx in merged_cells_map:
+            merge_widths[row_idx] = max(merge_widths.get(row_idx, 0), min(col_idx + 1, sheet.column_count))
+        return self._pad_rows(sheet.iter_content_rows(start_row, max_rows), start_row, merge_widths,
+                              sheet.default_style)
+
+    @staticmethod
+    def _pad_rows(rows: Iterable[Row], start_row: int, widths: dict[int, int], style) -> Iterable[Row]:
+        """把 widths 中列出的行补齐到指定的单元格数。"""
+        for row_idx, row in enumerate(rows, start_row):
+            width = widths.get(row_idx, 0)
+            if len(row.cells) < width:
+                row.cells.extend(Cell(value=None, style=style) for _ in range(width - len(row.cells)))
+            yield row
+
     def _generate_row_html(self, row: Row, styles: dict[str, Any], is_header: bool = False,
                           occupied_cells: set | None = None, merged_cells_map: dict | None = None,
                           row_idx: int = 0) -> str:
@@ -8,18 +8,25 @@
 """
 
 import logging
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, datetime
 from pathlib import Path
+from collections.abc import Iterator
 from typing import Any
 
-from .utils.range_parser import parse_range_string
+from .utils.range_parser import CellRange, parse_range_string
 from .utils.style_parser import style_to_dict
+from .parsers.base_parser import BaseParser
 from .parsers.factory import ParserFactory
-from .models.table_model import Sheet
+from .parsers.xlsx_native_parser import XlsxNativeParser
+from .models.columnar_sheet import ColumnarSheet
+from .models.sparse_sheet import SparseSheet
+from .models.table_model import Row, Sheet
 from .converters.html_converter import HTMLConverter
+from .converters.parallel_converter import convert_sheets_in_parallel
 from .streaming import StreamingTableReader, ChunkFilter
 from .unified_config import get_config
-from .cache import get_cache_manager
+from .cache import get_cache_manager, get_sheet_cache
 from .exceptions import FileNotFoundError
 from .validators import validate_file_input
 
@@ -72,37 +79,17 @@ class CoreService:
             if enable_streaming and self._should_use_streaming(str(validated_path), streaming_threshold):
                 json_data = self._parse_sheet_streaming(str(validated_path), sheet_name, range_string)
             else:
-                # 使用传统方法
-                sheets = parser.parse(str(validated_path))
-                
-                # 如果指定了工作表名称，则选择对应的工作表
-                if sheet_name:
-                    target_sheet = next((s for s in sheets if s.name == sheet_name), None)
-                    if not target_sheet:
-                        raise ValueError(f"工作表 '{sheet_name}' 不存在。")
-                # 否则，默认使用第一个工作表
-                else:
-                    if not sheets:
-                        raise ValueError("文件中没有找到任何工作表。")
-                    target_sheet = sheets[0]
+                # 使用传统方法（只解析目标工作表，未指定时为第一个工作表；指定范围时只解析该范围）
+                cell_range = self._get_pushdown_range(range_string)
+                target_name = sheet_name or self._get_first_sheet_name(parser, str(validated_path))
+                sheets, cell_range = self._parse_sheets(parser, str(validated_path), target_name, cell_range)
 
-                # 检查工作表是否为空
+                target_sheet = next((s for s in sheets if s.name == target_name), None)
                 if not target_sheet:
-                    logger.warning("目标工作表为None")
-                    return {
-                        "sheet_name": "Empty",
-                        "headers": [],
-                        "rows": [],
-                        "total_rows": 0,
-                        "total_columns": 0,
-                        "size_info": {
-                            "total_cells": 0,
-                            "processing_mode": "empty",
-                            "recommendation": "工作表为空，无数据可显示"
-                        }
-                    }
+                    raise ValueError(f"工作表 '{target_name}' 不存在。")
 
-                if not target_sheet.rows:
+                # 检查工作表是否为空
+                if target_sheet.get_total_rows() == 0 and cell_range is None:
                     logger.warning(f"工作表 '{target_sheet.name}' 为空")
                     return {
                         "sheet_name": target_sheet.name,
@@ -117,8 +104,9 @@ class CoreService:
                         }
                     }
                 
-                # 转换为标准化JSON格式
-                json_data = self._sheet_to_json(target_sheet, range_string)
+                # 转换为标准化JSON格式（范围已下推时工作表只包含范围内的单元格）
+                origin = cell_range[:2] if cell_range is not None else (0, 0)
+                json_data = self._sheet_to_json(target_sheet, range_string, origin)
             
             # 缓存解析结果
             cache_manager.set(file_path, json_data, range_string, sheet_name)
@@ -133,7 +121,7 @@ class CoreService:
     def parse_sheet_optimized(self, file_path: str, sheet_name: str | None = None,
                              range_string: str | None = None, include_full_data: bool = False,
                              include_styles: bool = False, preview_rows: int = 5,
-                             max_rows: int | None = None) -> dict[str, Any]:
+                             max_rows: int | None = None, engine: str | None = None) -> dict[str, Any]:
         """
         参数：
             file_path: 文件路径
@@ -143,6 +131,7 @@ class CoreService:
             include_styles: 是否包含样式信息（默认False）
             preview_rows: 预览行数（默认5行）
             max_rows: 最大返回行数（可选）
+            engine: 解析引擎（可选）。未指定时，不需要样式则使用原生纯数据引擎
 
         返回：
             优化后的JSON数据
@@ -151,38 +140,46 @@ class CoreService:
             # 验证文件输入
             validated_path, _ = validate_file_input(file_path)
 
+            # 不需要样式时自动选择只读取数据的原生引擎；已缓存的默认解析器结果包含全部数据，同样可用
+            accept_default_parser = False
+            if engine is None and not include_styles:
+                engine = ParserFactory.NATIVE_ENGINE
+                accept_default_parser = True
+
             # 获取解析器
-            parser = self.parser_factory.get_parser(str(validated_path))
+            parser = self.parser_factory.get_parser(str(validated_path), engine=engine)
 
-            # 解析文件
-            sheets = parser.parse(str(validated_path))
+            # 解析文件（只解析目标工作表，未指定时为第一个工作表；指定范围时只解析该范围）
+            cell_range = self._get_pushdown_range(range_string)
+            target_name = sheet_name or self._get_first_sheet_name(parser, str(validated_path))
+            sheets, cell_range = self._parse_sheets(parser, str(validated_path), target_name, cell_range,
+                                                    accept_default_parser)
 
             # 选择目标工作表
-            if sheet_name:
-                target_sheet = next((s for s in sheets if s.name == sheet_name), None)
-                if not target_sheet:
-                    available_sheets = [s.name for s in sheets]
-                    raise ValueError(f"工作表 '{sheet_name}' 不存在。可用工作表: {available_sheets}")
-            else:
-                if not sheets:
-                    raise ValueError("文件中没有找到任何工作表。")
-                target_sheet = sheets[0]
+            target_sheet = next((s for s in sheets if s.name == target_name), None)
+            if not target_sheet:
+                available_sheets = parser.get_sheet_names(str(validated_path))
+                raise ValueError(f"工作表 '{target_name}' 不存在。可用工作表: {available_sheets}")
 
             # 处理范围选择
             if range_string:
                 try:
                     start_row, start_col, end_row, end_col = parse_range_string(range_string)
-                    return self._extract_range_data(target_sheet, start_row, start_col, end_row, end_col, include_styles)
+                    origin = cell_range[:2] if cell_range is not None else (0, 0)
+                    return self._extract_range_data(target_sheet, start_row, start_col, end_row, end_col,
+                                                    include_styles, origin)
                 except ValueError as e:
                     raise ValueError(f"范围格式错误: {e}")
 
-            # 根据参数返回不同级别的数据
+            # 根据参数返回不同级别的数据；原生引擎不读取样式，即使命中默认解析器缓存的结果也不报告样式，
+            # 保证响应与缓存状态无关
             return self._extract_optimized_data(
                 target_sheet,
                 include_full_data=include_full_data,
                 include_styles=include_styles,
                 preview_rows=preview_rows,
-                max_rows=max_rows
+                max_rows=max_rows,
+                styles_known=not isinstance(parser, XlsxNativeParser)
             )
 
         except Exception as e:
@@ -216,20 +213,29 @@ class CoreService:
             if output_path is None:
                 output_path = str(path.with_suffix('.html'))
 
-            # 获取解析器并解析
+            # 获取解析器并解析（指定工作表时只解析该工作表）
             parser = self.parser_factory.get_parser(file_path)
-            sheets: list[Sheet] = parser.parse(file_path)
+
+            # 不分页地转换全部工作表时，多工作表工作簿可在进程池中并行解析与渲染
+            if not sheet_name and not (page_size is not None and page_size > 0):
+                parallel_results = self._convert_sheets_in_parallel(parser, file_path, output_path, header_rows)
+                if parallel_results is not None:
+                    return parallel_results
+
+            sheets, _ = self._parse_sheets(parser, file_path, sheet_name)
 
             # Filter sheets if a specific sheet_name is provided
             sheets_to_convert = sheets
+            workbook_sheet_count = len(sheets)
             if sheet_name:
                 sheets_to_convert = [s for s in sheets if s.name == sheet_name]
                 if not sheets_to_convert:
                     raise ValueError(f"工作表 '{sheet_name}' 在文件中未找到。")
+                workbook_sheet_count = len(parser.get_sheet_names(file_path))
 
             # When converting a single sheet from a multi-sheet workbook,
             # the output file name should reflect the sheet name.
-            if len(sheets_to_convert) == 1 and len(sheets) > 1:
+            if len(sheets_to_convert) == 1 and workbook_sheet_count > 1:
                  output_p = Path(output_path)
                  final_output_path = str(output_p.parent / f"{output_p.stem}-{sheets_to_convert[0].name}{output_p.suffix or '.html'}")
             else:
@@ -259,6 +265,83 @@ class CoreService:
             logger.error(f"HTML转换失败: {e}")
             raise
 
+    def _get_first_sheet_name(self, parser, file_path: str) -> str:
+        """
+        获取第一个工作表的名称。
+
+        解析器只读取工作簿目录，未指定工作表时据此只解析第一个工作表，不再解析整个工作簿后取第一个。
+        """
+        sheet_names = parser.get_sheet_names(file_path)
+        if not sheet_names:
+            raise ValueError("文件中没有找到任何工作表。")
+        return sheet_names[0]
+
+    def _parse_sheets(self, parser, file_path: str, sheet_name: str | None = None,
+                      cell_range: CellRange | None = None,
+                      accept_default_parser: bool = False) -> tuple[list[Sheet], CellRange | None]:
+        """
+        解析文件，优先使用工作表缓存中已有的解析结果。
+
+        命中缓存时得到完整的工作表，cell_range 不再下推；未命中时按 cell_range 解析，
+        只有完整解析（未下推范围）的结果才写入缓存。
+
+        参数：
+            parser: 解析器
+            file_path: 文件路径
+            sheet_name: 只解析该工作表（可选）
+            cell_range: 下推给解析器的单元格范围（可选）
+            accept_default_parser: 是否也接受默认解析器缓存的结果（在 parser 自身的结果之后查找）
+
+        返回：
+            (工作表列表, 实际下推的范围)
+        """
+        sheet_cache = get_sheet_cache() if isinstance(parser, BaseParser) else None
+        if sheet_cache is not None:
+            parser_classes = [type(parser)]
+            if accept_default_parser:
+                parser_classes.append(ParserFactory.get_parser_class(file_path))
+            sheets = sheet_cache.get(file_path, parser_classes, sheet_name or None)
+            if sheets is not None:
+                logger.debug(f"从工作表缓存获取解析结果: {file_path}")
+                return sheets, None
+
+        sheets = parser.parse(file_path, sheet_name=sheet_name or None, cell_range=cell_range)
+        if sheet_cache is not None and cell_range is None:
+            sheet_cache.set(file_path, type(parser), sheet_name or None, sheets)
+        return sheets, cell_range
+
+    def _convert_sheets_in_parallel(self, parser, file_path: str, output_path: str,
+                                    header_rows: int) -> list[dict[str, Any]] | None:
+        """
+        按 parallel_sheet_workers 配置在进程池中并行转换多工作表工作簿。
+
+        工作进程使用当前配置的快照和同一个解析器类；整个工作簿的解析结果已在工作表缓存中时
+        直接串行渲染，不再交给工作进程重新解析。
+
+        返回：
+            转换结果列表；未启用并行、只有一个工作表、解析结果已缓存或进程池不可用时返回None，由调用方串行转换
+        """
+        config = get_config()
+        workers = config.get_parallel_sheet_workers()
+        if workers <= 1:
+            return None
+
+        sheet_names = parser.get_sheet_names(file_path)
+        if len(sheet_names) <= 1:
+            return None
+
+        sheet_cache = get_sheet_cache() if isinstance(parser, BaseParser) else None
+        if sheet_cache is not None and sheet_cache.get(file_path, [type(parser)]) is not None:
+            return None
+
+        try:
+            return convert_sheets_in_parallel(file_path, sheet_names, output_path, workers,
+                                              header_rows=header_rows, config=config,
+                                              parser_class=type(parser))
+        except (BrokenProcessPool, NotImplementedError, OSError) as e:
+            logger.warning(f"并行转换不可用，回退到串行转换: {e}")
+            return None
+
     def apply_changes(self, file_path: str, table_model_json: dict[str, Any], create_backup: bool = True) -> dict[str, Any]:
         """
         将TableModel JSON的修改应用回原始文件。
@@ -545,13 +628,32 @@ class CoreService:
         logger.info(f"XLSX文件已更新: {file_path}")
         return changes_count
 
-    def _sheet_to_json(self, sheet: Sheet, range_string: str | None = None) -> dict[str, Any]:
+    def _get_pushdown_range(self, range_string: str | None) -> CellRange | None:
+        """
+        将范围字符串转换为可下推给解析器的单元格范围。
+
+        无范围或范围无效时返回 None，此时完整解析工作表，由 _sheet_to_json 按原逻辑处理
+        （无效范围返回采样数据或报错）。
+        """
+        if not range_string:
+            return None
+        try:
+            start_row, start_col, end_row, end_col = parse_range_string(range_string)
+        except ValueError:
+            return None
+        if start_row > end_row or start_col > end_col:
+            return None
+        return start_row, start_col, end_row, end_col
+
+    def _sheet_to_json(self, sheet: Sheet, range_string: str | None = None,
+                       origin: tuple[int, int] = (0, 0)) -> dict[str, Any]:
         """
         将Sheet对象转换为标准化的JSON格式。
 
         参数：
             sheet: Sheet对象
             range_string: 可选的范围字符串（如"A1:D10"）
+            origin: sheet 第一个单元格在原工作表中的 (行, 列)，范围已下推给解析器时不为 (0, 0)
 
         返回值：
             标准化的JSON数据
@@ -569,7 +671,7 @@ class CoreService:
         if range_string:
             try:
                 start_row, start_col, end_row, end_col = parse_range_string(range_string)
-                return self._extract_range_data(sheet, start_row, start_col, end_row, end_col)
+                return self._extract_range_data(sheet, start_row, start_col, end_row, end_col, origin=origin)
             except ValueError as e:
                 logger.warning(f"范围解析失败: {e}, 返回采样数据")
                 # 范围解析失败时，返回采样数据而不是完整数据
@@ -597,20 +699,23 @@ class CoreService:
 
     def _extract_optimized_data(self, sheet: Sheet, include_full_data: bool = False,
                                include_styles: bool = False, preview_rows: int = 5,
-                               max_rows: int | None = None) -> dict[str, Any]:
+                               max_rows: int | None = None, styles_known: bool = True) -> dict[str, Any]:
         """
         提取优化后的数据，避免上下文爆炸。
+
+        styles_known 为 False（解析引擎不读取样式）时 metadata.has_styles 为 None，表示未知。
         """
         # 基础元数据
-        total_rows = len(sheet.rows)
-        total_cols = len(sheet.rows[0].cells) if sheet.rows else 0
+        total_rows = sheet.get_total_rows()
+        first_row = self._get_first_row(sheet)
+        total_cols = len(first_row.cells) if first_row else 0
         total_cells = total_rows * total_cols
 
         # 提取表头
         headers = []
-        if sheet.rows:
+        if first_row:
             headers = [cell.value if cell is not None and cell.value is not None else f"Column_{i}"
-                      for i, cell in enumerate(sheet.rows[0].cells)]
+                      for i, cell in enumerate(first_row.cells)]
 
         # 分析数据类型
         data_types = self._analyze_data_types(sheet, headers)
@@ -623,7 +728,7 @@ class CoreService:
                 "total_cols": total_cols,
                 "total_cells": total_cells,
                 "data_rows": max(0, total_rows - 1),  # 减去表头行
-                "has_styles": any(any(cell.style for cell in row.cells if cell is not None) for row in sheet.rows),
+                "has_styles": self._has_styles(sheet) if styles_known else None,
                 "has_merged_cells": len(sheet.merged_cells) > 0,
                 "merged_cells_count": len(sheet.merged_cells),
                 "preview_rows": min(preview_rows, max(0, total_rows - 1))
@@ -645,7 +750,7 @@ class CoreService:
                 response["metadata"]["truncated"] = True
                 response["metadata"]["truncated_at"] = max_rows
 
-            for row in sheet.rows[start_row:end_row]:
+            for row in sheet.iter_rows(start_row, end_row - start_row):
                 row_data = []
                 for cell in row.cells:
                     if cell is not None:
@@ -667,14 +772,8 @@ class CoreService:
             start_row = 1 if total_rows > 1 else 0
             end_row = min(start_row + preview_rows, total_rows)
 
-            for row in sheet.rows[start_row:end_row]:
-                row_data = []
-                for cell in row.cells:
-                    # 预览模式下不包含样式，减少数据量
-                    if cell is not None:
-                        row_data.append(self._value_to_json_serializable(cell.value))
-                    else:
-                        row_data.append(None)
+            # 预览模式下不包含样式，减少数据量
+            for row_data, _ in self._iter_json_rows(sheet, start_row, end_row - start_row, include_styles=False):
                 preview_data.append(row_data)
 
             response["preview_rows"] = preview_data
@@ -685,15 +784,16 @@ class CoreService:
         """分析每列的数据类型。"""
         data_types = {}
 
-        if len(sheet.rows) <= 1:
+        if sheet.get_total_rows() <= 1:
             return {header: "unknown" for header in headers}
 
+        sample_rows = list(sheet.iter_rows(1, 5))
         for col_idx, header in enumerate(headers):
             types_found = set()
             sample_count = 0
 
             # 检查前几行来推断数据类型
-            for row in sheet.rows[1:min(6, len(sheet.rows))]:
+            for row in sample_rows:
                 if col_idx < len(row.cells):
                     cell = row.cells[col_idx]
                     # 检查单元格是否为None或者值为None
@@ -701,10 +801,10 @@ class CoreService:
                         value = cell.value
                         if isinstance(value, str) and value.strip():
                             types_found.add("text")
-                        elif isinstance(value, (int, float)):
-                            types_found.add("number")
                         elif isinstance(value, bool):
                             types_found.add("boolean")
+                        elif isinstance(value, (int, float)):
+                            types_found.add("number")
                         else:
                             types_found.add("other")
                         sample_count += 1
@@ -721,38 +821,27 @@ class CoreService:
     def _extract_sample_data(self, sheet: Sheet, total_cells: int) -> dict[str, Any]:
         """提取采样数据，用于中等大小的文件。"""
         # 提取前10行作为样本
-        sample_size = min(10, len(sheet.rows))
-        sample_rows = []
+        total_rows = sheet.get_total_rows()
+        sample_size = min(10, total_rows)
+        first_row = self._get_first_row(sheet)
 
         # 提取表头
         headers = []
-        if sheet.rows:
+        if first_row:
             headers = [cell.value if cell is not None and cell.value is not None else f"Column_{i}"
-                      for i, cell in enumerate(sheet.rows[0].cells)]
+                      for i, cell in enumerate(first_row.cells)]
 
         # 提取样本数据
-        for i in range(sample_size):
-            if i < len(sheet.rows):
-                row_data = []
-                for cell in sheet.rows[i].cells:
-                    if cell is not None:
-                        cell_data = {
-                            "value": self._value_to_json_serializable(cell.value),
-                            "style": style_to_dict(cell.style) if cell.style else None
-                        }
-                    else:
-                        cell_data = {
-                            "value": None,
-                            "style": None
-                        }
-                    row_data.append(cell_data)
-                sample_rows.append(row_data)
+        sample_rows = [
+            [{"value": value, "style": style} for value, style in zip(values, styles)]
+            for values, styles in self._iter_json_rows(sheet, 0, sample_size)
+        ]
 
         return {
             "sheet_name": sheet.name,
             "metadata": {
-                "total_rows": len(sheet.rows),
-                "total_cols": len(sheet.rows[0].cells) if sheet.rows else 0,
+                "total_rows": total_rows,
+                "total_cols": len(first_row.cells) if first_row else 0,
                 "total_cells": total_cells,
                 "processing_mode": "sample",
                 "supports_streaming": False
@@ -775,26 +864,21 @@ class CoreService:
         headers = []
         data_rows = []
 
-        if sheet.rows:
+        first_row = self._get_first_row(sheet)
+
+        if first_row:
             # 第一行作为表头
             headers = [cell.value if cell is not None and cell.value is not None else f"Column_{i}"
-                      for i, cell in enumerate(sheet.rows[0].cells)]
+                      for i, cell in enumerate(first_row.cells)]
 
             # 其余行作为数据（不包含样式）
-            for row in sheet.rows[1:]:
-                row_data = []
-                for cell in row.cells:
-                    if cell is not None:
-                        row_data.append(self._value_to_json_serializable(cell.value))
-                    else:
-                        row_data.append(None)
-                data_rows.append(row_data)
+            data_rows = [row_data for row_data, _ in self._iter_json_rows(sheet, 1, include_styles=False)]
 
         return {
             "sheet_name": sheet.name,
             "metadata": {
-                "total_rows": len(sheet.rows),
-                "total_cols": len(sheet.rows[0].cells) if sheet.rows else 0,
+                "total_rows": sheet.get_total_rows(),
+                "total_cols": len(first_row.cells) if first_row else 0,
                 "total_cells": total_cells,
                 "processing_mode": "simplified",
                 "supports_streaming": False
@@ -810,6 +894,55 @@ class CoreService:
             }
         }
 
+    def _get_first_row(self, sheet: Sheet) -> Row | None:
+        """返回工作表的第一行（表头行），空表返回 None。"""
+        return next(iter(sheet.iter_rows(0, 1)), None)
+
+    def _has_styles(self, sheet: Sheet) -> bool:
+        """检查工作表中是否有带样式的单元格，列式和稀疏工作表直接检查保存的样式。"""
+        if isinstance(sheet, (ColumnarSheet, SparseSheet)):
+            return sheet.has_styles()
+        return any(any(cell.style for cell in row.cells if cell is not None) for row in sheet.rows)
+
+    def _iter_json_rows(self, sheet: Sheet, start_row: int = 0, max_rows: int | None = None,
+                        include_styles: bool = True) -> Iterator[tuple[list[Any], list[dict[str, Any] | None] | None]]:
+        """
+        按行产出 (可JSON序列化的值列表, 样式字典列表)，include_styles 为 False 时样式字典列表为 None。
+
+        列式工作表按列批量取值，只有 object 列的值需要逐个转换，不创建 Row/Cell 对象；
+        稀疏工作表只转换保存的单元格，空位置不创建对象。同一样式实例的样式字典只生成一次。
+        """
+        style_dicts: dict[int, dict[str, Any]] = {}
+
+        def to_style_dicts(styles: list) -> list[dict[str, Any] | None]:
+            result = []
+            for style in styles:
+                if not style:
+                    result.append(None)
+                    continue
+                style_dict = style_dicts.get(id(style))
+                if style_dict is None:
+                    style_dict = style_dicts[id(style)] = style_to_dict(style)
+                result.append(style_dict)
+            return result
+
+        if isinstance(sheet, (ColumnarSheet, SparseSheet)):
+            value_rows = sheet.iter_row_values(start_row, max_rows, convert_objects=self._value_to_json_serializable)
+            if not include_styles:
+                for values in value_rows:
+                    yield values, None
+                return
+            for values, styles in zip(value_rows, sheet.iter_row_styles(start_row, max_rows)):
+                yield values, to_style_dicts(styles)
+            return
+
+        for row in sheet.iter_rows(start_row, max_rows):
+            values = [self._value_to_json_serializable(cell.value) if cell is not None else None for cell in row.cells]
+            if not include_styles:
+                yield values, None
+            else:
+                yield values, to_style_dicts([cell.style if cell is not None else None for cell in row.cells])
+
     def _value_to_json_serializable(self, value):
         """Converts a cell value to a JSON serializable format."""
         if isinstance(value, (datetime, date)):
@@ -820,23 +953,35 @@ class CoreService:
 
     def _calculate_data_size(self, sheet: Sheet) -> int:
         """计算表格的总单元格数，处理空表格的边界条件。"""
-        if not sheet or not sheet.rows:
+        if not sheet:
+            return 0
+        if isinstance(sheet, (ColumnarSheet, SparseSheet)):
+            return sheet.count_cells()
+        if not sheet.rows:
             return 0
         return sum(len(row.cells) if row and row.cells else 0 for row in sheet.rows)
 
 
     def _extract_range_data(self, sheet: Sheet, start_row: int, start_col: int,
-                           end_row: int, end_col: int, include_styles: bool = False) -> dict[str, Any]:
-        """提取指定范围的数据。"""
+                           end_row: int, end_col: int, include_styles: bool = False,
+                           origin: tuple[int, int] = (0, 0)) -> dict[str, Any]:
+        """
+        提取指定范围的数据。
+
+        范围坐标始终是原工作表中的坐标；origin 为 sheet 第一个单元格在原工作表中的 (行, 列)，
+        解析器已按范围截取工作表时据此换算到 sheet 内的索引。
+        """
         # 验证范围有效性
         if start_row < 0 or start_col < 0:
             raise ValueError("范围起始位置不能为负数")
         if start_row > end_row or start_col > end_col:
             raise ValueError(f"范围无效: 起始位置({start_row},{start_col})不能大于结束位置({end_row},{end_col})")
 
+        row_offset, col_offset = origin
+        total_rows = sheet.get_total_rows()
         # 调整范围以适应实际数据大小
-        actual_end_row = min(end_row, len(sheet.rows) - 1)
-        if start_row >= len(sheet.rows):
+        actual_end_row = min(end_row, total_rows - 1 + row_offset)
+        if start_row >= total_rows + row_offset:
             # 起始行超出数据范围，返回空结果
             return {
                 "sheet_name": sheet.name,
@@ -856,28 +1001,15 @@ class CoreService:
         range_rows = []
         headers = []
 
-        for row_idx in range(start_row, actual_end_row + 1):
-            row = sheet.rows[row_idx]
+        json_rows = self._iter_json_rows(sheet, start_row - row_offset, actual_end_row - start_row + 1,
+                                         include_styles)
+        for row_idx, (values, styles) in enumerate(json_rows, start_row):
             row_data = []
 
-            for col_idx in range(start_col, min(end_col + 1, len(row.cells))):
-                if col_idx < len(row.cells):
-                    cell = row.cells[col_idx]
-                    # 检查单元格是否为None
-                    if cell is not None:
-                        cell_data = {
-                            "value": self._value_to_json_serializable(cell.value)
-                        }
-                        if include_styles:
-                            cell_data["style"] = style_to_dict(cell.style) if cell.style else None
-                    else:
-                        cell_data = {"value": None}
-                        if include_styles:
-                            cell_data["style"] = None
-                else:
-                    cell_data = {"value": None}
-                    if include_styles:
-                        cell_data["style"] = None
+            for col_idx in range(start_col, min(end_col + 1, len(values) + col_offset)):
+                cell_data = {"value": values[col_idx - col_offset]}
+                if include_styles:
+                    cell_data["style"] = styles[col_idx - col_offset]
                 row_data.append(cell_data)
 
             if row_idx == start_row:
@@ -913,20 +1045,8 @@ class CoreService:
         sample_rows = []
         headers = []
 
-        for row_idx, row in enumerate(sheet.rows[:5]):
-            row_data = []
-            for cell in row.cells:
-                if cell is not None:
-                    cell_data = {
-                        "value": self._value_to_json_serializable(cell.value),
-                        "style": style_to_dict(cell.style) if cell.style else None
-                    }
-                else:
-                    cell_data = {
-                        "value": None,
-                        "style": None
-                    }
-                row_data.append(cell_data)
+        for row_idx, (values, styles) in enumerate(self._iter_json_rows(sheet, 0, 5)):
+            row_data = [{"value": value, "style": style} for value, style in zip(values, styles)]
 
             if row_idx == 0:
                 headers = [cell["value"] if cell["value"] is not None else f"Column_{i}"
@@ -936,9 +1056,10 @@ class CoreService:
 
         # 分析数据类型
         data_types = {}
+        data_sample_rows = list(sheet.iter_rows(1, 5))
         for col_idx, header in enumerate(headers):
             types_found = set()
-            for row in sheet.rows[1:6]:  # 检查前5行数据
+            for row in data_sample_rows:  # 检查前5行数据
                 if col_idx < len(row.cells) and row.cells[col_idx].value is not None:
                     value = self._value_to_json_serializable(row.cells[col_idx].value)
                     if isinstance(value, str):
@@ -953,10 +1074,10 @@ class CoreService:
             "sheet_name": sheet.name,
             "metadata": {
                 "parser_type": "新解析器系统",
-                "total_rows": len(sheet.rows),
+                "total_rows": sheet.get_total_rows(),
                 "total_cols": len(headers),
                 "total_cells": total_cells,
-                "has_styles": any(any(cell.style for cell in row.cells if cell is not None) for row in sheet.rows),
+                "has_styles": self._has_styles(sheet),
                 "data_types": data_types
             },
             "sample_data": {
@@ -982,41 +1103,33 @@ class CoreService:
         headers = []
         data_rows = []
         
-        if sheet.rows:
+        total_rows = sheet.get_total_rows()
+        first_row = self._get_first_row(sheet)
+
+        if first_row:
             # If there's only one row, treat it as data, not a header.
-            if len(sheet.rows) == 1:
-                 headers = [f"Column_{i}" for i in range(len(sheet.rows[0].cells))]
+            if total_rows == 1:
+                 headers = [f"Column_{i}" for i in range(len(first_row.cells))]
                  start_row_index = 0
             else:
                  headers = [cell.value if cell is not None and cell.value is not None else f"Column_{i}"
-                           for i, cell in enumerate(sheet.rows[0].cells)]
+                           for i, cell in enumerate(first_row.cells)]
                  start_row_index = 1
 
             # 提取数据行
-            for row in sheet.rows[start_row_index:]:
-                row_data = []
-                for cell in row.cells:
-                    if cell is not None:
-                        cell_data = {
-                            "value": self._value_to_json_serializable(cell.value),
-                            "style": style_to_dict(cell.style) if cell.style else None
-                        }
-                    else:
-                        cell_data = {
-                            "value": None,
-                            "style": None
-                        }
-                    row_data.append(cell_data)
-                data_rows.append(row_data)
+            data_rows = [
+                [{"value": value, "style": style} for value, style in zip(values, styles)]
+                for values, styles in self._iter_json_rows(sheet, start_row_index)
+            ]
 
         return {
             "sheet_name": sheet.name,
             "metadata": {
                 "parser_type": "新解析器系统",
-                "total_rows": len(sheet.rows),
+                "total_rows": total_rows,
                 "total_cols": len(headers),
                 "data_rows": len(data_rows),
-                "has_styles": any(any(cell.style for cell in row.cells if cell is not None) for row in sheet.rows)
+                "has_styles": self._has_styles(sheet)
             },
             "headers": headers,
             "rows": data_rows,
@@ -1054,10 +1167,10 @@ class CoreService:
             if file_size > current_config.streaming_file_size_mb * 1024 * 1024:
                 return True
             
-            # 对于较小的文件，可以先快速解析一小部分来估算总大小
+            # 对于较小的文件，按采样估算的行数判断，无需扫描整个文件
             try:
                 with StreamingTableReader(file_path) as reader:
-                    info = reader.get_info()
+                    info = reader.get_info(estimate_rows=True)
                     total_cells = info['total_rows'] * info['total_columns']
                     return total_cells >= threshold
             except Exception as e:
@@ -1151,17 +1264,15 @@ class CoreService:
             logger.error(f"流式解析失败: {e}")
             # 回退到传统方法
             parser = self.parser_factory.get_parser(file_path)
-            sheets = parser.parse(file_path)
-            # 选择指定的工作表或第一个工作表
-            if sheet_name:
-                target_sheet = next((s for s in sheets if s.name == sheet_name), None)
-                if not target_sheet:
-                    raise ValueError(f"工作表 '{sheet_name}' 不存在。")
-            else:
-                if not sheets:
-                    raise ValueError("文件中没有找到任何工作表。")
-                target_sheet = sheets[0]
-            return self._sheet_to_json(target_sheet, range_string)
+            cell_range = self._get_pushdown_range(range_string)
+            # 只解析指定的工作表或第一个工作表
+            target_name = sheet_name or self._get_first_sheet_name(parser, file_path)
+            sheets = parser.parse(file_path, sheet_name=target_name, cell_range=cell_range)
+            target_sheet = next((s for s in sheets if s.name == target_name), None)
+            if not target_sheet:
+                raise ValueError(f"工作表 '{target_name}' 不存在。")
+            origin = cell_range[:2] if cell_range is not None else (0, 0)
+            return self._sheet_to_json(target_sheet, range_string, origin)
     
     def _generate_streaming_summary(self, reader: StreamingTableReader, file_info: dict[str, Any]) -> dict[str, Any]:
         """
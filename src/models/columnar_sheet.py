@@ -0,0 +1,454 @@
+"""
+列式工作表模块
+
+按列保存工作表数据：数值列使用定长的 array（整数 'q'、浮点数 'd'、布尔值 'b'），
+字符串列按字典编码为整数代码，空值由有效性位图标记，样式以样式表中的编号保存在并行的样式编号列中。
+同一类型的列不为每个单元格创建Python对象，统计和JSON转换可以按列批量完成。
+"""
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+from src.models.table_model import Cell, Row, Sheet, Style
+
+# 列的存储类型
+NULL_KIND = "null"        # 全部为空值，不分配数据数组
+INT_KIND = "int"          # array('q')
+FLOAT_KIND = "float"      # array('d')
+BOOL_KIND = "bool"        # array('b')
+STRING_KIND = "string"    # 字典编码：array('I') 代码 + 字典
+OBJECT_KIND = "object"    # 其他类型（日期、富文本、混合类型）：list
+
+_ARRAY_KINDS = {int: (INT_KIND, 'q'), float: (FLOAT_KIND, 'd'), bool: (BOOL_KIND, 'b')}
+
+
+class Column:
+    """
+    列式工作表中的一列。
+
+    第一个非空值的类型决定列的存储类型；之后出现其他类型的值时整列转为 object 存储，
+    保证取出的值与写入时完全相同（整数不会变成浮点数）。
+    字符串列的代码 0 保留给空值，因此字符串列不需要查询有效性位图。
+    """
+
+    __slots__ = ('kind', '_values', '_dictionary', '_lookup', '_validity', '_style_ids', '_length', 'null_count')
+
+    def __init__(self, length: int = 0):
+        """
+        参数：
+            length: 初始长度，新列在已有行中全部为空值
+        """
+        self.kind = NULL_KIND
+        self._values: Any = None
+        self._dictionary: list[str | None] | None = None
+        self._lookup: dict[str, int] | None = None
+        self._validity = bytearray((length + 7) // 8)
+        self._style_ids: array | None = None
+        self._length = length
+        self.null_count = length
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> 'Column':
+        """
+        由整列的值一次性构建列，存储类型与逐个 append 这些值时相同。
+
+        按列批量填充数据数组和有效性位图，适合已按列读取的数据（如 pyarrow 表的列）。
+        """
+        length = len(values)
+        column = cls()
+        column._length = length
+        validity = bytearray((length + 7) // 8)
+        for index, value in enumerate(values):
+            if value is not None:
+                validity[index >> 3] |= 1 << (index & 7)
+        column._validity = validity
+        column.null_count = sum(1 for value in values if value is None)
+
+        kinds = {type(value) for value in values if value is not None}
+        if not kinds:
+            return column
+        value_type = kinds.pop() if len(kinds) == 1 else None
+        if value_type is str:
+            column._start_kind(str, 0)
+            dictionary, lookup, codes = column._dictionary, column._lookup, column._values
+            for value in values:
+                if value is None:
+                    codes.append(0)
+                    continue
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(dictionary)
+                    dictionary.append(value)
+                codes.append(code)
+            return column
+        if value_type in _ARRAY_KINDS:
+            kind, typecode = _ARRAY_KINDS[value_type]
+            try:
+                column._values = array(typecode, [0 if value is None else value for value in values])
+                column.kind = kind
+                return column
+            except OverflowError:
+                # 超出64位整数范围
+                pass
+        column.kind = OBJECT_KIND
+        column._values = list(values)
+        return column
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def dictionary(self) -> list[str | None] | None:
+        """字符串列的字典（代码 0 对应空值），其他类型的列为 None。"""
+        return self._dictionary
+
+    def append(self, value: Any, style_id: int = 0) -> None:
+        """在列尾追加一个值及其样式编号（0 表示无样式）。"""
+        index = self._length
+        if index % 8 == 0:
+            self._validity.append(0)
+        if style_id:
+            if self._style_ids is None:
+                self._style_ids = array('I', [0]) * index
+            self._style_ids.append(style_id)
+        elif self._style_ids is not None:
+            self._style_ids.append(0)
+        self._length = index + 1
+
+        if value is None:
+            self.null_count += 1
+            if self.kind != NULL_KIND:
+                self._append_placeholder()
+            return
+
+        self._validity[index >> 3] |= 1 << (index & 7)
+        value_type = type(value)
+        kind = self.kind
+        if kind == NULL_KIND:
+            self._start_kind(value_type, index)
+            kind = self.kind
+
+        if kind == STRING_KIND:
+            if value_type is str:
+                code = self._lookup.get(value)
+                if code is None:
+                    code = self._lookup[value] = len(self._dictionary)
+                    self._dictionary.append(value)
+                self._values.append(code)
+                return
+        elif kind == OBJECT_KIND:
+            self._values.append(value)
+            return
+        elif _ARRAY_KINDS.get(value_type, (None,))[0] == kind:
+            try:
+                self._values.append(value)
+                return
+            except OverflowError:
+                # 超出64位整数范围
+                pass
+
+        self._to_object(index)
+        self._values.append(value)
+
+    def get(self, index: int) -> Any:
+        """返回第 index 个值，空值返回 None。"""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"列索引 {index} 超出范围")
+        if self.kind == STRING_KIND:
+            return self._dictionary[self._values[index]]
+        if not self._validity[index >> 3] >> (index & 7) & 1:
+            return None
+        if self.kind == BOOL_KIND:
+            return bool(self._values[index])
+        return self._values[index]
+
+    def to_list(self, start: int = 0, stop: int | None = None) -> list[Any]:
+        """返回 [start, stop) 范围内的值列表，空值为 None。"""
+        start, stop, _ = slice(start, stop).indices(self._length)
+        if start >= stop:
+            return []
+        kind = self.kind
+        if kind == NULL_KIND:
+            return [None] * (stop - start)
+        if kind == STRING_KIND:
+            return list(map(self._dictionary.__getitem__, self._values[start:stop]))
+
+        values = self._values[start:stop]
+        if kind != OBJECT_KIND:
+            values = values.tolist()
+            if kind == BOOL_KIND:
+                values = list(map(bool, values))
+        if self.null_count and kind != OBJECT_KIND:
+            validity = self._validity
+            values = [value if validity[i >> 3] >> (i & 7) & 1 else None
+                      for i, value in enumerate(values, start)]
+        return values
+
+    def style_ids(self, start: int = 0, stop: int | None = None) -> list[int]:
+        """返回 [start, stop) 范围内的样式编号列表。"""
+        start, stop, _ = slice(start, stop).indices(self._length)
+        if self._style_ids is None:
+            return [0] * max(stop - start, 0)
+        return self._style_ids[start:stop].tolist()
+
+    def has_styles(self) -> bool:
+        """列中是否有带样式的值。"""
+        return self._style_ids is not None and any(self._style_ids)
+
+    def _start_kind(self, value_type: type, length: int) -> None:
+        """根据第一个非空值的类型选择存储方式，已有的 length 个空值用占位值填充。"""
+        if value_type is str:
+            self.kind = STRING_KIND
+            self._dictionary = [None]
+            self._lookup = {}
+            self._values = array('I', [0]) * length
+        elif value_type in _ARRAY_KINDS:
+            self.kind, typecode = _ARRAY_KINDS[value_type]
+            self._values = array(typecode, [0]) * length
+        else:
+            self.kind = OBJECT_KIND
+            self._values = [None] * length
+
+    def _append_placeholder(self) -> None:
+        """为空值追加占位值（字符串列为代码 0，数值列为 0，object 列为 None）。"""
+        self._values.append(None if self.kind == OBJECT_KIND else 0)
+
+    def _to_object(self, length: int) -> None:
+        """把前 length 个值转为 object 存储。"""
+        values = self.to_list(0, length)
+        self.kind = OBJECT_KIND
+        self._values = values
+        self._dictionary = None
+        self._lookup = None
+
+
+class ColumnarSheetBuilder:
+    """
+    按行填充 ColumnarSheet 的构建器，解析器逐行调用 append_row，最后调用 build。
+
+    第一行作为表头保存为普通的 Row 对象，不参与列类型的推断；之后的行写入各列。
+    """
+
+    def __init__(self):
+        self._header: Row | None = None
+        self._columns: list[Column] = []
+        self._row_lengths = array('I')
+        self._styles: list[Style | None] = [None]
+        self._style_ids: dict[int, int] = {}
+        self._formulas: dict[tuple[int, int], str] = {}
+
+    def append_row(self, values: Sequence[Any], styles: Sequence[Style | None] | None = None,
+                   formulas: dict[int, str] | None = None) -> None:
+        """
+        追加一行。
+
+        参数：
+            values: 各列的值
+            styles: 各列的样式（可选），长度与 values 相同
+            formulas: {列索引: 公式文本}（可选），只包含有公式的单元格
+        """
+        row_index = len(self._row_lengths) + (self._header is not None)
+        if self._header is None:
+            self._header = Row(cells=[
+                Cell(value=value, style=styles[col] if styles else None,
+                     formula=formulas.get(col) if formulas else None)
+                for col, value in enumerate(values)
+            ])
+            return
+
+        width = len(values)
+        columns = self._columns
+        data_rows = len(self._row_lengths)
+        while len(columns) < width:
+            columns.append(Column(data_rows))
+
+        if styles is None:
+            for column, value in zip(columns, values):
+                column.append(value)
+        else:
+            for column, value, style in zip(columns, values, styles):
+                column.append(value, self._get_style_id(style) if style is not None else 0)
+        for column in columns[width:]:
+            column.append(None)
+
+        self._row_lengths.append(width)
+        if formulas:
+            for col, formula in formulas.items():
+                self._formulas[(row_index, col)] = formula
+
+    def build(self, name: str, **kwargs) -> 'ColumnarSheet':
+        """生成 ColumnarSheet，kwargs 传给 Sheet（如 merged_cells、column_widths）。"""
+        return ColumnarSheet(name=name, header=self._header, columns=self._columns,
+                             row_lengths=self._row_lengths, styles=self._styles,
+                             formulas=self._formulas, **kwargs)
+
+    def _get_style_id(self, style: Style) -> int:
+        """返回样式在样式表中的编号。解析器返回共享的样式实例，按对象身份去重，无需计算哈希。"""
+        style_id = self._style_ids.get(id(style))
+        if style_id is None:
+            style_id = self._style_ids[id(style)] = len(self._styles)
+            self._styles.append(style)
+        return style_id
+
+
+class ColumnarSheet(Sheet):
+    """
+    列式保存数据的工作表。
+
+    第0行为表头，保存为普通的 Row；其后的行按列保存在 columns 中，
+    每行的实际单元格数保存在 row_lengths 中（各行长度可以不同）。
+    首次访问 rows 时才把全部数据转换为 Row/Cell 对象；iter_rows、iter_row_values
+    和 count_cells 等方法直接读取列数据。单元格的 row_span、col_span 恒为 1。
+    """
+
+    def __init__(self, name: str, header: Row | None, columns: list[Column], row_lengths: array,
+                 styles: list[Style | None], formulas: dict[tuple[int, int], str] | None = None, **kwargs):
+        """
+        参数：
+            name: 工作表名称
+            header: 表头行，为 None 时工作表为空
+            columns: 数据行的各列
+            row_lengths: 每个数据行的单元格数
+            styles: 样式表，样式编号为其下标，编号 0 为 None
+            formulas: {(行索引, 列索引): 公式文本}，行索引包含表头行
+        """
+        self.header = header
+        self.columns = columns
+        self.row_lengths = row_lengths
+        self.styles = styles
+        self.formulas = formulas or {}
+        super().__init__(name=name, rows=None, **kwargs)
+
+    @property
+    def rows(self) -> list[Row]:
+        """全部行，首次访问时从列式数据转换并缓存。"""
+        if self._rows is None:
+            self._rows = list(self.iter_rows())
+        return self._rows
+
+    @rows.setter
+    def rows(self, value: list[Row] | None) -> None:
+        self._rows = value
+
+    def get_total_rows(self) -> int:
+        """返回总行数（含表头行），无需转换数据。"""
+        if self._rows is not None:
+            return len(self._rows)
+        if self.header is None:
+            return 0
+        return len(self.row_lengths) + 1
+
+    def count_cells(self) -> int:
+        """返回全部行的单元格数之和。"""
+        if self._rows is not None:
+            return sum(len(row.cells) for row in self._rows)
+        if self.header is None:
+            return 0
+        return len(self.header.cells) + sum(self.row_lengths)
+
+    def has_styles(self) -> bool:
+        """是否有任何单元格带有样式。"""
+        if self._rows is not None:
+            return any(cell.style for row in self._rows for cell in row.cells if cell is not None)
+        if self.header is None:
+            return False
+        return any(cell.style for cell in self.header.cells) or any(column.has_styles() for column in self.columns)
+
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterable[Row]:
+        """遍历部分行，只转换请求范围内的数据。"""
+        if self._rows is not None:
+            yield from super().iter_rows(start_row, max_rows)
+            return
+
+        styles = self.styles
+        formulas = self.formulas
+        for row_index, values, style_ids in self._iter_row_data(start_row, max_rows, with_styles=True):
+            if values is None:
+                yield self.header
+                continue
+            yield Row(cells=[
+                Cell(value=value, style=styles[style_id], formula=formulas.get((row_index, col)) if formulas else None)
+                for col, (value, style_id) in enumerate(zip(values, style_ids))
+            ])
+
+    def iter_row_values(self, start_row: int = 0, max_rows: int | None = None,
+                        convert_objects: Callable[[Any], Any] | None = None) -> Iterator[list[Any]]:
+        """
+        按行产出单元格值的列表，不创建 Row/Cell 对象。
+
+        参数：
+            start_row: 起始行索引
+            max_rows: 最多产出的行数
+            convert_objects: 对表头和 object 列的值逐个应用的转换函数（可选），
+                数值、布尔值和字符串列的值原样产出，调用方的转换函数应对这些类型保持不变
+        """
+        if self._rows is not None:
+            for row in super().iter_rows(start_row, max_rows):
+                values = [cell.value if cell is not None else None for cell in row.cells]
+                yield values if convert_objects is None else list(map(convert_objects, values))
+            return
+
+        for _, values, _ in self._iter_row_data(start_row, max_rows, with_styles=False, convert=convert_objects):
+            if values is None:
+                values = [cell.value for cell in self.header.cells]
+                if convert_objects is not None:
+                    values = list(map(convert_objects, values))
+            yield values
+
+    def iter_row_styles(self, start_row: int = 0, max_rows: int | None = None) -> Iterator[list[Style | None]]:
+        """按行产出单元格样式的列表，与 iter_row_values 一一对应。"""
+        if self._rows is not None:
+            for row in super().iter_rows(start_row, max_rows):
+                yield [cell.style if cell is not None else None for cell in row.cells]
+            return
+
+        styles = self.styles
+        for _, values, style_ids in self._iter_row_data(start_row, max_rows, with_styles=True):
+            if values is None:
+                yield [cell.style for cell in self.header.cells]
+            else:
+                yield [styles[style_id] for style_id in style_ids]
+
+    def _iter_row_data(self, start_row: int, max_rows: int | None, with_styles: bool,
+                       convert: Callable[[Any], Any] | None = None
+                       ) -> Iterator[tuple[int, list[Any] | None, list[int] | None]]:
+        """
+        按行产出 (行索引, 值列表, 样式编号列表)。
+
+        先按列批量取出请求范围的值（convert 只应用于 object 列）再转置为行；
+        表头行的值列表为 None，由调用方使用 header。
+        """
+        total_rows = self.get_total_rows()
+        end_row = total_rows if max_rows is None else min(start_row + max_rows, total_rows)
+        if start_row >= end_row:
+            return
+        if start_row == 0:
+            yield 0, None, None
+            start_row = 1
+
+        data_start, data_stop = start_row - 1, end_row - 1
+        if data_start >= data_stop:
+            return
+        value_columns = [column.to_list(data_start, data_stop) for column in self.columns]
+        if convert is not None:
+            value_columns = [list(map(convert, values)) if column.kind == OBJECT_KIND else values
+                             for column, values in zip(self.columns, value_columns)]
+        style_columns = [column.style_ids(data_start, data_stop) for column in self.columns] if with_styles else None
+        row_lengths = self.row_lengths[data_start:data_stop]
+
+        value_rows = zip(*value_columns) if value_columns else (() for _ in row_lengths)
+        style_rows = (zip(*style_columns) if style_columns else (() for _ in row_lengths)) if with_styles else None
+        for offset, (width, values) in enumerate(zip(row_lengths, value_rows)):
+            yield (start_row + offset, list(values[:width]),
+                   list(next(style_rows)[:width]) if with_styles else None)
+
+
+def build_columnar_sheet(name: str, rows: Iterable[Sequence[Any]], **kwargs) -> ColumnarSheet:
+    """由各行的值序列构建不带样式的 ColumnarSheet，kwargs 传给 Sheet。"""
+    builder = ColumnarSheetBuilder()
+    for values in rows:
+        builder.append_row(values)
+    return builder.build(name, **kwargs)
@@ -0,0 +1,309 @@
+"""
+稀疏工作表模块
+
+格式延伸到很大范围（整列填充色、格式一直设置到第1048576行）但数据很少的工作表，
+按稠密网格保存时每个空位置都要一个 Cell 对象。稀疏工作表只保存有值或公式的单元格；
+只有样式的空单元格按行合并为 (起始列, 列数, 样式) 的游程，内容相同的行共享同一个 SparseRow。
+
+对外仍呈现为 row_count 行、每行 column_count 个单元格的矩形网格，
+未保存的位置是样式为 default_style 的空单元格。
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from src.models.table_model import Cell, Row, Sheet, Style
+
+
+class SparseRow:
+    """
+    稀疏工作表中的一行。
+
+    cells 为 {列索引: 单元格}，只包含有值或公式的单元格；
+    runs 为只有样式的空单元格游程 (起始列, 列数, 样式)，按起始列排列，与 cells 不重叠。
+    """
+
+    __slots__ = ('cells', 'runs')
+
+    def __init__(self, cells: dict[int, Cell] | None = None,
+                 runs: tuple[tuple[int, int, Style], ...] = ()):
+        self.cells = cells if cells is not None else {}
+        self.runs = runs
+
+    @property
+    def width(self) -> int:
+        """最后一个保存的单元格或游程之后的列索引。"""
+        width = max(self.cells) + 1 if self.cells else 0
+        if self.runs:
+            start, length, _ = self.runs[-1]
+            width = max(width, start + length)
+        return width
+
+
+class SparseSheetBuilder:
+    """
+    按行优先顺序填充 SparseSheet 的构建器，解析器对每个已存在的单元格调用 add_cell，最后调用 build。
+    """
+
+    def __init__(self, default_style: Style | None = None):
+        """
+        参数：
+            default_style: 未保存位置的单元格样式，样式与之相同的空单元格不保存
+        """
+        self.default_style = default_style
+        self._rows: dict[int, SparseRow] = {}
+        # 只有样式游程的行按游程去重，相同的行共享同一个 SparseRow
+        self._shared_rows: dict[tuple, SparseRow] = {}
+        self._row_index = -1
+        self._cells: dict[int, Cell] = {}
+        self._runs: list[list] = []
+
+    def add_cell(self, row: int, col: int, value: Any, style: Style | None = None,
+                 formula: str | None = None) -> None:
+        """
+        添加一个单元格，调用顺序必须按 (行, 列) 递增。
+
+        值和公式都为空、样式为 None 或 default_style 的单元格与未保存的位置相同，直接忽略。
+        """
+        if row != self._row_index:
+            self._flush_row()
+            self._row_index = row
+        if value is not None or formula is not None:
+            self._cells[col] = Cell(value=value, style=style, formula=formula)
+            return
+        if style is None or style is self.default_style:
+            return
+        runs = self._runs
+        if runs and runs[-1][2] is style and runs[-1][0] + runs[-1][1] == col:
+            runs[-1][1] += 1
+        else:
+            runs.append([col, 1, style])
+
+    def build(self, name: str, row_count: int, column_count: int, **kwargs) -> 'SparseSheet':
+        """生成 SparseSheet，kwargs 传给 Sheet（如 merged_cells、column_widths）。"""
+        self._flush_row()
+        return SparseSheet(name=name, sparse_rows=self._rows, row_count=row_count,
+                           column_count=column_count, default_style=self.default_style, **kwargs)
+
+    def _flush_row(self) -> None:
+        """保存当前行。"""
+        if not self._cells and not self._runs:
+            return
+        runs = tuple((start, length, style) for start, length, style in self._runs)
+        if self._cells:
+            self._rows[self._row_index] = SparseRow(self._cells, runs)
+        else:
+            key = tuple((start, length, id(style)) for start, length, style in runs)
+            shared = self._shared_rows.get(key)
+            if shared is None:
+                shared = self._shared_rows[key] = SparseRow(runs=runs)
+            self._rows[self._row_index] = shared
+        self._cells = {}
+        self._runs = []
+
+
+class SparseSheet(Sheet):
+    """
+    稀疏保存数据的工作表。
+
+    sparse_rows 为 {行索引: SparseRow}，未出现的行全部为空单元格。首次访问 rows 时才转换为
+    稠密的 Row/Cell 对象；iter_row_values、iter_row_styles、iter_content_rows 和 count_cells
+    等方法不为空位置创建对象。单元格的 row_span、col_span 恒为 1。
+    """
+
+    def __init__(self, name: str, sparse_rows: dict[int, SparseRow], row_count: int, column_count: int,
+                 default_style: Style | None = None, **kwargs):
+        """
+        参数：
+            name: 工作表名称
+            sparse_rows: {行索引: SparseRow}，按行索引递增插入
+            row_count: 总行数
+            column_count: 每行的单元格数
+            default_style: 未保存位置的单元格样式
+        """
+        self.sparse_rows = sparse_rows
+        self.row_count = row_count
+        self.column_count = column_count
+        self.default_style = default_style
+        super().__init__(name=name, rows=None, **kwargs)
+
+    @property
+    def rows(self) -> list[Row]:
+        """全部行，首次访问时转换为稠密的行并缓存。"""
+        if self._rows is None:
+            self._rows = list(self.iter_rows())
+        return self._rows
+
+    @rows.setter
+    def rows(self, value: list[Row] | None) -> None:
+        self._rows = value
+
+    def get_total_rows(self) -> int:
+        """返回总行数，无需转换数据。"""
+        if self._rows is not None:
+            return len(self._rows)
+        return self.row_count
+
+    def count_cells(self) -> int:
+        """返回全部行的单元格数之和（含空单元格）。"""
+        if self._rows is not None:
+            return sum(len(row.cells) for row in self._rows)
+        return self.row_count * self.column_count
+
+    def count_stored_cells(self) -> int:
+        """返回有值或公式的单元格数。"""
+        if self._rows is not None:
+            return sum(1 for row in self._rows for cell in row.cells
+                       if cell.value is not None or cell.formula is not None)
+        return sum(len(row.cells) for row in self.sparse_rows.values())
+
+    def has_styles(self) -> bool:
+        """是否有任何单元格带有样式。"""
+        if self._rows is not None:
+            return any(cell.style for row in self._rows for cell in row.cells if cell is not None)
+        if self.row_count and self.column_count and self.default_style:
+            return True
+        return any(row.runs or any(cell.style for cell in row.cells.values()) for row in self.sparse_rows.values())
+
+    def slice_rows(self, start_row: int, end_row: int, **kwargs) -> Sheet:
+        """
+        返回 [start_row, end_row) 范围内的行组成的新工作表，kwargs 传给 Sheet。
+
+        结果仍为 SparseSheet，共享本工作表保存的行；rows 已被转换时返回普通 Sheet。
+        """
+        if self._rows is not None:
+            return Sheet(name=self.name, rows=self._rows[start_row:end_row], **kwargs)
+        sparse_rows = {row_index - start_row: row for row_index, row in self.sparse_rows.items()
+                       if start_row <= row_index < end_row}
+        return SparseSheet(name=self.name, sparse_rows=sparse_rows,
+                           row_count=max(0, min(end_row, self.row_count) - start_row),
+                           column_count=self.column_count, default_style=self.default_style, **kwargs)
+
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterable[Row]:
+        """遍历部分行，只转换请求范围内的行。"""
+        if self._rows is not None:
+            yield from super().iter_rows(start_row, max_rows)
+            return
+        for _, row in self._iter_sparse_rows(start_row, max_rows):
+            yield Row(cells=self._row_cells(row, self.column_count))
+
+    def iter_content_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterator[Row]:
+        """
+        遍历部分行，每行只包含到最后一个保存的单元格或样式游程为止的单元格。
+
+        行尾省略的都是样式为 default_style 的空单元格；不需要这些单元格的调用方（如HTML渲染）
+        处理宽而稀疏的行时不必为它们创建对象。
+        """
+        if self._rows is not None:
+            yield from super().iter_rows(start_row, max_rows)
+            return
+        for _, row in self._iter_sparse_rows(start_row, max_rows):
+            yield Row(cells=self._row_cells(row, min(row.width, self.column_count)) if row else [])
+
+    def iter_row_values(self, start_row: int = 0, max_rows: int | None = None,
+                        convert_objects: Callable[[Any], Any] | None = None) -> Iterator[list[Any]]:
+        """
+        按行产出单元格值的列表，不创建 Row/Cell 对象。
+
+        参数：
+            start_row: 起始行索引
+            max_rows: 最多产出的行数
+            convert_objects: 对保存的单元格值逐个应用的转换函数（可选），空位置的 None 不经过转换
+        """
+        if self._rows is not None:
+            for row in super().iter_rows(start_row, max_rows):
+                values = [cell.value if cell is not None else None for cell in row.cells]
+                yield values if convert_objects is None else list(map(convert_objects, values))
+            return
+
+        width = self.column_count
+        for _, row in self._iter_sparse_rows(start_row, max_rows):
+            values = [None] * width
+            if row:
+                for col, cell in row.cells.items():
+                    if col < width:
+                        values[col] = cell.value if convert_objects is None else convert_objects(cell.value)
+            yield values
+
+    def iter_row_styles(self, start_row: int = 0, max_rows: int | None = None) -> Iterator[list[Style | None]]:
+        """按行产出单元格样式的列表，与 iter_row_values 一一对应。"""
+        if self._rows is not None:
+            for row in super().iter_rows(start_row, max_rows):
+                yield [cell.style if cell is not None else None for cell in row.cells]
+            return
+        for _, row in self._iter_sparse_rows(start_row, max_rows):
+            yield self._row_styles(row, self.column_count)
+
+    def iter_styles(self) -> Iterator[Style | None]:
+        """
+        按行优先顺序产出单元格样式，用于收集工作表中出现的全部样式。
+
+        每种样式首次出现的先后顺序与遍历稠密行时相同；共享同一个 SparseRow 的行只产出一次。
+        """
+        if self._rows is not None:
+            for row in self._rows:
+                for cell in row.cells:
+                    yield cell.style
+            return
+        if not self.column_count:
+            return
+
+        seen_rows: set[int] = set()
+        next_row = 0
+        for row_index, row in self.sparse_rows.items():
+            if row_index >= self.row_count:
+                break
+            if row_index > next_row:
+                # 中间有未保存的空行
+                yield self.default_style
+            next_row = row_index + 1
+            if id(row) in seen_rows:
+                continue
+            seen_rows.add(id(row))
+            width = min(row.width, self.column_count)
+            yield from self._row_styles(row, width)
+            if width < self.column_count:
+                yield self.default_style
+        if next_row < self.row_count:
+            yield self.default_style
+
+    def _iter_sparse_rows(self, start_row: int, max_rows: int | None) -> Iterator[tuple[int, SparseRow | None]]:
+        """按行产出 (行索引, SparseRow)，未保存的行为 None。"""
+        total_rows = self.row_count
+        end_row = total_rows if max_rows is None else min(start_row + max_rows, total_rows)
+        sparse_rows = self.sparse_rows
+        for row_index in range(max(start_row, 0), end_row):
+            yield row_index, sparse_rows.get(row_index)
+
+    def _row_styles(self, row: SparseRow | None, width: int) -> list[Style | None]:
+        """返回一行前 width 列的样式列表。"""
+        styles = [self.default_style] * width
+        if row:
+            for start, length, style in row.runs:
+                if start >= width:
+                    break
+                styles[start:min(start + length, width)] = [style] * (min(start + length, width) - start)
+            for col, cell in row.cells.items():
+                if col < width:
+                    styles[col] = cell.style
+        return styles
+
+    def _row_cells(self, row: SparseRow | None, width: int) -> list[Cell]:
+        """返回一行前 width 列的单元格，空位置创建新的空单元格。"""
+        if row is None:
+            default_style = self.default_style
+            return [Cell(value=None, style=default_style) for _ in range(width)]
+        cells = row.cells
+        return [cells[col] if col in cells else Cell(value=None, style=style)
+                for col, style in enumerate(self._row_styles(row, width))]
+
+
+def should_use_sparse(filled_cells: int, row_count: int, column_count: int,
+                      max_density: float, min_cells: int) -> bool:
+    """
+    判断工作表是否应使用稀疏存储：网格不小于 min_cells 个单元格，且有值单元格的比例低于 max_density。
+
+    max_density 为0时从不使用稀疏存储。
+    """
+    grid_cells = row_count * column_count
+    return max_density > 0 and grid_cells >= min_cells and filled_cells < grid_cells * max_density
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from typing import Any, Protocol
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from abc import ABC, abstractmethod
 
 @dataclass
@@ -27,8 +27,14 @@ CellValue = Any | list[RichTextFragment]
 class LazyRowProvider(Protocol):
     """惰性行提供者协议，可按需流式获取行。"""
 
-    def iter_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterable['Row']:
-        """从 start_row 开始按需生成行。"""
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None,
+                  col_range: tuple[int, int] | None = None) -> Iterable['Row']:
+        """
+        从 start_row 开始按需生成行。
+
+        指定 col_range（起始列, 结束列，基于0的闭区间）时，每行恰好包含这些列，
+        超出行宽的列补空单元格，范围外的列不会被解析。
+        """
         ...
 
     def get_row(self, row_index: int) -> 'Row':
@@ -53,13 +59,15 @@ class StreamingCapable(ABC):
         pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Style:
     """
     单元格的视觉样式。
 
     此类包含所有样式信息，包括字体属性、颜色、对齐方式、边框和其他格式细节。
     提供跨不同文件格式统一处理样式的方式。
+
+    样式是不可变的值对象，同一格式的单元格共享同一个实例；需要修改时用 dataclasses.replace 创建新实例。
     """
     # 字体属性（富文本后将弃用）
     bold: bool = False
@@ -94,12 +102,13 @@ class Style:
 
 
 
-@dataclass
+@dataclass(slots=True)
 class Cell:
     """
     表格中的单个单元格。
 
     单元格包含其值、可选的样式对象，以及合并单元格的行/列跨度信息。
+    使用 __slots__ 存储属性，大表中的每个单元格不再持有实例字典。
     """
     value: CellValue
     style: Style | None = None
@@ -110,7 +119,7 @@ class Cell:
 
 
 
-@dataclass
+@dataclass(slots=True)
 class Row:
     """
     表格中的一行，包含若干单元格对象。
@@ -169,6 +178,20 @@ class Sheet:
     row_heights: dict[int, float] = field(default_factory=dict)    # 行高信息 {行索引: 高度}
     default_column_width: float = 8.43  # Excel默认列宽
     default_row_height: float = 18.0    # Excel默认行高
+    # 延迟提取图表的函数，由 get_charts 在首次访问时调用
+    chart_loader: Callable[[], list[Chart]] | None = field(default=None, repr=False, compare=False)
+
+    def get_charts(self) -> list[Chart]:
+        """
+        返回工作表中的图表与图片。
+
+        解析器提供 chart_loader 时，首次调用才执行提取并将结果保存到 charts，
+        不渲染图表的调用方（如JSON解析）无需承担图表提取的开销。
+        """
+        if self.chart_loader is not None:
+            loader, self.chart_loader = self.chart_loader, None
+            self.charts = self.charts + loader()
+        return self.charts
 
     def iter_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterable[Row]:
         """
@@ -195,28 +218,139 @@ class Sheet:
 
 
 class LazySheet:
-    """惰性表对象，可按需流式读取数据，无需一次性加载全部内容到内存。"""
+    """
+    惰性表对象，可按需流式读取数据，无需一次性加载全部内容到内存。
+
+    指定 block_cache 和 cache_key 时，按窗口读取的行以 block_rows 行为一块保存在 block_cache 中，
+    键为 (*cache_key, block_rows, 块序号)；再次读取同一范围（如来回翻页）时直接使用缓存的行块，
+    不再访问行提供者。不限行数的遍历不经过缓存。
+    """
 
-    def __init__(self, name: str, provider: LazyRowProvider, merged_cells: list[str] |None = None):
+    def __init__(self, name: str, provider: LazyRowProvider, merged_cells: list[str] |None = None,
+                 block_cache: Any = None, cache_key: tuple | None = None, block_rows: int = 256):
+        """
+        参数：
+            name: 工作表名称
+            provider: 行提供者
+            merged_cells: 合并单元格范围列表（可选）
+            block_cache: 保存行块的缓存（可选），需提供 get(key) 和 set(key, value)
+            cache_key: 行块缓存键的前缀（可选），通常为 (文件指纹, 工作表名称)
+            block_rows: 每个行块的行数
+        """
         self.name = name
         self._provider = provider
         self.merged_cells = merged_cells or []
         self._total_rows_cache: int | None = None
-
-    def iter_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterable[Row]:
-        """按需遍历行。"""
-        return self._provider.iter_rows(start_row, max_rows)
+        self._block_cache = block_cache if cache_key is not None else None
+        self._cache_key = cache_key
+        self._block_rows = block_rows
+
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None,
+                  col_range: tuple[int, int] | None = None) -> Iterable[Row]:
+        """按需遍历行，可只读取 col_range 指定的列。"""
+        if self._block_cache is not None and max_rows is not None and start_row >= 0:
+            if col_range is None:
+                return self._iter_cached_rows(start_row, max_rows)
+            blocks = self._get_cached_blocks(start_row, max_rows)
+            if blocks is not None:
+                # 行块已全部缓存时从完整行中截取列，否则只让行提供者解析这些列
+                return self._project_rows(self._slice_blocks(blocks, start_row, max_rows), col_range)
+        if col_range is None:
+            return self._provider.iter_rows(start_row, max_rows)
+        return self._provider.iter_rows(start_row, max_rows, col_range)
 
     def get_row(self, row_index: int) -> Row:
         """按索引获取指定行。"""
+        if self._block_cache is not None and row_index >= 0:
+            for row in self._iter_cached_rows(row_index, 1):
+                return row
         return self._provider.get_row(row_index)
 
+    def _block_key(self, block_index: int) -> tuple:
+        return (*self._cache_key, self._block_rows, block_index)
+
+    def _get_cached_blocks(self, start_row: int, max_rows: int) -> list[list[Row]] | None:
+        """返回覆盖 [start_row, start_row + max_rows) 的已缓存行块，有行块未缓存时返回 None。"""
+        blocks = []
+        for block_index in range(start_row // self._block_rows,
+                                 (start_row + max(max_rows, 1) - 1) // self._block_rows + 1):
+            block = self._block_cache.get(self._block_key(block_index))
+            if block is None:
+                return None
+            blocks.append(block)
+            if len(block) < self._block_rows:
+                # 不满一块说明已到表尾
+                break
+        return blocks
+
+    def _iter_cached_rows(self, start_row: int, max_rows: int) -> Iterable[Row]:
+        """经行块缓存读取行，连续的未缓存行块合并为一次行提供者读取。"""
+        first_block = start_row // self._block_rows
+        last_block = (start_row + max(max_rows, 1) - 1) // self._block_rows
+        blocks: list[list[Row]] = []
+        block_index = first_block
+        while block_index <= last_block:
+            block = self._block_cache.get(self._block_key(block_index))
+            if block is None:
+                missing_end = block_index + 1
+                while missing_end <= last_block and self._block_cache.get(self._block_key(missing_end)) is None:
+                    missing_end += 1
+                rows = list(self._provider.iter_rows(block_index * self._block_rows,
+                                                     (missing_end - block_index) * self._block_rows))
+                fetched = [rows[offset:offset + self._block_rows]
+                           for offset in range(0, len(rows), self._block_rows)]
+                if len(fetched) < missing_end - block_index:
+                    # 已到表尾：补上最后一个不满一块的行块（可能为空）
+                    fetched.append([])
+                for offset, block in enumerate(fetched[:missing_end - block_index]):
+                    self._block_cache.set(self._block_key(block_index + offset), block)
+                    blocks.append(block)
+                    if len(block) < self._block_rows:
+                        return self._slice_blocks(blocks, start_row, max_rows)
+                block_index = missing_end
+                continue
+            blocks.append(block)
+            if len(block) < self._block_rows:
+                break
+            block_index += 1
+        return self._slice_blocks(blocks, start_row, max_rows)
+
+    def _slice_blocks(self, blocks: list[list[Row]], start_row: int, max_rows: int) -> list[Row]:
+        """从以 start_row 所在块开头的连续行块中取出请求的行。"""
+        offset = start_row % self._block_rows
+        return [row for block in blocks for row in block][offset:offset + max(max_rows, 0)]
+
+    @staticmethod
+    def _project_rows(rows: list[Row], col_range: tuple[int, int]) -> list[Row]:
+        """按 col_range 截取各行的单元格，超出行宽的列补空单元格（与行提供者的列下推结果相同）。"""
+        start_col, end_col = col_range
+        width = end_col - start_col + 1
+        projected = []
+        for row in rows:
+            cells = row.cells[start_col:end_col + 1]
+            cells.extend(Cell(value=None) for _ in range(width - len(cells)))
+            projected.append(Row(cells=cells))
+        return projected
+
     def get_total_rows(self) -> int:
         """无需加载全部数据即可获取总行数。"""
         if self._total_rows_cache is None:
             self._total_rows_cache = self._provider.get_total_rows()
         return self._total_rows_cache
 
+    def estimate_total_rows(self) -> int:
+        """
+        估算总行数，用于选择处理方式等不需要精确值的场合。
+
+        行提供者实现了 estimate_total_rows 时使用其估算值（无需扫描整个文件），否则返回精确行数。
+        """
+        if self._total_rows_cache is not None:
+            return self._total_rows_cache
+        estimate = getattr(self._provider, "estimate_total_rows", None)
+        if callable(estimate):
+            return estimate()
+        return self.get_total_rows()
+
     def __getitem__(self, key) -> Row | list[Row]:
         """支持下标访问行。"""
         if isinstance(key, int):
@@ -229,6 +363,18 @@ class LazySheet:
         else:
             raise TypeError("无效的下标类型")
 
+    def close(self) -> None:
+        """释放行提供者持有的资源（如打开的工作簿句柄）。"""
+        close = getattr(self._provider, "close", None)
+        if callable(close):
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def to_sheet(self) -> Sheet:
         """将惰性表全部加载为常规 Sheet 对象。"""
         rows = list(self.iter_rows())
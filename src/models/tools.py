@@ -94,6 +94,11 @@ def register_tools(server: Server) -> None:
                         "max_rows": {
                             "type": "integer",
                             "description": "【可选】最大返回行数。用于限制大文件的数据量，超出部分会被截断并提示。"
+                        },
+                        "engine": {
+                            "type": "string",
+                            "enum": ["default", "native", "arrow"],
+                            "description": "【可选】解析引擎。native只读取数据、速度更快但不含样式，不判断文件是否带样式（metadata.has_styles为null）；arrow用于CSV，推断数字、布尔值、日期等列类型；留空时，include_styles为false则自动使用native。"
                         }
                     },
                     "required": ["file_path"]
@@ -267,6 +272,10 @@ async def _handle_parse_sheet(arguments: dict[str, Any], core_service: CoreServi
         if max_rows is not None and (not isinstance(max_rows, int) or max_rows <= 0):
             raise ValueError("max_rows必须是正整数或None")
 
+        engine = arguments.get("engine")
+        if engine is not None and not isinstance(engine, str):
+            raise ValueError("engine必须是字符串")
+
         result = core_service.parse_sheet_optimized(
             file_path=file_path,
             sheet_name=sheet_name,
@@ -274,7 +283,8 @@ async def _handle_parse_sheet(arguments: dict[str, Any], core_service: CoreServi
             include_full_data=include_full_data,
             include_styles=include_styles,
             preview_rows=preview_rows,
-            max_rows=max_rows
+            max_rows=max_rows,
+            engine=engine
         )
 
         # 为LLM添加使用指导
@@ -341,8 +351,11 @@ def _generate_next_steps_guidance(result: dict, include_full_data: bool, include
         if total_rows > result.get("metadata", {}).get("preview_rows", 5):
             guidance.append(f"文件包含{total_rows}行数据，当前只显示预览。设置include_full_data=true获取完整数据")
 
-    if not include_styles and result.get("metadata", {}).get("has_styles", False):
+    has_styles = result.get("metadata", {}).get("has_styles", False)
+    if not include_styles and has_styles:
         guidance.append("文件包含样式信息（字体、颜色等）。设置include_styles=true获取样式数据")
+    elif not include_styles and has_styles is None:
+        guidance.append("当前解析引擎未读取样式信息。需要字体、颜色等样式时设置include_styles=true")
 
     if result.get("metadata", {}).get("total_cells", 0) > 1000:
         guidance.append("文件较大，建议使用range_string参数获取特定范围，如'A1:D10'")
@@ -5,7 +5,47 @@
 """
 
 from abc import ABC, abstractmethod
-from src.models.table_model import Sheet, LazySheet
+from src.cache.cache_manager import calculate_file_fingerprint
+from src.cache.lru_cache import get_row_block_cache
+from src.models.table_model import Sheet, LazySheet, LazyRowProvider, Row
+from src.unified_config import get_config
+from src.utils.range_parser import CellRange
+
+
+def project_sheet(sheet: Sheet, cell_range: CellRange) -> Sheet:
+    """
+    按单元格范围截取已解析的工作表，得到与解析器下推 cell_range 时相同的结果。
+
+    参数：
+        sheet: 完整解析的工作表
+        cell_range: (起始行, 起始列, 结束行, 结束列)，基于0的闭区间
+
+    返回：
+        只包含范围内行和列的 Sheet（不含合并单元格、图表等工作表级信息）
+    """
+    start_row, start_col, end_row, end_col = cell_range
+    return Sheet(
+        name=sheet.name,
+        rows=[Row(cells=row.cells[start_col:end_col + 1]) for row in sheet.rows[start_row:end_row + 1]]
+    )
+
+
+def build_lazy_sheet(file_path: str, name: str, provider: LazyRowProvider,
+                     merged_cells: list[str] | None = None) -> LazySheet:
+    """
+    创建 LazySheet，启用行块缓存时按窗口读取的行块保存在全局行块缓存中。
+
+    缓存键以文件指纹和工作表名称开头，文件变化后旧的行块不会再被命中；
+    行块缓存被禁用或无法计算文件指纹时，LazySheet 每次都从行提供者读取。
+    """
+    block_cache = get_row_block_cache()
+    if block_cache is not None:
+        fingerprint = calculate_file_fingerprint(file_path)
+        if not fingerprint.startswith(("missing:", "error:")):
+            return LazySheet(name=name, provider=provider, merged_cells=merged_cells,
+                             block_cache=block_cache, cache_key=(fingerprint, name),
+                             block_rows=get_config().row_block_size_rows)
+    return LazySheet(name=name, provider=provider, merged_cells=merged_cells)
 
 
 class BaseParser(ABC):
@@ -13,22 +53,29 @@ class BaseParser(ABC):
     所有文件解析器的抽象基类。
 
     定义所有解析器必须实现的通用接口，包括：
-    - 解析文件为 Sheet 对象列表的方法
+    - 解析文件为 Sheet 对象列表的方法（可只解析指定工作表）
+    - 获取工作表名称列表的方法
     - 检查是否支持流式处理的方法
     - 创建惰性加载表的方法
     """
 
     @abstractmethod
-    def parse(self, file_path: str) -> list[Sheet]:
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
         """
         解析指定文件并返回 Sheet 对象列表。
 
         这是每个解析器的主要方法。应负责打开文件、读取内容和结构，并转换为标准化的 Sheet 对象列表。
         对于单工作表文件（如CSV），返回包含一个Sheet的列表。
         对于多工作表文件（如Excel），返回包含所有工作表的列表。
+        指定 sheet_name 时只解码该工作表，返回至多包含一个Sheet的列表；工作表不存在时返回空列表。
+        指定 cell_range 时解析器跳过范围外的行，也不为范围外的列创建 Cell/Style 对象，
+        结果与 project_sheet(完整解析结果, cell_range) 相同：rows[0] 对应起始行，cells[0] 对应起始列。
 
         参数：
             file_path: 要解析的文件的绝对路径。
+            sheet_name: 只解析该名称的工作表（可选）。
+            cell_range: 只解析该单元格范围（可选），(起始行, 起始列, 结束行, 结束列)，基于0的闭区间。
 
         返回：
             包含结构化数据和样式的 Sheet 对象列表。
@@ -37,6 +84,14 @@ class BaseParser(ABC):
             RuntimeError: 解析失败时抛出。
         """
         pass
+
+    def get_sheet_names(self, file_path: str) -> list[str]:
+        """
+        获取文件中的工作表名称列表（按文件中的顺序）。
+
+        默认实现会完整解析文件，解析器应尽量只读取工作簿目录来覆盖此方法。
+        """
+        return [sheet.name for sheet in self.parse(file_path)]
     
     def supports_streaming(self) -> bool:
         """检查该解析器是否支持流式处理。"""
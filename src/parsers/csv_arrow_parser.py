@@ -0,0 +1,121 @@
+"""
+CSV Arrow解析器模块
+
+使用 pyarrow.csv 多线程解析CSV文件并推断列类型（整数、浮点数、布尔值、日期时间、空值），
+按列填充 ColumnarSheet，只在调用方需要时才转换为 Row/Cell 对象。
+"""
+
+import logging
+from array import array
+from pathlib import Path
+from typing import Any
+
+from src.models.columnar_sheet import Column, ColumnarSheet
+from src.models.table_model import Sheet, Row, Cell
+from src.parsers.csv_parser import CsvParser
+from src.utils.csv_scanner import sniff_encoding
+from src.utils.range_parser import CellRange
+
+logger = logging.getLogger(__name__)
+
+
+class CsvArrowParser(CsvParser):
+    """
+    基于 pyarrow.csv 的CSV解析器，返回列类型已推断的 ColumnarSheet。
+
+    单元格的值为 int、float、bool、datetime 或 None（数值等类型列中的空字段），
+    字符串列中的空字段仍为空字符串。首行作为表头保留为字符串。
+    pyarrow 不可用、各行列数不一致等无法按列式读取的文件回退到 CsvParser，单元格值均为字符串。
+    流式读取（create_lazy_sheet）与 CsvParser 相同。
+    """
+
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
+        """
+        解析CSV文件，返回包含单个 ColumnarSheet 的列表。
+
+        按文件开头判断的编码读取，UTF-8读取失败（含非UTF-8的数据行）时按GBK读取。指定 cell_range 时只保留范围内的行和列，
+        结果的 rows[0] 对应起始行、cells[0] 对应起始列。
+
+        参数：
+            file_path: CSV文件的绝对路径。
+            sheet_name: 只解析该名称的工作表（可选），与文件名不符时不读取文件，返回空列表。
+            cell_range: 只保留该单元格范围（可选）。
+
+        返回：
+            包含CSV数据的Sheet对象列表。
+
+        异常：
+            FileNotFoundError: 文件不存在时抛出。
+        """
+        path = Path(file_path)
+        if sheet_name is not None and sheet_name != path.stem:
+            return []
+        if not path.exists():
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+
+        result = self._read_table(path)
+        if result is None:
+            return super().parse(file_path, sheet_name, cell_range)
+
+        table, header = result
+        if cell_range is not None:
+            start_row, start_col, end_row, end_col = cell_range
+            end_col = min(end_col, table.num_columns - 1)
+            table = table.select(list(range(start_col, end_col + 1))) if start_col <= end_col \
+                else table.select([])
+            header = header[start_col:end_col + 1] if start_row == 0 else None
+            data_start = max(start_row - 1, 0)
+            table = table.slice(data_start, max(end_row - data_start, 0))
+
+        return [self._table_to_sheet(path.stem, table, header)]
+
+    def _table_to_sheet(self, name: str, table: Any, header: list[str] | None) -> ColumnarSheet:
+        """
+        把 pyarrow 表按列转换为 ColumnarSheet。
+
+        header 为 None 时（范围不含CSV首行）表中的第一行作为工作表的第0行。
+        """
+        columns = [column.to_pylist() for column in table.columns]
+        data_rows = table.num_rows
+        if header is None:
+            if data_rows == 0:
+                return ColumnarSheet(name=name, header=None, columns=[], row_lengths=array('I'), styles=[None])
+            header = [values[0] for values in columns]
+            columns = [values[1:] for values in columns]
+            data_rows -= 1
+        return ColumnarSheet(name=name, header=Row(cells=[Cell(value=value) for value in header]),
+                             columns=[Column.from_values(values) for values in columns],
+                             row_lengths=array('I', [len(columns)]) * data_rows, styles=[None])
+
+    def _read_table(self, path: Path) -> tuple[Any, list[str]] | None:
+        """
+        用 pyarrow.csv 读取整个文件，返回 (表, 表头)，无法读取时返回 None。
+
+        从 sniff_encoding 判断的编码开始，依次尝试UTF-8和GBK。pyarrow 不会因字段不是有效的UTF-8而报错，
+        而是把该列推断为二进制列，因此出现二进制列同样视为编码不符。
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            logger.debug("pyarrow 不可用，使用 CsvParser 解析CSV文件")
+            return None
+
+        # 引号内的字段可以包含换行，与 csv.reader 的行为一致
+        parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+        encodings = ('utf-8', 'gbk') if sniff_encoding(str(path)) == 'utf-8' else ('gbk',)
+        for encoding in encodings:
+            try:
+                table = pa_csv.read_csv(path, read_options=pa_csv.ReadOptions(encoding=encoding),
+                                        parse_options=parse_options)
+                # 列名（表头）不经过UTF-8校验，在这里解码，编码不符时改用下一种编码
+                header = list(table.column_names)
+            except (pa.ArrowInvalid, UnicodeDecodeError) as e:
+                logger.debug(f"pyarrow 按 {encoding} 读取CSV文件失败: {e}")
+                continue
+            if any(pa.types.is_binary(column.type) for column in table.columns):
+                logger.debug(f"pyarrow 按 {encoding} 读取CSV文件得到二进制列，编码不符")
+                continue
+            return table, header
+        return None
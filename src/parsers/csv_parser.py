@@ -5,72 +5,219 @@ CSV解析器模块
 """
 
 import csv
+import io
+import logging
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
 from collections.abc import Iterator
+from typing import TextIO
+from src.cache.row_index_cache import RowCheckpointIndex, RowIndexCache, get_row_index_cache
+from src.models.columnar_sheet import build_columnar_sheet
 from src.models.table_model import Sheet, Row, Cell, LazySheet
-from src.parsers.base_parser import BaseParser
+from src.parsers.base_parser import BaseParser, build_lazy_sheet
+from src.parsers.parallel_csv import build_row_index_parallel, parse_csv_parallel
+from src.unified_config import get_config
+from src.utils.csv_scanner import count_csv_records, estimate_csv_records, sniff_encoding
+from src.utils.range_parser import CellRange
+
+logger = logging.getLogger(__name__)
+
+# 行检查点间隔：每隔多少条记录保存一次字节偏移
+ROW_INDEX_INTERVAL = 1024
+# 不小于该大小的文件才把行索引保存到缓存目录
+ROW_INDEX_PERSIST_MIN_BYTES = 1024 * 1024
+# 不小于该大小的文件在配置了多个 parallel_csv_workers 时按字节范围并行解析
+PARALLEL_CSV_MIN_BYTES = 64 * 1024 * 1024
 
 
 class CsvRowProvider:
-    """CSV文件的惰性行提供者，支持按需流式读取。"""
+    """
+    CSV文件的惰性行提供者，支持按需流式读取。
 
-    def __init__(self, file_path: str):
+    首次需要随机定位（起始行超过一个检查点间隔或获取总行数）时扫描一次文件，
+    建立每 ROW_INDEX_INTERVAL 条记录的字节偏移索引（正确处理引号内的换行），
+    之后读取任意行范围都先 seek() 到最近的检查点，不再从文件开头逐行跳过。
+    较大文件的索引按文件指纹保存在缓存目录中，供之后打开同一文件的提供者复用。
+    """
+
+    def __init__(self, file_path: str, index_cache: RowIndexCache | None = None):
+        """
+        参数：
+            file_path: CSV文件路径
+            index_cache: 行索引缓存（可选），未指定时不小于 ROW_INDEX_PERSIST_MIN_BYTES 的文件使用全局缓存
+        """
         self.file_path = Path(file_path)
         self._total_rows_cache: int | None = None
-        self._encoding = self._detect_encoding()
-
-    def _detect_encoding(self) -> str:
-        """检测CSV文件的编码格式。"""
-        try:
-            with open(self.file_path, mode='r', encoding='utf-8') as f:
-                f.read(1024)  # 尝试读取一小段内容
-            return 'utf-8'
-        except UnicodeDecodeError:
-            return 'gbk'
+        self._encoding = sniff_encoding(str(self.file_path))
+        self._index_cache = index_cache
+        self._row_index: RowCheckpointIndex | None = None
+        self._row_index_failed = False
 
-    def iter_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterator[Row]:
-        """使用csv.reader生成器按需产出行。"""
-        with open(self.file_path, mode='r', encoding=self._encoding) as csvfile:
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None,
+                  col_range: tuple[int, int] | None = None) -> Iterator[Row]:
+        """使用csv.reader生成器按需产出行，指定 col_range 时只为这些列创建单元格。"""
+        with self._open_at_row(start_row) as (csvfile, skip):
             reader = csv.reader(csvfile)
 
-            # 跳过到start_row
-            for _ in range(start_row):
-                try:
-                    next(reader)
-                except StopIteration:
-                    return
-
-            # 产出最多max_rows行
-            count = 0
-            for row_data in reader:
-                if max_rows is not None and count >= max_rows:
-                    break
+            # 跳过检查点与start_row之间的记录
+            if skip:
+                next(islice(reader, skip, skip), None)
 
-                cells = [Cell(value=item) for item in row_data]
+            for row_data in islice(reader, None if max_rows is None else max(max_rows, 0)):
+                if col_range is None:
+                    cells = [Cell(value=item) for item in row_data]
+                else:
+                    start_col, end_col = col_range
+                    cells = [Cell(value=item) for item in row_data[start_col:end_col + 1]]
+                    cells.extend(Cell(value=None) for _ in range(end_col - start_col + 1 - len(cells)))
                 yield Row(cells=cells)
-                count += 1
 
     def get_row(self, row_index: int) -> Row:
         """按索引获取指定行。"""
-        with open(self.file_path, mode='r', encoding=self._encoding) as csvfile:
-            reader = csv.reader(csvfile)
-
-            # 跳转到目标行
-            for i, row_data in enumerate(reader):
-                if i == row_index:
-                    cells = [Cell(value=item) for item in row_data]
-                    return Row(cells=cells)
-
-            raise IndexError(f"行索引 {row_index} 超出范围")
+        if row_index >= 0:
+            for row in self.iter_rows(row_index, 1):
+                return row
+        raise IndexError(f"行索引 {row_index} 超出范围")
 
     def get_total_rows(self) -> int:
-        """无需加载全部数据即可获取总行数。"""
+        """
+        获取总行数。
+
+        已有行索引（内存中或缓存中）时直接读取；否则通过内存映射按字节统计记录数，
+        无法按字节确定记录边界时才建立行索引或用csv.reader逐条计数。
+        """
         if self._total_rows_cache is None:
-            with open(self.file_path, mode='r', encoding=self._encoding) as csvfile:
-                reader = csv.reader(csvfile)
-                self._total_rows_cache = sum(1 for _ in reader)
+            row_index = self._load_row_index()
+            if row_index is not None:
+                self._total_rows_cache = row_index.total_rows
+                return self._total_rows_cache
+
+            total_rows = count_csv_records(str(self.file_path))
+            if total_rows is None:
+                row_index = self._get_row_index()
+                if row_index is not None:
+                    total_rows = row_index.total_rows
+                else:
+                    with open(self.file_path, mode='r', encoding=self._encoding) as csvfile:
+                        reader = csv.reader(csvfile)
+                        total_rows = sum(1 for _ in reader)
+            self._total_rows_cache = total_rows
         return self._total_rows_cache
 
+    def estimate_total_rows(self) -> int:
+        """估算总行数：已知精确值时直接返回，否则根据文件中的均匀采样估算，不扫描整个文件。"""
+        if self._total_rows_cache is not None:
+            return self._total_rows_cache
+        if self._row_index is not None:
+            return self._row_index.total_rows
+        return estimate_csv_records(str(self.file_path))
+
+    @contextmanager
+    def _open_at_row(self, start_row: int) -> Iterator[tuple[TextIO, int]]:
+        """
+        以文本方式打开文件并定位到不晚于 start_row 的最近检查点。
+
+        产出 (文本文件对象, 还需跳过的记录数)；起始行在第一个检查点间隔内时不建立索引，直接从文件开头读取。
+        """
+        offset, skip = 0, start_row
+        if start_row >= ROW_INDEX_INTERVAL:
+            row_index = self._get_row_index()
+            if row_index is not None:
+                offset, skip = row_index.locate(start_row)
+
+        with open(self.file_path, mode='rb') as raw:
+            raw.seek(offset)
+            with io.TextIOWrapper(raw, encoding=self._encoding) as csvfile:
+                yield csvfile, skip
+
+    def _load_row_index(self) -> RowCheckpointIndex | None:
+        """获取内存中或缓存中已有的行检查点索引，不扫描文件。"""
+        if self._row_index is None and not self._row_index_failed:
+            index_cache = self._get_index_cache()
+            if index_cache is not None:
+                self._row_index = index_cache.get(str(self.file_path), self._encoding, ROW_INDEX_INTERVAL)
+        return self._row_index
+
+    def _get_row_index(self) -> RowCheckpointIndex | None:
+        """获取行检查点索引，依次使用内存中的索引、缓存中的索引，最后扫描文件建立索引。"""
+        if self._load_row_index() is None and not self._row_index_failed:
+            self._row_index = self._build_row_index()
+            if self._row_index is None:
+                self._row_index_failed = True
+            else:
+                index_cache = self._get_index_cache()
+                if index_cache is not None and len(self._row_index.offsets) > 1:
+                    index_cache.set(str(self.file_path), self._encoding, self._row_index)
+        return self._row_index
+
+    def _get_index_cache(self) -> RowIndexCache | None:
+        """返回用于保存行索引的缓存，小文件重新扫描比读写索引文件更快，不使用缓存。"""
+        if self._index_cache is not None:
+            return self._index_cache
+        try:
+            if self.file_path.stat().st_size < ROW_INDEX_PERSIST_MIN_BYTES:
+                return None
+        except OSError:
+            return None
+        return get_row_index_cache()
+
+    def _build_row_index(self) -> RowCheckpointIndex | None:
+        """
+        扫描一次文件，记录每 ROW_INDEX_INTERVAL 条记录的起始字节偏移。
+
+        以二进制方式逐行读取并累计字节数，解码后交给csv.reader组装记录；
+        csv.reader只在记录完整时才停止取行，因此引号内的换行不会被当作记录边界。
+        不小于 PARALLEL_CSV_MIN_BYTES 的文件在配置了多个并行进程时按字节范围并行扫描。
+        文件无法按检测到的编码解码或不是有效的CSV时返回 None，此时退回顺序跳行。
+        """
+        workers = _get_parallel_csv_workers(self.file_path)
+        if workers > 1:
+            try:
+                row_index = build_row_index_parallel(str(self.file_path), self._encoding, ROW_INDEX_INTERVAL, workers)
+            except UnicodeDecodeError as e:
+                logger.debug(f"无法为CSV文件建立行索引，改为顺序读取: {e}")
+                return None
+            if row_index is not None:
+                return row_index
+
+        offsets = [0]
+        total_rows = 0
+        position = 0
+        encoding = self._encoding
+
+        try:
+            with open(self.file_path, mode='rb') as f:
+                def decoded_lines() -> Iterator[str]:
+                    nonlocal position
+                    for line in f:
+                        position += len(line)
+                        yield line.decode(encoding)
+
+                for _ in csv.reader(decoded_lines()):
+                    total_rows += 1
+                    if total_rows % ROW_INDEX_INTERVAL == 0:
+                        # 此时 position 恰好是第 total_rows 条记录（0基）的起始偏移
+                        offsets.append(position)
+        except (UnicodeDecodeError, csv.Error) as e:
+            logger.debug(f"无法为CSV文件建立行索引，改为顺序读取: {e}")
+            return None
+
+        return RowCheckpointIndex(interval=ROW_INDEX_INTERVAL, offsets=tuple(offsets), total_rows=total_rows)
+
+
+def _get_parallel_csv_workers(path: Path) -> int:
+    """返回并行读取文件使用的进程数，未启用并行或文件小于 PARALLEL_CSV_MIN_BYTES 时为1。"""
+    workers = get_config().get_parallel_csv_workers()
+    if workers <= 1:
+        return 1
+    try:
+        if path.stat().st_size < PARALLEL_CSV_MIN_BYTES:
+            return 1
+    except OSError:
+        return 1
+    return workers
+
 
 class CsvParser(BaseParser):
     """
@@ -83,15 +230,19 @@ class CsvParser(BaseParser):
         # CSV不支持样式，返回None
         return None
 
-    def parse(self, file_path: str) -> list[Sheet]:
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
         """
         解析CSV文件并转换为Sheet对象列表。
 
         首先尝试使用UTF-8解码文件，如遇UnicodeDecodeError则回退为GBK。
-        CSV文件只包含一个工作表，因此返回包含单个Sheet的列表。
+        CSV文件只包含一个工作表（以文件名命名），因此返回包含单个Sheet的列表；
+        启用 columnar_sheets 配置时返回按列存储的 ColumnarSheet。
 
         参数：
             file_path: CSV文件的绝对路径。
+            sheet_name: 只解析该名称的工作表（可选），与文件名不符时不读取文件，返回空列表。
+            cell_range: 只解析该单元格范围（可选），读到范围的最后一行后即停止读取文件。
 
         返回：
             包含CSV数据的Sheet对象列表。
@@ -100,25 +251,50 @@ class CsvParser(BaseParser):
             FileNotFoundError: 文件不存在时抛出。
         """
         path = Path(file_path)
-        sheet_name = path.stem
-        rows = []
+        if sheet_name is not None and sheet_name != path.stem:
+            return []
 
         try:
-            with open(path, mode='r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                for row_data in reader:
-                    cells = [Cell(value=item) for item in row_data]
-                    rows.append(Row(cells=cells))
+            sheet = self._build_sheet(path.stem, self._iter_records(path, 'utf-8', cell_range))
         except UnicodeDecodeError:
             # 尝试使用GBK编码
-            with open(path, mode='r', encoding='gbk') as csvfile:
-                reader = csv.reader(csvfile)
-                for row_data in reader:
-                    cells = [Cell(value=item) for item in row_data]
-                    rows.append(Row(cells=cells))
+            sheet = self._build_sheet(path.stem, self._iter_records(path, 'gbk', cell_range))
 
-        sheet = Sheet(name=sheet_name, rows=rows)
         return [sheet]
+
+    def _build_sheet(self, name: str, records: Iterator[list[str]]) -> Sheet:
+        """由记录生成工作表，启用 columnar_sheets 时直接按列填充，不创建 Row/Cell 对象。"""
+        if get_config().columnar_sheets:
+            return build_columnar_sheet(name, records)
+        return Sheet(name=name, rows=[Row(cells=[Cell(value=item) for item in row_data]) for row_data in records])
+
+    def _iter_records(self, path: Path, encoding: str, cell_range: CellRange | None) -> Iterator[list[str]]:
+        """
+        按指定编码逐条产出CSV记录，指定 cell_range 时跳过范围前的行并只保留范围内的列。
+
+        读取整个文件时，较大的文件按 parallel_csv_workers 配置在进程池中按字节范围并行解析。
+        """
+        if cell_range is None:
+            workers = _get_parallel_csv_workers(path)
+            if workers > 1:
+                records = parse_csv_parallel(str(path), encoding, workers)
+                if records is not None:
+                    yield from records
+                    return
+
+        with open(path, mode='r', encoding=encoding) as csvfile:
+            reader = csv.reader(csvfile)
+            if cell_range is None:
+                yield from reader
+                return
+
+            start_row, start_col, end_row, end_col = cell_range
+            for row_data in islice(reader, start_row, end_row + 1):
+                yield row_data[start_col:end_col + 1]
+
+    def get_sheet_names(self, file_path: str) -> list[str]:
+        """CSV文件只有一个以文件名命名的工作表。"""
+        return [Path(file_path).stem]
     
     def supports_streaming(self) -> bool:
         """CSV解析器支持流式处理。"""
@@ -138,4 +314,4 @@ class CsvParser(BaseParser):
         path = Path(file_path)
         name = sheet_name or path.stem
         provider = CsvRowProvider(file_path)
-        return LazySheet(name=name, provider=provider)
+        return build_lazy_sheet(file_path, name, provider)
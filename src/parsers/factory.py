@@ -11,7 +11,9 @@
 
 from .base_parser import BaseParser
 from .xlsx_parser import XlsxParser
+from .xlsx_native_parser import XlsxNativeParser
 from .csv_parser import CsvParser
+from .csv_arrow_parser import CsvArrowParser
 from .xls_parser import XlsParser
 from .xlsb_parser import XlsbParser
 from .xlsm_parser import XlsmParser
@@ -27,6 +29,9 @@ class ParserFactory:
 
     注意：每次调用都会创建新的解析器实例，确保线程安全。
 
+    部分格式提供可选的解析引擎（如XLSX的 "native" 引擎只读取数据、不创建openpyxl对象，
+    CSV的 "arrow" 引擎用 pyarrow 推断列类型），可通过 get_parser 的 engine 参数选择。
+
     支持的格式：
     - CSV (.csv)：通用逗号分隔值文件。
     - XLSX (.xlsx)：现代Excel格式（2007+），支持完整样式。
@@ -44,8 +49,25 @@ class ParserFactory:
         "xlsm": XlsmParser,
     }
 
+    # 默认引擎名称
+    DEFAULT_ENGINE = "default"
+    # 纯数据原生引擎名称
+    NATIVE_ENGINE = "native"
+    # pyarrow列式类型化引擎名称
+    ARROW_ENGINE = "arrow"
+
+    # 可选引擎映射 {引擎名称: {格式: 解析器类}}，格式未提供该引擎时使用默认解析器
+    _engine_parser_classes = {
+        NATIVE_ENGINE: {
+            "xlsx": XlsxNativeParser,
+        },
+        ARROW_ENGINE: {
+            "csv": CsvArrowParser,
+        },
+    }
+
     @staticmethod
-    def get_parser(file_path: str) -> BaseParser:
+    def get_parser(file_path: str, engine: str | None = None) -> BaseParser:
         """
         获取指定文件路径对应的解析器。
 
@@ -53,6 +75,9 @@ class ParserFactory:
 
         参数：
             file_path: 文件的绝对路径。
+            engine: 解析引擎（可选）。None或"default"使用默认解析器；
+                    "native"对支持的格式使用只读取数据的原生解析器；
+                    "arrow"对CSV使用 pyarrow 推断列类型的列式解析器。
 
         返回：
             继承自 BaseParser 的解析器实例。
@@ -61,6 +86,17 @@ class ParserFactory:
             UnsupportedFileTypeError: 文件格式不支持时抛出。
             ValidationError: 文件路径无效时抛出。
             FileNotFoundError: 文件不存在时抛出。
+            ValueError: 引擎名称未知时抛出。
+        """
+        # 创建新的解析器实例，确保线程安全
+        return ParserFactory.get_parser_class(file_path, engine)()
+
+    @staticmethod
+    def get_parser_class(file_path: str, engine: str | None = None) -> type[BaseParser]:
+        """
+        返回 get_parser 会为该文件创建的解析器类，不创建实例。
+
+        参数与异常同 get_parser。
         """
         # 使用验证器验证文件输入
         validated_path, file_extension = validate_file_input(file_path)
@@ -70,8 +106,14 @@ class ParserFactory:
             supported_formats = list(ParserFactory._parser_classes.keys())
             raise UnsupportedFileTypeError(file_extension, supported_formats)
 
-        # 创建新的解析器实例，确保线程安全
-        return parser_class()
+        if engine is not None and engine != ParserFactory.DEFAULT_ENGINE:
+            engine_classes = ParserFactory._engine_parser_classes.get(engine)
+            if engine_classes is None:
+                supported_engines = [ParserFactory.DEFAULT_ENGINE, *ParserFactory._engine_parser_classes]
+                raise ValueError(f"不支持的解析引擎: {engine}，可用引擎: {supported_engines}")
+            parser_class = engine_classes.get(file_extension, parser_class)
+
+        return parser_class
 
     @staticmethod
     def get_supported_formats() -> list[str]:
@@ -106,16 +148,16 @@ class ParserFactory:
             "xls": {
                 "name": "Excel XLS",
                 "description": "Excel 97-2003格式",
-                "features": ["基础样式提取", "动态颜色获取", "合并单元格"],
+                "features": ["基础样式提取", "动态颜色获取", "合并单元格", "流式读取"],
                 "parser_class": "XlsParser",
-                "supports_streaming": False
+                "supports_streaming": True
             },
             "xlsb": {
                 "name": "Excel XLSB",
                 "description": "Excel二进制格式",
-                "features": ["数据准确性", "基础样式", "高性能"],
+                "features": ["数据准确性", "基础样式", "高性能", "流式读取"],
                 "parser_class": "XlsbParser",
-                "supports_streaming": False
+                "supports_streaming": True
             },
             "xlsm": {
                 "name": "Excel XLSM",
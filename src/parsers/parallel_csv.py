@@ -0,0 +1,294 @@
+"""
+CSV并行读取模块
+
+把CSV文件按字节切分为若干范围，在进程池中分别解析后按顺序合并。
+
+切分点必须落在记录边界上，而引号内的字段可以包含换行。切分分两步完成：
+1. 每个工作进程扫描自己的等长字节块，统计引号字符数，并分别找出“块开头在引号外”
+   和“块开头在引号内”两种假设下的第一个记录边界（其前面的引号数为偶数的换行之后）；
+2. 主进程按前面各块引号数之和的奇偶性确定每个块开头是否在引号内，选出对应的边界。
+
+引号只作为字段定界符或以 "" 转义出现时（RFC 4180）这样得到的切分是精确的。
+为了不依赖这一假设，解析时还会检查每个范围的最后一条记录是否恰好在范围末尾结束；
+任何范围不满足时返回 None，由调用方改为串行读取，保证结果与 csv.reader 顺序读取一致。
+"""
+
+import csv
+import io
+import logging
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.cache.row_index_cache import RowCheckpointIndex
+
+logger = logging.getLogger(__name__)
+
+# 扫描字节块时每次读取的大小
+SCAN_BLOCK_SIZE = 1024 * 1024
+
+
+def split_csv_ranges(file_path: str, parts: int, executor: ProcessPoolExecutor | None = None) -> list[tuple[int, int]]:
+    """
+    把CSV文件切分为最多 parts 个首尾都在记录边界上的字节范围。
+
+    参数：
+        file_path: CSV文件路径
+        parts: 期望的范围数量
+        executor: 用于并行扫描的进程池（可选），未指定时在当前进程中扫描
+
+    返回：
+        按文件顺序排列的 (起始偏移, 结束偏移) 列表；记录跨越整个块时相邻范围会合并
+    """
+    file_size = os.path.getsize(file_path)
+    if parts <= 1 or file_size == 0:
+        return [(0, file_size)]
+
+    block_size = -(-file_size // parts)
+    blocks = [(start, min(start + block_size, file_size)) for start in range(0, file_size, block_size)]
+    if executor is None:
+        scans = [_scan_block(file_path, start, end) for start, end in blocks]
+    else:
+        scans = list(executor.map(_scan_block, [file_path] * len(blocks),
+                                  [start for start, _ in blocks], [end for _, end in blocks]))
+
+    boundaries = [0]
+    quotes_before = 0
+    for index, (quote_count, boundary_outside, boundary_inside) in enumerate(scans):
+        if index > 0:
+            boundary = boundary_inside if quotes_before % 2 else boundary_outside
+            if boundary is not None and boundaries[-1] < boundary < file_size:
+                boundaries.append(boundary)
+        quotes_before += quote_count
+    boundaries.append(file_size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def parse_csv_parallel(file_path: str, encoding: str, workers: int) -> list[list[str]] | None:
+    """
+    在进程池中并行解析整个CSV文件。
+
+    参数：
+        file_path: CSV文件路径
+        encoding: 文件编码
+        workers: 进程数
+
+    返回：
+        按文件顺序排列的全部记录；切分点未落在记录边界上或进程池不可用时返回 None
+
+    异常：
+        UnicodeDecodeError: 文件无法按 encoding 解码时抛出
+    """
+    results = _run_over_ranges(file_path, workers, _parse_range, encoding)
+    if results is None:
+        return None
+    records: list[list[str]] = []
+    for range_records in results:
+        records.extend(range_records)
+    return records
+
+
+def build_row_index_parallel(file_path: str, encoding: str, interval: int, workers: int) -> RowCheckpointIndex | None:
+    """
+    在进程池中并行建立行检查点索引。
+
+    先并行统计每个范围的记录数，由此得到每个范围第一条记录的全局行号，
+    再并行收集行号为 interval 整数倍的记录的起始偏移。
+
+    返回：
+        行检查点索引；切分点未落在记录边界上或进程池不可用时返回 None
+
+    异常：
+        UnicodeDecodeError: 文件无法按 encoding 解码时抛出
+    """
+    try:
+        with _create_executor(workers) as executor:
+            ranges = split_csv_ranges(file_path, workers, executor)
+            counts = list(executor.map(_count_range, *_range_args(file_path, ranges, encoding)))
+            if None in counts:
+                return None
+
+            first_rows = [sum(counts[:index]) for index in range(len(counts))]
+            range_offsets = executor.map(_collect_checkpoints, *_range_args(file_path, ranges, encoding),
+                                         first_rows, [interval] * len(ranges))
+            offsets = [0]
+            for checkpoint_offsets in range_offsets:
+                offsets.extend(offset for offset in checkpoint_offsets if offset > 0)
+    except (BrokenProcessPool, NotImplementedError, OSError) as e:
+        logger.warning(f"并行建立CSV行索引不可用，回退到串行扫描: {e}")
+        return None
+
+    total_rows = sum(counts)
+    if total_rows and total_rows % interval == 0:
+        # 与串行扫描一致：记录数恰为间隔整数倍时，最后一个检查点指向文件末尾
+        offsets.append(ranges[-1][1])
+    return RowCheckpointIndex(interval=interval, offsets=tuple(offsets), total_rows=total_rows)
+
+
+def _create_executor(workers: int) -> ProcessPoolExecutor:
+    """创建进程池，使用 spawn 启动工作进程，避免在多线程的服务进程中 fork。"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _range_args(file_path: str, ranges: list[tuple[int, int]], encoding: str) -> tuple[list, ...]:
+    """把字节范围展开为 executor.map 的逐项参数：文件路径、起始偏移、结束偏移、编码、是否为最后一个范围。"""
+    return ([file_path] * len(ranges), [start for start, _ in ranges], [end for _, end in ranges],
+            [encoding] * len(ranges), [index == len(ranges) - 1 for index in range(len(ranges))])
+
+
+def _run_over_ranges(file_path: str, workers: int, job, encoding: str) -> list | None:
+    """切分文件并在进程池中对每个范围执行 job，任一范围未在记录边界结束或进程池不可用时返回 None。"""
+    try:
+        with _create_executor(workers) as executor:
+            ranges = split_csv_ranges(file_path, workers, executor)
+            results = list(executor.map(job, *_range_args(file_path, ranges, encoding)))
+    except (BrokenProcessPool, NotImplementedError, OSError) as e:
+        logger.warning(f"并行读取CSV不可用，回退到串行读取: {e}")
+        return None
+
+    if None in results:
+        logger.debug(f"CSV文件 {file_path} 的切分点未落在记录边界上，回退到串行读取")
+        return None
+    return results
+
+
+def _scan_block(file_path: str, start: int, end: int) -> tuple[int, int | None, int | None]:
+    """
+    扫描 [start, end) 字节块。
+
+    返回：
+        (块内引号字符数, 块开头在引号外时的第一个记录边界, 块开头在引号内时的第一个记录边界)，
+        边界为换行符之后的偏移，块内没有对应边界时为 None
+    """
+    quote_count = 0
+    boundaries: list[int | None] = [None, None]
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            block = f.read(min(SCAN_BLOCK_SIZE, end - position))
+            if not block:
+                break
+            cursor = 0
+            while None in boundaries:
+                newline = block.find(b'\n', cursor)
+                if newline < 0:
+                    break
+                quote_count += block.count(b'"', cursor, newline)
+                # 块开头在引号外时引号数为偶数的换行是记录边界，开头在引号内时则为奇数
+                parity = quote_count % 2
+                if boundaries[parity] is None:
+                    boundaries[parity] = position + newline + 1
+                cursor = newline + 1
+            quote_count += block.count(b'"', cursor)
+            position += len(block)
+    return quote_count, boundaries[0], boundaries[1]
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """只读取文件 [start, end) 字节范围的原始流。"""
+
+    def __init__(self, file_path: str, start: int, end: int):
+        self._file = open(file_path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._file.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _iter_range_records(file_path: str, start: int, end: int, encoding: str, is_last: bool,
+                        track_offsets: bool = False) -> Iterator[tuple[int, list[str] | None]]:
+    """
+    按 csv.reader 的规则产出 [start, end) 范围内的 (记录起始偏移, 记录)。
+
+    默认以文本方式读取，换行符的转换与 open(mode='r') 相同，记录内容与串行读取一致；
+    track_offsets 为 True 时改为逐行读取字节并累计偏移（与 CsvRowProvider 建立行索引的方式相同），
+    否则产出的偏移恒为 start。
+    非最后一个范围的最后一条记录需要读过范围末尾才能结束，或范围内容不是有效的CSV时，
+    说明切分点不在记录边界上，此时最后产出 (end, None)。
+    """
+    line_starts: list[int] = []
+    exhausted = False
+
+    def text_lines() -> Iterator[str]:
+        nonlocal exhausted
+        raw = io.BufferedReader(_ByteRangeReader(file_path, start, end))
+        with io.TextIOWrapper(raw, encoding=encoding) as text:
+            for line in text:
+                line_starts.append(start)
+                yield line
+        exhausted = True
+
+    def binary_lines() -> Iterator[str]:
+        nonlocal exhausted
+        position = start
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            while position < end:
+                line = f.readline(end - position)
+                if not line:
+                    break
+                line_starts.append(position)
+                position += len(line)
+                yield line.decode(encoding)
+        exhausted = True
+
+    try:
+        for record in csv.reader(binary_lines() if track_offsets else text_lines()):
+            if exhausted and not is_last:
+                break
+            # 一条记录可能跨越多行，其起始偏移是组成它的第一行的起始偏移
+            yield line_starts[0], record
+            line_starts.clear()
+        else:
+            return
+    except csv.Error:
+        pass
+    yield end, None
+
+
+def _parse_range(file_path: str, start: int, end: int, encoding: str, is_last: bool) -> list[list[str]] | None:
+    """工作进程任务：解析一个字节范围，切分点不在记录边界上时返回 None。"""
+    records = []
+    for _, record in _iter_range_records(file_path, start, end, encoding, is_last):
+        if record is None:
+            return None
+        records.append(record)
+    return records
+
+
+def _count_range(file_path: str, start: int, end: int, encoding: str, is_last: bool) -> int | None:
+    """工作进程任务：统计一个字节范围的记录数，切分点不在记录边界上时返回 None。"""
+    count = 0
+    for _, record in _iter_range_records(file_path, start, end, encoding, is_last, track_offsets=True):
+        if record is None:
+            return None
+        count += 1
+    return count
+
+
+def _collect_checkpoints(file_path: str, start: int, end: int, encoding: str, is_last: bool,
+                         first_row: int, interval: int) -> list[int]:
+    """工作进程任务：返回范围内全局行号为 interval 整数倍的记录的起始偏移。"""
+    return [
+        offset
+        for row, (offset, record) in enumerate(
+            _iter_range_records(file_path, start, end, encoding, is_last, track_offsets=True), first_row)
+        if record is not None and row % interval == 0
+    ]
@@ -1,18 +1,144 @@
 """
 XLS格式解析器模块
 
-基于xlrd库实现XLS格式的完整解析，支持样式提取和数据转换。
+基于xlrd库实现XLS格式的完整解析，支持样式提取、数据转换和按需读取。
 """
 
 import logging
+from collections.abc import Iterator
+from typing import Any
 import xlrd
 import xlrd.xldate
 from src.models.table_model import Sheet, Row, Cell, Style, LazySheet
-from src.parsers.base_parser import BaseParser
+from src.parsers.base_parser import BaseParser, build_lazy_sheet
+from src.utils.range_parser import CellRange
 from src.utils.border_utils import get_xls_border_style_name
 
 logger = logging.getLogger(__name__)
 
+# 数字格式中出现任一字符即视为日期格式（与原有的简单检测规则一致）
+_DATE_FORMAT_INDICATORS = ('d', 'm', 'y', 'h', 's', '/')
+
+# Excel错误代码映射
+_ERROR_CODES = {
+    0: "#NULL!",
+    7: "#DIV/0!",
+    15: "#VALUE!",
+    23: "#REF!",
+    29: "#NAME?",
+    36: "#NUM!",
+    42: "#N/A"
+}
+
+
+class XlsRowProvider:
+    """
+    XLS文件的惰性行提供者，基于xlrd的 on_demand 模式。
+
+    工作簿以 on_demand 模式打开，只加载目标工作表的BIFF记录；Row/Cell/Style 对象在
+    iter_rows/get_row 时才逐行构建，不会一次性生成整个工作表的对象。
+    xlrd 只能按整张工作表解码，已加载的工作表在多次读取间复用，
+    使用完毕后应调用 close()（或使用 with 语句），通过 unload_sheet 释放工作表并关闭文件。
+    """
+
+    def __init__(self, file_path: str, sheet_name: str | None = None, parser: 'XlsParser | None' = None):
+        """
+        参数:
+            file_path: XLS文件路径
+            sheet_name: 工作表名称（可选），未指定时使用第一个工作表
+            parser: 用于样式与值转换的XlsParser（可选）
+        """
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self._parser = parser or XlsParser()
+        self._workbook = None
+        self._worksheet = None
+        self._sheet_index: int | None = None
+        self._xf_styles: list[Style] = []
+        self._xf_is_date: list[bool] = []
+        self._default_style = Style()
+
+    def _get_worksheet(self):
+        """打开工作簿并加载目标工作表（只在首次调用时执行）。"""
+        if self._worksheet is None:
+            if self._workbook is None:
+                self._workbook = xlrd.open_workbook(self.file_path, formatting_info=True, on_demand=True)
+                self._xf_styles, self._xf_is_date = self._parser._build_xf_tables(self._workbook)
+            if self.sheet_name is None:
+                self._sheet_index = 0
+            else:
+                sheet_names = self._workbook.sheet_names()
+                if self.sheet_name not in sheet_names:
+                    raise ValueError(f"工作表 '{self.sheet_name}' 不存在")
+                self._sheet_index = sheet_names.index(self.sheet_name)
+            self._worksheet = self._workbook.sheet_by_index(self._sheet_index)
+        return self._worksheet
+
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None,
+                  col_range: tuple[int, int] | None = None) -> Iterator[Row]:
+        """按需逐行构建并产出行，指定 col_range 时只为这些列创建单元格，超出工作表宽度的列补空单元格。"""
+        worksheet = self._get_worksheet()
+        end_row = worksheet.nrows
+        if max_rows is not None:
+            end_row = min(start_row + max_rows, end_row)
+
+        if col_range is None:
+            col_indexes = range(worksheet.ncols)
+            padding = 0
+        else:
+            start_col, end_col = col_range
+            col_indexes = range(start_col, min(end_col + 1, worksheet.ncols))
+            padding = end_col - start_col + 1 - len(col_indexes)
+
+        for row_idx in range(start_row, end_row):
+            row = self._parser._parse_row(worksheet, row_idx, col_indexes, self._xf_styles,
+                                          self._xf_is_date, self._default_style)
+            if padding:
+                row.cells.extend(Cell(value=None) for _ in range(padding))
+            yield row
+
+    def get_row(self, row_index: int) -> Row:
+        """按索引获取指定行。"""
+        worksheet = self._get_worksheet()
+        if row_index < 0 or row_index >= worksheet.nrows:
+            raise IndexError(f"行索引 {row_index} 超出范围")
+        return self._parser._parse_row(worksheet, row_index, range(worksheet.ncols), self._xf_styles,
+                                       self._xf_is_date, self._default_style)
+
+    def get_total_rows(self) -> int:
+        """获取工作表总行数。"""
+        return self._get_worksheet().nrows
+
+    def get_sheet_name(self) -> str:
+        """获取目标工作表的名称。"""
+        return self._get_worksheet().name
+
+    def get_merged_cells(self) -> list[str]:
+        """获取目标工作表的合并单元格范围。"""
+        return self._parser._extract_merged_cells(self._get_worksheet())
+
+    def close(self) -> None:
+        """卸载已加载的工作表并释放工作簿资源。可重复调用。"""
+        if self._workbook is not None:
+            workbook, self._workbook = self._workbook, None
+            if self._sheet_index is not None:
+                workbook.unload_sheet(self._sheet_index)
+            workbook.release_resources()
+        self._worksheet = None
+        self._sheet_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
 
 class XlsParser(BaseParser):
     """XLS格式解析器，基于xlrd库实现完整的样式提取。"""
@@ -48,12 +174,19 @@ class XlsParser(BaseParser):
         # 动态颜色缓存
         self.workbook_colors = {}
     
-    def parse(self, file_path: str) -> list[Sheet]:
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
         """
         解析XLS文件并返回Sheet对象列表。
 
+        工作簿以 on_demand 模式打开，只有需要解析的工作表的BIFF记录才会被解码。
+        每个XF记录对应的样式与日期格式标志在工作簿级预先计算一次（见 _build_xf_tables），
+        逐单元格循环中只做列表查找，同一XF的单元格共享同一个Style实例。
+
         参数:
             file_path: XLS文件路径
+            sheet_name: 只解析该名称的工作表（可选），不存在时返回空列表
+            cell_range: 只解析该单元格范围（可选），范围外的单元格不读取值和样式
 
         返回:
             包含完整数据和样式的Sheet对象列表
@@ -61,46 +194,49 @@ class XlsParser(BaseParser):
         异常:
             RuntimeError: 当解析失败时
         """
+        workbook = None
         try:
-            # 打开XLS文件，启用格式化信息
-            workbook = xlrd.open_workbook(file_path, formatting_info=True)
+            # 打开XLS文件，启用格式化信息；工作表按需加载
+            workbook = xlrd.open_workbook(file_path, formatting_info=True, on_demand=True)
 
             # 检查工作表数量
             if workbook.nsheets == 0:
                 raise RuntimeError("工作簿不包含任何工作表")
 
-            sheets = []
+            sheet_indexes = range(workbook.nsheets)
+            if sheet_name is not None:
+                sheet_names = workbook.sheet_names()
+                if sheet_name not in sheet_names:
+                    return []
+                sheet_indexes = [sheet_names.index(sheet_name)]
 
-            # 解析所有工作表
-            for sheet_idx in range(workbook.nsheets):
-                worksheet = workbook.sheet_by_index(sheet_idx)
-                sheet_name = worksheet.name
+            xf_styles, xf_is_date = self._build_xf_tables(workbook)
+            default_style = Style()
 
-                # 解析所有行和单元格
-                rows = []
-                for row_idx in range(worksheet.nrows):
-                    cells = []
-                    for col_idx in range(worksheet.ncols):
-                        # 获取单元格值
-                        cell_value = self._get_cell_value(workbook, worksheet, row_idx, col_idx)
+            sheets = []
 
-                        # 提取样式信息
-                        cell_style = self._extract_style(workbook, worksheet, row_idx, col_idx)
+            # 解析所有（或指定的）工作表
+            for sheet_idx in sheet_indexes:
+                worksheet = workbook.sheet_by_index(sheet_idx)
 
-                        # 创建Cell对象
-                        cell = Cell(
-                            value=cell_value,
-                            style=cell_style
-                        )
-                        cells.append(cell)
+                row_indexes = range(worksheet.nrows)
+                col_indexes = range(worksheet.ncols)
+                if cell_range is not None:
+                    start_row, start_col, end_row, end_col = cell_range
+                    row_indexes = range(start_row, min(end_row + 1, worksheet.nrows))
+                    col_indexes = range(start_col, min(end_col + 1, worksheet.ncols))
 
-                    rows.append(Row(cells=cells))
+                # 解析所有（或范围内的）行和单元格
+                rows = [
+                    self._parse_row(worksheet, row_idx, col_indexes, xf_styles, xf_is_date, default_style)
+                    for row_idx in row_indexes
+                ]
 
-                # 处理合并单元格
-                merged_cells = self._extract_merged_cells(worksheet)
+                # 处理合并单元格（范围解析结果不含工作表级信息）
+                merged_cells = self._extract_merged_cells(worksheet) if cell_range is None else []
 
                 sheet = Sheet(
-                    name=sheet_name,
+                    name=worksheet.name,
                     rows=rows,
                     merged_cells=merged_cells
                 )
@@ -111,90 +247,146 @@ class XlsParser(BaseParser):
         except Exception as e:
             logger.error(f"解析XLS文件失败: {e}")
             raise RuntimeError(f"无法解析XLS文件 {file_path}: {str(e)}")
+        finally:
+            if workbook is not None:
+                workbook.release_resources()
+
+    def get_sheet_names(self, file_path: str) -> list[str]:
+        """以 on_demand 模式打开工作簿，只读取工作表目录。"""
+        workbook = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            return workbook.sheet_names()
+        finally:
+            workbook.release_resources()
     
-    def _get_cell_value(self, workbook, worksheet, row_idx: int, col_idx: int):
-        """获取单元格的值，处理不同的数据类型。"""
+    def _parse_row(self, worksheet, row_idx: int, col_indexes: range, xf_styles: list[Style],
+                   xf_is_date: list[bool], default_style: Style) -> Row:
+        """
+        构建一行中指定列的单元格。
+
+        参数:
+            worksheet: xlrd工作表对象
+            row_idx: 行索引
+            col_indexes: 要读取的列索引
+            xf_styles: _build_xf_tables 生成的按XF索引排列的样式
+            xf_is_date: _build_xf_tables 生成的按XF索引排列的日期格式标志
+            default_style: XF索引无效时使用的样式
+        """
+        xf_count = len(xf_styles)
+        cells = []
+        for col_idx in col_indexes:
+            try:
+                xls_cell = worksheet.cell(row_idx, col_idx)
+            except Exception as e:
+                logger.warning(f"获取单元格失败 ({row_idx}, {col_idx}): {e}")
+                cells.append(Cell(value=None, style=default_style))
+                continue
+
+            # 按单元格的XF索引查表获得共享样式与日期格式标志
+            xf_index = xls_cell.xf_index
+            if xf_index < xf_count:
+                cell_style = xf_styles[xf_index]
+                is_date = xf_is_date[xf_index]
+            else:
+                cell_style = default_style
+                is_date = False
+
+            try:
+                cell_value = self._convert_cell_value(xls_cell, is_date, worksheet)
+            except Exception as e:
+                logger.warning(f"获取单元格值失败 ({row_idx}, {col_idx}): {e}")
+                cell_value = None
+
+            cells.append(Cell(value=cell_value, style=cell_style))
+        return Row(cells=cells)
+
+    def _build_xf_tables(self, workbook) -> tuple[list[Style], list[bool]]:
+        """
+        为工作簿中的每个XF记录预先生成样式与日期格式标志。
+
+        参数:
+            workbook: xlrd工作簿对象
+
+        返回:
+            (按XF索引排列的Style列表, 按XF索引排列的是否日期格式列表)
+        """
+        xf_count = len(workbook.xf_list)
+        styles = [self._build_xf_style(workbook, xf_index) for xf_index in range(xf_count)]
+        date_flags = [self._is_date_xf(workbook, xf_index) for xf_index in range(xf_count)]
+        return styles, date_flags
+
+    def _is_date_xf(self, workbook, xf_index: int) -> bool:
+        """判断XF记录的数字格式是否为日期格式。"""
         try:
-            cell = worksheet.cell(row_idx, col_idx)
-            cell_type = cell.ctype
-            cell_value = cell.value
-            
-            # 处理不同的单元格类型
-            if cell_type == xlrd.XL_CELL_EMPTY:
-                return None
-            elif cell_type == xlrd.XL_CELL_TEXT:
-                return str(cell_value)
-            elif cell_type == xlrd.XL_CELL_NUMBER:
-                # 通过检查单元格的数字格式来判断是否为日期
+            if xf_index < len(workbook.xf_list):
+                xf = workbook.xf_list[xf_index]
+                if xf.format_key in workbook.format_map:
+                    format_info = workbook.format_map[xf.format_key]
+                    if format_info and format_info.format_str:
+                        # 简单的日期格式检测
+                        format_str = format_info.format_str.lower()
+                        return any(date_indicator in format_str for date_indicator in _DATE_FORMAT_INDICATORS)
+        except (ValueError, TypeError, IndexError):
+            # 如果日期检测失败，当作普通数字处理
+            pass
+        return False
+
+    def _convert_cell_value(self, cell, is_date: bool, worksheet):
+        """
+        按单元格类型转换xlrd单元格的值。
+
+        参数:
+            cell: xlrd单元格
+            is_date: 单元格的数字格式是否为日期格式
+            worksheet: 单元格所在的xlrd工作表（用于获取日期基准）
+        """
+        cell_type = cell.ctype
+        cell_value = cell.value
+
+        # 处理不同的单元格类型
+        if cell_type == xlrd.XL_CELL_EMPTY:
+            return None
+        elif cell_type == xlrd.XL_CELL_TEXT:
+            return str(cell_value)
+        elif cell_type == xlrd.XL_CELL_NUMBER:
+            if is_date:
                 try:
-                    # 获取单元格的格式信息
-                    xf_index = cell.xf_index
-                    if xf_index < len(workbook.xf_list):
-                        xf = workbook.xf_list[xf_index]
-                        if xf.format_key in workbook.format_map:
-                            format_info = workbook.format_map[xf.format_key]
-                            if format_info and format_info.format_str:
-                                # 简单的日期格式检测
-                                format_str = format_info.format_str.lower()
-                                if any(date_indicator in format_str for date_indicator in
-                                      ['d', 'm', 'y', 'h', 's', '/']):
-                                    logger.debug(f"将单元格 ({row_idx}, {col_idx}) 的值 '{cell_value}'（格式：'{format_str}'）作为日期处理。")
-                                    return xlrd.xldate.xldate_as_datetime(cell_value, worksheet.book.datemode)
+                    return xlrd.xldate.xldate_as_datetime(cell_value, worksheet.book.datemode)
                 except (ValueError, TypeError, IndexError):
-                    # 如果日期检测失败，当作普通数字处理
+                    # 日期转换失败，当作普通数字处理
                     pass
 
-                # 如果是整数，返回int，否则返回float
-                return int(cell_value) if cell_value.is_integer() else cell_value
-            elif cell_type == xlrd.XL_CELL_DATE:
-                try:
-                    return xlrd.xldate.xldate_as_datetime(cell_value, worksheet.book.datemode)
-                except xlrd.xldate.XLDateError:
-                    # 日期转换失败，返回原始数值
-                    return cell_value
-            elif cell_type == xlrd.XL_CELL_BOOLEAN:
-                return bool(cell_value)
-            elif cell_type == xlrd.XL_CELL_ERROR:
-                # Excel错误代码映射
-                error_codes = {
-                    0: "#NULL!",
-                    7: "#DIV/0!",
-                    15: "#VALUE!",
-                    23: "#REF!",
-                    29: "#NAME?",
-                    36: "#NUM!",
-                    42: "#N/A"
-                }
-                return error_codes.get(cell_value, f"#ERROR:{cell_value}")
-            else:
+            # 如果是整数，返回int，否则返回float
+            return int(cell_value) if cell_value.is_integer() else cell_value
+        elif cell_type == xlrd.XL_CELL_DATE:
+            try:
+                return xlrd.xldate.xldate_as_datetime(cell_value, worksheet.book.datemode)
+            except xlrd.xldate.XLDateError:
+                # 日期转换失败，返回原始数值
                 return cell_value
-                
-        except Exception as e:
-            logger.warning(f"获取单元格值失败 ({row_idx}, {col_idx}): {e}")
-            return None
-    
-    def _extract_style(self, workbook, worksheet, row_idx: int, col_idx: int) -> Style:
+        elif cell_type == xlrd.XL_CELL_BOOLEAN:
+            return bool(cell_value)
+        elif cell_type == xlrd.XL_CELL_ERROR:
+            return _ERROR_CODES.get(cell_value, f"#ERROR:{cell_value}")
+        else:
+            return cell_value
+
+    def _build_xf_style(self, workbook, xf_index: int) -> Style:
         """
-        从XLS单元格提取样式信息。
-        
+        根据XF记录生成样式。
+
         参数:
             workbook: xlrd工作簿对象
-            worksheet: xlrd工作表对象
-            row_idx: 行索引
-            col_idx: 列索引
-            
+            xf_index: XF记录索引
+
         返回:
-            Style对象
+            Style对象，XF索引无效时为默认样式
         """
-        style = Style()
-        
+        style_attrs: dict[str, Any] = {}
+
         try:
-            # 获取单元格的格式索引
-            cell = worksheet.cell(row_idx, col_idx)
-            xf_index = cell.xf_index
-            
             if xf_index >= len(workbook.xf_list):
-                return style
+                return Style()
                 
             # 获取扩展格式记录
             xf = workbook.xf_list[xf_index]
@@ -202,21 +394,21 @@ class XlsParser(BaseParser):
             # 提取字体信息
             if xf.font_index < len(workbook.font_list):
                 font = workbook.font_list[xf.font_index]
-                style.bold = bool(font.bold)
-                style.italic = bool(font.italic)
-                style.underline = bool(font.underline_type)
+                style_attrs['bold'] = bool(font.bold)
+                style_attrs['italic'] = bool(font.italic)
+                style_attrs['underline'] = bool(font.underline_type)
                 
                 # 字体大小（xlrd中以20分之一点为单位）
                 if font.height:
-                    style.font_size = font.height / 20.0
+                    style_attrs['font_size'] = font.height / 20.0
                 
                 # 字体名称
                 if font.name:
-                    style.font_name = font.name
+                    style_attrs['font_name'] = font.name
                 
                 # 字体颜色
                 if font.colour_index:
-                    style.font_color = self._get_color_from_index(workbook, font.colour_index)
+                    style_attrs['font_color'] = self._get_color_from_index(workbook, font.colour_index)
             
             # 提取背景颜色（增强版）
             if hasattr(xf, 'background') and xf.background:
@@ -229,15 +421,15 @@ class XlsParser(BaseParser):
                     if bg_color_index != 64:
                         bg_color = self._get_color_from_index(workbook, bg_color_index)
                         if bg_color:
-                            style.background_color = bg_color
+                            style_attrs['background_color'] = bg_color
 
                 # 如果有背景颜色索引，也尝试提取
                 if hasattr(xf.background, 'background_colour_index'):
                     bg_color_index = xf.background.background_colour_index
-                    if bg_color_index != 64 and not style.background_color:
+                    if bg_color_index != 64 and not style_attrs.get('background_color'):
                         bg_color = self._get_color_from_index(workbook, bg_color_index)
                         if bg_color:
-                            style.background_color = bg_color
+                            style_attrs['background_color'] = bg_color
             
             # 提取对齐方式
             if hasattr(xf, 'alignment'):
@@ -245,30 +437,30 @@ class XlsParser(BaseParser):
                 
                 # 水平对齐
                 if alignment.hor_align == 1:
-                    style.text_align = "left"
+                    style_attrs['text_align'] = "left"
                 elif alignment.hor_align == 2:
-                    style.text_align = "center"
+                    style_attrs['text_align'] = "center"
                 elif alignment.hor_align == 3:
-                    style.text_align = "right"
+                    style_attrs['text_align'] = "right"
                 elif alignment.hor_align == 4:
-                    style.text_align = "justify"
+                    style_attrs['text_align'] = "justify"
                 
                 # 垂直对齐
                 if alignment.vert_align == 0:
-                    style.vertical_align = "top"
+                    style_attrs['vertical_align'] = "top"
                 elif alignment.vert_align == 1:
-                    style.vertical_align = "middle"
+                    style_attrs['vertical_align'] = "middle"
                 elif alignment.vert_align == 2:
-                    style.vertical_align = "bottom"
+                    style_attrs['vertical_align'] = "bottom"
                 
                 # 文本换行
-                style.wrap_text = bool(alignment.wrap)
+                style_attrs['wrap_text'] = bool(alignment.wrap)
             
             # 提取数字格式
             if xf.format_key < len(workbook.format_map):
                 format_info = workbook.format_map[xf.format_key]
                 if format_info and format_info.format_str:
-                    style.number_format = format_info.format_str
+                    style_attrs['number_format'] = format_info.format_str
             
             # 提取边框信息（增强版）
             if hasattr(xf, 'border'):
@@ -277,16 +469,16 @@ class XlsParser(BaseParser):
                     # 处理各个边框 - 使用统一的边框工具
                     if border.top_line_style:
                         style_name = get_xls_border_style_name(border.top_line_style)
-                        style.border_top = style_name if style_name else "solid"
+                        style_attrs['border_top'] = style_name if style_name else "solid"
                     if border.bottom_line_style:
                         style_name = get_xls_border_style_name(border.bottom_line_style)
-                        style.border_bottom = style_name if style_name else "solid"
+                        style_attrs['border_bottom'] = style_name if style_name else "solid"
                     if border.left_line_style:
                         style_name = get_xls_border_style_name(border.left_line_style)
-                        style.border_left = style_name if style_name else "solid"
+                        style_attrs['border_left'] = style_name if style_name else "solid"
                     if border.right_line_style:
                         style_name = get_xls_border_style_name(border.right_line_style)
-                        style.border_right = style_name if style_name else "solid"
+                        style_attrs['border_right'] = style_name if style_name else "solid"
 
                     # 边框颜色（使用第一个有效的边框颜色）
                     for color_idx in [border.top_colour_index, border.bottom_colour_index,
@@ -294,13 +486,13 @@ class XlsParser(BaseParser):
                         if color_idx and color_idx != 64: # 64是默认颜色
                             border_color = self._get_color_from_index(workbook, color_idx)
                             if border_color:
-                                style.border_color = border_color
+                                style_attrs['border_color'] = border_color
                                 break
             
         except Exception as e:
-            logger.warning(f"提取样式失败 ({row_idx}, {col_idx}): {e}")
+            logger.warning(f"提取样式失败 (XF {xf_index}): {e}")
         
-        return style
+        return Style(**style_attrs)
     
     def _get_color_from_index(self, workbook, color_index: int) -> str:
         """
@@ -383,12 +575,24 @@ class XlsParser(BaseParser):
         return f"{col_str}{row + 1}"
     
     def supports_streaming(self) -> bool:
-        """由于xlrd库限制，XLS解析器不支持流式处理。"""
-        return False  # xlrd 不支持真正的流式读取，但可实现分块读取
+        """XLS解析器通过XlsRowProvider支持按需读取。"""
+        return True
 
-    def create_lazy_sheet(self, file_path: str, sheet_name: str | None = None) -> LazySheet | None:
+    def create_lazy_sheet(self, file_path: str, sheet_name: str | None = None) -> LazySheet:
         """
-        由于xlrd库限制，XLS格式不支持流式读取。
-        大文件建议采用分块读取方案。
+        创建用于按需读取XLS数据的LazySheet。
+
+        xlrd 只能按整张工作表解码BIFF记录，但只加载目标工作表，
+        且Row/Cell/Style对象只在读取时逐行构建，大文件不再需要一次性生成所有对象。
+
+        参数：
+            file_path: XLS文件路径
+            sheet_name: 工作表名称（可选），未指定时使用第一个工作表
+
+        返回：
+            可按需读取数据的LazySheet对象
         """
-        return None  # 受xlrd限制，未实现
+        provider = XlsRowProvider(file_path, sheet_name, self)
+        name = provider.get_sheet_name()
+        merged_cells = provider.get_merged_cells()
+        return build_lazy_sheet(file_path, name, provider, merged_cells)
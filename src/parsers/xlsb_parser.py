@@ -1,29 +1,184 @@
 """
 XLSB格式解析器模块
 
-基于pyxlsb库实现XLSB格式的解析，支持Excel二进制格式的数据提取。
+基于pyxlsb库实现XLSB格式的解析，支持Excel二进制格式的数据提取和流式读取。
 XLSB格式的样式信息相对有限，主要专注于数据准确性。
 """
 
 import logging
+from collections.abc import Iterator
 from datetime import datetime
+from itertools import islice
+from typing import Any
 
 from pyxlsb import open_workbook, convert_date
 from src.models.table_model import Sheet, Row, Cell, Style, LazySheet
-from src.parsers.base_parser import BaseParser
+from src.parsers.base_parser import BaseParser, build_lazy_sheet
+from src.utils.range_parser import CellRange
 
 logger = logging.getLogger(__name__)
 
 
+class XlsbRowProvider:
+    """
+    XLSB文件的惰性行提供者，基于pyxlsb的顺序行迭代器。
+
+    提供者持有打开的工作簿与工作表句柄，在多次 iter_rows/get_row/get_total_rows 调用间复用；
+    若本次起始行恰好是上一次读取停下的位置（如StreamingTableReader的连续分块），
+    则直接从上次的行迭代器继续，不再从第1行重新扫描，内存占用只与分块大小有关。
+    使用完毕后应调用 close()（或使用 with 语句）。
+    """
+
+    def __init__(self, file_path: str, sheet_name: str | None = None, parser: 'XlsbParser | None' = None):
+        """
+        参数:
+            file_path: XLSB文件路径
+            sheet_name: 工作表名称（可选），未指定时使用第一个工作表
+            parser: 用于单元格值与样式转换的XlsbParser（可选）
+        """
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self._parser = parser or XlsbParser()
+        self._workbook = None
+        self._worksheet = None
+        self._sheet_title: str | None = None
+        self._total_rows_cache: int | None = None
+        # 前向行游标：(行迭代器, 下一次将产出的行索引)
+        self._cursor: tuple[Iterator, int] | None = None
+
+    def _get_worksheet(self):
+        """打开工作簿与目标工作表（只在首次调用时执行）。"""
+        if self._worksheet is None:
+            if self._workbook is None:
+                self._workbook = open_workbook(self.file_path)
+            sheet_names = list(self._workbook.sheets or [])
+            if not sheet_names:
+                raise RuntimeError("工作簿不包含任何工作表")
+            if self.sheet_name is None:
+                sheet_idx = 0
+            elif self.sheet_name in sheet_names:
+                sheet_idx = sheet_names.index(self.sheet_name)
+            else:
+                raise ValueError(f"工作表 '{self.sheet_name}' 不存在")
+            self._sheet_title = sheet_names[sheet_idx]
+            # pyxlsb使用1基索引
+            self._worksheet = self._workbook.get_sheet(sheet_idx + 1)
+        return self._worksheet
+
+    def get_sheet_name(self) -> str:
+        """获取目标工作表的名称。"""
+        self._get_worksheet()
+        return self._sheet_title
+
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None,
+                  col_range: tuple[int, int] | None = None) -> Iterator[Row]:
+        """按需逐行产出行，指定 col_range 时只为这些列创建单元格，超出行宽度的列补空单元格。"""
+        worksheet = self._get_worksheet()
+        if max_rows is not None and max_rows <= 0:
+            return
+
+        first_col, last_col = (0, None) if col_range is None else col_range
+        rows, position = self._take_cursor(worksheet, start_row)
+        try:
+            while max_rows is None or position < start_row + max_rows:
+                row_data = next(rows, None)
+                if row_data is None:
+                    break
+                position += 1
+                row = self._parser._build_row(row_data, first_col, last_col)
+                if last_col is not None and len(row.cells) < last_col - first_col + 1:
+                    row.cells.extend(Cell(value=None) for _ in range(last_col - first_col + 1 - len(row.cells)))
+                yield row
+        finally:
+            self._park_cursor(rows, position)
+
+    def _take_cursor(self, worksheet, start_row: int) -> tuple[Iterator, int]:
+        """取出可从 start_row 继续的行迭代器，没有则重新从工作表开头定位到 start_row。"""
+        cursor, self._cursor = self._cursor, None
+        if cursor is not None and cursor[1] == start_row:
+            return cursor
+        if cursor is not None:
+            self._close_rows(cursor[0])
+        rows = iter(worksheet.rows())
+        # 跳过起始行之前的行，只解码不创建Row对象
+        next(islice(rows, start_row, start_row), None)
+        return rows, start_row
+
+    def _park_cursor(self, rows: Iterator, position: int) -> None:
+        """保存未读完的行迭代器供下一次连续读取使用。"""
+        if self._cursor is not None or self._worksheet is None:
+            self._close_rows(rows)
+        else:
+            self._cursor = (rows, position)
+
+    @staticmethod
+    def _close_rows(rows: Iterator) -> None:
+        """关闭行生成器。"""
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
+
+    def get_row(self, row_index: int) -> Row:
+        """按索引获取指定行。"""
+        if row_index < 0:
+            raise IndexError(f"行索引 {row_index} 超出范围")
+        row = next(iter(self.iter_rows(row_index, 1)), None)
+        if row is None:
+            raise IndexError(f"行索引 {row_index} 超出范围")
+        return row
+
+    def get_total_rows(self) -> int:
+        """获取工作表总行数，优先使用工作表的 DIMENSION 记录，缺失时扫描一次行记录。"""
+        if self._total_rows_cache is None:
+            worksheet = self._get_worksheet()
+            dimension = getattr(worksheet, "dimension", None)
+            if dimension is not None:
+                self._total_rows_cache = dimension.r + dimension.h
+            else:
+                self._total_rows_cache = sum(1 for _ in worksheet.rows())
+                # 扫描移动了共享的读取位置，已保存的游标不再有效
+                if self._cursor is not None:
+                    self._close_rows(self._cursor[0])
+                    self._cursor = None
+        return self._total_rows_cache
+
+    def close(self) -> None:
+        """关闭行迭代器、工作表与工作簿。可重复调用。"""
+        if self._cursor is not None:
+            cursor, self._cursor = self._cursor, None
+            self._close_rows(cursor[0])
+        if self._worksheet is not None:
+            worksheet, self._worksheet = self._worksheet, None
+            worksheet.close()
+        if self._workbook is not None:
+            workbook, self._workbook = self._workbook, None
+            workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
 class XlsbParser(BaseParser):
     """XLSB格式解析器，基于pyxlsb库实现数据提取和基础样式支持。"""
     
-    def parse(self, file_path: str) -> list[Sheet]:
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
         """
         解析XLSB文件并返回Sheet对象列表。
 
         参数:
             file_path: XLSB文件路径
+            sheet_name: 只解析该名称的工作表（可选），不存在时返回空列表
+            cell_range: 只解析该单元格范围（可选），读到范围的最后一行后即停止读取工作表
 
         返回:
             包含数据和基础样式的Sheet对象列表
@@ -39,52 +194,28 @@ class XlsbParser(BaseParser):
 
                 sheets = []
 
-                # 解析所有工作表
-                for sheet_idx, sheet_name in enumerate(workbook.sheets, 1):
+                # 解析所有（或指定的）工作表，未选中的工作表不会被读取
+                for sheet_idx, name in enumerate(workbook.sheets, 1):
+                    if sheet_name is not None and name != sheet_name:
+                        continue
                     # 打开工作表（pyxlsb使用1基索引）
                     with workbook.get_sheet(sheet_idx) as worksheet:
                         rows = []
+                        row_iter = worksheet.rows()
+                        first_col, last_col = 0, None
+                        if cell_range is not None:
+                            start_row, first_col, end_row, last_col = cell_range
+                            row_iter = islice(row_iter, start_row, end_row + 1)
 
-                        # 读取所有行数据
-                        for row_data in worksheet.rows():
-                            cells = []
-
-                            # 处理当前行的所有单元格
-                            if row_data:
-                                # 获取最大列数
-                                max_col = max(cell.c for cell in row_data) if row_data else 0
-
-                                # 创建完整的行，包括空单元格
-                                for col_idx in range(max_col + 1):
-                                    # 查找当前列的单元格
-                                    cell_data = None
-                                    for cell in row_data:
-                                        if cell.c == col_idx:
-                                            cell_data = cell
-                                            break
-
-                                    # 获取单元格值和样式
-                                    if cell_data:
-                                        cell_value = self._process_cell_value(cell_data.v)
-                                        cell_style = self._extract_basic_style(cell_data)
-                                    else:
-                                        cell_value = None
-                                        cell_style = None
-
-                                    # 创建Cell对象
-                                    cell = Cell(
-                                        value=cell_value,
-                                        style=cell_style
-                                    )
-                                    cells.append(cell)
-
-                            rows.append(Row(cells=cells))
+                        # 读取所有（或范围内的）行数据
+                        for row_data in row_iter:
+                            rows.append(self._build_row(row_data, first_col, last_col))
 
                         # XLSB格式中合并单元格信息较难获取，暂时返回空列表
                         merged_cells = []
 
                         sheet = Sheet(
-                            name=sheet_name,
+                            name=name,
                             rows=rows,
                             merged_cells=merged_cells
                         )
@@ -96,6 +227,38 @@ class XlsbParser(BaseParser):
             logger.error(f"解析XLSB文件失败: {e}")
             raise RuntimeError(f"无法解析XLSB文件 {file_path}: {str(e)}")
     
+    def _build_row(self, row_data, first_col: int = 0, last_col: int | None = None) -> Row:
+        """
+        将pyxlsb的一行单元格转换为Row，行宽度为该行最大列索引加1（或截止到 last_col）。
+
+        单元格按列索引直接放入对应位置，每行只遍历一次；同一列出现多个单元格时保留第一个。
+
+        参数:
+            row_data: pyxlsb产出的单元格列表（元素包含列索引c和值v）
+            first_col: 起始列索引（0基）
+            last_col: 结束列索引（0基，包含，可选）
+        """
+        if not row_data:
+            return Row(cells=[])
+
+        max_col = max(cell.c for cell in row_data)
+        if last_col is not None:
+            max_col = min(max_col, last_col)
+        width = max_col - first_col + 1
+        if width <= 0:
+            return Row(cells=[])
+
+        slots: list[Cell | None] = [None] * width
+        for cell_data in row_data:
+            position = cell_data.c - first_col
+            if 0 <= position < width and slots[position] is None:
+                slots[position] = Cell(
+                    value=self._process_cell_value(cell_data.v),
+                    style=self._extract_basic_style(cell_data)
+                )
+        cells = [cell if cell is not None else Cell(value=None, style=None) for cell in slots]
+        return Row(cells=cells)
+
     def _process_cell_value(self, value):
         """
         处理单元格值，包括数据类型转换和日期处理。
@@ -150,7 +313,7 @@ class XlsbParser(BaseParser):
         if not cell_data:
             return None
 
-        style = Style()
+        style_attrs: dict[str, Any] = {}
 
         try:
             # pyxlsb中单元格对象可能包含一些基本样式信息
@@ -169,7 +332,7 @@ class XlsbParser(BaseParser):
             # 检查数字格式
             if hasattr(cell_data, 'f') and cell_data.f:
                 # f属性可能包含格式信息
-                style.number_format = str(cell_data.f)
+                style_attrs['number_format'] = str(cell_data.f)
 
             # 对于XLSB，我们主要依赖数据类型来推断一些基本样式
             if hasattr(cell_data, 'v') and cell_data.v is not None:
@@ -179,21 +342,21 @@ class XlsbParser(BaseParser):
                 if isinstance(value, float):
                     # 浮点数可能是日期或普通数字
                     if 25569 <= value <= 73050:  # 可能的日期范围
-                        style.number_format = "yyyy-mm-dd"
+                        style_attrs['number_format'] = "yyyy-mm-dd"
                     else:
-                        style.number_format = "0.00"
+                        style_attrs['number_format'] = "0.00"
                 elif isinstance(value, int):
-                    style.number_format = "0"
+                    style_attrs['number_format'] = "0"
 
         except Exception as e:
             logger.debug(f"XLSB样式提取失败: {e}")
 
         # 如果没有提取到任何样式信息，返回None
-        if not any([style.font_name, style.font_size, style.font_color,
-                   style.background_color, style.number_format]):
+        if not any(style_attrs.get(attr) for attr in
+                   ('font_name', 'font_size', 'font_color', 'background_color', 'number_format')):
             return None
 
-        return style
+        return Style(**style_attrs)
     
     def _get_sheet_names(self, workbook) -> list[str]:
         """
@@ -210,6 +373,11 @@ class XlsbParser(BaseParser):
         except Exception as e:
             logger.warning(f"获取工作表名称失败: {e}")
             return []
+
+    def get_sheet_names(self, file_path: str) -> list[str]:
+        """只读取工作簿目录获取工作表名称。"""
+        with open_workbook(file_path) as workbook:
+            return list(self._get_sheet_names(workbook))
     
     def _normalize_row_data(self, row_data, max_columns: int) -> list:
         """
@@ -232,12 +400,19 @@ class XlsbParser(BaseParser):
         return normalized_row
     
     def supports_streaming(self) -> bool:
-        """由于pyxlsb库限制，XLSB解析器的流式处理能力有限。"""
-        return False  # pyxlsb 有部分流式能力，但样式支持有限
+        """XLSB解析器通过XlsbRowProvider支持流式读取（样式信息与完整解析一样有限）。"""
+        return True
 
-    def create_lazy_sheet(self, file_path: str, sheet_name: str | None = None) -> LazySheet | None:
+    def create_lazy_sheet(self, file_path: str, sheet_name: str | None = None) -> LazySheet:
         """
-        XLSB格式流式处理能力有限。
-        pyxlsb支持流式读取，但样式信息极为有限。
+        创建用于流式读取XLSB数据的LazySheet。
+
+        参数：
+            file_path: XLSB文件路径
+            sheet_name: 工作表名称（可选），未指定时使用第一个工作表
+
+        返回：
+            按需读取数据的LazySheet对象（XLSB不提供合并单元格信息）
         """
-        return None  # 由于流式模式下样式支持有限，未实现
+        provider = XlsbRowProvider(file_path, sheet_name, self)
+        return build_lazy_sheet(file_path, provider.get_sheet_name(), provider)
@@ -8,8 +8,10 @@ XLSM本质上是带宏的XLSX，样式提取与XLSX完全相同。
 import logging
 import openpyxl
 from src.models.table_model import Sheet, Row, Cell, LazySheet
-from src.parsers.xlsx_parser import XlsxParser
-from src.utils.style_parser import extract_style
+from src.parsers.base_parser import build_lazy_sheet
+from src.parsers.xlsx_parser import XlsxParser, _get_dimensions, _load_workbook
+from src.utils.range_parser import CellRange
+from src.utils.style_parser import StyleCache, extract_style
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +24,15 @@ class XlsmParser(XlsxParser):
     本解析器保留宏信息但不执行，仅专注于数据和样式提取。
     """
     
-    def parse(self, file_path: str) -> list[Sheet]:
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
         """
         解析XLSM文件并返回Sheet对象列表。
 
         参数:
             file_path: XLSM文件路径
+            sheet_name: 只解析该名称的工作表（可选），不存在时返回空列表
+            cell_range: 只解析该单元格范围（可选），与XLSX相同走只读模式读取
 
         返回:
             包含完整数据和样式的Sheet对象列表
@@ -35,24 +40,30 @@ class XlsmParser(XlsxParser):
         异常:
             RuntimeError: 当解析失败时
         """
+        if cell_range is not None:
+            # 范围读取只需要单元格数据，宏信息无关，直接复用XLSX的只读范围读取
+            return super().parse(file_path, sheet_name, cell_range)
+
         try:
             # 使用keep_vba=True保留宏信息，但不执行
-            workbook = openpyxl.load_workbook(file_path, keep_vba=True)
+            workbook = _load_workbook(file_path, sheet_name, keep_vba=True)
 
             if not workbook.worksheets:
+                if sheet_name is not None:
+                    return []
                 raise ValueError("工作簿不包含任何工作表")
 
             # 记录宏文件信息（用于调试和日志）
             self._log_macro_info(workbook, file_path)
 
             sheets = []
+            style_cache = StyleCache()
 
             # 解析所有工作表
             for worksheet in workbook.worksheets:
                 # 解析数据和样式（使用与XlsxParser相同的完整性逻辑）
-                # 获取工作表的实际尺寸，确保包含所有数据和样式
-                max_row = worksheet.max_row or 0
-                max_col = worksheet.max_column or 0
+                # 获取工作表的实际尺寸，确保包含所有数据（默认不含只设置了格式的尾部空行、空列）
+                max_row, max_col = _get_dimensions(worksheet)
 
                 rows = []
                 # 使用坐标访问方式确保完整的表格结构
@@ -64,7 +75,7 @@ class XlsmParser(XlsxParser):
 
                         # 提取单元格值和样式
                         cell_value = cell.value
-                        cell_style = extract_style(cell)
+                        cell_style = extract_style(cell, style_cache)
 
                         # 创建Cell对象
                         parsed_cell = Cell(
@@ -191,7 +202,7 @@ class XlsmParser(XlsxParser):
         provider = XlsxRowProvider(file_path, sheet_name)
         name = provider._get_worksheet_info()
         merged_cells = provider._get_merged_cells()
-        return LazySheet(name=name, provider=provider, merged_cells=merged_cells)
+        return build_lazy_sheet(file_path, name, provider, merged_cells)
     
     def is_macro_enabled_file(self, file_path: str) -> bool:
         """
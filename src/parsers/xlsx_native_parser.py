@@ -0,0 +1,248 @@
+"""
+XLSX原生解析器模块
+
+直接从zip包中流式读取工作表XML与共享字符串表，只提取单元格值，
+不创建任何openpyxl对象。适用于不需要样式信息的纯数据读取场景。
+"""
+
+import logging
+import sys
+import zipfile
+from datetime import datetime
+from xml.parsers.expat import ExpatError
+
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+
+from src.models.columnar_sheet import ColumnarSheetBuilder
+from src.models.sparse_sheet import SparseSheetBuilder, should_use_sparse
+from src.models.table_model import Sheet, Row, Cell
+from src.parsers.base_parser import BaseParser
+from src.utils.range_parser import CellRange
+from src.parsers.xlsx_parser import XlsxParser, _classify_number_format
+from src.unified_config import get_config
+from src.utils.xlsx_xml_reader import (
+    SheetXmlScanner,
+    cast_number,
+    decode_cached_value,
+    get_sheet_xml_paths,
+    is_date1904,
+    read_cell_number_formats,
+    read_shared_strings,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class XlsxNativeParser(BaseParser):
+    """
+    XLSX原生解析器，基于expat流式读取工作表XML，只提取数据。
+
+    与XlsxParser相比不提取样式、图表和图片，单元格的style始终为None；
+    合并单元格与公式文本仍会保留。文件无法按XLSX结构读取时回退到XlsxParser。
+    """
+
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
+        """
+        解析XLSX文件，返回每个工作表对应的Sheet对象列表（仅包含值）。
+
+        参数:
+            file_path: XLSX文件路径
+            sheet_name: 只解析该名称的工作表（可选），不存在时返回空列表
+            cell_range: 只解码该范围内的单元格（可选），范围外的单元格只参与工作表尺寸计算
+
+        返回:
+            Sheet对象列表，工作表顺序与工作簿一致
+        """
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                sheet_paths = get_sheet_xml_paths(archive)
+                if not sheet_paths:
+                    raise RuntimeError("工作簿不包含任何工作表")
+                if sheet_name is not None:
+                    if sheet_name not in sheet_paths:
+                        return []
+                    sheet_paths = {sheet_name: sheet_paths[sheet_name]}
+
+                shared_strings = read_shared_strings(archive)
+                number_formats = read_cell_number_formats(archive)
+                epoch = CALENDAR_MAC_1904 if is_date1904(archive) else CALENDAR_WINDOWS_1900
+
+                sheets = []
+                for name, sheet_path in sheet_paths.items():
+                    with archive.open(sheet_path) as f:
+                        sheets.append(
+                            self._parse_sheet(name, f, shared_strings, number_formats, epoch, cell_range)
+                        )
+                return sheets
+
+        except (zipfile.BadZipFile, KeyError, OSError, ExpatError, RuntimeError) as e:
+            logger.warning(f"原生XLSX解析失败，回退到openpyxl解析: {e}")
+            return XlsxParser().parse(file_path, sheet_name, cell_range)
+
+    def get_sheet_names(self, file_path: str) -> list[str]:
+        """只读取工作簿目录获取工作表名称。"""
+        return XlsxParser().get_sheet_names(file_path)
+
+    def _parse_sheet(self, sheet_name: str, stream, shared_strings: list[str],
+                     number_formats: list[str], epoch: datetime,
+                     cell_range: CellRange | None = None) -> Sheet:
+        """
+        将单个工作表XML流转换为Sheet，行列从A1开始补齐为矩形区域。
+        启用 trim_used_range 配置时范围只到最后一个有值或公式的单元格（合并区域也计入）。
+
+        指定 cell_range 时仍扫描整个XML以确定工作表尺寸，但只解码范围内的单元格，
+        结果等同于完整解析后按范围截取（不含合并单元格）。
+        启用 columnar_sheets 配置时返回按列存储的 ColumnarSheet；网格很大而有值单元格很少时
+        （见 sparse_sheet_density 配置）返回只保存非空单元格的 SparseSheet。
+
+        参数：
+            sheet_name: 工作表名称
+            stream: 工作表XML的二进制文件对象
+            shared_strings: 共享字符串表
+            number_formats: 按样式索引排列的数字格式代码
+            epoch: 工作簿日期基准
+            cell_range: 只解码的单元格范围（可选，0 基闭区间）
+        """
+        scanner = SheetXmlScanner()
+        # 各样式索引的日期判断结果缓存：{样式索引: (是否日期, 是否时长)}
+        date_styles: dict[int, tuple[bool, bool]] = {}
+
+        # 解码窗口（1 基闭区间），未指定范围时覆盖整个工作表
+        if cell_range is None:
+            first_row, first_col, last_row, last_col = 1, 1, sys.maxsize, sys.maxsize
+        else:
+            first_row, first_col, last_row, last_col = (index + 1 for index in cell_range)
+
+        # {行号: (单元格值列表, {列位置: 公式文本})}
+        parsed_rows: dict[int, tuple[list, dict[int, str]]] = {}
+        max_row = 0
+        max_col = 0
+        config = get_config()
+        trim_used_range = config.trim_used_range
+        for row_idx, raw_cells in scanner.iter_rows(stream):
+            if trim_used_range:
+                # 只有样式的空单元格不计入工作表范围
+                row_width = max((raw_cell[0] for raw_cell in raw_cells
+                                 if raw_cell[3] is not None or raw_cell[4] is not None), default=0)
+            else:
+                row_width = max(raw_cell[0] for raw_cell in raw_cells)
+            if row_width:
+                max_row = max(max_row, row_idx)
+                max_col = max(max_col, row_width)
+            if row_idx < first_row or row_idx > last_row:
+                continue
+            values: list = []
+            formulas: dict[int, str] = {}
+            for col_idx, data_type, style_idx, raw, formula_text in raw_cells:
+                if col_idx < first_col or col_idx > last_col:
+                    continue
+                if (data_type is None or data_type == "n") and not style_idx and raw is not None:
+                    # 最常见的无样式数值单元格走快速路径
+                    try:
+                        value = cast_number(raw)
+                    except ValueError:
+                        value = raw
+                else:
+                    value = self._decode_value(data_type, style_idx, raw, shared_strings,
+                                               number_formats, date_styles, epoch)
+
+                position = col_idx - first_col
+                filled = len(values)
+                if position == filled:
+                    values.append(value)
+                elif position > filled:
+                    values.extend([None] * (position - filled))
+                    values.append(value)
+                else:
+                    values[position] = value
+                if formula_text:
+                    formulas[position] = f"={formula_text}"
+                else:
+                    formulas.pop(position, None)
+            parsed_rows[row_idx] = (values, formulas)
+
+        # 与openpyxl一致，合并区域也计入工作表范围
+        for merged_range in scanner.merged_cells:
+            try:
+                _, _, range_max_col, range_max_row = range_boundaries(merged_range)
+            except ValueError:
+                continue
+            max_row = max(max_row, range_max_row or 0)
+            max_col = max(max_col, range_max_col or 0)
+
+        width = max(0, min(max_col, last_col) - first_col + 1)
+        merged_cells = scanner.merged_cells if cell_range is None else []
+        row_count = max(0, min(max_row, last_row) - first_row + 1)
+        filled_cells = sum(len(values) - values.count(None) for values, _ in parsed_rows.values())
+        if should_use_sparse(filled_cells, row_count, width,
+                             config.sparse_sheet_density, config.sparse_sheet_min_cells):
+            sparse_builder = SparseSheetBuilder()
+            for row_idx in sorted(parsed_rows):
+                if row_idx - first_row >= row_count:
+                    continue
+                values, formulas = parsed_rows[row_idx]
+                for col, value in enumerate(values[:width]):
+                    formula = formulas.get(col)
+                    if value is not None or formula is not None:
+                        sparse_builder.add_cell(row_idx - first_row, col, value, formula=formula)
+            return sparse_builder.build(sheet_name, row_count, width, merged_cells=merged_cells)
+
+        builder = ColumnarSheetBuilder() if config.columnar_sheets else None
+        rows = []
+        for row_idx in range(first_row, min(max_row, last_row) + 1):
+            values, formulas = parsed_rows.get(row_idx, ([], {}))
+            if len(values) < width:
+                values.extend([None] * (width - len(values)))
+            elif len(values) > width:
+                # 裁剪使用范围后，行尾可能还有只有样式的空单元格
+                del values[width:]
+            if builder is not None:
+                builder.append_row(values, formulas=formulas)
+            else:
+                rows.append(Row(cells=[Cell(value=value, formula=formulas.get(col))
+                                       for col, value in enumerate(values)]))
+
+        if builder is not None:
+            return builder.build(sheet_name, merged_cells=merged_cells)
+        return Sheet(name=sheet_name, rows=rows, merged_cells=merged_cells)
+
+    def _decode_value(self, data_type: str | None, style_idx: int, raw: str | None,
+                      shared_strings: list[str], number_formats: list[str],
+                      date_styles: dict[int, tuple[bool, bool]], epoch: datetime):
+        """按单元格类型解码原始值，日期格式的数值转换为datetime。"""
+        if data_type == "inlineStr":
+            return raw
+        if data_type == "d":
+            return self._parse_iso_date(raw)
+        value = decode_cached_value(raw, data_type, shared_strings)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and style_idx:
+            value = self._convert_date_value(value, style_idx, number_formats, date_styles, epoch)
+        return value
+
+    def _convert_date_value(self, value: int | float, style_idx: int, number_formats: list[str],
+                            date_styles: dict[int, tuple[bool, bool]], epoch: datetime):
+        """根据样式索引的数字格式，将日期/时长格式的数值转换为datetime/timedelta。"""
+        classification = date_styles.get(style_idx)
+        if classification is None:
+            number_format = number_formats[style_idx] if style_idx < len(number_formats) else "General"
+            classification = _classify_number_format(number_format)
+            date_styles[style_idx] = classification
+
+        is_date, is_timedelta = classification
+        if not is_date:
+            return value
+        try:
+            return from_excel(value, epoch, timedelta=is_timedelta)
+        except (OverflowError, ValueError, TypeError):
+            return value
+
+    def _parse_iso_date(self, raw: str | None):
+        """解析 t="d" 单元格中的ISO 8601日期文本，无法解析时保留原文本。"""
+        if raw is None:
+            return None
+        try:
+            return from_ISO8601(raw)
+        except ValueError:
+            return raw
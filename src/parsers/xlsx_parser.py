@@ -10,43 +10,107 @@ import openpyxl
 import zipfile
 import re
 import os
+import weakref
 from tempfile import NamedTemporaryFile
 import shutil
 
 logger = logging.getLogger(__name__)
 from openpyxl.utils import get_column_letter
 from openpyxl.cell.cell import Cell as OpenpyxlCell
+from openpyxl.cell.read_only import EMPTY_CELL
+from openpyxl.reader.excel import ExcelReader
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from openpyxl.xml.constants import MAX_COLUMN, MAX_ROW
 from openpyxl.drawing.image import Image as OpenpyxlImage
 from openpyxl.chart.bar_chart import BarChart
 from openpyxl.chart.line_chart import LineChart
 from openpyxl.chart.pie_chart import PieChart
 from openpyxl.chart.area_chart import AreaChart
-from typing import BinaryIO, cast
-from collections.abc import Iterator
+from datetime import datetime
+from functools import lru_cache, partial
+from typing import Any, BinaryIO, cast
+from collections.abc import Callable, Iterator
+from openpyxl.styles.numbers import is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import from_excel
+from src.cache.repair_cache import get_repair_cache
+from src.models.columnar_sheet import ColumnarSheetBuilder
+from src.models.sparse_sheet import SparseSheetBuilder, should_use_sparse
 from src.models.table_model import Sheet, Row, Cell, LazySheet, Chart, ChartPosition
-from src.parsers.base_parser import BaseParser
-from src.utils.style_parser import extract_style, extract_cell_value
+from src.parsers.base_parser import BaseParser, build_lazy_sheet, project_sheet
+from src.unified_config import get_config
+from src.utils.style_parser import StyleCache, extract_style, extract_cell_value
 from src.utils.chart_data_extractor import ChartDataExtractor
+from src.utils.range_parser import CellRange
+from src.utils.workbook_pool import WorkbookPool
+from src.utils.xlsx_xml_reader import (
+    get_sheet_xml_paths, read_formula_cached_values, read_merged_cells, read_used_range
+)
+
+
+@lru_cache(maxsize=256)
+def _classify_number_format(number_format: str) -> tuple[bool, bool]:
+    """判断数字格式是否为日期/时长格式（结果按格式字符串缓存）。"""
+    return is_date_format(number_format), is_timedelta_format(number_format)
 
 
 class XlsxRowProvider:
-    """XLSX文件的惰性行提供者，基于openpyxl的read_only流式模式。"""
-    
+    """
+    XLSX文件的惰性行提供者，基于openpyxl的read_only流式模式。
+
+    提供者持有一个只读工作簿句柄，在多次 iter_rows/get_row/get_total_rows 调用间复用；
+    句柄来自按 (路径, 修改时间) 共享的句柄池，使用完毕后应调用 close()（或使用 with 语句）归还。
+    """
+
     def __init__(self, file_path: str, sheet_name: str | None = None):
         self.file_path = file_path
         self.sheet_name = sheet_name
         self._total_rows_cache: int | None= None
         self._merged_cells_cache: list[str] | None = None
         self._worksheet_title_cache: str | None = None
-    
+        self._workbook = None
+        self._pool_key = None
+        self._cursor: _RowCursor | None = None
+        self._style_cache = StyleCache()
+
+    def _get_workbook(self):
+        """获取（必要时从句柄池取得）只读工作簿句柄。"""
+        if self._workbook is None:
+            self._pool_key, self._workbook = _read_only_workbook_pool.acquire(self.file_path)
+        return self._workbook
+
+    def _get_worksheet(self):
+        """获取目标工作表，未指定名称时使用活动工作表。"""
+        workbook = self._get_workbook()
+        return workbook.active if self.sheet_name is None else workbook[self.sheet_name]
+
+    def close(self) -> None:
+        """关闭行游标并将工作簿句柄归还句柄池。可重复调用。"""
+        if self._cursor is not None:
+            cursor, self._cursor = self._cursor, None
+            cursor.close()
+        if self._workbook is not None:
+            workbook, self._workbook = self._workbook, None
+            _read_only_workbook_pool.release(self._pool_key, workbook)
+            self._pool_key = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def _get_worksheet_info(self):
         """无需读取全部数据即可获取工作表信息。"""
         if self._worksheet_title_cache is None:
-            workbook = None
             try:
-                workbook = openpyxl.load_workbook(self.file_path, read_only=True)
-                worksheet = workbook.active if self.sheet_name is None else workbook[self.sheet_name]
+                worksheet = self._get_worksheet()
                 if worksheet is not None:
                     self._worksheet_title_cache = worksheet.title
                 else:
@@ -54,37 +118,36 @@ class XlsxRowProvider:
             except Exception as e:
                 logger.warning(f"Failed to get worksheet info: {e}")
                 self._worksheet_title_cache = ""
-            finally:
-                if workbook is not None:
-                    workbook.close()
         return self._worksheet_title_cache
-    
+
     def _get_merged_cells(self) -> list[str]:
-        """获取合并单元格信息。"""
+        """
+        获取合并单元格信息。
+
+        只读工作表不提供 merged_cells，此时直接扫描工作表XML中的 <mergeCell>，
+        不再为此以非只读模式完整加载工作簿。
+        """
         if self._merged_cells_cache is None:
-            workbook = None
             try:
-                workbook = openpyxl.load_workbook(self.file_path)
-                worksheet = workbook.active if self.sheet_name is None else workbook[self.sheet_name]
-                if worksheet is not None and hasattr(worksheet, "merged_cells"):
-                    self._merged_cells_cache = [str(merged_cell_range) for merged_cell_range in worksheet.merged_cells.ranges]
-                else:
-                    self._merged_cells_cache = []
+                worksheet = self._get_worksheet()
             except Exception as e:
                 logger.error(f"获取合并单元格信息失败: {e}")
                 raise RuntimeError(f"无法加载工作簿以获取合并单元格: {e}") from e
-            finally:
-                # 确保只有在workbook成功创建后才尝试关闭
-                if 'workbook' in locals() and workbook is not None:
-                    workbook.close()
+
+            if worksheet is not None and hasattr(worksheet, "merged_cells"):
+                self._merged_cells_cache = [str(merged_cell_range) for merged_cell_range in worksheet.merged_cells.ranges]
+            elif isinstance(worksheet, ReadOnlyWorksheet):
+                self._merged_cells_cache = read_merged_cells(self.file_path, worksheet.title)
+            else:
+                self._merged_cells_cache = []
         return self._merged_cells_cache
-    
+
     def _parse_row(self, row_cells: tuple) -> Row:
         """将openpyxl单元格元组解析为Row对象。"""
         cells = []
         for cell in row_cells:
             cell_value = cell.value
-            cell_style = extract_style(cell) if cell else None
+            cell_style = extract_style(cell, self._style_cache) if cell else None
             formula = None
             if isinstance(cell, OpenpyxlCell) and hasattr(cell, 'data_type') and cell.data_type == 'f':
                 if hasattr(cell, 'value') and cell.value:
@@ -92,87 +155,291 @@ class XlsxRowProvider:
             cells.append(Cell(value=cell_value, style=cell_style, formula=formula))
         return Row(cells=cells)
 
-    def iter_rows(self, start_row: int = 0, max_rows: int | None = None) -> Iterator[Row]:
-        """按需产出完整结构的行。"""
-        workbook = None
+    def iter_rows(self, start_row: int = 0, max_rows: int | None = None,
+                  col_range: tuple[int, int] | None = None) -> Iterator[Row]:
+        """
+        按需产出完整结构的行。
+
+        使用只读工作表的顺序游标（worksheet.iter_rows）逐行前进，而不是逐坐标随机访问；
+        若本次起始行恰好是上一次读取停下的位置（如StreamingTableReader的连续分块），
+        则直接从上次的游标继续，不再从第1行重新扫描。
+        指定 col_range（0 基闭区间）时只为该范围内的列创建单元格与样式，超出工作表宽度的列补空单元格。
+        """
         try:
-            workbook = openpyxl.load_workbook(self.file_path, read_only=True)
-            worksheet = workbook.active if self.sheet_name is None else workbook[self.sheet_name]
+            worksheet = self._get_worksheet()
 
             if worksheet is not None:
                 # 获取工作表的完整尺寸
-                max_row = worksheet.max_row or 0
-                max_col = worksheet.max_column or 0
+                max_row, max_col = _get_dimensions(worksheet, self.file_path)
 
                 # 计算实际的行范围
                 end_row = max_row
                 if max_rows is not None:
                     end_row = min(start_row + max_rows, max_row)
+                if start_row >= end_row:
+                    return
 
-                # 使用坐标访问确保完整的行结构
-                for row_idx in range(start_row + 1, end_row + 1):
-                    cells = []
-                    for col_idx in range(1, max_col + 1):
-                        cell = worksheet.cell(row=row_idx, column=col_idx)
-                        cells.append(cell)
-                    yield self._parse_row(tuple(cells))
+                cursor = self._take_cursor(worksheet, start_row, max_row, max_col)
+                try:
+                    while cursor.position < end_row:
+                        row_cells = next(cursor.rows, None)
+                        if row_cells is None:
+                            break
+                        cursor.position += 1
+                        # 参差不齐的行补齐到 max_column，保证完整的行结构
+                        if len(row_cells) < max_col:
+                            row_cells = tuple(row_cells) + (EMPTY_CELL,) * (max_col - len(row_cells))
+                        if col_range is None:
+                            yield self._parse_row(row_cells)
+                            continue
+                        start_col, end_col = col_range
+                        row = self._parse_row(row_cells[start_col:end_col + 1])
+                        row.cells.extend(Cell(value=None) for _ in range(end_col - start_col + 1 - len(row.cells)))
+                        yield row
+                finally:
+                    self._park_cursor(cursor, max_row)
         except Exception as e:
             raise RuntimeError(f"流式读取XLSX文件失败: {str(e)}") from e
-        finally:
-            if workbook is not None:
-                workbook.close()
-    
+
+    def _take_cursor(self, worksheet, start_row: int, max_row: int, max_col: int) -> '_RowCursor':
+        """取出可从 start_row 继续的游标，没有则新建一个从 start_row 开始的游标。"""
+        cursor, self._cursor = self._cursor, None
+        if cursor is not None and cursor.position == start_row:
+            return cursor
+        if cursor is not None:
+            cursor.close()
+        rows = worksheet.iter_rows(min_row=start_row + 1, max_row=max_row, max_col=max_col or None)
+        return _RowCursor(iter(rows), start_row)
+
+    def _park_cursor(self, cursor: '_RowCursor', max_row: int) -> None:
+        """保存未读完的游标供下一次连续读取使用。"""
+        if cursor.position >= max_row or self._cursor is not None or self._workbook is None:
+            cursor.close()
+        else:
+            self._cursor = cursor
+
     def get_row(self, row_index: int) -> Row:
-        """按索引获取完整结构的指定行。"""
-        workbook = openpyxl.load_workbook(self.file_path, read_only=True)
-        worksheet = workbook.active if self.sheet_name is None else workbook[self.sheet_name]
+        """
+        按索引获取完整结构的指定行。
+
+        与 iter_rows 共用顺序游标，一次读出整行，不逐列调用 worksheet.cell
+        （只读工作表上每次 cell 调用都会重新解析工作表XML）；连续按索引读取时直接从游标继续。
+        """
         try:
+            worksheet = self._get_worksheet()
             if worksheet is not None:
-                max_row = worksheet.max_row or 0
-                max_col = worksheet.max_column or 0
+                max_row, max_col = _get_dimensions(worksheet, self.file_path)
 
                 if row_index >= max_row:
                     raise IndexError(f"Row index {row_index} out of range (max: {max_row-1})")
 
-                # 使用坐标访问获取完整的行
-                cells = []
-                for col_idx in range(1, max_col + 1):
-                    cell = worksheet.cell(row=row_index + 1, column=col_idx)
-                    cells.append(cell)
-                return self._parse_row(tuple(cells))
+                cursor = self._take_cursor(worksheet, row_index, max_row, max_col)
+                try:
+                    row_cells = tuple(next(cursor.rows, ()))
+                    cursor.position += 1
+                finally:
+                    self._park_cursor(cursor, max_row)
+                # 参差不齐的行补齐到 max_column，保证完整的行结构
+                if len(row_cells) < max_col:
+                    row_cells += (EMPTY_CELL,) * (max_col - len(row_cells))
+                return self._parse_row(row_cells)
             raise IndexError(f"Row index {row_index} out of range")
         except IndexError:
             # 重新抛出索引错误
-            workbook.close()
             raise
         except Exception as e:
             # 处理其他异常
-            workbook.close()
             raise RuntimeError(f"获取XLSX行数据失败: {str(e)}") from e
-        finally:
-            workbook.close()
-    
+
     def get_total_rows(self) -> int:
         """无需加载全部数据即可获取总行数。"""
         if self._total_rows_cache is None:
-            workbook = None  # 初始化workbook变量
             try:
-                workbook = openpyxl.load_workbook(self.file_path, read_only=True)
-                worksheet = workbook.active if self.sheet_name is None else workbook[self.sheet_name]
-                if worksheet is not None and hasattr(worksheet, "max_row"):
-                    self._total_rows_cache = worksheet.max_row or 0
-                else:
-                    self._total_rows_cache = 0
+                worksheet = self._get_worksheet()
             except Exception as e:
                 logger.error(f"获取工作表总行数失败: {e}")
                 raise RuntimeError(f"无法加载工作簿以获取总行数: {e}") from e
-            finally:
-                # 确保只有在workbook成功创建后才尝试关闭
-                if workbook is not None:
-                    workbook.close()
+            if worksheet is not None and hasattr(worksheet, "max_row"):
+                self._total_rows_cache = _get_dimensions(worksheet, self.file_path)[0]
+            else:
+                self._total_rows_cache = 0
         return self._total_rows_cache
 
 
+def _get_dimensions(worksheet, file_path: str | None = None) -> tuple[int, int]:
+    """
+    返回工作表的 (max_row, max_column)。
+
+    启用 trim_used_range 配置时裁剪到真实使用范围，只设置了格式的尾部空行、空列不计入。
+    只读工作表见 _get_read_only_dimensions，file_path 为其所在文件。
+    """
+    if isinstance(worksheet, ReadOnlyWorksheet):
+        return _get_read_only_dimensions(worksheet, file_path)
+    max_row, max_col = worksheet.max_row or 0, worksheet.max_column or 0
+    if get_config().trim_used_range:
+        used_range = _get_used_range(worksheet)
+        if used_range is not None:
+            max_row, max_col = min(max_row, used_range[0]), min(max_col, used_range[1])
+    return max_row, max_col
+
+
+def _get_read_only_dimensions(worksheet: ReadOnlyWorksheet, file_path: str | None) -> tuple[int, int]:
+    """
+    返回只读工作表的 (max_row, max_column)。
+
+    直接使用 <dimension> 声明的尺寸；只有缺失或明显虚高（到第1048576行或XFD列）时，
+    启用 trim_used_range 配置才扫描一次工作表XML取真实使用范围（见 _get_read_only_used_range）。
+    仍缺失时（如write_only写出的文件）由openpyxl逐行计算。
+    """
+    max_row, max_col = worksheet.max_row or 0, worksheet.max_column or 0
+    declared = bool(max_row and max_col)
+    if declared and max_row < MAX_ROW and max_col < MAX_COLUMN:
+        return max_row, max_col
+
+    if get_config().trim_used_range and file_path is not None:
+        used_range = _get_read_only_used_range(worksheet, file_path)
+        if used_range is not None:
+            if not declared:
+                return used_range
+            return min(max_row, used_range[0]), min(max_col, used_range[1])
+
+    if not declared:
+        try:
+            worksheet.calculate_dimension(force=True)
+        except Exception as e:
+            # 空工作表在openpyxl中计算尺寸会失败，按0处理
+            logger.debug(f"计算工作表尺寸失败: {e}")
+        max_row, max_col = worksheet.max_row or 0, worksheet.max_column or 0
+    return max_row, max_col
+
+
+# 只读工作表的真实使用范围 {工作表: (行, 列)}，随句柄池中的工作簿一起释放
+_read_only_used_ranges: "weakref.WeakKeyDictionary[ReadOnlyWorksheet, tuple[int, int]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _get_read_only_used_range(worksheet: ReadOnlyWorksheet, file_path: str) -> tuple[int, int] | None:
+    """
+    返回只读工作表最后一个有值或公式的单元格（合并区域也计入）所在的 (行, 列)，无法确定时返回 None。
+
+    从 file_path 中扫描一次工作表XML（见 read_used_range），同一工作表对象的结果只计算一次。
+    """
+    used_range = _read_only_used_ranges.get(worksheet)
+    if used_range is None:
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                sheet_path = get_sheet_xml_paths(archive).get(worksheet.title)
+                if sheet_path is None:
+                    return None
+                with archive.open(sheet_path) as source:
+                    scanned = read_used_range(source)
+        except (zipfile.BadZipFile, KeyError, OSError) as e:
+            logger.debug(f"扫描工作表使用范围失败: {e}")
+            return None
+        if scanned is None:
+            return None
+        used_range = _read_only_used_ranges[worksheet] = scanned[2:]
+    return used_range
+
+
+def _get_used_range(worksheet: Worksheet) -> tuple[int, int] | None:
+    """
+    返回最后一个有值或公式的单元格（合并区域也计入）所在的 (行, 列)，无法确定时返回 None。
+
+    只检查已加载的单元格。
+    """
+    existing_cells = getattr(worksheet, "_cells", None)
+    if not isinstance(existing_cells, dict):
+        return None
+    last_row = last_col = 0
+    for (row_idx, col_idx), cell in existing_cells.items():
+        if cell.value is not None:
+            if row_idx > last_row:
+                last_row = row_idx
+            if col_idx > last_col:
+                last_col = col_idx
+    for merged_range in worksheet.merged_cells.ranges:
+        last_row = max(last_row, merged_range.max_row)
+        last_col = max(last_col, merged_range.max_col)
+    return last_row, last_col
+
+
+class _RowCursor:
+    """只读工作表上的前向行游标，position 为下一次将产出的行索引（0基）。"""
+
+    __slots__ = ("rows", "position")
+
+    def __init__(self, rows: Iterator[tuple], position: int):
+        self.rows = rows
+        self.position = position
+
+    def close(self) -> None:
+        """关闭底层生成器，释放其打开的工作表XML流。"""
+        close = getattr(self.rows, "close", None)
+        if close is not None:
+            close()
+
+
+def _load_read_only_workbook(file_path: str):
+    """以只读模式打开工作簿，供句柄池使用。"""
+    return openpyxl.load_workbook(file_path, read_only=True)
+
+
+# 进程内共享的只读工作簿句柄池
+_read_only_workbook_pool = WorkbookPool(_load_read_only_workbook)
+
+
+def _load_workbook(file_path: str, sheet_name: str | None = None, **kwargs):
+    """
+    加载工作簿；指定 sheet_name 时只解码该工作表的XML（含其图表、图片和批注）。
+
+    openpyxl 会跳过压缩包中不存在的工作表部件，这里把其余工作表的部件从
+    ExcelReader 的有效文件列表中移除，因此返回的工作簿只包含目标工作表；
+    工作表不存在时工作簿中没有任何工作表。工作表级定义名称（含打印区域、打印标题）
+    的处理见 _SingleSheetReader。
+    """
+    if sheet_name is None:
+        return openpyxl.load_workbook(file_path, **kwargs)
+
+    reader = _SingleSheetReader(file_path, sheet_name, **kwargs)
+    try:
+        skipped_parts = {path for name, path in get_sheet_xml_paths(reader.archive).items()
+                         if name != sheet_name}
+    except Exception:
+        reader.archive.close()
+        raise
+    reader.valid_files = [name for name in reader.valid_files if name not in skipped_parts]
+    reader.read()
+    return reader.wb
+
+
+class _SingleSheetReader(ExcelReader):
+    """
+    只加载一个工作表的 ExcelReader。
+
+    工作表级定义名称的 localSheetId 是工作表在整个工作簿中的序号，而加载后的工作簿中
+    目标工作表的序号为0；绑定名称前把目标工作表的名称改写到序号0，丢弃其余工作表的名称，
+    避免它们被绑定到错误的工作表上。
+    """
+
+    def __init__(self, file_path: str, sheet_name: str, **kwargs):
+        super().__init__(file_path, **kwargs)
+        self.sheet_name = sheet_name
+
+    def read_worksheets(self):
+        super().read_worksheets()
+        sheet_index = next((index for index, sheet in enumerate(self.parser.sheets)
+                            if sheet.name == self.sheet_name), None)
+        defined_names = []
+        for defined_name in self.parser.defined_names.definedName:
+            if defined_name.localSheetId is not None:
+                if sheet_index is None or int(defined_name.localSheetId) != sheet_index:
+                    continue
+                defined_name.localSheetId = 0
+            defined_names.append(defined_name)
+        self.parser.defined_names.definedName = defined_names
+
+
 class XlsxParser(BaseParser):
     """
     XLSX文件解析器，支持完整样式提取。
@@ -184,12 +451,27 @@ class XlsxParser(BaseParser):
     def __init__(self):
         self.chart_extractor = ChartDataExtractor()
 
-    def parse(self, file_path: str) -> list[Sheet]:
+    def parse(self, file_path: str, sheet_name: str | None = None,
+              cell_range: CellRange | None = None) -> list[Sheet]:
         """
         解析XLSX文件，返回每个工作表对应的Sheet对象列表。
+
+        工作簿只通过openpyxl加载一次（公式模式），公式单元格的缓存计算结果
+        由 read_formula_cached_values 单次流式扫描工作表XML获得，
+        不再以 data_only=True 重复加载整个工作簿。
+        指定 sheet_name 时其余工作表的XML不会被解码；
+        指定 cell_range 时改走只读模式，只读取范围内的行列（见 _parse_range）。
+
+        需要修复样式的文件，其修复副本保存在缓存目录中按文件指纹复用；
+        首选方式之外的成功加载方式会被记住，同一文件的后续请求直接使用该方式。
         """
+        if cell_range is not None:
+            return self._parse_range(file_path, sheet_name, cell_range)
+
         workbook = None
-        data_only_workbook = None
+        # 实际成功加载的文件（可能是修复后的副本），以及是否保留了公式
+        loaded_file = file_path
+        formulas_loaded = False
 
         # 尝试多种加载方式
         load_attempts = [
@@ -198,23 +480,32 @@ class XlsxParser(BaseParser):
             {"data_only": True, "keep_vba": False, "keep_links": False, "read_only": True},
         ]
 
+        repair_cache = get_repair_cache()
+        strategy = repair_cache.get_strategy(file_path)
+        if strategy is not None:
+            # 同一问题文件已知可行的加载方式，直接使用
+            repaired, attempt = strategy
+            kwargs = load_attempts[attempt]
+            try:
+                if repaired:
+                    loaded_file = repair_cache.get_repaired_file(file_path, self._fix_excel_styles)
+                workbook = _load_workbook(loaded_file, sheet_name, **kwargs)
+                formulas_loaded = not kwargs.get("data_only", False)
+                logger.info(f"使用记录的加载方式 {attempt+1}（修复副本: {repaired}）加载文件")
+            except Exception as e:
+                logger.warning(f"记录的加载方式失效，重新尝试所有加载方式: {e}")
+                repair_cache.forget_strategy(file_path)
+                loaded_file = file_path
+
         last_error = None
-        for i, kwargs in enumerate(load_attempts):
+        for i, kwargs in enumerate(load_attempts if workbook is None else []):
             try:
                 logger.info(f"尝试加载方式 {i+1}: {kwargs}")
-                workbook = openpyxl.load_workbook(file_path, **kwargs)
-
-                # 如果成功加载，尝试获取data_only版本
-                if not kwargs.get("data_only", False):
-                    try:
-                        data_only_workbook = openpyxl.load_workbook(file_path, data_only=True, keep_vba=False, keep_links=False)
-                    except Exception as e:
-                        logger.debug(f"无法加载data_only版本，使用原始工作簿: {e}")
-                        data_only_workbook = workbook
-                else:
-                    data_only_workbook = workbook
-
+                workbook = _load_workbook(file_path, sheet_name, **kwargs)
+                formulas_loaded = not kwargs.get("data_only", False)
                 logger.info(f"成功使用方式 {i+1} 加载文件")
+                if i > 0:
+                    repair_cache.remember_strategy(file_path, (False, i))
                 break
 
             except Exception as e:
@@ -227,21 +518,16 @@ class XlsxParser(BaseParser):
             if last_error and "Fill" in str(last_error):
                 logger.warning(f"检测到样式兼容性问题，尝试修复Excel文件: {last_error}")
                 try:
-                    fixed_file = self._fix_excel_styles(file_path)
+                    fixed_file = repair_cache.get_repaired_file(file_path, self._fix_excel_styles)
                     logger.info(f"样式修复成功，重新尝试解析: {fixed_file}")
 
                     # 使用修复后的文件重新尝试解析
                     for i, kwargs in enumerate(load_attempts):
                         try:
-                            workbook = openpyxl.load_workbook(fixed_file, **kwargs)
-                            if not kwargs.get("data_only", False):
-                                try:
-                                    data_only_workbook = openpyxl.load_workbook(fixed_file, data_only=True, keep_vba=False, keep_links=False)
-                                except Exception as e:
-                                    logger.debug(f"修复文件无法加载data_only版本，使用原始工作簿: {e}")
-                                    data_only_workbook = workbook
-                            else:
-                                data_only_workbook = workbook
+                            workbook = _load_workbook(fixed_file, sheet_name, **kwargs)
+                            loaded_file = fixed_file
+                            formulas_loaded = not kwargs.get("data_only", False)
+                            repair_cache.remember_strategy(file_path, (True, i))
                             logger.info(f"修复后文件解析成功")
                             break
                         except Exception as e:
@@ -260,75 +546,230 @@ class XlsxParser(BaseParser):
                     from .xls_parser import XlsParser
                     xls_parser = XlsParser()
                     logger.info("使用XLS解析器作为备选方案")
-                    return xls_parser.parse(file_path)
+                    return xls_parser.parse(file_path, sheet_name)
                 except Exception as xls_error:
                     logger.error(f"XLS解析器也失败: {xls_error}")
                     raise IOError(f"无法加载Excel文件 (openpyxl: {last_error}, xlrd: {xls_error})")
 
+        # 同一工作簿内的所有工作表共享一份样式缓存
+        style_cache = StyleCache()
         sheets = []
-        for sheet_name in workbook.sheetnames:
-            worksheet = workbook[sheet_name]
-            data_only_worksheet = data_only_workbook[sheet_name] if data_only_workbook else worksheet
-
-            sheet = self._parse_sheet(worksheet, data_only_worksheet)
+        for name in workbook.sheetnames:
+            worksheet = workbook[name]
+            # 仅当工作簿以公式模式加载时才需要补充缓存值，且按需（遇到首个公式时）读取
+            cached_values_loader = None
+            if formulas_loaded:
+                cached_values_loader = partial(read_formula_cached_values, loaded_file, name)
+
+            sheet = self._parse_sheet(worksheet, cached_values_loader, getattr(workbook, 'epoch', None),
+                                      style_cache, loaded_file)
             sheets.append(sheet)
             
         return sheets
 
-    def _parse_sheet(self, worksheet: Worksheet, data_only_worksheet: Worksheet) -> Sheet:
-        """解析单个工作表的辅助方法。"""
-        max_row = worksheet.max_row or 0
-        max_col = worksheet.max_column or 0
+    def _parse_range(self, file_path: str, sheet_name: str | None, cell_range: CellRange) -> list[Sheet]:
+        """
+        只解析单元格范围内的数据。
+
+        使用句柄池中的只读工作簿顺序读取工作表XML：读到范围最后一行即停止，
+        范围外的列不创建 Cell 与 Style 对象。只读模式无法加载文件时回退为完整解析后截取。
+        """
+        try:
+            pool_key, workbook = _read_only_workbook_pool.acquire(file_path)
+        except Exception as e:
+            logger.warning(f"只读模式加载失败，回退到完整解析后截取范围: {e}")
+            return [project_sheet(sheet, cell_range) for sheet in self.parse(file_path, sheet_name)]
+
+        try:
+            if sheet_name is None:
+                names = workbook.sheetnames
+            else:
+                names = [sheet_name] if sheet_name in workbook.sheetnames else []
+            style_cache = StyleCache()
+            return [
+                self._parse_sheet_range(workbook[name], file_path, cell_range, workbook.epoch, style_cache)
+                for name in names
+            ]
+        finally:
+            _read_only_workbook_pool.release(pool_key, workbook)
 
+    def _parse_sheet_range(self, worksheet: ReadOnlyWorksheet, file_path: str, cell_range: CellRange,
+                           epoch: datetime | None, style_cache: StyleCache) -> Sheet:
+        """
+        将只读工作表中 cell_range 覆盖的部分转换为Sheet，结果与完整解析后截取一致（不含合并单元格与图表）。
+        """
+        start_row, start_col, end_row, end_col = cell_range
+        max_row, max_col = _get_dimensions(worksheet, file_path)
+        last_row = min(end_row + 1, max_row)
+        last_col = min(end_col + 1, max_col)
+        if start_row >= last_row:
+            return Sheet(name=worksheet.title, rows=[])
+        if start_col >= last_col:
+            return Sheet(name=worksheet.title, rows=[Row(cells=[]) for _ in range(last_row - start_row)])
+
+        cached_values: dict[tuple[int, int], Any] | None = None
         rows = []
-        for row_idx in range(1, max_row + 1):
+        row_iter = worksheet.iter_rows(min_row=start_row + 1, max_row=last_row,
+                                       min_col=start_col + 1, max_col=last_col)
+        for row_idx, row_cells in enumerate(row_iter, start_row + 1):
             cells = []
-            for col_idx in range(1, max_col + 1):
-                cell = worksheet.cell(row=row_idx, column=col_idx)
-                data_cell = data_only_worksheet.cell(row=row_idx, column=col_idx)
-                
-                cell_style = extract_style(cell)
-                
+            for col_idx, cell in enumerate(row_cells, start_col + 1):
                 if cell.data_type == 'f' and cell.value:
-                    cell_value = data_cell.value
+                    if cached_values is None:
+                        cached_values = read_formula_cached_values(file_path, worksheet.title)
+                    cell_value = self._convert_cached_value(cached_values.get((row_idx, col_idx)), cell, epoch)
                     formula = str(cell.value)
                 else:
                     cell_value = extract_cell_value(cell)
                     formula = None
-                
-                parsed_cell = Cell(
-                    value=cell_value,
-                    style=cell_style,
-                    formula=formula
-                )
-                cells.append(parsed_cell)
+                cells.append(Cell(value=cell_value, style=extract_style(cell, style_cache), formula=formula))
             rows.append(Row(cells=cells))
 
+        return Sheet(name=worksheet.title, rows=rows)
+
+    def _parse_sheet(self, worksheet: Worksheet,
+                     cached_values_loader: Callable[[], dict[tuple[int, int], Any]] | None = None,
+                     epoch: datetime | None = None,
+                     style_cache: StyleCache | None = None,
+                     file_path: str | None = None) -> Sheet:
+        """
+        解析单个工作表的辅助方法。
+
+        参数：
+            worksheet: 以公式模式（或data_only模式）加载的工作表
+            cached_values_loader: 返回 {(行, 列): 缓存值} 的函数，遇到第一个公式单元格时才调用
+            epoch: 工作簿的日期基准，用于将日期格式的缓存数值转换为datetime
+            style_cache: 工作簿级的样式缓存，未提供时为本工作表新建一个
+            file_path: 工作表所在的文件，以只读模式加载时用于确定使用范围（可选）
+
+        启用 columnar_sheets 配置时直接填充按列存储的 ColumnarSheet，样式以共享实例的编号保存；
+        网格很大而有值单元格很少的工作表（见 sparse_sheet_density 配置）只读取已存在的单元格，
+        生成不为空位置创建对象的 SparseSheet。
+        工作表尺寸按 _get_dimensions 计算，默认不含只设置了格式的尾部空行、空列。
+        """
+        if style_cache is None:
+            style_cache = StyleCache()
+        max_row, max_col = _get_dimensions(worksheet, file_path)
+
+        cached_values: dict[tuple[int, int], Any] | None = None
+
+        def read_cell(cell: OpenpyxlCell, row_idx: int, col_idx: int) -> tuple[Any, str | None]:
+            """返回单元格的 (值, 公式)，公式单元格的值取文件中的缓存值。"""
+            nonlocal cached_values
+            if cell.data_type == 'f' and cell.value:
+                if cached_values is None:
+                    cached_values = cached_values_loader() if cached_values_loader else {}
+                return self._convert_cached_value(cached_values.get((row_idx, col_idx)), cell, epoch), str(cell.value)
+            return extract_cell_value(cell), None
+
+        config = get_config()
+        existing_cells = getattr(worksheet, '_cells', None)
+        sparse_builder = None
+        builder = None
+        rows = []
+        if isinstance(existing_cells, dict) and should_use_sparse(
+                sum(1 for cell in existing_cells.values() if cell.value is not None), max_row, max_col,
+                config.sparse_sheet_density, config.sparse_sheet_min_cells):
+            # 只遍历工作表中已存在的单元格，worksheet.cell() 会为每个空位置创建单元格对象
+            sparse_builder = SparseSheetBuilder(default_style=style_cache.default_style)
+            for row_idx, col_idx in sorted(existing_cells):
+                if row_idx > max_row or col_idx > max_col:
+                    continue
+                cell = existing_cells[(row_idx, col_idx)]
+                cell_value, formula = read_cell(cell, row_idx, col_idx)
+                sparse_builder.add_cell(row_idx - 1, col_idx - 1, cell_value, extract_style(cell, style_cache), formula)
+        else:
+            builder = ColumnarSheetBuilder() if config.columnar_sheets else None
+            for row_idx in range(1, max_row + 1):
+                values = []
+                styles = []
+                formulas = {}
+                for col_idx in range(1, max_col + 1):
+                    cell = worksheet.cell(row=row_idx, column=col_idx)
+                    cell_value, formula = read_cell(cell, row_idx, col_idx)
+                    values.append(cell_value)
+                    styles.append(extract_style(cell, style_cache))
+                    if formula is not None:
+                        formulas[col_idx - 1] = formula
+
+                if builder is not None:
+                    builder.append_row(values, styles, formulas)
+                else:
+                    rows.append(Row(cells=[
+                        Cell(value=value, style=style, formula=formulas.get(col))
+                        for col, (value, style) in enumerate(zip(values, styles))
+                    ]))
+
         merged_cells = [str(merged_cell_range) for merged_cell_range in worksheet.merged_cells.ranges]
         
         column_widths = {col_idx - 1: worksheet.column_dimensions[get_column_letter(col_idx)].width 
                          for col_idx in range(1, max_col + 1) if worksheet.column_dimensions[get_column_letter(col_idx)].width}
                          
-        row_heights = {row_idx - 1: worksheet.row_dimensions[row_idx].height 
-                       for row_idx in range(1, max_row + 1) if worksheet.row_dimensions[row_idx].height}
+        # 只遍历已存在的行尺寸，按行号下标访问会为每一行创建尺寸对象
+        row_heights = {row_idx - 1: row_dimension.height
+                       for row_idx, row_dimension in sorted(worksheet.row_dimensions.items())
+                       if row_idx <= max_row and row_dimension.height}
 
         default_col_width = worksheet.sheet_format.defaultColWidth or 8.43
         default_row_height = worksheet.sheet_format.defaultRowHeight or 18.0
-        
-        charts = self._extract_charts(worksheet)
-        images = self._extract_images(worksheet)
-        all_visuals = charts + images
 
-        return Sheet(
-            name=worksheet.title,
-            rows=rows,
+        sheet_kwargs = dict(
             merged_cells=merged_cells,
-            charts=all_visuals,
+            # 图表与图片在首次通过 Sheet.get_charts 访问时才提取
+            chart_loader=partial(self._extract_visuals, worksheet),
             column_widths=column_widths,
             row_heights=row_heights,
             default_column_width=default_col_width,
             default_row_height=default_row_height
         )
+        if sparse_builder is not None:
+            return sparse_builder.build(worksheet.title, max_row, max_col, **sheet_kwargs)
+        if builder is not None:
+            return builder.build(worksheet.title, **sheet_kwargs)
+        return Sheet(name=worksheet.title, rows=rows, **sheet_kwargs)
+
+    def _convert_cached_value(self, value: Any, cell: OpenpyxlCell, epoch: datetime | None) -> Any:
+        """
+        按公式单元格的数字格式转换缓存值，与openpyxl的data_only模式保持一致。
+
+        日期/时长格式的数值转换为datetime/timedelta，其余值原样返回。
+        """
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or epoch is None:
+            return value
+        number_format = getattr(cell, 'number_format', None)
+        if not isinstance(number_format, str):
+            return value
+        is_date, is_timedelta = _classify_number_format(number_format)
+        if not is_date:
+            return value
+        try:
+            return from_excel(value, epoch, timedelta=is_timedelta)
+        except (OverflowError, ValueError, TypeError):
+            return value
+
+    def _extract_visuals(self, worksheet: Worksheet) -> list[Chart]:
+        """提取工作表中的全部图表与图片，作为 Sheet 的延迟图表加载函数。"""
+        return self._extract_charts(worksheet) + self._extract_images(worksheet)
+
+    def load_sheet_visuals(self, file_path: str, sheet_name: str) -> list[Chart]:
+        """
+        重新打开文件，提取指定工作表的图表与图片。
+
+        供缓存的工作表在不保留已加载工作簿的情况下延迟提取图表；只解码该工作表的XML，
+        需要修复样式的文件使用其修复副本。文件无法加载时返回空列表。
+        """
+        repair_cache = get_repair_cache()
+        strategy = repair_cache.get_strategy(file_path)
+        try:
+            if strategy is not None and strategy[0]:
+                file_path = repair_cache.get_repaired_file(file_path, self._fix_excel_styles)
+            workbook = _load_workbook(file_path, sheet_name, data_only=True, keep_vba=False, keep_links=False)
+        except Exception as e:
+            logger.warning(f"重新加载文件以提取图表失败: {e}")
+            return []
+        if sheet_name not in workbook.sheetnames:
+            return []
+        return self._extract_visuals(workbook[sheet_name])
 
     def _extract_images(self, worksheet: Worksheet) -> list[Chart]:
         """提取工作表中的嵌入图片。"""
@@ -537,7 +978,14 @@ class XlsxParser(BaseParser):
 
         return charts
 
-
+    def get_sheet_names(self, file_path: str) -> list[str]:
+        """只读取工作簿目录获取工作表名称，无法按XLSX结构读取时回退到完整解析。"""
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                return list(get_sheet_xml_paths(archive))
+        except (zipfile.BadZipFile, KeyError, OSError) as e:
+            logger.warning(f"读取工作表目录失败，回退到完整解析: {e}")
+            return super().get_sheet_names(file_path)
     
     def supports_streaming(self) -> bool:
         """XLSX解析器支持流式处理。"""
@@ -557,7 +1005,7 @@ class XlsxParser(BaseParser):
         provider = XlsxRowProvider(file_path, sheet_name)
         name = provider._get_worksheet_info()
         merged_cells = provider._get_merged_cells()
-        return LazySheet(name=name, provider=provider, merged_cells=merged_cells)
+        return build_lazy_sheet(file_path, name, provider, merged_cells)
 
     def _extract_chart_data(self, chart, chart_type: str) -> dict:
         """
@@ -761,19 +1209,21 @@ class XlsxParser(BaseParser):
 
         return chart_data
 
-    def _fix_excel_styles(self, file_path: str) -> str:
+    def _fix_excel_styles(self, file_path: str, fixed_file: str | None = None) -> str:
         """
         修复Excel文件中的样式兼容性问题
 
         参数:
             file_path: 原始Excel文件路径
+            fixed_file: 修复后文件的保存路径（可选），默认保存为原文件旁的 *_fixed 文件
 
         返回:
             修复后的Excel文件路径
         """
-        # 生成修复后的文件名
-        name, ext = os.path.splitext(file_path)
-        fixed_file = f"{name}_fixed{ext}"
+        if fixed_file is None:
+            # 生成修复后的文件名
+            name, ext = os.path.splitext(file_path)
+            fixed_file = f"{name}_fixed{ext}"
 
         logger.info(f"正在修复Excel样式兼容性问题: {file_path} -> {fixed_file}")
 
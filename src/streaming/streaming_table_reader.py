@@ -190,10 +190,20 @@ class StreamingTableReader:
                 self._total_rows_cache = 0
         return self._total_rows_cache
     
+    def _estimate_total_rows(self) -> int:
+        """估算总行数，懒加载工作表无需扫描整个文件。"""
+        if self._total_rows_cache is None and self._lazy_sheet:
+            return self._lazy_sheet.estimate_total_rows()
+        return self._get_total_rows()
+    
     def _get_chunk_rows(self, start_row: int, chunk_size: int, column_indices: list[int] | None = None) -> list[Row]:
         """获取一块数据行，支持可选列过滤。"""
         rows: list[Row] = []
         if self._lazy_sheet:
+            if column_indices and column_indices == list(range(column_indices[0], column_indices[-1] + 1)):
+                # 连续列下推给行提供者，范围外的列不会被解析
+                col_range = (column_indices[0], column_indices[-1])
+                return list(self._lazy_sheet.iter_rows(start_row, chunk_size, col_range))
             # 使用懒加载工作表进行流式读取
             rows = list(self._lazy_sheet.iter_rows(start_row, chunk_size))
         elif self._regular_sheet and self._regular_sheet.rows is not None:
@@ -337,22 +347,30 @@ class StreamingTableReader:
             result = result * 26 + (ord(char) - ord('A') + 1)
         return result - 1
     
-    def get_info(self) -> dict[str, Any]:
-        """获取文件及读取器相关信息。"""
+    def get_info(self, estimate_rows: bool = False) -> dict[str, Any]:
+        """
+        获取文件及读取器相关信息。
+        
+        参数：
+            estimate_rows: 为True时 total_rows 为估算值（懒加载工作表无需扫描整个文件），
+                用于选择处理方式等不需要精确行数的场合
+        """
+        total_rows = self._estimate_total_rows() if estimate_rows else self._get_total_rows()
         return {
             'file_path': str(self.file_path),
             'file_size': self.file_path.stat().st_size,
             'parser_type': type(self._parser).__name__,
             'supports_streaming': self._parser.supports_streaming(),
-            'total_rows': self._get_total_rows(),
+            'total_rows': total_rows,
             'total_columns': len(self._get_headers()),
             'headers': self._get_headers(),
-            'estimated_memory_usage': self._estimate_memory_usage()
+            'estimated_memory_usage': self._estimate_memory_usage(total_rows)
         }
     
-    def _estimate_memory_usage(self) -> str:
+    def _estimate_memory_usage(self, total_rows: int | None = None) -> str:
         """估算文件的内存占用量。"""
-        total_rows = self._get_total_rows()
+        if total_rows is None:
+            total_rows = self._get_total_rows()
         total_cols = len(self._get_headers())
         
         # 粗略估算：假设每个单元格平均咇50字节
@@ -373,5 +391,9 @@ class StreamingTableReader:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """上下文管理器退出，清理资源。"""
-        # 如有需要可在此处释放资源
-        pass
+        self.close()
+
+    def close(self):
+        """释放懒加载工作表持有的资源。"""
+        if self._lazy_sheet is not None:
+            self._lazy_sheet.close()
@@ -46,10 +46,23 @@ class UnifiedConfig:
     # 磁盘缓存配置
     disk_cache_enabled: bool = True
     max_disk_cache_size_mb: int = 1024
+    # 磁盘缓存文件格式：'pickle'，或列式的 'arrow'（内存映射读取）、'parquet'（占用空间更小）
     disk_cache_format: str = 'pickle'
     
     # 内存缓存配置
     memory_cache_enabled: bool = True
+
+    # 文件指纹配置：大文件也按完整内容计算指纹（每个文件版本只计算一次），内容相同的文件共用缓存条目；
+    # 关闭时只有小于1MB的文件按内容计算，大文件按元数据计算
+    strong_file_hash: bool = False
+
+    # 行块缓存配置：惰性工作表读取过的行按固定行数分块缓存在内存中（容量为0时不缓存）
+    row_block_cache_size_mb: int = 64
+    row_block_size_rows: int = 256
+
+    # 工作表缓存配置：解析得到的工作表模型按文件指纹与工作表缓存在内存中，
+    # parse_sheet、parse_sheet_optimized 与 convert_to_html 共用（容量为0时不缓存）
+    sheet_cache_size_mb: int = 256
     
     # 性能和超时配置
     max_memory_usage_mb: int = 1024
@@ -59,6 +72,21 @@ class UnifiedConfig:
     # 分页配置
     max_page_size: int = 10000
     default_page_size: int = 100
+
+    # 并行配置：多工作表工作簿逐表解析和渲染的进程数（1 为串行，0 为使用全部CPU核心）
+    parallel_sheet_workers: int = 1
+    # 并行配置：大CSV文件按字节范围并行解析的进程数（1 为串行，0 为使用全部CPU核心）
+    parallel_csv_workers: int = 1
+
+    # 内存模型配置：CSV与XLSX解析器直接生成按列存储的 ColumnarSheet
+    columnar_sheets: bool = True
+    # 内存模型配置：不少于 sparse_sheet_min_cells 个单元格、有值单元格比例低于 sparse_sheet_density 的
+    # XLSX工作表使用只保存非空单元格的 SparseSheet（比例为0时不使用）
+    sparse_sheet_density: float = 0.1
+    sparse_sheet_min_cells: int = 10000
+    # 内存模型配置：XLSX工作表按真实使用范围（最后一个有值或公式的单元格及合并区域）裁剪，
+    # 只设置了格式的尾部空行、空列不再计入行列数
+    trim_used_range: bool = True
     
     def __post_init__(self):
         """初始化后处理"""
@@ -90,8 +118,29 @@ class UnifiedConfig:
         if self.max_disk_cache_size_mb <= 0:
             raise ValueError("max_disk_cache_size_mb must be positive")
         
-        if self.disk_cache_format not in ['pickle', 'parquet']:
-            raise ValueError("disk_cache_format must be 'pickle' or 'parquet'")
+        if self.disk_cache_format not in ['pickle', 'arrow', 'parquet']:
+            raise ValueError("disk_cache_format must be 'pickle', 'arrow' or 'parquet'")
+        
+        if self.row_block_cache_size_mb < 0:
+            raise ValueError("row_block_cache_size_mb must be non-negative")
+        
+        if self.row_block_size_rows <= 0:
+            raise ValueError("row_block_size_rows must be positive")
+        
+        if self.sheet_cache_size_mb < 0:
+            raise ValueError("sheet_cache_size_mb must be non-negative")
+        
+        if self.parallel_sheet_workers < 0:
+            raise ValueError("parallel_sheet_workers must be non-negative")
+        
+        if self.parallel_csv_workers < 0:
+            raise ValueError("parallel_csv_workers must be non-negative")
+        
+        if not 0 <= self.sparse_sheet_density <= 1:
+            raise ValueError("sparse_sheet_density must be between 0 and 1")
+        
+        if self.sparse_sheet_min_cells < 0:
+            raise ValueError("sparse_sheet_min_cells must be non-negative")
         
         if not (self.small_file_threshold_cells < self.medium_file_threshold_cells < self.large_file_threshold_cells):
             raise ValueError("File size thresholds must be in ascending order")
@@ -104,6 +153,14 @@ class UnifiedConfig:
             self.cache_dir = cache_dir  
         return Path(cache_dir)
     
+    def get_parallel_sheet_workers(self) -> int:
+        """获取多工作表并行处理的实际进程数，0 解析为CPU核心数"""
+        return self.parallel_sheet_workers or os.cpu_count() or 1
+    
+    def get_parallel_csv_workers(self) -> int:
+        """获取CSV并行解析的实际进程数，0 解析为CPU核心数"""
+        return self.parallel_csv_workers or os.cpu_count() or 1
+    
     def is_cache_enabled(self) -> bool:
         """检查是否启用了任何形式的缓存"""
         return self.cache_enabled and (self.memory_cache_enabled or self.disk_cache_enabled)
@@ -135,6 +192,12 @@ class ConfigManager:
             new_config.validate()
             self._config = new_config
     
+    def set_config(self, config: UnifiedConfig) -> None:
+        """替换为给定的配置（线程安全），如在工作进程中应用主进程的配置快照"""
+        config.validate()
+        with self._lock:
+            self._config = config
+
     def reset_to_defaults(self) -> None:
         """重置为默认配置（线程安全）"""
         with self._lock:
@@ -191,6 +254,11 @@ def update_config(**kwargs) -> None:
     get_config_manager().update_config(**kwargs)
 
 
+def set_config(config: UnifiedConfig) -> None:
+    """替换当前配置的便捷函数"""
+    get_config_manager().set_config(config)
+
+
 # 为了向后兼容，提供旧的接口
 def get_cache_config():
     """获取缓存配置（向后兼容）"""
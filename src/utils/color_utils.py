@@ -5,6 +5,7 @@
 """
 
 import re
+from dataclasses import replace
 from typing import TYPE_CHECKING
 from functools import lru_cache
 
@@ -435,7 +436,7 @@ def apply_smart_color_matching(style: "Style") -> "Style":
     参数：
         style: Style对象，需包含background_color和font_color属性
     返回：
-        调整后的Style对象
+        调整后的新Style对象；无需调整时返回原对象
     """
     # 如果没有背景色，不需要调整
     if not style.background_color:
@@ -451,15 +452,12 @@ def apply_smart_color_matching(style: "Style") -> "Style":
         # 没有字体色时，只有在背景色很深的情况下才设置白色字体
         bg_brightness = get_color_brightness(style.background_color)
         if bg_brightness < 64:  # 只有非常深的背景才自动设置白色字体
-            style.font_color = "#FFFFFF"
+            return replace(style, font_color="#FFFFFF")
         return style
 
     # 根据背景色的亮度决定字体色（只在对比度不足时）
     bg_brightness = get_color_brightness(style.background_color)
 
     if bg_brightness < 128:  # 深色背景
-        style.font_color = "#FFFFFF"  # 使用白色字体
-    else:  # 浅色背景
-        style.font_color = "#000000"  # 使用黑色字体
-
-    return style
\ No newline at end of file
+        return replace(style, font_color="#FFFFFF")  # 使用白色字体
+    return replace(style, font_color="#000000")  # 使用黑色字体（浅色背景）
\ No newline at end of file
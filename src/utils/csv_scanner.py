@@ -0,0 +1,149 @@
+"""
+CSV字节扫描工具
+
+通过内存映射直接扫描CSV文件的字节，用于不需要解析字段的快速操作：
+编码嗅探、记录计数和基于采样的记录数估算。
+
+UTF-8和GBK编码中换行符、回车符、逗号和引号的字节不会出现在多字节字符内部，
+因此可以不解码、直接按字节查找这些分隔符。
+"""
+
+import codecs
+import logging
+import mmap
+import os
+
+logger = logging.getLogger(__name__)
+
+# 嗅探编码时读取的字节数
+ENCODING_SAMPLE_BYTES = 64 * 1024
+# 扫描时每次切片的字节数
+SCAN_SLICE_BYTES = 16 * 1024 * 1024
+# 估算记录数时每个采样点读取的字节数
+ESTIMATE_SAMPLE_BYTES = 256 * 1024
+# 估算记录数时的采样点数量（均匀分布在文件中）
+ESTIMATE_SAMPLE_COUNT = 8
+
+
+def sniff_encoding(file_path: str, sample_size: int = ENCODING_SAMPLE_BYTES) -> str:
+    """
+    根据文件开头的字节判断编码，能按UTF-8解码时返回 'utf-8'，否则返回 'gbk'。
+
+    只读取 sample_size 字节；采样末尾被截断的多字节字符不视为解码错误。
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=len(sample) < sample_size)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'gbk'
+
+
+def count_csv_records(file_path: str) -> int | None:
+    """
+    统计CSV文件的记录数，结果与 csv.reader 按文本方式读取文件得到的记录数相同。
+
+    文件不含引号时直接按块统计换行符；含引号时跳过引号字段内的换行。
+    引号不符合默认CSV方言（只出现在字段开头、字段结尾或以 "" 转义）或存在单独的回车换行符时，
+    无法只凭字节确定记录边界，返回 None，由调用方改用 csv.reader 计数。
+
+    参数：
+        file_path: CSV文件路径
+
+    返回：
+        记录数；无法确定时返回 None
+    """
+    if os.path.getsize(file_path) == 0:
+        return 0
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        if _count_lone_carriage_returns(mm, 0, size):
+            return None
+
+        newlines = 0
+        segment_start = 0
+        quote = mm.find(b'"')
+        while quote >= 0:
+            # 引号外的片段：统计换行符，引号必须位于字段开头
+            if quote > 0 and mm[quote - 1] not in b',\n\r':
+                return None
+            newlines += _count_newlines(mm, segment_start, quote)
+
+            # 引号内的片段：跳过 "" 转义，找到结束引号
+            position = quote + 1
+            while True:
+                closing = mm.find(b'"', position)
+                if closing < 0:
+                    # 文件在引号字段内结束，csv.reader 仍会产出最后一条记录
+                    return newlines + 1
+                if closing + 1 < size and mm[closing + 1] == ord('"'):
+                    position = closing + 2
+                    continue
+                break
+            if closing + 1 < size and mm[closing + 1] not in b',\n\r':
+                return None
+            segment_start = closing + 1
+            quote = mm.find(b'"', segment_start)
+
+        newlines += _count_newlines(mm, segment_start, size)
+        # 文件不以引号外的换行符结尾时，最后一条记录没有结尾换行符，也计为一条记录
+        return newlines + (0 if mm.rfind(b'\n', segment_start) == size - 1 else 1)
+
+
+def estimate_csv_records(file_path: str, sample_size: int = ESTIMATE_SAMPLE_BYTES,
+                         sample_count: int = ESTIMATE_SAMPLE_COUNT) -> int:
+    """
+    根据均匀分布的采样估算CSV文件的记录数，用于选择处理方式等不需要精确值的场合。
+
+    文件不大于全部采样的总大小时直接精确计数。采样按换行符估算平均记录长度，
+    不区分引号内的换行，因此含多行字段的文件会高估记录数。
+
+    参数：
+        file_path: CSV文件路径
+        sample_size: 每个采样点读取的字节数
+        sample_count: 采样点数量
+
+    返回：
+        估算的记录数
+    """
+    size = os.path.getsize(file_path)
+    if size <= sample_size * sample_count:
+        count = count_csv_records(file_path)
+        if count is not None:
+            return count
+
+    newlines = 0
+    sampled = 0
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        step = max((size - sample_size) // max(sample_count - 1, 1), 1)
+        for start in range(0, max(size - sample_size, 0) + 1, step)[:sample_count]:
+            sample = mm[start:start + sample_size]
+            newlines += sample.count(b'\n')
+            sampled += len(sample)
+
+    if newlines == 0:
+        return 1 if size else 0
+    return max(round(size * newlines / sampled), 1)
+
+
+def _count_newlines(mm: mmap.mmap, start: int, end: int) -> int:
+    """分块统计 [start, end) 内的换行符数量。"""
+    count = 0
+    for offset in range(start, end, SCAN_SLICE_BYTES):
+        count += mm[offset:min(offset + SCAN_SLICE_BYTES, end)].count(b'\n')
+    return count
+
+
+def _count_lone_carriage_returns(mm: mmap.mmap, start: int, end: int) -> int:
+    """统计 [start, end) 内不属于 \\r\\n 的回车符数量（文本方式读取时它们同样被当作换行）。"""
+    if mm.find(b'\r', start, end) < 0:
+        return 0
+    count = 0
+    for offset in range(start, end, SCAN_SLICE_BYTES):
+        slice_end = min(offset + SCAN_SLICE_BYTES, end)
+        # 多读一个字节，使跨越切片边界的 \r\n 也能被识别
+        data = mm[offset:slice_end + 1]
+        count += data.count(b'\r', 0, slice_end - offset) - data.count(b'\r\n')
+    return count
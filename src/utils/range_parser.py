@@ -2,8 +2,12 @@
 解析单元格范围字符串，如 "A1:D10" 或 "A1"。
 """
 import re
+from typing import TypeAlias
 
-def parse_range_string(range_string: str) -> tuple[int, int, int, int]:
+# 单元格范围 (start_row, start_col, end_row, end_col)，基于0的闭区间
+CellRange: TypeAlias = tuple[int, int, int, int]
+
+def parse_range_string(range_string: str) -> CellRange:
     """
     解析范围字符串，例如 "A1:D10" 或 "A1"。
 
@@ -1,6 +1,7 @@
 """
 用于从 openpyxl 对象解析单元格样式的工具函数。
 """
+from dataclasses import fields, replace
 from typing import Any, TypeAlias
 from openpyxl.cell.cell import Cell as OpenpyxlCell, MergedCell as OpenpyxlMergedCell
 from src.models.table_model import Style, RichTextFragment, RichTextFragmentStyle, CellValue
@@ -59,49 +60,105 @@ def extract_cell_value(cell: CellLike) -> CellValue:
         return _extract_rich_text(cell)
     return cell.value
 
-def extract_style(cell: CellLike) -> Style:
+def extract_style(cell: CellLike, style_cache: 'StyleCache | None' = None) -> Style:
     """
     从 openpyxl 单元格中提取完整的样式信息。
     兼容普通单元格和合并单元格。
+
+    传入 style_cache 时，相同样式索引的单元格共享同一个 Style 实例（不可修改），
+    只有带超链接或批注的单元格会得到叠加了这两项的新实例。
     """
-    style = Style()
+    if style_cache is not None:
+        return style_cache.get(cell)
     if not hasattr(cell, 'has_style') or not cell.has_style:
-        return style
-    
+        return Style()
+    return _apply_cell_overlays(_extract_base_style(cell), cell)
+
+
+class StyleCache:
+    """
+    按单元格样式索引缓存 Style 的享元缓存，每个工作簿使用一个实例。
+
+    工作簿中的单元格格式（cellXfs）通常只有几十种，样式索引相同的单元格其字体、填充、
+    边框、对齐与数字格式完全相同，因此每种格式只解析一次。超链接和批注属于单元格本身，
+    作为覆盖层叠加在共享样式之上。返回的 Style 实例被多个单元格共享，调用方不应修改。
+    """
+
+    def __init__(self):
+        self._styles: dict[int, Style] = {}
+        self._default_style = Style()
+
+    def get(self, cell: CellLike) -> Style:
+        """获取单元格的样式，优先返回缓存中的共享实例。"""
+        if not hasattr(cell, 'has_style') or not cell.has_style:
+            return self._default_style
+
+        key = _get_style_key(cell)
+        style = self._styles.get(key) if key is not None else None
+        if style is None:
+            style = _extract_base_style(cell)
+            if key is not None:
+                self._styles[key] = style
+
+        return _apply_cell_overlays(style, cell)
+
+    @property
+    def default_style(self) -> Style:
+        """没有设置样式的单元格共享的样式实例。"""
+        return self._default_style
+
+    def __len__(self) -> int:
+        return len(self._styles)
+
+
+def _get_style_key(cell: CellLike) -> int | None:
+    """获取单元格在工作簿样式表中的索引，无法获取时返回 None（不缓存）。"""
+    # 只读单元格直接保存样式索引，普通单元格和合并单元格通过 style_id 查询
+    style_id = getattr(cell, '_style_id', None)
+    if style_id is None:
+        try:
+            style_id = cell.style_id
+        except (AttributeError, TypeError):
+            return None
+    return style_id if isinstance(style_id, int) else None
+
+
+def _extract_base_style(cell: CellLike) -> Style:
+    """提取由单元格格式决定的样式部分（不含超链接与批注）。"""
+    style_attrs: dict[str, Any] = {}
+
     # 提取字体样式
     if cell.font:
         font = cell.font
-        style.bold = font.bold if font.bold is not None else False
-        style.italic = font.italic if font.italic is not None else False
-        style.underline = font.underline is not None and font.underline != 'none'
-        style.font_size = font.size if font.size else None
-        style.font_name = font.name if font.name else None
+        style_attrs['bold'] = font.bold if font.bold is not None else False
+        style_attrs['italic'] = font.italic if font.italic is not None else False
+        style_attrs['underline'] = font.underline is not None and font.underline != 'none'
+        style_attrs['font_size'] = font.size if font.size else None
+        style_attrs['font_name'] = font.name if font.name else None
         if font.color:
             font_color = extract_color(font.color)
             if font_color:
-                style.font_color = font_color
+                style_attrs['font_color'] = font_color
 
     # 提取背景色
     if cell.fill:
         background_color = extract_fill_color(cell.fill)
         if background_color:
-            style.background_color = background_color
+            style_attrs['background_color'] = background_color
 
-    # 智能匹配字体色与背景色
-    style = apply_smart_color_matching(style)
     if cell.alignment:
         alignment = cell.alignment
         if alignment.horizontal:
-            style.text_align = alignment.horizontal
+            style_attrs['text_align'] = alignment.horizontal
         if alignment.vertical:
-            style.vertical_align = alignment.vertical
-        style.wrap_text = alignment.wrap_text if alignment.wrap_text is not None else False
+            style_attrs['vertical_align'] = alignment.vertical
+        style_attrs['wrap_text'] = alignment.wrap_text if alignment.wrap_text is not None else False
     if cell.border:
         border = cell.border
-        style.border_top = get_border_style(border.top) if border.top else ""
-        style.border_bottom = get_border_style(border.bottom) if border.bottom else ""
-        style.border_left = get_border_style(border.left) if border.left else ""
-        style.border_right = get_border_style(border.right) if border.right else ""
+        style_attrs['border_top'] = get_border_style(border.top) if border.top else ""
+        style_attrs['border_bottom'] = get_border_style(border.bottom) if border.bottom else ""
+        style_attrs['border_left'] = get_border_style(border.left) if border.left else ""
+        style_attrs['border_right'] = get_border_style(border.right) if border.right else ""
         border_color = None
         for border_side in [border.top, border.bottom, border.left, border.right]:
             if border_side and border_side.color:
@@ -109,39 +166,52 @@ def extract_style(cell: CellLike) -> Style:
                 if extracted_color:
                     border_color = extracted_color
                     break
-        if border_color:
-            style.border_color = border_color
-        else:
-            style.border_color = Style().border_color
+        style_attrs['border_color'] = border_color
     # 提取数字格式
     if hasattr(cell, 'number_format') and cell.number_format and cell.number_format != 'General':
-        style.number_format = cell.number_format
+        style_attrs['number_format'] = cell.number_format
+
+    # 智能匹配字体色与背景色
+    return apply_smart_color_matching(Style(**style_attrs))
+
+
+def _apply_cell_overlays(style: Style, cell: CellLike) -> Style:
+    """返回叠加了单元格自身超链接与批注的样式，二者都没有时返回原样式。"""
+    hyperlink = _extract_hyperlink(cell)
+    comment = _extract_comment(cell)
+    if hyperlink is None and comment is None:
+        return style
+    return replace(style, hyperlink=hyperlink, comment=comment)
 
-    # 提取超链接
+
+def _extract_hyperlink(cell: CellLike) -> str | None:
+    """提取超链接目标，内部位置以 # 开头。"""
     if hasattr(cell, 'hyperlink') and cell.hyperlink:
         try:
             if hasattr(cell.hyperlink, 'target') and cell.hyperlink.target:
                 target = cell.hyperlink.target
                 if isinstance(target, str):
-                    style.hyperlink = target
+                    return target
             elif hasattr(cell.hyperlink, 'location') and cell.hyperlink.location:
                 location = cell.hyperlink.location
                 if isinstance(location, str):
-                    style.hyperlink = f"#{location}"
+                    return f"#{location}"
         except Exception:
             pass # 忽略提取超链接时的任何异常
+    return None
 
-    # 提取注释
+
+def _extract_comment(cell: CellLike) -> str | None:
+    """提取批注文本。"""
     if hasattr(cell, 'comment') and cell.comment:
         try:
             if hasattr(cell.comment, 'text'):
-                style.comment = str(cell.comment.text)
+                return str(cell.comment.text)
             elif hasattr(cell.comment, 'content'): # 兼容不同版本的 comment 对象
-                style.comment = str(cell.comment.content)
+                return str(cell.comment.content)
         except (AttributeError, TypeError):
             pass # 忽略提取注释时的任何异常
-            
-    return style
+    return None
 
 def extract_fill_color(fill) -> str | None:
     """
@@ -192,10 +262,11 @@ def style_to_dict(style: Style) -> dict[str, Any]:
     
     style_dict = {}
     
-    # 使用 vars() 动态获取属性，但过滤默认值以保持简洁。
+    # 遍历数据类字段获取属性，但过滤默认值以保持简洁。
     default_style = Style()
-    for attr, value in vars(style).items():
-        if value != getattr(default_style, attr):
-             style_dict[attr] = value
+    for style_field in fields(style):
+        value = getattr(style, style_field.name)
+        if value != getattr(default_style, style_field.name):
+             style_dict[style_field.name] = value
              
     return style_dict
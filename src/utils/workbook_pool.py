@@ -0,0 +1,138 @@
+"""
+工作簿句柄池。
+
+按 (文件路径, 修改时间) 复用已打开的工作簿句柄，使同一会话中多次惰性读取
+共享一次解析好的压缩包，而不是每次调用都重新打开、解压文件。
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, int]
+
+
+class _PoolEntry:
+    """池中的一个句柄及其引用计数。"""
+
+    __slots__ = ("handle", "refs")
+
+    def __init__(self, handle: Any):
+        self.handle = handle
+        self.refs = 0
+
+
+class WorkbookPool:
+    """
+    带引用计数的小型工作簿句柄池。
+
+    acquire 返回的句柄必须通过 release 归还；引用计数归零的句柄保留在池中供后续复用，
+    超出容量时按最近最少使用顺序关闭。文件被修改后修改时间变化，旧句柄不会再被命中。
+    无法获取修改时间的路径不进入池，release 时直接关闭。
+    """
+
+    def __init__(self, opener: Callable[[str], Any], max_size: int = 4):
+        """
+        参数：
+            opener: 根据文件路径打开工作簿句柄的函数
+            max_size: 池中最多保留的句柄数（正在使用的句柄不计入淘汰）
+        """
+        self._opener = opener
+        self._max_size = max_size
+        self._entries: OrderedDict[PoolKey, _PoolEntry] = OrderedDict()
+        # 句柄可能在 __del__ 中被归还，使用可重入锁避免同线程死锁
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(file_path: str) -> PoolKey | None:
+        """生成池键 (绝对路径, 修改时间纳秒)，文件不可访问时返回 None。"""
+        try:
+            return os.path.abspath(file_path), os.stat(file_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def acquire(self, file_path: str) -> tuple[PoolKey | None, Any]:
+        """
+        获取文件对应的工作簿句柄。
+
+        返回：
+            (池键, 句柄)；池键需在 release 时一并传回
+        """
+        key = self.make_key(file_path)
+        if key is None:
+            return None, self._opener(file_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self._entries.move_to_end(key)
+                return key, entry.handle
+
+        handle = self._opener(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # 其他线程已抢先打开同一文件，使用池中的句柄
+                self._close(handle)
+            else:
+                entry = self._entries[key] = _PoolEntry(handle)
+            entry.refs += 1
+            self._entries.move_to_end(key)
+            self._evict_stale(key)
+            self._evict_idle()
+            return key, entry.handle
+
+    def release(self, key: PoolKey | None, handle: Any) -> None:
+        """归还 acquire 获得的句柄。"""
+        if key is None:
+            self._close(handle)
+            return
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.handle is not handle:
+                self._close(handle)
+                return
+            entry.refs = max(0, entry.refs - 1)
+            self._evict_idle()
+
+    def clear(self) -> None:
+        """关闭并移除所有空闲句柄。"""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry.refs == 0]:
+                self._close(self._entries.pop(key).handle)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict_stale(self, current_key: PoolKey) -> None:
+        """移除同一路径下修改时间已过期的空闲句柄。"""
+        path = current_key[0]
+        for key in [k for k, entry in self._entries.items()
+                    if k[0] == path and k != current_key and entry.refs == 0]:
+            self._close(self._entries.pop(key).handle)
+
+    def _evict_idle(self) -> None:
+        """超出容量时按LRU顺序关闭空闲句柄。"""
+        if len(self._entries) <= self._max_size:
+            return
+        for key in [k for k, entry in self._entries.items() if entry.refs == 0]:
+            if len(self._entries) <= self._max_size:
+                break
+            self._close(self._entries.pop(key).handle)
+
+    @staticmethod
+    def _close(handle: Any) -> None:
+        close = getattr(handle, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"关闭工作簿句柄失败: {e}")
@@ -0,0 +1,524 @@
+"""
+XLSX 压缩包底层读取工具。
+
+直接从 zip 包中流式读取工作表 XML，无需构建 openpyxl 对象模型。
+用于在一次 openpyxl 加载之外，廉价地补充公式单元格的缓存值。
+"""
+
+import logging
+import posixpath
+import zipfile
+from collections.abc import Iterator
+from typing import Any
+from xml.etree.ElementTree import iterparse
+from xml.parsers.expat import ExpatError, ParserCreate
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS
+from openpyxl.formula.translate import Translator
+from openpyxl.utils.cell import column_index_from_string, get_column_letter, range_boundaries
+
+logger = logging.getLogger(__name__)
+
+# 工作簿入口在包关系中的默认位置
+DEFAULT_WORKBOOK_PATH = "xl/workbook.xml"
+OFFICE_DOCUMENT_REL_SUFFIX = "/officeDocument"
+R_ID_ATTR_SUFFIX = "}id"
+
+
+def _local_name(tag: str) -> str:
+    """去掉命名空间，兼容 transitional 与 strict 两种 OOXML 命名空间。"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _get_attr(element, suffix: str) -> str | None:
+    """按后缀查找带命名空间的属性（如 r:id）。"""
+    for key, value in element.attrib.items():
+        if key.endswith(suffix):
+            return value
+    return None
+
+
+def _rels_path_for(part_path: str) -> str:
+    """返回部件对应的 .rels 文件路径。"""
+    directory, name = posixpath.split(part_path)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def _resolve_target(base_dir: str, target: str) -> str:
+    """将关系中的 Target 解析为压缩包内的绝对路径。"""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _read_relationships(archive: zipfile.ZipFile, rels_path: str) -> dict[str, tuple[str, str]]:
+    """读取关系文件，返回 {rId: (Type, Target)}。"""
+    relationships: dict[str, tuple[str, str]] = {}
+    if rels_path not in archive.namelist():
+        return relationships
+    with archive.open(rels_path) as f:
+        for _, element in iterparse(f):
+            if _local_name(element.tag) == "Relationship":
+                rel_id = element.get("Id")
+                if rel_id:
+                    relationships[rel_id] = (element.get("Type", ""), element.get("Target", ""))
+    return relationships
+
+
+def get_workbook_path(archive: zipfile.ZipFile) -> str:
+    """通过包关系定位 workbook.xml，找不到时返回默认路径。"""
+    for rel_type, target in _read_relationships(archive, "_rels/.rels").values():
+        if rel_type.endswith(OFFICE_DOCUMENT_REL_SUFFIX):
+            return _resolve_target("", target)
+    return DEFAULT_WORKBOOK_PATH
+
+
+def get_sheet_xml_paths(archive: zipfile.ZipFile) -> dict[str, str]:
+    """
+    获取工作表名称到工作表 XML 路径的映射（保持工作簿中的顺序）。
+
+    参数：
+        archive: 已打开的 XLSX 压缩包
+
+    返回：
+        {工作表名称: 压缩包内 XML 路径}
+    """
+    workbook_path = get_workbook_path(archive)
+    relationships = _read_relationships(archive, _rels_path_for(workbook_path))
+    base_dir = posixpath.dirname(workbook_path)
+
+    sheet_paths: dict[str, str] = {}
+    with archive.open(workbook_path) as f:
+        for _, element in iterparse(f):
+            if _local_name(element.tag) != "sheet":
+                continue
+            name = element.get("name")
+            rel_id = _get_attr(element, R_ID_ATTR_SUFFIX)
+            if name is None or rel_id not in relationships:
+                continue
+            _, target = relationships[rel_id]
+            sheet_paths[name] = _resolve_target(base_dir, target)
+    return sheet_paths
+
+
+def _find_workbook_part(archive: zipfile.ZipFile, rel_type_suffix: str) -> str | None:
+    """按关系类型后缀查找工作簿级部件（共享字符串、样式表等）的路径。"""
+    workbook_path = get_workbook_path(archive)
+    for rel_type, target in _read_relationships(archive, _rels_path_for(workbook_path)).values():
+        if rel_type.endswith(rel_type_suffix):
+            part_path = _resolve_target(posixpath.dirname(workbook_path), target)
+            return part_path if part_path in archive.namelist() else None
+    return None
+
+
+def read_shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    """读取共享字符串表，富文本片段按顺序拼接为纯文本。"""
+    shared_path = _find_workbook_part(archive, "/sharedStrings")
+    if shared_path is None:
+        return []
+
+    strings: list[str] = []
+    with archive.open(shared_path) as f:
+        for _, element in iterparse(f):
+            if _local_name(element.tag) == "si":
+                strings.append(_collect_text(element))
+                element.clear()
+    return strings
+
+
+def read_cell_number_formats(archive: zipfile.ZipFile) -> list[str]:
+    """
+    读取样式表中每个单元格格式（cellXfs 中的 xf）对应的数字格式代码。
+
+    返回：
+        按单元格样式索引 s 排列的格式代码列表；内置格式按 openpyxl 的内置表解析
+    """
+    styles_path = _find_workbook_part(archive, "/styles")
+    if styles_path is None:
+        return []
+
+    custom_formats: dict[int, str] = {}
+    number_formats: list[str] = []
+    with archive.open(styles_path) as f:
+        for _, element in iterparse(f):
+            tag = _local_name(element.tag)
+            if tag == "numFmt":
+                try:
+                    custom_formats[int(element.get("numFmtId", ""))] = element.get("formatCode", "")
+                except ValueError:
+                    continue
+            elif tag == "cellXfs":
+                for xf in element:
+                    try:
+                        fmt_id = int(xf.get("numFmtId", 0))
+                    except ValueError:
+                        fmt_id = 0
+                    number_formats.append(
+                        custom_formats.get(fmt_id) or BUILTIN_FORMATS.get(fmt_id) or "General"
+                    )
+                break
+    return number_formats
+
+
+def is_date1904(archive: zipfile.ZipFile) -> bool:
+    """检查工作簿是否使用 1904 日期系统（workbookPr/@date1904）。"""
+    with archive.open(get_workbook_path(archive)) as f:
+        for _, element in iterparse(f):
+            if _local_name(element.tag) == "workbookPr":
+                return element.get("date1904", "").lower() in ("1", "true")
+            if _local_name(element.tag) == "sheets":
+                break
+    return False
+
+
+def _collect_text(element) -> str:
+    """拼接 <si>/<is> 下所有 <t> 文本，忽略注音 <rPh>。"""
+    parts = []
+    for child in element:
+        tag = _local_name(child.tag)
+        if tag == "t":
+            parts.append(child.text or "")
+        elif tag == "r":
+            for run_child in child:
+                if _local_name(run_child.tag) == "t":
+                    parts.append(run_child.text or "")
+    return "".join(parts)
+
+
+def cast_number(value: str) -> int | float:
+    """与 openpyxl 一致：含小数点或指数时为 float，否则为 int。"""
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def decode_cached_value(raw: str | None, data_type: str | None,
+                        shared_strings: list[str] | None = None) -> Any:
+    """
+    按单元格类型 t 解码 <v> 中的原始缓存值。
+
+    参数：
+        raw: <v> 文本
+        data_type: 单元格的 t 属性（n/s/str/b/e/inlineStr）
+        shared_strings: 共享字符串表（t="s" 时需要）
+
+    返回：
+        Python 值；数值的日期转换由调用方结合数字格式处理
+    """
+    if raw is None:
+        return None
+    if data_type in (None, "n"):
+        try:
+            return cast_number(raw)
+        except ValueError:
+            return raw
+    if data_type == "b":
+        return raw.strip() not in ("0", "false", "")
+    if data_type == "s":
+        try:
+            return (shared_strings or [])[int(raw)]
+        except (ValueError, IndexError):
+            return raw
+    # str / e / inlineStr 等均按文本处理
+    return raw
+
+
+def read_formula_cached_values(file_path: str, sheet_name: str) -> dict[tuple[int, int], Any]:
+    """
+    单次流式扫描工作表 XML，收集所有公式单元格的缓存值。
+
+    openpyxl 在公式模式下会丢弃 <v>，此前需要再以 data_only=True 完整加载一次工作簿。
+    这里直接用 expat 回调扫描一遍 XML，不构建元素树，也不创建任何 openpyxl 对象。
+
+    参数：
+        file_path: XLSX 文件路径
+        sheet_name: 工作表名称
+
+    返回：
+        {(行号, 列号): 缓存值}，行列均为 1 基；读取失败时返回空字典
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            sheet_path = get_sheet_xml_paths(archive).get(sheet_name)
+            if sheet_path is None:
+                return {}
+            values: dict[tuple[int, int], Any] = {}
+            shared_string_cells: list[tuple[int, int]] = []
+            with archive.open(sheet_path) as f:
+                for row_idx, cells in SheetXmlScanner(formulas_only=True).iter_rows(f):
+                    for col_idx, data_type, _, raw, _ in cells:
+                        key = (row_idx, col_idx)
+                        if data_type == "s" and raw is not None:
+                            # 共享字符串表只在确实需要时才读取
+                            values[key] = raw
+                            shared_string_cells.append(key)
+                        else:
+                            values[key] = decode_cached_value(raw, data_type)
+            if shared_string_cells:
+                shared_strings = read_shared_strings(archive)
+                for key in shared_string_cells:
+                    values[key] = decode_cached_value(values[key], "s", shared_strings)
+            return values
+    except (zipfile.BadZipFile, KeyError, OSError, ValueError, ExpatError) as e:
+        logger.debug(f"读取公式缓存值失败，公式单元格将没有计算结果: {e}")
+        return {}
+
+
+def read_merged_cells(file_path: str, sheet_name: str) -> list[str]:
+    """
+    读取工作表的合并单元格区域，只处理 <mergeCell> 元素。
+
+    用于 openpyxl 只读模式（ReadOnlyWorksheet 不提供 merged_cells）下获取合并信息，
+    避免为此再完整加载一次工作簿。读取失败时返回空列表。
+    """
+    merged_cells: list[str] = []
+
+    def start(name: str, attrs: dict[str, str]) -> None:
+        if name.rpartition(':')[2] == "mergeCell":
+            ref = attrs.get("ref")
+            if ref:
+                merged_cells.append(ref)
+
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            sheet_path = get_sheet_xml_paths(archive).get(sheet_name)
+            if sheet_path is None:
+                return []
+            parser = ParserCreate()
+            parser.StartElementHandler = start
+            with archive.open(sheet_path) as f:
+                parser.ParseFile(f)
+    except (zipfile.BadZipFile, KeyError, OSError, ValueError, ExpatError) as e:
+        logger.debug(f"读取合并单元格失败: {e}")
+        return []
+    return merged_cells
+
+
+def read_used_range(stream) -> tuple[int, int, int, int] | None:
+    """
+    单次扫描工作表 XML，返回 <dimension> 声明的尺寸和真实使用范围。
+
+    只设置了格式的空单元格（如 <c r="Z9999" s="3"/>）会被计入 <dimension>；这里只把含 <v>、<f>
+    或内联字符串的单元格以及合并区域计入使用范围。只注册开始标签回调，不收集文本。
+
+    参数：
+        stream: 工作表 XML 的二进制文件对象
+
+    返回：
+        (声明的最后一行, 声明的最后一列, 最后一个非空单元格所在行, 所在列)，均为 1 基；
+        缺少 <dimension> 时声明尺寸为 0，没有非空单元格时使用范围为 0；XML 无法解析时返回 None
+    """
+    dimension_row = dimension_col = 0
+    last_row = last_col = 0
+    row = col = 0
+    # 当前单元格是否已计入使用范围
+    counted = True
+
+    def start(name: str, attrs: dict[str, str]) -> None:
+        nonlocal dimension_row, dimension_col, last_row, last_col, row, col, counted
+        tag = name.rpartition(':')[2]
+        if tag == "c":
+            coordinate = attrs.get("r")
+            if coordinate:
+                col = column_index_from_string(coordinate.rstrip("0123456789"))
+            else:
+                col += 1
+            counted = False
+        elif tag in ("v", "f", "is"):
+            if not counted:
+                counted = True
+                last_row = max(last_row, row)
+                last_col = max(last_col, col)
+        elif tag == "row":
+            r = attrs.get("r")
+            row = int(r) if r else row + 1
+            col = 0
+        elif tag == "mergeCell":
+            try:
+                _, _, max_col, max_row = range_boundaries(attrs.get("ref", ""))
+            except (TypeError, ValueError):
+                return
+            last_row = max(last_row, max_row or 0)
+            last_col = max(last_col, max_col or 0)
+        elif tag == "dimension":
+            try:
+                _, _, dimension_col, dimension_row = range_boundaries(attrs.get("ref", ""))
+            except (TypeError, ValueError):
+                return
+            dimension_row = dimension_row or 0
+            dimension_col = dimension_col or 0
+
+    parser = ParserCreate()
+    parser.StartElementHandler = start
+    try:
+        parser.ParseFile(stream)
+    except (ExpatError, ValueError) as e:
+        logger.debug(f"扫描工作表使用范围失败: {e}")
+        return None
+    return dimension_row, dimension_col, last_row, last_col
+
+
+# 原始单元格：(列号, 类型t, 样式索引s, 值文本, 公式文本)；列号为 1 基，无公式时公式文本为 None
+RawCell = tuple[int, str | None, int, str | None, str | None]
+
+
+class SheetXmlScanner:
+    """
+    基于 expat 回调的工作表 XML 扫描器。
+
+    按块读取并解析 sheetN.xml，逐行产出原始单元格，不构建元素树。
+    扫描过程中顺带记录 <dimension> 与 <mergeCell>，在迭代结束后可用。
+    共享公式的从属单元格（<f t="shared" si="…"/> 不含文本）与openpyxl一致，
+    按相对位置平移主单元格的公式得到公式文本。
+    """
+
+    # 每次送入 expat 的字节数
+    CHUNK_SIZE = 64 * 1024
+
+    # 文本收集目标
+    _TEXT_NONE = 0
+    _TEXT_VALUE = 1
+    _TEXT_FORMULA = 2
+
+    def __init__(self, formulas_only: bool = False):
+        """
+        参数：
+            formulas_only: 为 True 时只产出带 <f> 的公式单元格
+        """
+        self.formulas_only = formulas_only
+        self.dimension: str | None = None
+        self.merged_cells: list[str] = []
+        self._pending: list[tuple[int, list[RawCell]]] = []
+        self._row_cells: list[RawCell] = []
+        self._row = 0
+        self._col = 0
+        self._cell_type: str | None = None
+        self._style = 0
+        self._has_formula = False
+        self._value_text: str | None = None
+        self._formula_text = ""
+        # 当前单元格所属共享公式的编号，以及 {编号: 主单元格公式的平移器}
+        self._shared_index: str | None = None
+        self._shared_formulas: dict[str, Translator] = {}
+        self._target = self._TEXT_NONE
+        self._in_inline = False
+        self._in_phonetic = False
+        # 热路径缓存：带前缀的元素名 -> 本地名，列字母 -> 列号
+        self._local_names: dict[str, str] = {}
+        self._column_indexes: dict[str, int] = {}
+
+    def iter_rows(self, stream) -> Iterator[tuple[int, list[RawCell]]]:
+        """
+        逐行产出 (行号, 原始单元格列表)，行号为 1 基，只产出包含单元格的行。
+
+        参数：
+            stream: 工作表 XML 的二进制文件对象
+        """
+        parser = ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._chars
+        while True:
+            chunk = stream.read(self.CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            if self._pending:
+                pending, self._pending = self._pending, []
+                yield from pending
+            if not chunk:
+                break
+
+    def _local_name(self, name: str) -> str:
+        tag = self._local_names.get(name)
+        if tag is None:
+            tag = self._local_names[name] = name.rpartition(':')[2]
+        return tag
+
+    def _column_index(self, letters: str) -> int:
+        col = self._column_indexes[letters] = column_index_from_string(letters)
+        return col
+
+    def _start(self, name: str, attrs: dict[str, str]) -> None:
+        tag = self._local_names.get(name) or self._local_name(name)
+        if tag == "c":
+            coordinate = attrs.get("r")
+            if coordinate:
+                # 行号取自 <row>，单元格坐标只用于定位列
+                letters = coordinate.rstrip("0123456789")
+                self._col = self._column_indexes.get(letters) or self._column_index(letters)
+            else:
+                self._col += 1
+            self._cell_type = attrs.get("t")
+            style = attrs.get("s")
+            self._style = int(style) if style else 0
+            self._has_formula = False
+            self._shared_index = None
+            self._value_text = None
+        elif tag == "v":
+            self._target = self._TEXT_VALUE
+        elif tag == "f":
+            self._has_formula = True
+            self._formula_text = ""
+            self._shared_index = attrs.get("si") if attrs.get("t") == "shared" else None
+            self._target = self._TEXT_FORMULA
+        elif tag == "row":
+            r = attrs.get("r")
+            self._row = int(r) if r else self._row + 1
+            self._col = 0
+        elif tag == "is":
+            self._in_inline = True
+        elif tag == "rPh":
+            self._in_phonetic = True
+        elif tag == "t":
+            if self._in_inline and not self._in_phonetic:
+                self._target = self._TEXT_VALUE
+        elif tag == "mergeCell":
+            ref = attrs.get("ref")
+            if ref:
+                self.merged_cells.append(ref)
+        elif tag == "dimension":
+            self.dimension = attrs.get("ref")
+
+    def _chars(self, data: str) -> None:
+        target = self._target
+        if target == self._TEXT_VALUE:
+            self._value_text = data if self._value_text is None else self._value_text + data
+        elif target == self._TEXT_FORMULA:
+            self._formula_text += data
+
+    def _end(self, name: str) -> None:
+        tag = self._local_names.get(name) or self._local_name(name)
+        if tag == "c":
+            if self.formulas_only and not self._has_formula:
+                return
+            formula_text = self._formula_text if self._has_formula else None
+            if self._shared_index is not None:
+                formula_text = self._resolve_shared_formula(formula_text)
+            self._row_cells.append((
+                self._col,
+                self._cell_type,
+                self._style,
+                self._value_text,
+                formula_text,
+            ))
+        elif tag == "v" or tag == "f" or tag == "t":
+            self._target = self._TEXT_NONE
+        elif tag == "row":
+            if self._row_cells:
+                self._pending.append((self._row, self._row_cells))
+                self._row_cells = []
+        elif tag == "is":
+            self._in_inline = False
+        elif tag == "rPh":
+            self._in_phonetic = False
+
+    def _resolve_shared_formula(self, formula_text: str) -> str:
+        """主单元格登记共享公式并原样返回，从属单元格返回平移到当前位置的公式。"""
+        coordinate = f"{get_column_letter(self._col)}{self._row}"
+        if formula_text:
+            self._shared_formulas[self._shared_index] = Translator(f"={formula_text}", origin=coordinate)
+            return formula_text
+        translator = self._shared_formulas.get(self._shared_index)
+        if translator is None:
+            return formula_text
+        return translator.translate_formula(coordinate)[1:]
@@ -5,10 +5,11 @@
 测试缓存管理器的核心功能：初始化、存取、清理、并发安全等。
 """
 
+import os
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import time
-from src.cache.cache_manager import CacheManager, get_cache_manager, reset_cache_manager
+from src.cache.cache_manager import CacheManager, calculate_file_fingerprint, get_cache_manager, reset_cache_manager
 from src.unified_config import UnifiedConfig
 
 def create_mock_config(memory_enabled=True, disk_enabled=True, cache_enabled=True):
@@ -412,8 +413,8 @@ class TestCacheManagerFileHashExceptions:
 
             manager = CacheManager(config=mock_config)
 
-            # 模拟Path.exists抛出异常
-            with patch('src.cache.cache_manager.Path.exists', side_effect=RuntimeError("Unexpected error")):
+            # 模拟Path.stat抛出异常
+            with patch('src.cache.cache_manager.Path.stat', side_effect=RuntimeError("Unexpected error")):
                 file_hash = manager._calculate_file_hash("test.xlsx")
 
                 # 验证返回了错误标识
@@ -1015,6 +1016,25 @@ class TestCacheManagerOptimization:
             assert 'Failed to optimize disk cache' in result['errors'][0]
             assert '磁盘缓存访问失败' in result['errors'][0]
 
+    def test_cache_manager_optimize_cache_columnar_files(self, tmp_path):
+        """测试optimize_cache读取列式缓存文件的元数据，只移除过期的条目"""
+        mock_config = create_mock_config(memory_enabled=False)
+        mock_config.cache_dir = str(tmp_path / "cache")
+        mock_config.disk_cache_format = 'arrow'
+        source = tmp_path / "data.csv"
+        source.write_text("a,b\n1,2\n")
+        manager = CacheManager(config=mock_config)
+
+        rows = [[{"value": "a", "style": None}]]
+        manager.disk_cache.set("expired", {'data': {'rows': rows}, 'timestamp': 0, 'file_path': str(source)})
+        manager.disk_cache.set("valid", {'data': {'rows': rows}, 'timestamp': time.time(), 'file_path': str(source)})
+
+        result = manager.optimize_cache()
+
+        assert result == {'memory_cache_cleaned': 0, 'disk_cache_cleaned': 1, 'errors': []}
+        assert manager.disk_cache.get("expired") is None
+        assert manager.disk_cache.get("valid")['data']['rows'] == rows
+
 
 class TestCacheManagerConcurrency:
     """TDD测试：缓存管理器并发安全测试"""
@@ -1081,3 +1101,76 @@ class TestCacheManagerConcurrency:
             # 验证没有发生错误
             assert len(errors) == 0, f"并发访问出现错误: {errors}"
             assert len(results) == 50  # 5个线程 × 10次操作
+
+
+class TestFileFingerprint:
+    """测试文件指纹的内容寻址与记忆。"""
+
+    @staticmethod
+    def _make_old(path):
+        """把修改时间设为一小时前，使指纹可以被记忆。"""
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+
+    def test_identical_files_share_fingerprint(self, tmp_path):
+        """测试内容相同的小文件在不同路径下指纹相同，扩展名或内容不同时指纹不同。"""
+        first = tmp_path / "a" / "data.xlsx"
+        second = tmp_path / "b" / "copy.xlsx"
+        for path in (first, second):
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(b"id,name\n1,Alice\n")
+        other_suffix = tmp_path / "data.xls"
+        other_suffix.write_bytes(first.read_bytes())
+
+        assert calculate_file_fingerprint(str(first)) == calculate_file_fingerprint(str(second))
+        assert calculate_file_fingerprint(str(first)) != calculate_file_fingerprint(str(other_suffix))
+        second.write_bytes(b"id,name\n1,Bob\n")
+        assert calculate_file_fingerprint(str(first)) != calculate_file_fingerprint(str(second))
+
+    def test_path_named_files_keep_file_name_in_fingerprint(self, tmp_path):
+        """测试工作表名取自文件名的 CSV 只在文件名也相同时共用指纹。"""
+        content = b"id,name\n1,Alice\n"
+        first = tmp_path / "a" / "data.csv"
+        same_name = tmp_path / "b" / "data.csv"
+        other_name = tmp_path / "b" / "copy.csv"
+        for path in (first, same_name, other_name):
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(content)
+
+        assert calculate_file_fingerprint(str(first)) == calculate_file_fingerprint(str(same_name))
+        assert calculate_file_fingerprint(str(first)) != calculate_file_fingerprint(str(other_name))
+
+    def test_unchanged_file_is_not_read_again(self, tmp_path):
+        """测试文件未变化时直接使用记忆的指纹，修改后重新计算。"""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"a,b\n")
+        self._make_old(path)
+        fingerprint = calculate_file_fingerprint(str(path))
+
+        with patch("builtins.open", side_effect=AssertionError("文件不应被再次读取")):
+            assert calculate_file_fingerprint(str(path)) == fingerprint
+
+        path.write_bytes(b"a,c\n")
+        self._make_old(path)
+        assert calculate_file_fingerprint(str(path)) != fingerprint
+
+    def test_recently_modified_file_is_not_memoised(self, tmp_path):
+        """测试刚修改过的文件每次都重新计算指纹。"""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"a,b\n")
+        calculate_file_fingerprint(str(path))
+
+        with patch("src.cache.cache_manager._hash_file_content", return_value="changed") as mock_hash:
+            calculate_file_fingerprint(str(path))
+        mock_hash.assert_called_once()
+
+    def test_strong_hash_for_large_files(self, tmp_path):
+        """测试启用 strong_file_hash 后大文件也按内容计算指纹。"""
+        content = b"x" * (2 * 1024 * 1024)
+        first, second = tmp_path / "first.xlsx", tmp_path / "second.xlsx"
+        first.write_bytes(content)
+        second.write_bytes(content)
+
+        assert calculate_file_fingerprint(str(first)) != calculate_file_fingerprint(str(second))
+        with patch("src.cache.cache_manager.get_config", return_value=UnifiedConfig(strong_file_hash=True)):
+            assert calculate_file_fingerprint(str(first)) == calculate_file_fingerprint(str(second))
@@ -351,3 +351,67 @@ def test_cleanup_cache_with_overall_error(mock_glob, temp_cache_dir):
 
     # 验证glob方法被调用
     mock_glob.assert_called()
+
+
+def _sheet_entry():
+    """构造与CacheManager缓存的解析结果结构相同的条目。"""
+    bold = {"bold": True}
+    rows = [
+        [{"value": "名称", "style": bold}, {"value": 1, "style": None}, {"value": True, "style": bold}],
+        [{"value": None, "style": None}, {"value": 2.5, "style": {"bold": True}}],
+        [{"value": "名称", "style": None}, {"value": "x", "style": None}, {"value": 2 ** 70, "style": None}],
+    ]
+    return {
+        'data': {'sheet_name': "Sheet1", 'headers': ["A", "B", "C"], 'rows': rows,
+                 'metadata': {'total_rows': 4}},
+        'timestamp': 123.0,
+        'file_path': "/data/test.xlsx",
+        'range_string': None,
+        'sheet_name': None
+    }
+
+
+@pytest.mark.parametrize("cache_format, magic", [("arrow", b"ARROW1"), ("parquet", b"PAR1")])
+def test_columnar_format_round_trip(temp_cache_dir, cache_format, magic):
+    """测试列式格式保存的条目读取后与原值相同，同一样式的单元格共用样式字典。"""
+    cache = DiskCache(cache_dir=str(temp_cache_dir), cache_format=cache_format)
+    entry = _sheet_entry()
+    cache.set("sheet", entry)
+
+    assert cache._get_cache_file_path("sheet").read_bytes().startswith(magic)
+    restored = cache.get("sheet")
+    assert restored == entry
+    assert [type(cell["value"]) for cell in restored['data']['rows'][2]] == [str, str, int]
+    assert restored['data']['rows'][0][0]["style"] is restored['data']['rows'][0][2]["style"]
+
+
+@pytest.mark.parametrize("cache_format", ["pickle", "arrow", "parquet"])
+def test_get_rows_reads_row_range_and_columns(temp_cache_dir, cache_format):
+    """测试get_rows只返回请求的行和列，各格式的结果相同。"""
+    cache = DiskCache(cache_dir=str(temp_cache_dir), cache_format=cache_format)
+    entry = _sheet_entry()
+    rows = entry['data']['rows']
+    cache.set("sheet", entry)
+
+    assert cache.get_rows("sheet") == rows
+    assert cache.get_rows("sheet", 1, 1) == rows[1:2]
+    assert cache.get_rows("sheet", columns=[2, 0]) == [[rows[0][2], rows[0][0]], [rows[1][0]], [rows[2][2], rows[2][0]]]
+    assert cache.get_rows("sheet", 5) == []
+    assert cache.get_rows("missing") is None
+
+
+def test_columnar_format_falls_back_to_pickle(temp_cache_dir):
+    """测试不含行数据或无法无损转换的值仍按pickle保存。"""
+    cache = DiskCache(cache_dir=str(temp_cache_dir), cache_format="arrow")
+    values = {
+        "plain": {"data": "value"},
+        "tuple": {'data': {'rows': [], 'merged_cells': ("A1:B1",)}},
+        "object": {'data': {'rows': [[{"value": object.__name__, "style": ("bold",)}]]}},
+    }
+    for key, value in values.items():
+        cache.set(key, value)
+
+    for key, value in values.items():
+        assert cache._get_cache_file_path(key).read_bytes().startswith(b"\x80")
+        assert cache.get(key) == value
+    assert cache.get_rows("plain") is None
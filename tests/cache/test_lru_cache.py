@@ -0,0 +1,43 @@
+from src.cache.lru_cache import LRURowBlockCache, estimate_row_block_size
+from src.models.table_model import Cell, Row
+
+
+def _rows(count, value="x"):
+    return [Row(cells=[Cell(value=value)]) for _ in range(count)]
+
+
+def test_entry_limit():
+    """测试未指定字节上限时按条目数量淘汰最久未使用的条目。"""
+    cache = LRURowBlockCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_byte_budget():
+    """测试按估算大小限制总占用，超出上限的单个条目不缓存。"""
+    block_size = estimate_row_block_size(_rows(10))
+    cache = LRURowBlockCache(max_bytes=block_size * 2, getsizeof=estimate_row_block_size)
+    for key in range(3):
+        cache.set(key, _rows(10))
+
+    assert cache.get(0) is None
+    assert cache.get(1) is not None and cache.get(2) is not None
+
+    cache.set("big", _rows(100))
+    assert cache.get("big") is None
+    assert cache.get(2) is not None
+
+    cache.clear()
+    assert cache.get(2) is None
+
+
+def test_estimate_row_block_size_grows_with_content():
+    """测试估算大小随行数和单元格值的大小增加。"""
+    assert estimate_row_block_size(_rows(2)) > estimate_row_block_size(_rows(1))
+    assert estimate_row_block_size(_rows(1, "x" * 1000)) > estimate_row_block_size(_rows(1))
@@ -0,0 +1,128 @@
+import os
+
+import pytest
+
+from src.cache.repair_cache import RepairCache
+
+
+@pytest.fixture
+def repair_cache(tmp_path):
+    """提供修复副本存放在临时目录中的RepairCache实例。"""
+    return RepairCache(tmp_path / "repaired")
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    """提供一个待修复的源文件。"""
+    path = tmp_path / "broken.xlsx"
+    path.write_bytes(b"original content")
+    return path
+
+
+def _copy_repair(calls):
+    """返回记录调用并把源文件复制到目标路径的修复函数。"""
+    def repair(file_path, target):
+        calls.append((file_path, target))
+        with open(file_path, "rb") as src, open(target, "wb") as dst:
+            dst.write(src.read())
+        return target
+    return repair
+
+
+def test_repaired_file_is_reused(repair_cache, source_file, tmp_path):
+    """测试修复副本写入缓存目录，同一文件再次请求时不再修复。"""
+    calls = []
+
+    first = repair_cache.get_repaired_file(str(source_file), _copy_repair(calls))
+    second = repair_cache.get_repaired_file(str(source_file), _copy_repair(calls))
+
+    assert first == second
+    assert len(calls) == 1
+    assert os.path.dirname(first) == str(tmp_path / "repaired")
+    assert first.endswith(".xlsx")
+    assert not (tmp_path / "broken_fixed.xlsx").exists()
+
+
+def test_repaired_file_is_written_atomically(repair_cache, source_file, tmp_path):
+    """测试修复函数写入同一目录下的临时文件，完成后才出现在最终路径上。"""
+    calls = []
+    repair = _copy_repair(calls)
+
+    def checked_repair(file_path, target):
+        assert os.path.dirname(target) == str(tmp_path / "repaired")
+        assert os.listdir(tmp_path / "repaired") == []
+        return repair(file_path, target)
+
+    result = repair_cache.get_repaired_file(str(source_file), checked_repair)
+
+    assert calls[0][1] != result
+    assert os.listdir(tmp_path / "repaired") == [os.path.basename(result)]
+    with open(result, "rb") as f:
+        assert f.read() == b"original content"
+
+
+def test_failed_repair_leaves_no_file(repair_cache, source_file, tmp_path):
+    """测试修复中途失败时不留下半成品，下次请求会重新修复。"""
+    def failing_repair(file_path, target):
+        with open(target, "wb") as f:
+            f.write(b"partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        repair_cache.get_repaired_file(str(source_file), failing_repair)
+    assert os.listdir(tmp_path / "repaired") == []
+
+    calls = []
+    repair_cache.get_repaired_file(str(source_file), _copy_repair(calls))
+    assert len(calls) == 1
+
+
+def test_changed_file_is_repaired_again(repair_cache, source_file):
+    """测试源文件内容变化后重新修复。"""
+    calls = []
+    repair_cache.get_repaired_file(str(source_file), _copy_repair(calls))
+
+    source_file.write_bytes(b"changed content")
+    repair_cache.get_repaired_file(str(source_file), _copy_repair(calls))
+
+    assert len(calls) == 2
+    assert calls[0][1] != calls[1][1]
+
+
+def test_repaired_files_are_bounded(tmp_path):
+    """测试修复副本超出数量上限时删除最旧的副本。"""
+    cache = RepairCache(tmp_path / "repaired", max_files=2)
+    for idx in range(4):
+        path = tmp_path / f"file{idx}.xlsx"
+        path.write_bytes(f"content {idx}".encode())
+        cache.get_repaired_file(str(path), _copy_repair([]))
+
+    assert len(list((tmp_path / "repaired").iterdir())) == 2
+
+
+def test_strategy_memo(repair_cache, source_file):
+    """测试加载方式的记录、读取、失效与移除。"""
+    assert repair_cache.get_strategy(str(source_file)) is None
+
+    repair_cache.remember_strategy(str(source_file), (True, 1))
+    assert repair_cache.get_strategy(str(source_file)) == (True, 1)
+
+    stat = source_file.stat()
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert repair_cache.get_strategy(str(source_file)) is None
+
+    repair_cache.remember_strategy(str(source_file), (False, 2))
+    repair_cache.forget_strategy(str(source_file))
+    assert repair_cache.get_strategy(str(source_file)) is None
+    assert repair_cache.get_strategy("missing.xlsx") is None
+
+
+def test_clear(repair_cache, source_file):
+    """测试清除加载方式记录与修复副本。"""
+    repaired = repair_cache.get_repaired_file(str(source_file), _copy_repair([]))
+    repair_cache.remember_strategy(str(source_file), (True, 0))
+
+    repair_cache.clear()
+
+    assert not os.path.exists(repaired)
+    assert repair_cache.get_strategy(str(source_file)) is None
@@ -0,0 +1,59 @@
+import pytest
+
+from src.cache.row_index_cache import RowCheckpointIndex, RowIndexCache
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """提供一个需要建立行索引的数据文件。"""
+    path = tmp_path / "data.csv"
+    path.write_text("a\nb\nc\n", encoding="utf-8")
+    return path
+
+
+def test_locate():
+    """测试定位到不晚于目标行的最近检查点。"""
+    index = RowCheckpointIndex(interval=10, offsets=(0, 100, 250), total_rows=25)
+
+    assert index.locate(0) == (0, 0)
+    assert index.locate(9) == (0, 9)
+    assert index.locate(10) == (100, 0)
+    assert index.locate(24) == (250, 4)
+
+
+def test_set_and_get(tmp_path, data_file):
+    """测试索引按文件和编码保存，检查点间隔不一致时不命中。"""
+    cache = RowIndexCache(tmp_path / "index")
+    index = RowCheckpointIndex(interval=2, offsets=(0, 4), total_rows=3)
+
+    assert cache.get(str(data_file), "utf-8", 2) is None
+    cache.set(str(data_file), "utf-8", index)
+
+    assert cache.get(str(data_file), "utf-8", 2) == index
+    assert cache.get(str(data_file), "gbk", 2) is None
+    assert cache.get(str(data_file), "utf-8", 4) is None
+    assert cache.get(str(tmp_path / "missing.csv"), "utf-8", 2) is None
+
+
+def test_corrupted_index_is_removed(tmp_path, data_file):
+    """测试损坏的索引文件被删除并视为未命中。"""
+    cache = RowIndexCache(tmp_path / "index")
+    cache.set(str(data_file), "utf-8", RowCheckpointIndex(interval=2, offsets=(0, 4), total_rows=3))
+    index_file = next((tmp_path / "index").glob("*.json"))
+    index_file.write_text("{broken", encoding="utf-8")
+
+    assert cache.get(str(data_file), "utf-8", 2) is None
+    assert not index_file.exists()
+
+
+def test_index_files_are_bounded(tmp_path):
+    """测试索引文件超出数量上限时删除最旧的索引，clear 删除全部索引。"""
+    cache = RowIndexCache(tmp_path / "index", max_files=2)
+    for idx in range(4):
+        path = tmp_path / f"file{idx}.csv"
+        path.write_text(f"row {idx}\n", encoding="utf-8")
+        cache.set(str(path), "utf-8", RowCheckpointIndex(interval=2, offsets=(0,), total_rows=1))
+
+    assert len(list((tmp_path / "index").glob("*.json"))) == 2
+    cache.clear()
+    assert list((tmp_path / "index").glob("*.json")) == []
@@ -0,0 +1,175 @@
+from unittest.mock import MagicMock, patch
+
+import openpyxl
+import pytest
+
+from src.cache.sheet_cache import SheetCache, estimate_sheets_size, get_sheet_cache, reset_sheet_cache
+from src.core_service import CoreService
+from src.models.columnar_sheet import build_columnar_sheet
+from src.models.table_model import Cell, Chart, Row, Sheet
+from src.parsers.xlsx_native_parser import XlsxNativeParser
+from src.parsers.xlsx_parser import XlsxParser
+from src.unified_config import UnifiedConfig
+
+
+def _sheet(name, rows=10):
+    return Sheet(name=name, rows=[Row(cells=[Cell(value=i)]) for i in range(rows)])
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "First"
+    workbook.active.append(["ID", "Name"])
+    workbook.active.append([1, "Alice"])
+    workbook.create_sheet("Second").append(["x"])
+    workbook.save(path)
+    return path
+
+
+def test_get_by_parser_and_sheet(data_file):
+    """测试按解析器类与工作表查找，整个工作簿的解析结果可用于单个工作表。"""
+    cache = SheetCache(max_bytes=1024 * 1024)
+    first, second = _sheet("First"), _sheet("Second")
+    cache.set(str(data_file), XlsxParser, None, [first, second])
+
+    assert cache.get(str(data_file), [XlsxParser]) == [first, second]
+    assert cache.get(str(data_file), [XlsxParser], "Second") == [second]
+    assert cache.get(str(data_file), [XlsxParser], "Missing") is None
+    assert cache.get(str(data_file), [XlsxNativeParser]) is None
+    assert cache.get(str(data_file), [XlsxNativeParser, XlsxParser], "First") == [first]
+
+
+def test_returns_copies_sharing_row_data(data_file):
+    """测试每次返回新的浅拷贝，行数据共享，调用方提取的图表不进入缓存。"""
+    cache = SheetCache(max_bytes=1024 * 1024)
+    sheet = _sheet("First")
+    cache.set(str(data_file), XlsxParser, None, [sheet])
+
+    cached = cache.get(str(data_file), [XlsxParser])[0]
+    cached.charts = [Chart(name="c", type="bar")]
+    assert cached is not sheet and cached.rows is sheet.rows
+    assert cache.get(str(data_file), [XlsxParser])[0].charts == []
+
+
+def test_pending_charts_are_not_extracted_on_set(data_file):
+    """测试缓存时不调用延迟图表加载函数，缓存的拷贝改为按文件路径提取。"""
+    cache = SheetCache(max_bytes=1024 * 1024)
+    loader = MagicMock(return_value=[])
+    sheet = _sheet("First")
+    sheet.chart_loader = loader
+    cache.set(str(data_file), XlsxParser, None, [sheet])
+
+    loader.assert_not_called()
+    assert sheet.chart_loader is loader
+    charts = [Chart(name="c", type="bar")]
+    with patch.object(XlsxParser, "load_sheet_visuals", return_value=charts) as mock_load:
+        assert cache.get(str(data_file), [XlsxParser])[0].get_charts() == charts
+    mock_load.assert_called_once_with(str(data_file), "First")
+    loader.assert_not_called()
+
+    # 无法按文件路径提取图表的解析器，其结果不缓存
+    cache.set(str(data_file), XlsxNativeParser, None, [sheet])
+    assert cache.get(str(data_file), [XlsxNativeParser]) is None
+
+
+def test_chart_bytes_are_estimated():
+    """测试已提取的图表与图片的数据计入估算大小。"""
+    sheet = _sheet("First")
+    plain_size = estimate_sheets_size([sheet])
+    sheet.charts = [Chart(name="img", type="image", chart_data={"image_data": b"x" * 100_000})]
+
+    assert estimate_sheets_size([sheet]) > plain_size + 100_000
+
+
+def test_file_change_and_missing_file(data_file, tmp_path):
+    """测试文件变化后不再命中，不存在的文件与空结果不缓存。"""
+    cache = SheetCache(max_bytes=1024 * 1024)
+    cache.set(str(data_file), XlsxParser, None, [_sheet("First")])
+    data_file.write_bytes(data_file.read_bytes() + b"\0")
+    assert cache.get(str(data_file), [XlsxParser]) is None
+
+    missing = str(tmp_path / "missing.xlsx")
+    cache.set(missing, XlsxParser, None, [_sheet("First")])
+    cache.set(str(data_file), XlsxParser, "Empty", [])
+    assert cache.get(missing, [XlsxParser]) is None
+    assert cache.get(str(data_file), [XlsxParser], "Empty") is None
+
+
+def test_byte_budget(data_file, tmp_path):
+    """测试按估算大小淘汰最久未使用的条目。"""
+    other = tmp_path / "other.xlsx"
+    other.write_bytes(data_file.read_bytes() + b"\0")
+    sheets = [_sheet("First", rows=100)]
+    cache = SheetCache(max_bytes=estimate_sheets_size(sheets) + 100)
+    cache.set(str(data_file), XlsxParser, None, sheets)
+    cache.set(str(other), XlsxParser, None, [_sheet("First", rows=100)])
+
+    assert cache.get(str(data_file), [XlsxParser]) is None
+    assert cache.get(str(other), [XlsxParser]) is not None
+
+
+def test_columnar_sheets_are_estimated_compactly():
+    """测试列式工作表按列存储估算，小于同样内容的稠密行。"""
+    data = [["h1", "h2"]] + [[i, "same"] for i in range(1000)]
+    columnar = build_columnar_sheet("t", data)
+    dense = Sheet(name="t", rows=[Row(cells=[Cell(value=value) for value in row]) for row in data])
+
+    assert 0 < estimate_sheets_size([columnar]) < estimate_sheets_size([dense]) / 4
+
+
+def test_entry_points_share_parsed_workbook(data_file):
+    """测试 convert_to_html、parse_sheet 与 parse_sheet_optimized 共用一次解析结果。"""
+    reset_sheet_cache()
+    service = CoreService()
+    try:
+        with patch.object(XlsxParser, "parse", autospec=True, side_effect=XlsxParser.parse) as mock_parse, \
+                patch.object(XlsxNativeParser, "parse", autospec=True,
+                             side_effect=XlsxNativeParser.parse) as mock_native_parse, \
+                patch("src.core_service.get_cache_manager") as mock_cache_manager:
+            mock_cache_manager.return_value.get.return_value = None
+            service.convert_to_html(str(data_file), str(data_file.with_suffix(".html")))
+            json_data = service.parse_sheet(str(data_file), range_string="A1:B2", enable_streaming=False)
+            optimized = service.parse_sheet_optimized(str(data_file), sheet_name="First", range_string="A1:B2")
+
+        assert mock_parse.call_count == 1
+        assert mock_native_parse.call_count == 0
+        assert json_data["rows"][0][1]["value"] == "Alice"
+        assert optimized["headers"] == ["ID", "Name"]
+        assert optimized["rows"] == [[{"value": 1}, {"value": "Alice"}]]
+    finally:
+        reset_sheet_cache()
+
+
+def test_get_sheet_cache_disabled():
+    """测试容量为0或缓存被禁用时不使用工作表缓存。"""
+    reset_sheet_cache()
+    with patch("src.cache.sheet_cache.get_config", return_value=UnifiedConfig(sheet_cache_size_mb=0)):
+        assert get_sheet_cache() is None
+    with patch("src.cache.sheet_cache.get_config", return_value=UnifiedConfig(cache_enabled=False)):
+        assert get_sheet_cache() is None
+    with patch("src.cache.sheet_cache.get_config", return_value=UnifiedConfig(sheet_cache_size_mb=1)):
+        assert get_sheet_cache() is get_sheet_cache()
+    reset_sheet_cache()
+
+
+def test_cached_sheet_loads_charts_from_file(tmp_path):
+    """测试缓存命中的工作表按文件路径重新提取图表。"""
+    from openpyxl.chart import BarChart, Reference
+
+    path = tmp_path / "chart.xlsx"
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    for row in [["x", "y"], [1, 2], [2, 3]]:
+        worksheet.append(row)
+    chart = BarChart()
+    chart.add_data(Reference(worksheet, min_col=2, min_row=1, max_row=3), titles_from_data=True)
+    worksheet.add_chart(chart, "D2")
+    workbook.save(path)
+
+    cache = SheetCache(max_bytes=1024 * 1024)
+    cache.set(str(path), XlsxParser, None, XlsxParser().parse(str(path)))
+    charts = cache.get(str(path), [XlsxParser])[0].get_charts()
+
+    assert [chart.type for chart in charts] == ["bar"]
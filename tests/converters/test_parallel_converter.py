@@ -0,0 +1,78 @@
+"""
+多工作表并行转换模块的测试。
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import openpyxl
+import pytest
+
+from src.converters.html_converter import HTMLConverter
+from src.converters.parallel_converter import _convert_sheet_job, _initialize_worker, convert_sheets_in_parallel
+from src.parsers.xlsx_native_parser import XlsxNativeParser
+from src.parsers.xlsx_parser import XlsxParser
+from src.unified_config import UnifiedConfig, get_config, get_config_manager
+
+
+@pytest.fixture
+def multi_sheet_file(tmp_path):
+    """创建包含两个工作表的工作簿。"""
+    path = tmp_path / "book.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "First"
+    workbook.active.append(["A", 1])
+    workbook.create_sheet("Second").append(["B", 2])
+    workbook.save(path)
+    return str(path)
+
+
+def test_convert_sheets_in_parallel_matches_serial(multi_sheet_file, tmp_path):
+    """测试进程池中转换的结果与串行转换的HTML内容一致。"""
+    results = convert_sheets_in_parallel(
+        multi_sheet_file, ["First", "Second"], str(tmp_path / "parallel" / "out.html"), max_workers=2
+    )
+    serial = HTMLConverter().convert_to_files(
+        XlsxParser().parse(multi_sheet_file), str(tmp_path / "serial" / "out.html")
+    )
+
+    assert [result["sheet_name"] for result in results] == ["First", "Second"]
+    assert all(result["status"] == "success" for result in results)
+    assert Path(results[1]["output_path"]).name == "out-Second.html"
+    for parallel_result, serial_result in zip(results, serial):
+        assert Path(parallel_result["output_path"]).read_text(encoding="utf-8") == \
+            Path(serial_result["output_path"]).read_text(encoding="utf-8")
+
+
+def test_convert_sheet_job_missing_sheet(multi_sheet_file, tmp_path):
+    """测试工作表不存在时返回错误结果而不是抛出异常。"""
+    result = _convert_sheet_job(multi_sheet_file, "Missing", str(tmp_path / "out.html"), 1, False)
+
+    assert result["status"] == "error"
+    assert result["sheet_name"] == "Missing"
+    assert not (tmp_path / "out.html").exists()
+
+
+def test_worker_applies_config_snapshot_and_parser_class(multi_sheet_file, tmp_path):
+    """测试工作进程应用主进程的配置快照，并使用主进程选定的解析器类。"""
+    config = UnifiedConfig(columnar_sheets=True, trim_used_range=False)
+    try:
+        _initialize_worker(config)
+        assert get_config() is config
+
+        with patch.object(XlsxNativeParser, "parse", autospec=True,
+                          side_effect=XlsxNativeParser.parse) as mock_parse:
+            result = _convert_sheet_job(multi_sheet_file, "Second", str(tmp_path / "out.html"), 1, False,
+                                        XlsxNativeParser)
+        assert result["status"] == "success"
+        mock_parse.assert_called_once()
+    finally:
+        get_config_manager().reset_to_defaults()
+
+
+def test_initialize_worker_without_snapshot_keeps_config():
+    """测试未提供配置快照时工作进程保留当前配置。"""
+    config = get_config()
+    _initialize_worker(None)
+
+    assert get_config() is config
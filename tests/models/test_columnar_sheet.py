@@ -0,0 +1,153 @@
+"""
+列式工作表模块的测试。
+"""
+
+import pickle
+from datetime import datetime
+
+import pytest
+
+from src.models.columnar_sheet import (
+    BOOL_KIND, FLOAT_KIND, INT_KIND, NULL_KIND, OBJECT_KIND, STRING_KIND,
+    Column, ColumnarSheet, ColumnarSheetBuilder, build_columnar_sheet
+)
+from src.models.table_model import Cell, Row, Sheet, Style
+
+
+def _row_values(rows):
+    return [[cell.value for cell in row.cells] for row in rows]
+
+
+@pytest.mark.parametrize("values, kind", [
+    ([1, None, 3], INT_KIND),
+    ([1.5, None, 2.0], FLOAT_KIND),
+    ([True, None, False], BOOL_KIND),
+    (["a", None, "a", "b"], STRING_KIND),
+    ([datetime(2024, 1, 1), None], OBJECT_KIND),
+    ([None, None], NULL_KIND),
+])
+def test_column_typed_storage(values, kind):
+    """测试列按第一个非空值的类型选择存储方式，取出的值与写入时相同。"""
+    column = Column()
+    for value in values:
+        column.append(value)
+
+    assert column.kind == kind
+    assert column.to_list() == values
+    assert [column.get(i) for i in range(len(values))] == values
+    assert column.null_count == values.count(None)
+
+
+def test_column_dictionary_encodes_strings():
+    """测试字符串列只保存不同的字符串一次。"""
+    column = Column()
+    for value in ["北京", "上海", "北京", "北京", None]:
+        column.append(value)
+
+    assert column.dictionary == [None, "北京", "上海"]
+    assert column.to_list(1, 4) == ["上海", "北京", "北京"]
+
+
+@pytest.mark.parametrize("values", [
+    [1, 2.5],           # 整数与浮点数混合时不把整数转为浮点数
+    [1, "x", None],
+    ["x", 2],
+    [True, 1],          # 布尔值与整数不混用同一数组
+    [1, 2 ** 70],       # 超出64位整数范围
+])
+def test_column_falls_back_to_object(values):
+    """测试出现其他类型的值时整列转为 object 存储，值与类型保持不变。"""
+    column = Column()
+    for value in values:
+        column.append(value)
+
+    assert column.kind == OBJECT_KIND
+    assert column.to_list() == values
+    assert [type(value) for value in column.to_list()] == [type(value) for value in values]
+
+
+def test_builder_keeps_header_styles_and_formulas():
+    """测试表头单独保存，样式按实例编号保存，公式按坐标保存。"""
+    bold = Style(bold=True)
+    builder = ColumnarSheetBuilder()
+    builder.append_row(["名称", "数量"], [bold, bold])
+    builder.append_row(["苹果", 3], [None, bold], {1: "=1+2"})
+    builder.append_row(["香蕉"])
+    sheet = builder.build("水果", merged_cells=["A1:B1"])
+
+    assert sheet.get_total_rows() == 3
+    assert sheet.count_cells() == 5
+    assert sheet.has_styles()
+    assert sheet.styles == [None, bold]
+    assert [column.kind for column in sheet.columns] == [STRING_KIND, INT_KIND]
+    assert sheet.merged_cells == ["A1:B1"]
+
+    rows = list(sheet.iter_rows())
+    assert _row_values(rows) == [["名称", "数量"], ["苹果", 3], ["香蕉"]]
+    assert rows[1].cells[1] == Cell(value=3, style=bold, formula="=1+2")
+    assert rows[1].cells[0].style is None
+    assert rows[0].cells[0].style is bold
+
+
+def test_sheet_views_match_row_layout():
+    """测试 rows、iter_rows 和 iter_row_values 与普通 Sheet 的行视图一致。"""
+    data = [["a", "b", "c"], [1, 2.5, None], [None, "x", True], [4, None, False]]
+    sheet = build_columnar_sheet("t", data)
+    plain = Sheet(name="t", rows=[Row(cells=[Cell(value=value) for value in row]) for row in data])
+
+    assert _row_values(sheet.iter_rows(1, 2)) == _row_values(plain.iter_rows(1, 2))
+    assert list(sheet.iter_row_values(2)) == data[2:]
+    assert list(sheet.iter_row_values(0, 1)) == data[:1]
+    assert list(sheet.iter_rows(10)) == []
+    assert sheet.rows == plain.rows
+    assert not sheet.has_styles()
+
+
+def test_iter_row_values_converts_object_columns():
+    """测试 convert_objects 只应用于表头和 object 列。"""
+    sheet = build_columnar_sheet("t", [["日期", "值"], [datetime(2024, 1, 2), 1], [None, 2]])
+    converted = list(sheet.iter_row_values(convert_objects=lambda value: repr(value) if value else value))
+
+    assert converted == [["'日期'", "'值'"], ["datetime.datetime(2024, 1, 2, 0, 0)", 1], [None, 2]]
+
+
+def test_rows_are_materialised_once_and_pickle():
+    """测试首次访问 rows 后转换结果被缓存，且工作表可以序列化。"""
+    sheet = build_columnar_sheet("t", [["h"], ["v1"], ["v2"]])
+    sheet.rows.append(Row(cells=[Cell(value="v3")]))
+
+    assert sheet.get_total_rows() == 4
+    assert _row_values(sheet.iter_rows(3)) == [["v3"]]
+
+    restored = pickle.loads(pickle.dumps(sheet))
+    assert isinstance(restored, ColumnarSheet)
+    assert restored.rows == sheet.rows
+
+
+def test_empty_sheet():
+    """测试没有任何行的列式工作表。"""
+    sheet = ColumnarSheetBuilder().build("empty")
+
+    assert sheet.get_total_rows() == 0
+    assert sheet.count_cells() == 0
+    assert sheet.rows == []
+    assert not sheet.has_styles()
+
+
+@pytest.mark.parametrize("values", [
+    [1, None, 3], [1.5, None], [True, False, None], ["a", None, "a", "b"], [None, None],
+    [1, 2.5], [1, 2 ** 70], [datetime(2024, 1, 1), None], [], [None] * 9 + ["x"],
+])
+def test_column_from_values_matches_append(values):
+    """测试按整列构建的列与逐个追加值得到的列存储类型和取值相同。"""
+    appended = Column()
+    for value in values:
+        appended.append(value)
+    column = Column.from_values(values)
+
+    assert column.kind == appended.kind
+    assert column.null_count == appended.null_count
+    assert column.to_list() == values
+    assert [column.get(i) for i in range(len(values))] == values
+    column.append("tail")
+    assert column.to_list() == values + ["tail"]
@@ -0,0 +1,110 @@
+"""
+稀疏工作表模块的测试。
+"""
+
+import pickle
+
+from src.models.sparse_sheet import SparseSheet, SparseSheetBuilder, should_use_sparse
+from src.models.table_model import Cell, Row, Sheet, Style
+
+DEFAULT = Style()
+FILL = Style(background_color="#FFFF00")
+BOLD = Style(bold=True)
+
+
+def _build():
+    """3行、5列：第0行有两个值，第1行为填充色游程，第2行与第1行相同。"""
+    builder = SparseSheetBuilder(default_style=DEFAULT)
+    builder.add_cell(0, 0, "名称", BOLD)
+    builder.add_cell(0, 1, None, DEFAULT)
+    builder.add_cell(0, 3, 3, formula="=1+2")
+    for row in (1, 2):
+        builder.add_cell(row, 1, None, FILL)
+        builder.add_cell(row, 2, None, FILL)
+    return builder.build("稀疏", row_count=4, column_count=5, merged_cells=["A1:B1"])
+
+
+def _dense(sheet):
+    return [[(cell.value, cell.style, cell.formula) for cell in row.cells] for row in sheet.iter_rows()]
+
+
+def test_builder_keeps_values_and_style_runs():
+    """测试只保存有值或公式的单元格，只有样式的空单元格合并为游程，相同的行共享存储。"""
+    sheet = _build()
+
+    assert sheet.sparse_rows[0].cells.keys() == {0, 3}
+    assert sheet.sparse_rows[1].runs == ((1, 2, FILL),)
+    assert sheet.sparse_rows[1] is sheet.sparse_rows[2]
+    assert 3 not in sheet.sparse_rows
+    assert sheet.count_cells() == 20
+    assert sheet.count_stored_cells() == 2
+    assert sheet.merged_cells == ["A1:B1"]
+
+
+def test_dense_views_match_grid():
+    """测试 iter_rows、iter_row_values 和 iter_row_styles 呈现完整的矩形网格。"""
+    sheet = _build()
+    dense = _dense(sheet)
+
+    assert len(dense) == 4 and all(len(row) == 5 for row in dense)
+    assert dense[0][0] == ("名称", BOLD, None)
+    assert dense[0][3] == (3, None, "=1+2")
+    assert dense[1][:3] == [(None, DEFAULT, None), (None, FILL, None), (None, FILL, None)]
+    assert dense[3] == [(None, DEFAULT, None)] * 5
+    assert list(sheet.iter_row_values(0, 1, convert_objects=str)) == [["名称", None, None, "3", None]]
+    assert list(sheet.iter_row_styles(1, 1)) == [[DEFAULT, FILL, FILL, DEFAULT, DEFAULT]]
+    assert sheet.rows == [Row(cells=[Cell(value=v, style=s, formula=f) for v, s, f in row]) for row in dense]
+
+
+def test_content_rows_stop_at_last_stored_cell():
+    """测试 iter_content_rows 省略行尾的空单元格。"""
+    sheet = _build()
+
+    assert [len(row.cells) for row in sheet.iter_content_rows()] == [4, 3, 3, 0]
+
+
+def test_iter_styles_matches_dense_order():
+    """测试样式首次出现的顺序与遍历稠密行时相同。"""
+    sheet = _build()
+
+    def first_seen(styles):
+        return list(dict.fromkeys(style for style in styles))
+
+    assert first_seen(sheet.iter_styles()) == first_seen(style for row in _dense(sheet) for _, style, _ in row)
+    assert sheet.has_styles()
+
+
+def test_slice_rows_and_materialised_rows():
+    """测试按行截取仍为稀疏工作表；rows 被修改后各视图以 rows 为准。"""
+    sheet = _build()
+    page = sheet.slice_rows(1, 3, merged_cells=[])
+
+    assert isinstance(page, SparseSheet)
+    assert _dense(page) == _dense(sheet)[1:3]
+
+    sheet.rows.append(Row(cells=[Cell(value="新行")]))
+    assert sheet.get_total_rows() == 5
+    assert list(sheet.iter_row_values(4)) == [["新行"]]
+    assert isinstance(sheet.slice_rows(0, 1), Sheet)
+
+    restored = pickle.loads(pickle.dumps(sheet))
+    assert restored.rows == sheet.rows
+
+
+def test_unstyled_sheet():
+    """测试没有样式的稀疏工作表。"""
+    builder = SparseSheetBuilder()
+    builder.add_cell(5, 2, "x")
+    sheet = builder.build("t", row_count=6, column_count=3)
+
+    assert not sheet.has_styles()
+    assert list(sheet.iter_row_values(5)) == [[None, None, "x"]]
+    assert set(sheet.iter_styles()) == {None}
+
+
+def test_should_use_sparse():
+    """测试只有网格足够大且有值单元格比例足够低时使用稀疏存储。"""
+    assert should_use_sparse(10, 1000, 100, max_density=0.1, min_cells=10000)
+    assert not should_use_sparse(20000, 1000, 100, max_density=0.1, min_cells=10000)
+    assert not should_use_sparse(10, 10, 10, max_density=0.1, min_cells=10000)
+    assert not should_use_sparse(0, 1000, 100, max_density=0, min_cells=10000)
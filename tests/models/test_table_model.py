@@ -1,3 +1,5 @@
+import dataclasses
+
 import pytest
 from src.models.table_model import (
     RichTextFragmentStyle, RichTextFragment, Cell, Style, Row, Sheet, 
@@ -182,6 +184,28 @@ class TestStyle:
         assert style.hyperlink == "http://example.com"
         assert style.comment == "Test comment"
 
+    def test_style_is_immutable_and_hashable(self):
+        """测试Style不可修改、可作为共享值使用，修改需通过 dataclasses.replace 生成新对象。"""
+        style = Style(bold=True, font_color="#FF0000")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            style.bold = False
+
+        bolder = dataclasses.replace(style, italic=True)
+        assert bolder is not style
+        assert style.italic is False
+        assert {style, Style(bold=True, font_color="#FF0000")} == {style}
+
+    def test_cell_and_row_use_slots(self):
+        """测试Cell和Row使用 __slots__，不创建实例字典。"""
+        cell = Cell(value=1)
+        row = Row(cells=[cell])
+
+        assert not hasattr(cell, "__dict__")
+        assert not hasattr(row, "__dict__")
+        with pytest.raises(AttributeError):
+            cell.rich_text = []
+
 class TestRow:
     """测试Row类。"""
 
@@ -313,6 +337,25 @@ class TestSheet:
         assert sheet.default_column_width == 10.0
         assert sheet.default_row_height == 20.0
 
+    def test_sheet_get_charts_resolves_loader_once(self):
+        """
+        TDD测试：Sheet.get_charts应该在首次访问时才调用chart_loader，并缓存结果
+        """
+        chart = Chart(name="Chart1", type="line", anchor="A1")
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [chart]
+
+        sheet = Sheet(name="TestSheet", rows=[], chart_loader=loader)
+
+        assert calls == []
+        assert sheet.get_charts() == [chart]
+        assert sheet.get_charts() == [chart]
+        assert calls == [1]
+        assert sheet == Sheet(name="TestSheet", rows=[], charts=[chart])
+
 class MockRowProvider:
     """模拟的行提供者，用于测试LazySheet。"""
 
@@ -386,6 +429,70 @@ class TestLazySheet:
 
         assert total_rows == 10
 
+    def test_lazy_sheet_close_delegates_to_provider(self):
+        """
+        测试LazySheet关闭时释放提供者资源，提供者没有close方法时忽略
+        """
+        from unittest.mock import MagicMock
+
+        provider = MagicMock()
+        with LazySheet(name="Closable", provider=provider):
+            pass
+        provider.close.assert_called_once()
+
+        LazySheet(name="Plain", provider=MockRowProvider(total_rows=1)).close()
+
+    def test_lazy_sheet_estimate_total_rows(self):
+        """
+        测试LazySheet优先使用提供者的估算行数，提供者不支持估算时返回精确行数
+        """
+        from unittest.mock import MagicMock
+
+        provider = MagicMock()
+        provider.estimate_total_rows.return_value = 1000
+        lazy_sheet = LazySheet(name="Estimated", provider=provider)
+        assert lazy_sheet.estimate_total_rows() == 1000
+        provider.get_total_rows.assert_not_called()
+
+        assert LazySheet(name="Plain", provider=MockRowProvider(total_rows=7)).estimate_total_rows() == 7
+
+    def test_lazy_sheet_block_cache_serves_repeated_windows(self):
+        """
+        测试LazySheet按块缓存读取过的行，再次读取同一窗口时不访问提供者
+        """
+        from unittest.mock import MagicMock
+        from src.cache.lru_cache import LRURowBlockCache
+
+        provider = MockRowProvider(total_rows=10)
+        provider.iter_rows = MagicMock(side_effect=MockRowProvider(total_rows=10).iter_rows)
+        cache = LRURowBlockCache()
+        lazy_sheet = LazySheet(name="Cached", provider=provider, block_cache=cache,
+                               cache_key=("fingerprint", "Cached"), block_rows=4)
+
+        rows = list(lazy_sheet.iter_rows(start_row=3, max_rows=3))
+        assert [row.cells[0].value for row in rows] == ["Row3Col0", "Row4Col0", "Row5Col0"]
+        # 两个未缓存的相邻行块合并为一次读取
+        provider.iter_rows.assert_called_once_with(0, 8)
+
+        assert lazy_sheet.get_row(0).cells[0].value == "Row0Col0"
+        assert [row.cells[0].value for row in lazy_sheet.iter_rows(5, 2)] == ["Row5Col0", "Row6Col0"]
+        assert [[cell.value for cell in row.cells] for row in lazy_sheet.iter_rows(1, 2, col_range=(2, 3))] == \
+            [["Row1Col2", None], ["Row2Col2", None]]
+        assert provider.iter_rows.call_count == 1
+
+        # 表尾不满一块的行块同样被缓存
+        assert [row.cells[0].value for row in lazy_sheet.iter_rows(7, 10)] == ["Row7Col0", "Row8Col0", "Row9Col0"]
+        assert provider.iter_rows.call_count == 2
+        assert len(list(lazy_sheet.iter_rows(6, 10))) == 4
+        assert provider.iter_rows.call_count == 2
+        # 超出表尾的空行块也被缓存
+        assert list(lazy_sheet.iter_rows(12, 2)) == []
+        assert list(lazy_sheet.iter_rows(12, 2)) == []
+        assert provider.iter_rows.call_count == 3
+
+        with pytest.raises(IndexError):
+            lazy_sheet.get_row(10)
+
 class MockStreamingParser(StreamingCapable):
     """模拟的流式解析器，用于测试StreamingCapable。"""
 
@@ -157,6 +157,11 @@ def test_generate_next_steps_guidance():
     guidance = _generate_next_steps_guidance(result_meta, True, False)
     assert "设置include_styles=true获取样式数据" in guidance[0]
 
+    # Case 2b: Styles unknown (native engine)
+    result_meta = {"metadata": {"total_rows": 10, "preview_rows": 10, "has_styles": None, "total_cells": 50}}
+    guidance = _generate_next_steps_guidance(result_meta, True, False)
+    assert "未读取样式信息" in guidance[0]
+
     # Case 3: Large file
     result_meta = {"metadata": {"total_rows": 10, "preview_rows": 10, "has_styles": False, "total_cells": 2000}}
     guidance = _generate_next_steps_guidance(result_meta, True, True)
@@ -1,7 +1,7 @@
 import pytest
 from abc import ABC
-from src.parsers.base_parser import BaseParser
-from src.models.table_model import Sheet, LazySheet
+from src.parsers.base_parser import BaseParser, build_lazy_sheet, project_sheet
+from src.models.table_model import Sheet, LazySheet, Row, Cell
 
 
 class ConcreteParser(BaseParser):
@@ -205,3 +205,37 @@ def test_abstract_parse_method_direct_call():
 
     # 抽象方法的pass语句应该返回None
     assert result is None
+
+
+def test_project_sheet():
+    """测试按范围截取工作表，超出范围的部分被忽略。"""
+    sheet = Sheet(name="S", rows=[Row(cells=[Cell(value=r * 10 + c) for c in range(3)]) for r in range(3)],
+                  merged_cells=["A1:B1"])
+
+    projected = project_sheet(sheet, (1, 1, 5, 5))
+
+    assert projected.name == "S"
+    assert [[cell.value for cell in row.cells] for row in projected.rows] == [[11, 12], [21, 22]]
+    assert projected.merged_cells == []
+
+
+def test_build_lazy_sheet_shares_row_blocks(tmp_path):
+    """测试同一文件创建的多个LazySheet共享行块缓存，文件变化后不再命中。"""
+    from unittest.mock import MagicMock, patch
+    from src.unified_config import UnifiedConfig
+
+    data_file = tmp_path / "data.csv"
+    data_file.write_text("a\nb\n", encoding="utf-8")
+    provider = MagicMock()
+    provider.iter_rows.side_effect = lambda start, count: iter([Row(cells=[Cell(value="a")])])
+
+    build_lazy_sheet(str(data_file), "data", provider).get_row(0)
+    assert build_lazy_sheet(str(data_file), "data", provider).get_row(0).cells[0].value == "a"
+    assert provider.iter_rows.call_count == 1
+
+    data_file.write_text("changed\n", encoding="utf-8")
+    build_lazy_sheet(str(data_file), "data", provider).get_row(0)
+    assert provider.iter_rows.call_count == 2
+
+    with patch('src.cache.lru_cache.get_config', return_value=UnifiedConfig(row_block_cache_size_mb=0)):
+        assert build_lazy_sheet(str(data_file), "data", provider)._block_cache is None
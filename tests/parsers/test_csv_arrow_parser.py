@@ -0,0 +1,123 @@
+"""
+CSV Arrow解析器的测试。
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.parsers.base_parser import project_sheet
+from src.models.columnar_sheet import ColumnarSheet
+from src.parsers.csv_arrow_parser import CsvArrowParser
+from src.parsers.csv_parser import CsvParser
+
+
+@pytest.fixture
+def typed_csv(tmp_path):
+    """创建包含整数、浮点数、布尔值、日期时间、空值和多行文本列的CSV文件。"""
+    path = tmp_path / "typed.csv"
+    path.write_text(
+        "id,price,active,updated,note\n"
+        "1,2.5,true,2024-01-02 08:30:00,\"第一行\n第二行\"\n"
+        "2,,false,2024-01-03 00:00:00,\n"
+        "3,4,true,2024-01-04 12:00:00,备注\n",
+        encoding="utf-8"
+    )
+    return path
+
+
+def _values(sheet):
+    return [[cell.value for cell in row.cells] for row in sheet.rows]
+
+
+def test_parse_infers_column_types(typed_csv):
+    """测试数值、布尔值、日期时间列按类型解析，首行保留为字符串表头。"""
+    sheet = CsvArrowParser().parse(str(typed_csv))[0]
+
+    assert isinstance(sheet, ColumnarSheet)
+    assert sheet.name == "typed"
+    assert _values(sheet) == [
+        ["id", "price", "active", "updated", "note"],
+        [1, 2.5, True, datetime(2024, 1, 2, 8, 30), "第一行\n第二行"],
+        [2, None, False, datetime(2024, 1, 3), ""],
+        [3, 4.0, True, datetime(2024, 1, 4, 12), "备注"],
+    ]
+
+
+def test_rows_are_materialized_on_demand(typed_csv):
+    """测试 iter_rows 和 get_total_rows 不转换全部行，访问 rows 后才缓存全部行。"""
+    sheet = CsvArrowParser().parse(str(typed_csv))[0]
+
+    assert sheet.get_total_rows() == 4
+    assert [[cell.value for cell in row.cells] for row in sheet.iter_rows(2, 5)] == [
+        [2, None, False, datetime(2024, 1, 3), ""],
+        [3, 4.0, True, datetime(2024, 1, 4, 12), "备注"],
+    ]
+    assert sheet._rows is None
+
+    assert sheet.rows is sheet.rows
+    assert sheet.get_total_rows() == 4
+
+
+@pytest.mark.parametrize("cell_range", [(0, 0, 1, 1), (1, 2, 3, 4), (2, 1, 10, 10), (0, 6, 2, 8)])
+def test_parse_with_cell_range_matches_projection(typed_csv, cell_range):
+    """测试下推 cell_range 的结果与截取完整解析结果相同。"""
+    parser = CsvArrowParser()
+    full_sheet = parser.parse(str(typed_csv))[0]
+
+    assert _values(parser.parse(str(typed_csv), cell_range=cell_range)[0]) == \
+        _values(project_sheet(full_sheet, cell_range))
+
+
+def test_parse_gbk_file(tmp_path):
+    """测试UTF-8读取失败时按GBK读取。"""
+    path = tmp_path / "gbk.csv"
+    path.write_bytes("名称,数量\n苹果,3\n".encode("gbk"))
+
+    assert _values(CsvArrowParser().parse(str(path))[0]) == [["名称", "数量"], ["苹果", 3]]
+
+
+@pytest.mark.parametrize("ascii_rows", [0, 10000])
+def test_parse_gbk_data_rows_with_ascii_header(tmp_path, ascii_rows):
+    """测试表头为ASCII、只有数据行是GBK时按GBK解码，不返回二进制值（非UTF-8行可在编码采样范围之外）。"""
+    path = tmp_path / "gbk_rows.csv"
+    path.write_bytes(b"name,val\n" + b"abcdef,0\n" * ascii_rows + "张三,1\n".encode("gbk"))
+
+    values = _values(CsvArrowParser().parse(str(path))[0])
+    assert values[0] == ["name", "val"]
+    assert values[-1] == ["张三", 1]
+
+
+def test_fallback_to_csv_parser(tmp_path):
+    """测试各行列数不一致或 pyarrow 不可用时回退到 CsvParser。"""
+    path = tmp_path / "ragged.csv"
+    path.write_text("a,b\n1,2,3\n4\n", encoding="utf-8")
+    expected = _values(CsvParser().parse(str(path))[0])
+
+    assert _values(CsvArrowParser().parse(str(path))[0]) == expected
+
+    path.write_text("a,b\n1,2\n", encoding="utf-8")
+    with patch.dict("sys.modules", {"pyarrow": None}):
+        assert _values(CsvArrowParser().parse(str(path))[0]) == [["a", "b"], ["1", "2"]]
+
+
+def test_parse_sheet_name_and_missing_file(typed_csv):
+    """测试工作表名称不符时返回空列表，文件不存在时抛出 FileNotFoundError。"""
+    parser = CsvArrowParser()
+
+    assert parser.parse(str(typed_csv), sheet_name="other") == []
+    with pytest.raises(FileNotFoundError):
+        parser.parse(str(typed_csv.with_name("missing.csv")))
+
+
+def test_optimized_parse_does_not_materialise_rows(typed_csv):
+    """测试 parse_sheet_optimized 使用 arrow 引擎时按列读取数据，不转换出 Row/Cell 对象。"""
+    from src.core_service import CoreService
+
+    rows = property(lambda self: pytest.fail("rows 被转换"), ColumnarSheet.rows.fset)
+    with patch.object(ColumnarSheet, "rows", rows):
+        result = CoreService().parse_sheet_optimized(str(typed_csv), engine="arrow", include_full_data=True)
+
+    assert result["headers"] == ["id", "price", "active", "updated", "note"]
+    assert result["rows"][0][0] == {"value": 1}
@@ -1,6 +1,11 @@
+import csv
 import pytest
 from pathlib import Path
-from src.parsers.csv_parser import CsvParser, CsvRowProvider
+from unittest.mock import patch
+from src.parsers.base_parser import project_sheet
+from src.cache.row_index_cache import RowIndexCache
+from src.parsers.csv_parser import CsvParser, CsvRowProvider, ROW_INDEX_INTERVAL
+from src.models.columnar_sheet import ColumnarSheet
 from src.models.table_model import Sheet, LazySheet
 
 @pytest.fixture
@@ -52,12 +57,58 @@ class TestCsvParser:
         assert sheet.rows[0].cells[0].value == "标题1"
         assert sheet.rows[1].cells[1].value == "值2"
 
+    def test_parse_builds_columnar_sheet(self, create_csv_file):
+        """测试默认直接生成字典编码的 ColumnarSheet，关闭 columnar_sheets 配置时生成普通 Sheet。"""
+        file_path = create_csv_file("columnar.csv", "city,count\n北京,1\n上海,2\n北京,3")
+
+        sheet = CsvParser().parse(str(file_path))[0]
+        assert isinstance(sheet, ColumnarSheet)
+        assert sheet.columns[0].dictionary == [None, "北京", "上海"]
+
+        with patch("src.parsers.csv_parser.get_config") as mock_get_config:
+            mock_get_config.return_value.columnar_sheets = False
+            mock_get_config.return_value.get_parallel_csv_workers.return_value = 1
+            plain = CsvParser().parse(str(file_path))[0]
+        assert type(plain) is Sheet
+        assert plain.rows == sheet.rows
+
     def test_file_not_found(self):
         """测试当文件不存在时是否会抛出FileNotFoundError。"""
         parser = CsvParser()
         with pytest.raises(FileNotFoundError):
             parser.parse("non_existent_file.csv")
 
+    def test_parse_sheet_name(self, create_csv_file):
+        """测试指定工作表名称：与文件名一致时正常解析，否则不读取文件并返回空列表。"""
+        file_path = create_csv_file("named.csv", "a,b\nc,d")
+        parser = CsvParser()
+
+        assert [sheet.name for sheet in parser.parse(str(file_path), "named")] == ["named"]
+        with patch("builtins.open") as mock_file:
+            assert parser.parse(str(file_path), "other") == []
+        mock_file.assert_not_called()
+        assert parser.get_sheet_names(str(file_path)) == ["named"]
+
+    def test_parse_cell_range(self, create_csv_file):
+        """测试指定范围时只读取范围内的行列，结果与完整解析后截取一致。"""
+        file_path = create_csv_file("ranged.csv", "a,b,c\nd,e\nf,g,h,i\nj,k,l")
+        parser = CsvParser()
+        full = parser.parse(str(file_path))[0]
+
+        for cell_range in [(1, 1, 2, 3), (0, 2, 9, 2), (5, 0, 9, 1)]:
+            sheet = parser.parse(str(file_path), cell_range=cell_range)[0]
+            assert [[cell.value for cell in row.cells] for row in sheet.rows] == \
+                [[cell.value for cell in row.cells] for row in project_sheet(full, cell_range).rows]
+
+    def test_row_provider_col_range(self, create_csv_file):
+        """测试行提供者只产出指定列，超出行宽的列补空单元格。"""
+        file_path = create_csv_file("cols.csv", "a,b,c\nd,e")
+        lazy_sheet = CsvParser().create_lazy_sheet(str(file_path))
+
+        rows = list(lazy_sheet.iter_rows(0, None, col_range=(1, 2)))
+
+        assert [[cell.value for cell in row.cells] for row in rows] == [["b", "c"], ["e", None]]
+
     def test_supports_streaming(self):
         """测试解析器是否正确报告其支持流式处理。"""
         parser = CsvParser()
@@ -373,4 +424,84 @@ class TestCsvParserStyleExtraction:
         # 验证所有单元格的样式都是None
         for row in sheet.rows:
             for cell in row.cells:
-                assert cell.style is None
\ No newline at end of file
+                assert cell.style is None
+
+
+class TestCsvRowProviderIndex:
+    """测试CsvRowProvider的行检查点索引。"""
+
+    @staticmethod
+    def _write_records(tmp_path, count, encoding='utf-8'):
+        """写出包含引号内换行的CSV文件，返回文件路径和按csv模块读取的全部记录。"""
+        file_path = tmp_path / "indexed.csv"
+        lines = []
+        for idx in range(count):
+            note = f'"第{idx}行\n含换行, 和逗号"' if idx % 7 == 0 else f"备注{idx}"
+            lines.append(f"{idx},{note}")
+        file_path.write_text("\n".join(lines), encoding=encoding)
+        with open(file_path, mode='r', encoding=encoding) as f:
+            records = list(csv.reader(f))
+        return file_path, records
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "gbk"])
+    def test_seek_matches_sequential_read(self, tmp_path, encoding):
+        """测试通过检查点定位读取的行与从头顺序读取一致。"""
+        file_path, records = self._write_records(tmp_path, ROW_INDEX_INTERVAL * 3 + 5, encoding)
+        provider = CsvRowProvider(str(file_path), index_cache=RowIndexCache(tmp_path / "index"))
+
+        assert provider.get_total_rows() == len(records)
+        for start_row in [0, ROW_INDEX_INTERVAL - 1, ROW_INDEX_INTERVAL, ROW_INDEX_INTERVAL * 2 + 3,
+                          len(records) - 2]:
+            rows = list(provider.iter_rows(start_row, 3))
+            assert [[cell.value for cell in row.cells] for row in rows] == records[start_row:start_row + 3]
+        assert [cell.value for cell in provider.get_row(ROW_INDEX_INTERVAL * 3).cells] == \
+            records[ROW_INDEX_INTERVAL * 3]
+        assert list(provider.iter_rows(len(records), 3)) == []
+        with pytest.raises(IndexError):
+            provider.get_row(len(records))
+
+    def test_index_is_persisted_and_invalidated(self, tmp_path):
+        """测试索引按文件指纹保存并被新的提供者复用，文件变化后重新建立。"""
+        file_path, records = self._write_records(tmp_path, ROW_INDEX_INTERVAL * 2)
+        index_cache = RowIndexCache(tmp_path / "index")
+        CsvRowProvider(str(file_path), index_cache=index_cache).get_row(ROW_INDEX_INTERVAL)
+
+        with patch.object(CsvRowProvider, "_build_row_index") as mock_build:
+            provider = CsvRowProvider(str(file_path), index_cache=index_cache)
+            assert provider.get_total_rows() == len(records)
+            assert provider.get_row(ROW_INDEX_INTERVAL + 1).cells[0].value == records[ROW_INDEX_INTERVAL + 1][0]
+        mock_build.assert_not_called()
+        assert len(list((tmp_path / "index").glob("*.json"))) == 1
+
+        with open(file_path, mode='a', encoding='utf-8') as f:
+            f.write("\nextra,row")
+        assert CsvRowProvider(str(file_path), index_cache=index_cache).get_total_rows() == len(records) + 1
+
+    def test_small_file_index_is_not_persisted(self, create_csv_file):
+        """测试小文件只在内存中建立索引，不使用全局索引缓存。"""
+        file_path = create_csv_file("small.csv", "a,b\nc,d")
+
+        with patch("src.parsers.csv_parser.get_row_index_cache") as mock_get_cache:
+            assert CsvRowProvider(str(file_path)).get_total_rows() == 2
+        mock_get_cache.assert_not_called()
+
+    def test_total_rows_counted_without_index(self, tmp_path):
+        """测试获取总行数时按字节计数而不建立行索引，估算行数不扫描整个文件。"""
+        file_path, records = self._write_records(tmp_path, ROW_INDEX_INTERVAL * 2)
+        provider = CsvRowProvider(str(file_path), index_cache=RowIndexCache(tmp_path / "index"))
+
+        with patch("src.parsers.csv_parser.estimate_csv_records", return_value=123) as mock_estimate:
+            assert provider.estimate_total_rows() == 123
+        mock_estimate.assert_called_once_with(str(file_path))
+
+        with patch.object(CsvRowProvider, "_build_row_index") as mock_build:
+            assert provider.get_total_rows() == len(records)
+        mock_build.assert_not_called()
+        assert provider.estimate_total_rows() == len(records)
+
+    def test_total_rows_falls_back_to_index(self, tmp_path):
+        """测试引号不规范、无法按字节计数时通过建立行索引获取总行数。"""
+        file_path = tmp_path / "stray_quote.csv"
+        file_path.write_text('a,b"c\nd,e\n', encoding="utf-8")
+
+        assert CsvRowProvider(str(file_path)).get_total_rows() == 2
@@ -347,3 +347,33 @@ def test_create_lazy_sheet_without_sheet_name(mock_get_parser):
     mock_get_parser.assert_called_once_with("test.xlsx")
     mock_parser.create_lazy_sheet.assert_called_once_with("test.xlsx", None)
     assert result == mock_lazy_sheet
+
+@patch('src.parsers.factory.validate_file_input')
+def test_get_parser_native_engine(mock_validate):
+    """测试native引擎为XLSX返回原生解析器，对未提供该引擎的格式使用默认解析器。"""
+    from src.parsers.xlsx_native_parser import XlsxNativeParser
+
+    mock_validate.return_value = ("dummy.xlsx", "xlsx")
+    assert isinstance(ParserFactory.get_parser("dummy.xlsx", engine="native"), XlsxNativeParser)
+    assert type(ParserFactory.get_parser("dummy.xlsx", engine="default")) is XlsxParser
+
+    mock_validate.return_value = ("dummy.csv", "csv")
+    assert isinstance(ParserFactory.get_parser("dummy.csv", engine="native"), CsvParser)
+
+@patch('src.parsers.factory.validate_file_input')
+def test_get_parser_unknown_engine(mock_validate):
+    """测试未知引擎名称抛出ValueError。"""
+    mock_validate.return_value = ("dummy.xlsx", "xlsx")
+    with pytest.raises(ValueError, match="不支持的解析引擎"):
+        ParserFactory.get_parser("dummy.xlsx", engine="turbo")
+
+@patch('src.parsers.factory.validate_file_input')
+def test_get_parser_arrow_engine(mock_validate):
+    """测试arrow引擎为CSV返回pyarrow列式解析器，对XLSX使用默认解析器。"""
+    from src.parsers.csv_arrow_parser import CsvArrowParser
+
+    mock_validate.return_value = ("dummy.csv", "csv")
+    assert isinstance(ParserFactory.get_parser("dummy.csv", engine="arrow"), CsvArrowParser)
+
+    mock_validate.return_value = ("dummy.xlsx", "xlsx")
+    assert type(ParserFactory.get_parser("dummy.xlsx", engine="arrow")) is XlsxParser
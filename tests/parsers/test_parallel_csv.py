@@ -0,0 +1,105 @@
+"""
+CSV并行读取模块的测试。
+"""
+
+import csv
+from unittest.mock import patch
+
+import pytest
+
+from src.parsers.csv_parser import CsvParser, CsvRowProvider
+from src.parsers.parallel_csv import (
+    _parse_range, build_row_index_parallel, parse_csv_parallel, split_csv_ranges
+)
+
+
+@pytest.fixture
+def quoted_csv(tmp_path):
+    """创建包含引号内换行、转义引号和CRLF换行的CSV文件，返回文件路径和顺序读取的全部记录。"""
+    path = tmp_path / "quoted.csv"
+    lines = []
+    for idx in range(400):
+        if idx % 5 == 0:
+            lines.append(f'{idx},"多行\r\n""备注"" {idx}\n结束",x')
+        else:
+            lines.append(f"{idx},值{idx},y")
+    path.write_bytes("\r\n".join(lines).encode("utf-8"))
+    with open(path, mode='r', encoding='utf-8') as f:
+        records = list(csv.reader(f))
+    return path, records
+
+
+@pytest.mark.parametrize("parts", [2, 3, 7, 16])
+def test_split_csv_ranges_aligns_to_records(quoted_csv, parts):
+    """测试切分出的每个范围都从记录开头开始，逐个解析后合并与顺序读取一致。"""
+    path, records = quoted_csv
+    ranges = split_csv_ranges(str(path), parts)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == path.stat().st_size
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+
+    merged = []
+    for index, (start, end) in enumerate(ranges):
+        range_records = _parse_range(str(path), start, end, "utf-8", index == len(ranges) - 1)
+        assert range_records is not None
+        merged.extend(range_records)
+    assert merged == records
+
+
+def test_split_csv_ranges_merges_blocks_inside_record(tmp_path):
+    """测试一条记录跨越整个块时不在该块内切分。"""
+    path = tmp_path / "long.csv"
+    path.write_text('a,"' + "x\n" * 100 + '"\nb,c\n', encoding="utf-8")
+
+    ranges = split_csv_ranges(str(path), 8)
+
+    assert len(ranges) < 8
+    assert ranges[-1] == (path.read_bytes().rindex(b"b,c"), path.stat().st_size)
+
+
+def test_parse_range_rejects_misaligned_end(tmp_path):
+    """测试范围末尾落在引号字段内部时返回 None。"""
+    path = tmp_path / "open_quote.csv"
+    path.write_text('a,"b\nc"\nd,e\n', encoding="utf-8")
+
+    assert _parse_range(str(path), 0, 5, "utf-8", False) is None
+    assert _parse_range(str(path), 0, 8, "utf-8", False) == [["a", "b\nc"]]
+
+
+def test_parse_and_index_in_process_pool(quoted_csv):
+    """测试进程池中的解析和建立行索引（含记录计数）与顺序读取一致。"""
+    path, records = quoted_csv
+
+    assert parse_csv_parallel(str(path), "utf-8", 3) == records
+
+    index = build_row_index_parallel(str(path), "utf-8", 16, 3)
+    assert index.total_rows == len(records)
+    with patch("src.parsers.csv_parser.ROW_INDEX_INTERVAL", 16):
+        assert index == CsvRowProvider(str(path))._build_row_index()
+
+
+def test_parallel_fallback_when_pool_unavailable(quoted_csv):
+    """测试进程池无法创建时返回 None，由调用方串行读取。"""
+    path, _ = quoted_csv
+
+    with patch("src.parsers.parallel_csv._create_executor", side_effect=OSError("no semaphores")):
+        assert parse_csv_parallel(str(path), "utf-8", 2) is None
+        assert build_row_index_parallel(str(path), "utf-8", 16, 2) is None
+
+
+def test_csv_parser_uses_parallel_engine(quoted_csv):
+    """测试配置了多个进程时大文件整表解析使用并行引擎，返回 None 时回退到串行读取。"""
+    path, records = quoted_csv
+
+    with patch("src.parsers.csv_parser.PARALLEL_CSV_MIN_BYTES", 0), \
+         patch("src.parsers.csv_parser.get_config") as mock_get_config, \
+         patch("src.parsers.csv_parser.parse_csv_parallel", return_value=[["p"]]) as mock_parallel:
+        mock_get_config.return_value.get_parallel_csv_workers.return_value = 4
+        sheet = CsvParser().parse(str(path))[0]
+        mock_parallel.assert_called_once_with(str(path), "utf-8", 4)
+        assert [[cell.value for cell in row.cells] for row in sheet.rows] == [["p"]]
+
+        mock_parallel.return_value = None
+        sheet = CsvParser().parse(str(path))[0]
+        assert [[cell.value for cell in row.cells] for row in sheet.rows] == records
@@ -2,7 +2,10 @@
 import pytest
 from unittest.mock import MagicMock, patch
 import xlrd
-from src.parsers.xls_parser import XlsParser
+import xlwt
+from datetime import datetime
+from src.parsers.base_parser import project_sheet
+from src.parsers.xls_parser import XlsParser, XlsRowProvider
 from src.models.table_model import Sheet, Cell, Style
 
 @pytest.fixture
@@ -27,6 +30,11 @@ def mock_workbook():
     workbook.sheet_by_index.return_value = sheet
     return workbook
 
+def _read_cell(parser, workbook, worksheet):
+    """按解析时的路径（工作簿级XF表 + _parse_row）读取 (0, 0) 单元格。"""
+    xf_styles, xf_is_date = parser._build_xf_tables(workbook)
+    return parser._parse_row(worksheet, 0, range(1), xf_styles, xf_is_date, Style()).cells[0]
+
 @patch('xlrd.open_workbook')
 def test_parse_success(mock_open_workbook, mock_workbook):
     """Test successful parsing of an XLS file."""
@@ -49,28 +57,28 @@ def test_parse_no_sheets(mock_open_workbook, mock_workbook):
     with pytest.raises(RuntimeError, match="工作簿不包含任何工作表"):
         parser.parse("dummy.xls")
 
-def test_get_cell_value_types(mock_workbook):
-    """Test _get_cell_value with different cell types."""
+def test_read_cell_value_types(mock_workbook):
+    """Test reading cell values of different types through the XF tables."""
     parser = XlsParser()
     sheet = mock_workbook.sheet_by_index(0)
     # Text
     sheet.cell(0, 0).ctype = xlrd.XL_CELL_TEXT
     sheet.cell(0, 0).value = "Hello"
-    assert parser._get_cell_value(mock_workbook, sheet, 0, 0) == "Hello"
+    assert _read_cell(parser, mock_workbook, sheet).value == "Hello"
     # Number
     sheet.cell(0, 0).ctype = xlrd.XL_CELL_NUMBER
     sheet.cell(0, 0).value = 123.0
-    assert parser._get_cell_value(mock_workbook, sheet, 0, 0) == 123
+    assert _read_cell(parser, mock_workbook, sheet).value == 123
     # Date
     sheet.cell(0, 0).ctype = xlrd.XL_CELL_DATE
     sheet.cell(0, 0).value = 44197.0 # 2020-12-31
     # Boolean
     sheet.cell(0, 0).ctype = xlrd.XL_CELL_BOOLEAN
     sheet.cell(0, 0).value = 1
-    assert parser._get_cell_value(mock_workbook, sheet, 0, 0) is True
+    assert _read_cell(parser, mock_workbook, sheet).value is True
 
-def test_extract_style(mock_workbook):
-    """Test _extract_style."""
+def test_xf_style(mock_workbook):
+    """Test building cell styles from the XF tables."""
     parser = XlsParser()
     sheet = mock_workbook.sheet_by_index(0)
     # Setup mock style info
@@ -87,7 +95,7 @@ def test_extract_style(mock_workbook):
     mock_workbook.xf_list = [xf]
     sheet.cell(0, 0).xf_index = 0
 
-    style = parser._extract_style(mock_workbook, sheet, 0, 0)
+    style = _read_cell(parser, mock_workbook, sheet).style
     assert isinstance(style, Style)
     assert style.bold is True
     assert style.font_size == 12.0
@@ -123,8 +131,7 @@ def test_index_to_excel_cell():
 def test_streaming_support():
     """Test streaming support methods."""
     parser = XlsParser()
-    assert parser.supports_streaming() is False
-    assert parser.create_lazy_sheet("dummy.xls") is None
+    assert parser.supports_streaming() is True
 
 # === TDD测试：提升XLS解析器覆盖率 ===
 
@@ -219,9 +226,9 @@ def test_parse_with_unknown_error_code(mock_open_workbook, mock_workbook):
     # 应该返回包含错误代码的字符串
     assert sheets[0].rows[0].cells[0].value == "#ERROR:255"
 
-def test_extract_style_with_no_xf_list():
+def test_xf_style_with_no_xf_list():
     """
-    TDD测试：_extract_style应该处理空的xf_list
+    TDD测试：XF样式表应该处理空的xf_list
 
     这个测试覆盖第224-226行的代码路径
     """
@@ -230,16 +237,17 @@ def test_extract_style_with_no_xf_list():
     workbook = MagicMock()
     workbook.xf_list = []  # 空的格式列表
     worksheet = MagicMock()
+    worksheet.cell.return_value.xf_index = 0
 
-    style = parser._extract_style(workbook, worksheet, 0, 0)
+    style = _read_cell(parser, workbook, worksheet).style
 
     # 应该返回默认样式
     assert style is not None
     assert isinstance(style, Style)
 
-def test_extract_style_with_invalid_xf_index():
+def test_xf_style_with_invalid_xf_index():
     """
-    TDD测试：_extract_style应该处理无效的xf_index
+    TDD测试：XF样式表应该处理无效的xf_index
 
     这个测试确保方法在索引超出范围时不会崩溃
     """
@@ -248,17 +256,18 @@ def test_extract_style_with_invalid_xf_index():
     workbook = MagicMock()
     workbook.xf_list = [MagicMock()]  # 只有一个格式
     worksheet = MagicMock()
+    worksheet.cell.return_value.xf_index = 5  # 超出范围的索引
 
-    style = parser._extract_style(workbook, worksheet, 0, 0)
+    style = _read_cell(parser, workbook, worksheet).style
 
     # 应该返回默认样式
     assert style is not None
     assert isinstance(style, Style)
 
 
-def test_get_cell_value_empty_cell():
+def test_read_cell_value_empty_cell():
     """
-    TDD测试：_get_cell_value应该处理空单元格
+    TDD测试：按XF表读取单元格值时应该处理空单元格
 
     这个测试覆盖第124行的空单元格处理代码
     """
@@ -271,16 +280,17 @@ def test_get_cell_value_empty_cell():
     cell = MagicMock()
     cell.ctype = xlrd.XL_CELL_EMPTY
     cell.value = ""
+    cell.xf_index = 0
     worksheet.cell.return_value = cell
 
-    result = parser._get_cell_value(workbook, worksheet, 0, 0)
+    result = _read_cell(parser, workbook, worksheet).value
 
     # 空单元格应该返回None
     assert result is None
 
-def test_get_cell_value_number_with_date_format():
+def test_read_cell_value_number_with_date_format():
     """
-    TDD测试：_get_cell_value应该识别数字单元格中的日期格式
+    TDD测试：按XF表读取单元格值时应该识别数字单元格中的日期格式
 
     这个测试覆盖第133-142行的日期格式检测代码
     """
@@ -312,15 +322,15 @@ def test_get_cell_value_number_with_date_format():
         from datetime import datetime
         mock_xldate.return_value = datetime(2020, 12, 31)
 
-        result = parser._get_cell_value(workbook, worksheet, 0, 0)
+        result = _read_cell(parser, workbook, worksheet).value
 
         # 应该返回日期对象
         assert result == datetime(2020, 12, 31)
         mock_xldate.assert_called_once_with(44197.0, 0)
 
-def test_get_cell_value_number_with_date_format_exception():
+def test_read_cell_value_number_with_date_format_exception():
     """
-    TDD测试：_get_cell_value应该处理日期转换异常
+    TDD测试：按XF表读取单元格值时应该处理日期转换异常
 
     这个测试覆盖第143-145行的异常处理代码
     """
@@ -349,14 +359,14 @@ def test_get_cell_value_number_with_date_format_exception():
 
     # 模拟xldate转换抛出异常
     with patch('xlrd.xldate.xldate_as_datetime', side_effect=ValueError("Invalid date")):
-        result = parser._get_cell_value(workbook, worksheet, 0, 0)
+        result = _read_cell(parser, workbook, worksheet).value
 
         # 应该返回原始数值
         assert result == 123.45
 
-def test_get_cell_value_number_without_format_info():
+def test_read_cell_value_number_without_format_info():
     """
-    TDD测试：_get_cell_value应该处理没有格式信息的数字单元格
+    TDD测试：按XF表读取单元格值时应该处理没有格式信息的数字单元格
 
     这个测试覆盖第132-145行中格式信息缺失的情况
     """
@@ -376,14 +386,14 @@ def test_get_cell_value_number_without_format_info():
     workbook.xf_list = []
     workbook.format_map = {}
 
-    result = parser._get_cell_value(workbook, worksheet, 0, 0)
+    result = _read_cell(parser, workbook, worksheet).value
 
     # 应该返回整数（因为是整数值）
     assert result == 123
 
-def test_get_cell_value_number_float():
+def test_read_cell_value_number_float():
     """
-    TDD测试：_get_cell_value应该正确处理浮点数
+    TDD测试：按XF表读取单元格值时应该正确处理浮点数
 
     这个测试覆盖第148行的浮点数处理代码
     """
@@ -401,14 +411,14 @@ def test_get_cell_value_number_float():
 
     workbook.xf_list = []
 
-    result = parser._get_cell_value(workbook, worksheet, 0, 0)
+    result = _read_cell(parser, workbook, worksheet).value
 
     # 应该返回浮点数
     assert result == 123.45
 
-def test_get_cell_value_date_with_xldate_error():
+def test_read_cell_value_date_with_xldate_error():
     """
-    TDD测试：_get_cell_value应该处理日期单元格的xldate错误
+    TDD测试：按XF表读取单元格值时应该处理日期单元格的xldate错误
 
     这个测试覆盖第170-174行的日期异常处理代码
     """
@@ -428,14 +438,14 @@ def test_get_cell_value_date_with_xldate_error():
 
     # 模拟xldate转换抛出XLDateError
     with patch('xlrd.xldate.xldate_as_datetime', side_effect=xlrd.xldate.XLDateError("Invalid date")):
-        result = parser._get_cell_value(workbook, worksheet, 0, 0)
+        result = _read_cell(parser, workbook, worksheet).value
 
         # 应该返回原始数值
         assert result == 99999999
 
-def test_get_cell_value_error_codes():
+def test_read_cell_value_error_codes():
     """
-    TDD测试：_get_cell_value应该处理各种错误代码
+    TDD测试：按XF表读取单元格值时应该处理各种错误代码
 
     这个测试覆盖第238-262行的错误代码映射
     """
@@ -462,12 +472,12 @@ def test_get_cell_value_error_codes():
         cell.xf_index = 0
         worksheet.cell.return_value = cell
 
-        result = parser._get_cell_value(workbook, worksheet, 0, 0)
+        result = _read_cell(parser, workbook, worksheet).value
         assert result == expected_text
 
-def test_extract_style_with_font_properties():
+def test_xf_style_with_font_properties():
     """
-    TDD测试：_extract_style应该正确提取字体属性
+    TDD测试：XF样式表应该正确提取字体属性
 
     这个测试覆盖第269-298行的字体属性提取代码
     """
@@ -499,7 +509,7 @@ def test_extract_style_with_font_properties():
 
     # 模拟颜色映射
     with patch.object(parser, '_get_color_from_index', return_value="#FF0000"):
-        style = parser._extract_style(workbook, worksheet, 0, 0)
+        style = _read_cell(parser, workbook, worksheet).style
 
         assert style.bold is True
         assert style.italic is True
@@ -508,9 +518,9 @@ def test_extract_style_with_font_properties():
         assert style.font_name == "Arial"
         assert style.font_color == "#FF0000"
 
-def test_extract_style_with_missing_font():
+def test_xf_style_with_missing_font():
     """
-    TDD测试：_extract_style应该处理缺失的字体信息
+    TDD测试：XF样式表应该处理缺失的字体信息
 
     这个测试覆盖第324-325行的字体索引越界处理
     """
@@ -531,7 +541,7 @@ def test_extract_style_with_missing_font():
     cell.xf_index = 0
     worksheet.cell.return_value = cell
 
-    style = parser._extract_style(workbook, worksheet, 0, 0)
+    style = _read_cell(parser, workbook, worksheet).style
 
     # 应该返回默认样式，不会崩溃
     assert style is not None
@@ -552,9 +562,9 @@ def test_parse_with_file_error():
 
 # === 边界情况和错误处理测试 ===
 
-def test_get_cell_value_with_exception():
+def test_read_cell_value_with_exception():
     """
-    TDD测试：_get_cell_value应该处理获取单元格值时的异常
+    TDD测试：按XF表读取单元格值时应该处理获取单元格值时的异常
 
     这个测试覆盖第172-174行的异常处理代码
     """
@@ -568,14 +578,14 @@ def test_get_cell_value_with_exception():
     mock_worksheet.cell.side_effect = Exception("单元格访问错误")
 
     # 调用方法，应该返回None而不是抛出异常
-    result = parser._get_cell_value(mock_workbook, mock_worksheet, 0, 0)
+    result = _read_cell(parser, mock_workbook, mock_worksheet).value
 
     # 验证返回None
     assert result is None
 
-def test_extract_style_with_background_color_coverage():
+def test_xf_style_with_background_color_coverage():
     """
-    TDD测试：_extract_style应该覆盖背景颜色提取的代码路径
+    TDD测试：XF样式表应该覆盖背景颜色提取的代码路径
 
     这个测试覆盖第235-240行的背景颜色提取代码路径
     """
@@ -607,15 +617,15 @@ def test_extract_style_with_background_color_coverage():
     mock_cell.xf_index = 0
     mock_worksheet.cell.return_value = mock_cell
 
-    style = parser._extract_style(mock_workbook, mock_worksheet, 0, 0)
+    style = _read_cell(parser, mock_workbook, mock_worksheet).style
 
     # 验证方法被调用且没有异常（主要是为了覆盖代码路径）
     assert style is not None
     # 由于复杂的条件逻辑，我们主要验证代码路径被执行而不是具体的颜色值
 
-def test_extract_style_with_text_alignment():
+def test_xf_style_with_text_alignment():
     """
-    TDD测试：_extract_style应该提取文本对齐方式
+    TDD测试：XF样式表应该提取文本对齐方式
 
     这个测试覆盖第247-262行的对齐方式提取代码
     """
@@ -656,15 +666,15 @@ def test_extract_style_with_text_alignment():
         mock_cell.xf_index = 0
         mock_worksheet.cell.return_value = mock_cell
 
-        style = parser._extract_style(mock_workbook, mock_worksheet, 0, 0)
+        style = _read_cell(parser, mock_workbook, mock_worksheet).style
 
         # 验证对齐方式
         assert style.text_align == expected_text_align
         assert style.vertical_align == expected_vertical_align
 
-def test_extract_style_with_wrap_text():
+def test_xf_style_with_wrap_text():
     """
-    TDD测试：_extract_style应该提取文本换行设置
+    TDD测试：XF样式表应该提取文本换行设置
 
     这个测试覆盖第265行的文本换行代码
     """
@@ -696,14 +706,14 @@ def test_extract_style_with_wrap_text():
     mock_cell.xf_index = 0
     mock_worksheet.cell.return_value = mock_cell
 
-    style = parser._extract_style(mock_workbook, mock_worksheet, 0, 0)
+    style = _read_cell(parser, mock_workbook, mock_worksheet).style
 
     # 验证文本换行设置
     assert style.wrap_text is True
 
-def test_extract_style_with_number_format():
+def test_xf_style_with_number_format():
     """
-    TDD测试：_extract_style应该提取数字格式
+    TDD测试：XF样式表应该提取数字格式
 
     这个测试覆盖第268-271行的数字格式提取代码
     """
@@ -734,7 +744,7 @@ def test_extract_style_with_number_format():
     mock_cell.xf_index = 0
     mock_worksheet.cell.return_value = mock_cell
 
-    style = parser._extract_style(mock_workbook, mock_worksheet, 0, 0)
+    style = _read_cell(parser, mock_workbook, mock_worksheet).style
 
     # 验证数字格式被提取
     assert style.number_format == "0.00%"
@@ -793,25 +803,116 @@ def test_get_color_from_index_with_invalid_index():
     assert parser._get_color_from_index(mock_workbook, 999) == "#000000"
     assert parser._get_color_from_index(mock_workbook, -1) == "#000000"
 
-def test_supports_streaming_false():
-    """
-    TDD测试：XlsParser应该不支持流式读取
-
-    这个测试验证流式读取支持状态
-    """
-    parser = XlsParser()
-
-    # XLS格式不支持流式读取
-    assert parser.supports_streaming() is False
+def test_create_lazy_sheet(tmp_path):
+    """
+    TDD测试：XlsParser的create_lazy_sheet应该返回按需读取的LazySheet
+
+    这个测试验证懒加载结果与完整解析一致
+    """
+    path = tmp_path / "lazy.xls"
+    workbook = xlwt.Workbook()
+    workbook.add_sheet("First").write(0, 0, "first")
+    worksheet = workbook.add_sheet("Data")
+    for row_idx in range(5):
+        for col_idx in range(3):
+            worksheet.write(row_idx, col_idx, row_idx * 10 + col_idx)
+    worksheet.write_merge(5, 5, 0, 1, "merged")
+    workbook.save(str(path))
+    parser = XlsParser()
+    full = parser.parse(str(path), "Data")[0]
+
+    lazy_sheet = parser.create_lazy_sheet(str(path), "Data")
+
+    assert lazy_sheet.name == "Data"
+    assert lazy_sheet.merged_cells == full.merged_cells
+    assert lazy_sheet.get_total_rows() == len(full.rows)
+    assert [[cell.value for cell in row.cells] for row in lazy_sheet.iter_rows(0)] == \
+        [[cell.value for cell in row.cells] for row in full.rows]
+    assert [cell.value for cell in lazy_sheet.get_row(2).cells] == [20, 21, 22]
+    lazy_sheet.close()
+
+    assert parser.create_lazy_sheet(str(path)).name == "First"
+    with pytest.raises(ValueError):
+        parser.create_lazy_sheet(str(path), "Missing")
+
+def test_row_provider_col_range_and_close(tmp_path):
+    """Test that the row provider reads column windows and unloads the sheet on close."""
+    path = tmp_path / "provider.xls"
+    workbook = xlwt.Workbook()
+    worksheet = workbook.add_sheet("Data")
+    for row_idx in range(4):
+        for col_idx in range(3):
+            worksheet.write(row_idx, col_idx, f"{row_idx}-{col_idx}")
+    workbook.save(str(path))
+
+    with XlsRowProvider(str(path), "Data") as provider:
+        rows = list(provider.iter_rows(1, 2, col_range=(1, 4)))
+        workbook_obj = provider._workbook
+        with patch.object(workbook_obj, "unload_sheet", wraps=workbook_obj.unload_sheet) as mock_unload:
+            provider.close()
+            mock_unload.assert_called_once_with(0)
+
+    assert [[cell.value for cell in row.cells] for row in rows] == \
+        [["1-1", "1-2", None, None], ["2-1", "2-2", None, None]]
+    assert provider._workbook is None
+    with pytest.raises(IndexError):
+        XlsRowProvider(str(path)).get_row(4)
 
-def test_create_lazy_sheet_returns_none():
-    """
-    TDD测试：XlsParser的create_lazy_sheet应该返回None
-
-    这个测试验证懒加载功能未实现（返回None）
-    """
+@patch('xlrd.open_workbook')
+def test_parse_selected_sheet(mock_open_workbook, mock_workbook):
+    """Test that only the requested sheet is loaded and resources are released."""
+    mock_workbook.nsheets = 2
+    mock_workbook.sheet_names.return_value = ["Other", "Test Sheet"]
+    mock_open_workbook.return_value = mock_workbook
     parser = XlsParser()
 
-    # 应该返回None，因为XLS格式不支持懒加载
-    result = parser.create_lazy_sheet("test.xls")
-    assert result is None
+    sheets = parser.parse("dummy.xls", "Test Sheet")
+
+    assert [sheet.name for sheet in sheets] == ["Test Sheet"]
+    mock_workbook.sheet_by_index.assert_called_once_with(1)
+    assert mock_open_workbook.call_args.kwargs["on_demand"] is True
+    mock_workbook.release_resources.assert_called_once()
+    assert parser.parse("dummy.xls", "Missing") == []
+
+def test_parse_cell_range(tmp_path):
+    """Test that a cell range only reads the covered cells and matches the projected full parse."""
+    path = tmp_path / "range.xls"
+    workbook = xlwt.Workbook()
+    worksheet = workbook.add_sheet("Data")
+    for row_idx in range(6):
+        for col_idx in range(4):
+            worksheet.write(row_idx, col_idx, f"{row_idx}-{col_idx}")
+    worksheet.write_merge(6, 6, 0, 1, "merged")
+    workbook.save(str(path))
+    parser = XlsParser()
+    full = parser.parse(str(path))[0]
+
+    for cell_range in [(1, 1, 3, 2), (5, 2, 10, 9), (8, 0, 9, 1)]:
+        sheet = parser.parse(str(path), cell_range=cell_range)[0]
+        assert [[cell.value for cell in row.cells] for row in sheet.rows] == \
+            [[cell.value for cell in row.cells] for row in project_sheet(full, cell_range).rows]
+        assert sheet.merged_cells == []
+
+def test_parse_shares_style_per_xf(tmp_path):
+    """Test that styles and date flags are precomputed once per workbook and shared by XF index."""
+    path = tmp_path / "styles.xls"
+    workbook = xlwt.Workbook()
+    worksheet = workbook.add_sheet("Data")
+    bold = xlwt.easyxf("font: bold on")
+    date_format = xlwt.easyxf(num_format_str="yyyy-mm-dd")
+    for row_idx in range(3):
+        worksheet.write(row_idx, 0, "text", bold)
+        worksheet.write(row_idx, 1, 45292, date_format)
+        worksheet.write(row_idx, 2, 1.5)
+    workbook.save(str(path))
+    parser = XlsParser()
+
+    with patch.object(parser, "_build_xf_style", wraps=parser._build_xf_style) as mock_build:
+        rows = parser.parse(str(path))[0].rows
+        xf_count = mock_build.call_count
+
+    assert all(row.cells[0].style is rows[0].cells[0].style for row in rows)
+    assert rows[0].cells[0].style.bold is True
+    assert xf_count == len(xlrd.open_workbook(str(path), formatting_info=True).xf_list)
+    assert rows[0].cells[1].value == datetime(2024, 1, 1)
+    assert rows[0].cells[2].value == 1.5
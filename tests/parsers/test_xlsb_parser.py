@@ -1,7 +1,9 @@
 
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, mock_open, PropertyMock
-from src.parsers.xlsb_parser import XlsbParser
+from pyxlsb.worksheet import Cell as XlsbCell
+from src.parsers.xlsb_parser import XlsbParser, XlsbRowProvider
 from src.models.table_model import Sheet, Style
 
 @pytest.fixture
@@ -79,8 +81,69 @@ def test_normalize_row_data():
 def test_streaming_support():
     """Test streaming support methods."""
     parser = XlsbParser()
-    assert parser.supports_streaming() is False
-    assert parser.create_lazy_sheet("dummy.xlsb") is None
+    assert parser.supports_streaming() is True
+
+def _mock_streaming_workbook(row_count=5, width=3):
+    """Create a mocked pyxlsb workbook whose worksheet yields dense rows of real pyxlsb cells."""
+    workbook = MagicMock()
+    workbook.sheets = ["Sheet1", "Data"]
+    worksheet = MagicMock()
+    worksheet.dimension = SimpleNamespace(r=0, h=row_count, c=0, w=width)
+    worksheet.rows.side_effect = lambda: iter(
+        [XlsbCell(r, c, f"{r}-{c}") for c in range(width)] for r in range(row_count)
+    )
+    workbook.get_sheet.return_value = worksheet
+    return workbook, worksheet
+
+def test_build_row_places_cells_by_index():
+    """Test that cells are placed by column index in a single pass, keeping the first duplicate."""
+    parser = XlsbParser()
+    row_data = [XlsbCell(0, 3, "D"), XlsbCell(0, 1, "B"), XlsbCell(0, 1, "dup")]
+
+    assert [cell.value for cell in parser._build_row(row_data).cells] == [None, "B", None, "D"]
+    assert [cell.value for cell in parser._build_row(row_data, 1, 2).cells] == ["B", None]
+    assert parser._build_row(row_data, 5).cells == []
+    assert parser._build_row([]).cells == []
+
+@patch('src.parsers.xlsb_parser.open_workbook')
+def test_create_lazy_sheet_streams_rows(mock_open_workbook):
+    """Test that the lazy sheet reads the requested sheet and continues consecutive chunks from the same iterator."""
+    workbook, worksheet = _mock_streaming_workbook()
+    mock_open_workbook.return_value = workbook
+    parser = XlsbParser()
+
+    lazy_sheet = parser.create_lazy_sheet("dummy.xlsb", "Data")
+    first = list(lazy_sheet.iter_rows(0, 2))
+    second = list(lazy_sheet.iter_rows(2, 2))
+
+    assert lazy_sheet.name == "Data"
+    workbook.get_sheet.assert_called_once_with(2)
+    assert lazy_sheet.get_total_rows() == 5
+    assert [row.cells[0].value for row in first + second] == ["0-0", "1-0", "2-0", "3-0"]
+    assert worksheet.rows.call_count == 1
+
+    assert [cell.value for cell in lazy_sheet.get_row(1).cells] == ["1-0", "1-1", "1-2"]
+    assert worksheet.rows.call_count == 2
+    with pytest.raises(IndexError):
+        lazy_sheet.get_row(5)
+
+    lazy_sheet.close()
+    worksheet.close.assert_called_once()
+    workbook.close.assert_called_once()
+
+@patch('src.parsers.xlsb_parser.open_workbook')
+def test_row_provider_col_range(mock_open_workbook):
+    """Test that the row provider only builds the requested columns and pads past the row width."""
+    workbook, _ = _mock_streaming_workbook()
+    mock_open_workbook.return_value = workbook
+
+    with XlsbRowProvider("dummy.xlsb") as provider:
+        rows = list(provider.iter_rows(3, None, col_range=(1, 4)))
+
+    assert [[cell.value for cell in row.cells] for row in rows] == \
+        [["3-1", "3-2", None, None], ["4-1", "4-2", None, None]]
+    with pytest.raises(ValueError):
+        XlsbRowProvider("dummy.xlsb", "Missing").get_total_rows()
 
 class TestProcessCellValueEdgeCases:
     """测试_process_cell_value的边界情况。"""
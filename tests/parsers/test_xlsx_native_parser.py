@@ -0,0 +1,231 @@
+"""
+XLSX原生解析器测试模块
+
+验证原生引擎与openpyxl解析器在数据层面的一致性，以及各单元格类型的解码。
+"""
+
+import re
+import zipfile
+from datetime import datetime, time
+from unittest.mock import patch
+
+import openpyxl
+import pytest
+
+from src.models.columnar_sheet import ColumnarSheet
+from src.models.sparse_sheet import SparseSheet
+from src.parsers.base_parser import project_sheet
+from src.parsers.xlsx_native_parser import XlsxNativeParser
+from src.parsers.xlsx_parser import XlsxParser
+from src.unified_config import UnifiedConfig
+
+
+@pytest.fixture
+def value_workbook(tmp_path):
+    """创建包含数字、文本、布尔、日期、公式和合并单元格的工作簿。"""
+    path = tmp_path / "values.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Data"
+    sheet.append(["Name", "Count", "Ratio", "Flag", "When"])
+    sheet.append(["Alice", 3, 0.5, True, datetime(2024, 5, 6, 7, 8, 9)])
+    sheet.append(["Bob", 4, 1.25, False, datetime(2023, 1, 2)])
+    sheet["G5"] = "far"
+    sheet["B6"] = "=B2+B3"
+    sheet["C6"] = time(12, 30)
+    sheet.merge_cells("A8:B8")
+    second = workbook.create_sheet("Second")
+    second["A1"] = "only"
+    workbook.save(path)
+    return path
+
+
+def _values(sheet):
+    return [[cell.value for cell in row.cells] for row in sheet.rows]
+
+
+def test_parse_matches_openpyxl_values(value_workbook):
+    """测试原生引擎解析出的值、形状与合并单元格与openpyxl解析器一致。"""
+    native_sheets = XlsxNativeParser().parse(str(value_workbook))
+    openpyxl_sheets = XlsxParser().parse(str(value_workbook))
+
+    assert [s.name for s in native_sheets] == ["Data", "Second"]
+    for native, reference in zip(native_sheets, openpyxl_sheets):
+        assert _values(native) == _values(reference)
+        assert native.merged_cells == reference.merged_cells
+
+
+def test_parse_cell_details(value_workbook):
+    """测试公式文本保留、样式为空以及矩形补齐。"""
+    sheet = XlsxNativeParser().parse(str(value_workbook))[0]
+
+    assert len(sheet.rows) == 8
+    assert all(len(row.cells) == 7 for row in sheet.rows)
+    assert sheet.rows[1].cells[4].value == datetime(2024, 5, 6, 7, 8, 9)
+    assert sheet.rows[5].cells[1].formula == "=B2+B3"
+    assert sheet.rows[5].cells[2].value == time(12, 30)
+    assert all(cell.style is None for row in sheet.rows for cell in row.cells)
+
+
+def test_parse_fills_typed_columns(value_workbook):
+    """测试原生引擎直接填充列式工作表，数值列使用定长数组，字符串列按字典编码。"""
+    sheet = XlsxNativeParser().parse(str(value_workbook))[0]
+
+    assert isinstance(sheet, ColumnarSheet)
+    assert sheet._rows is None
+    assert [column.kind for column in sheet.columns[:4]] == ["string", "int", "object", "bool"]
+    assert sheet.columns[1].to_list(0, 2) == [3, 4]
+    assert sheet.formulas == {(5, 1): "=B2+B3"}
+
+
+def test_parse_builds_sparse_sheet(tmp_path):
+    """测试网格很大而有值单元格很少时生成稀疏工作表，单元格与稠密解析结果一致。"""
+    path = tmp_path / "sparse.xlsx"
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet["A1"] = "h"
+    worksheet["B3"] = "=1+1"
+    worksheet["CV200"] = 7
+    workbook.save(path)
+
+    sheet = XlsxNativeParser().parse(str(path))[0]
+    with patch("src.parsers.xlsx_native_parser.get_config", return_value=UnifiedConfig(sparse_sheet_density=0)):
+        dense = XlsxNativeParser().parse(str(path))[0]
+
+    assert isinstance(sheet, SparseSheet)
+    assert (sheet.row_count, sheet.column_count) == (200, 100)
+    assert [[(cell.value, cell.formula) for cell in row.cells] for row in sheet.iter_rows()] == \
+        [[(cell.value, cell.formula) for cell in row.cells] for row in dense.iter_rows()]
+
+
+def test_parse_trims_formatted_trailing_cells(tmp_path):
+    """测试只有样式的尾部行列不计入工作表范围，与openpyxl解析器的结果一致。"""
+    from openpyxl.styles import Font
+
+    path = tmp_path / "formatted.xlsx"
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(["a", 1])
+    worksheet["H1"].font = Font(bold=True)
+    worksheet["A50"].font = Font(bold=True)
+    workbook.save(path)
+
+    sheet = XlsxNativeParser().parse(str(path))[0]
+    expected = XlsxParser().parse(str(path))[0]
+    assert [[cell.value for cell in row.cells] for row in sheet.rows] == [["a", 1]]
+    assert [[cell.value for cell in row.cells] for row in expected.rows] == [["a", 1]]
+    with patch("src.parsers.xlsx_native_parser.get_config", return_value=UnifiedConfig(trim_used_range=False)):
+        untrimmed = XlsxNativeParser().parse(str(path))[0]
+    assert (untrimmed.get_total_rows(), len(untrimmed.rows[0].cells)) == (50, 8)
+
+
+def test_parse_shared_and_inline_strings(tmp_path):
+    """测试共享字符串（含富文本）、内联字符串与1904日期系统的解码。"""
+    path = tmp_path / "handmade.xlsx"
+    main_ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel_ns = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{main_ns}" xmlns:r="{rel_ns}"><workbookPr date1904="1"/>'
+            '<sheets><sheet name="S" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Target="worksheets/sheet1.xml" Type="{rel_ns}/worksheet"/>'
+            f'<Relationship Id="rId2" Target="sharedStrings.xml" Type="{rel_ns}/sharedStrings"/>'
+            f'<Relationship Id="rId3" Target="styles.xml" Type="{rel_ns}/styles"/>'
+            '</Relationships>'
+        )
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            f'<sst xmlns="{main_ns}"><si><t>shared</t></si><si><r><t>ri</t></r><r><t>ch</t></r></si></sst>'
+        )
+        archive.writestr(
+            "xl/styles.xml",
+            f'<styleSheet xmlns="{main_ns}"><numFmts><numFmt numFmtId="164" formatCode="yyyy/mm/dd"/></numFmts>'
+            '<cellXfs><xf numFmtId="0"/><xf numFmtId="164"/></cellXfs></styleSheet>'
+        )
+        archive.writestr(
+            "xl/worksheets/sheet1.xml",
+            f'<worksheet xmlns="{main_ns}"><sheetData>'
+            '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+            '<c r="C1" t="inlineStr"><is><t>inline</t><rPh><t>skip</t></rPh></is></c></row>'
+            '<row r="2"><c r="A2" s="1"><v>1</v></c><c r="B2" t="e"><v>#N/A</v></c></row>'
+            '</sheetData></worksheet>'
+        )
+
+    sheet = XlsxNativeParser().parse(str(path))[0]
+    assert _values(sheet) == [["shared", "rich", "inline"], [datetime(1904, 1, 2), "#N/A", None]]
+
+
+def test_parse_shared_formulas_match_openpyxl(tmp_path):
+    """测试共享公式的从属单元格按主单元格公式平移，与openpyxl解析器一致。"""
+    source = tmp_path / "source.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active["A1"] = 1
+    workbook.save(source)
+    sheet_data = (
+        '<sheetData>'
+        '<row r="1"><c r="A1"><v>1</v></c><c r="B1"><f t="shared" ref="B1:C3" si="0">A1*2+$A$1</f><v>3</v></c>'
+        '<c r="C1"><f t="shared" si="0"/><v>4</v></c></row>'
+        '<row r="2"><c r="A2"><v>2</v></c><c r="B2"><f t="shared" si="0"/><v>5</v></c></row>'
+        '<row r="3"><c r="A3"><v>3</v></c><c r="B3"><f t="shared" si="0"/><v>7</v></c>'
+        '<c r="C3"><f>SUM(B1:B3)</f><v>15</v></c></row>'
+        '</sheetData>'
+    )
+    path = tmp_path / "shared_formulas.xlsx"
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(path, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = re.sub(rb"<sheetData>.*</sheetData>|<sheetData\s*/>", sheet_data.encode(), data)
+                data = re.sub(rb'<dimension ref="[^"]*"\s*/>', b'<dimension ref="A1:C3"/>', data)
+            dst.writestr(item, data)
+
+    native = XlsxNativeParser().parse(str(path))[0]
+    reference = XlsxParser().parse(str(path))[0]
+
+    def formulas(sheet):
+        return [[cell.formula for cell in row.cells] for row in sheet.rows]
+
+    assert formulas(native) == [
+        [None, "=A1*2+$A$1", "=B1*2+$A$1"],
+        [None, "=A2*2+$A$1", None],
+        [None, "=A3*2+$A$1", "=SUM(B1:B3)"],
+    ]
+    assert formulas(native) == formulas(reference)
+    assert _values(native) == _values(reference)
+
+
+def test_parse_falls_back_to_openpyxl_parser(tmp_path):
+    """测试文件不是有效的zip包时回退到XlsxParser。"""
+    path = tmp_path / "broken.xlsx"
+    path.write_bytes(b"not a zip")
+    with patch.object(XlsxParser, "parse", return_value=["fallback"]) as mock_parse:
+        assert XlsxNativeParser().parse(str(path)) == ["fallback"]
+    mock_parse.assert_called_once_with(str(path), None, None)
+
+
+def test_parse_selected_sheet(value_workbook):
+    """测试指定工作表时只解析该工作表，不存在时返回空列表。"""
+    parser = XlsxNativeParser()
+
+    sheets = parser.parse(str(value_workbook), "Second")
+
+    assert [sheet.name for sheet in sheets] == ["Second"]
+    assert _values(sheets[0]) == [["only"]]
+    assert parser.parse(str(value_workbook), "Missing") == []
+    assert parser.get_sheet_names(str(value_workbook)) == ["Data", "Second"]
+
+
+@pytest.mark.parametrize("cell_range", [(0, 0, 2, 2), (1, 3, 9, 9), (4, 6, 4, 6), (20, 0, 30, 3)])
+def test_parse_cell_range(value_workbook, cell_range):
+    """测试指定范围时结果与完整解析后截取一致，且不含合并单元格。"""
+    full = XlsxNativeParser().parse(str(value_workbook), "Data")[0]
+
+    sheet = XlsxNativeParser().parse(str(value_workbook), "Data", cell_range)[0]
+
+    assert _values(sheet) == _values(project_sheet(full, cell_range))
+    assert sheet.merged_cells == []
@@ -10,6 +10,9 @@ XLSX解析器测试模块
 
 import pytest
 from unittest.mock import MagicMock, patch, mock_open, PropertyMock, call
+from src.cache.repair_cache import RepairCache
+from src.parsers import xlsx_parser
+from src.parsers.base_parser import project_sheet
 from src.parsers.xlsx_parser import XlsxParser, XlsxRowProvider
 from src.models.table_model import Sheet, LazySheet, Chart, Row, Cell
 import openpyxl
@@ -18,8 +21,10 @@ from openpyxl.cell.cell import Cell as OpenpyxlCell
 from openpyxl.worksheet.worksheet import Worksheet as OpenpyxlWorksheet
 from openpyxl.chart.bar_chart import BarChart as OpenpyxlBarChart
 from openpyxl.drawing.image import Image as OpenpyxlImage
+from openpyxl.worksheet._reader import WorksheetReader
 import zipfile
 from io import BytesIO
+from datetime import datetime
 
 @pytest.fixture
 def mock_openpyxl_cell():
@@ -100,13 +105,17 @@ class TestXlsxRowProvider:
         mock_load_workbook.assert_called_once()
 
     @patch('openpyxl.load_workbook')
-    def test_get_row(self, mock_load_workbook, mock_openpyxl_workbook):
+    def test_get_row(self, mock_load_workbook, mock_openpyxl_workbook, mock_openpyxl_cell):
         mock_load_workbook.return_value = mock_openpyxl_workbook
+        worksheet = mock_openpyxl_workbook.active
+        worksheet.iter_rows.return_value = iter([(mock_openpyxl_cell, mock_openpyxl_cell)])
         provider = XlsxRowProvider("dummy.xlsx")
         row = provider.get_row(0)
         assert isinstance(row, Row)
         assert len(row.cells) == 2
         assert row.cells[0].value == "Test Data"
+        worksheet.iter_rows.assert_called_once_with(min_row=1, max_row=2, max_col=2)
+        worksheet.cell.assert_not_called()
 
     @patch('openpyxl.load_workbook')
     def test_get_row_out_of_range(self, mock_load_workbook, mock_openpyxl_workbook):
@@ -207,6 +216,89 @@ class TestXlsxRowProvider:
         with pytest.raises(RuntimeError, match="流式读取XLSX文件失败"):
             list(provider.iter_rows())
 
+    def test_provider_reuses_single_workbook_handle(self, tmp_path):
+        """测试提供者在多次读取间复用句柄，同一文件的多个提供者共享池中的句柄。"""
+        file_path = tmp_path / "pooled.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        for i in range(4):
+            sheet.append([i, f"v{i}"])
+        sheet.merge_cells("A5:B5")
+        workbook.save(file_path)
+
+        with patch('openpyxl.load_workbook', wraps=openpyxl.load_workbook) as mock_load:
+            with XlsxRowProvider(str(file_path)) as provider:
+                assert provider.get_total_rows() == 5
+                assert provider._get_merged_cells() == ["A5:B5"]
+                assert provider.get_row(1).cells[0].value == 1
+                assert [row.cells[1].value for row in provider.iter_rows(0, 2)] == ["v0", "v1"]
+            assert provider._workbook is None
+
+            other = XlsxRowProvider(str(file_path))
+            assert other._get_worksheet_info() == "Sheet"
+            other.close()
+
+        mock_load.assert_called_once_with(str(file_path), read_only=True)
+
+    def test_iter_rows_resumes_cursor_between_chunks(self, tmp_path):
+        """测试连续分块读取复用同一个顺序游标，非连续读取时重新定位。"""
+        from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+        file_path = tmp_path / "chunks.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        for i in range(10):
+            sheet.append([i, f"v{i}"])
+        workbook.save(file_path)
+
+        with patch.object(ReadOnlyWorksheet, "iter_rows", autospec=True,
+                          side_effect=ReadOnlyWorksheet.iter_rows) as mock_iter_rows:
+            with XlsxRowProvider(str(file_path)) as provider:
+                values = []
+                for start in range(0, 10, 3):
+                    values.extend(row.cells[0].value for row in provider.iter_rows(start, 3))
+                assert values == list(range(10))
+                assert mock_iter_rows.call_count == 1
+
+                assert [row.cells[0].value for row in provider.iter_rows(2, 2)] == [2, 3]
+                assert mock_iter_rows.call_count == 2
+
+    def test_get_row_reads_row_in_one_pass(self, tmp_path):
+        """按索引读取整行时不逐列调用 cell，连续读取复用同一个游标。"""
+        from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+        file_path = tmp_path / "random_access.xlsx"
+        workbook = openpyxl.Workbook()
+        for index in range(5):
+            workbook.active.append([index, f"v{index}"])
+        workbook.save(file_path)
+
+        with patch.object(ReadOnlyWorksheet, "cell", side_effect=AssertionError("逐列访问")), \
+                patch.object(ReadOnlyWorksheet, "iter_rows", autospec=True,
+                             side_effect=ReadOnlyWorksheet.iter_rows) as mock_iter_rows:
+            with XlsxRowProvider(str(file_path)) as provider:
+                assert [provider.get_row(index).cells[1].value for index in (1, 2, 3)] == ["v1", "v2", "v3"]
+                assert mock_iter_rows.call_count == 1
+                assert provider.get_row(0).cells[0].value == 0
+                assert mock_iter_rows.call_count == 2
+
+    def test_iter_rows_pads_ragged_rows_without_dimension(self, tmp_path):
+        """测试缺少<dimension>的文件也能读取，且各行补齐到max_column。"""
+        file_path = tmp_path / "ragged.xlsx"
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("Data")
+        sheet.append(["a"])
+        sheet.append([])
+        sheet.append(["b", None, "c"])
+        workbook.save(file_path)
+
+        with XlsxRowProvider(str(file_path)) as provider:
+            rows = list(provider.iter_rows())
+            assert provider.get_total_rows() == 3
+        assert [[cell.value for cell in row.cells] for row in rows] == [
+            ["a", None, None], [None, None, None], ["b", None, "c"]
+        ]
+
 class TestXlsxParser:
     @patch('openpyxl.load_workbook')
     def test_xlsx_parser_parse(self, mock_load_workbook, mock_openpyxl_workbook):
@@ -220,12 +312,14 @@ class TestXlsxParser:
         assert sheets[0].rows[0].cells[0].value == "Test Data"
         assert sheets[0].merged_cells == ["A1:B1"]
 
+    @patch('src.parsers.xlsx_parser.read_formula_cached_values', return_value={(1, 1): 42})
     @patch('openpyxl.load_workbook')
-    def test_formula_parsing(self, mock_load_workbook, mock_openpyxl_workbook, mock_openpyxl_worksheet):
-        """测试公式单元格的解析，确保公式和计算结果都被正确提取。"""
+    def test_formula_parsing(self, mock_load_workbook, mock_read_cached, mock_openpyxl_workbook, mock_openpyxl_worksheet):
+        """测试公式单元格的解析，确保公式和计算结果都被正确提取，且工作簿只加载一次。"""
         formula_cell = MagicMock(spec=OpenpyxlCell)
         formula_cell.value = "=SUM(A1:B1)"
         formula_cell.data_type = 'f'
+        formula_cell.number_format = 'General'
         # Mock style attributes
         formula_cell.font = MagicMock()
         formula_cell.fill = MagicMock()
@@ -235,17 +329,8 @@ class TestXlsxParser:
         formula_cell.comment = None
         formula_cell.has_style = True
 
-        data_only_cell = MagicMock()
-        data_only_cell.value = 42
-
-        mock_openpyxl_worksheet.cell.side_effect = [formula_cell, data_only_cell] * 2 # for both workbooks
-        
-        data_only_workbook = MagicMock()
-        data_only_worksheet = MagicMock()
-        data_only_worksheet.cell.return_value = data_only_cell
-        data_only_workbook.__getitem__.return_value = data_only_worksheet
-        
-        mock_load_workbook.side_effect = [mock_openpyxl_workbook, data_only_workbook]
+        mock_openpyxl_worksheet.cell.return_value = formula_cell
+        mock_load_workbook.return_value = mock_openpyxl_workbook
         
         parser = XlsxParser()
         sheets = parser.parse("dummy.xlsx")
@@ -253,6 +338,48 @@ class TestXlsxParser:
         parsed_cell = sheets[0].rows[0].cells[0]
         assert parsed_cell.value == 42
         assert parsed_cell.formula == "=SUM(A1:B1)"
+        # 不再以data_only模式二次加载工作簿
+        mock_load_workbook.assert_called_once()
+        # 缓存值只读取一次
+        mock_read_cached.assert_called_once_with("dummy.xlsx", "TestSheet")
+
+    def test_formula_cached_values_from_real_file(self, tmp_path):
+        """测试真实文件中公式与缓存值（含日期格式）在单次加载中一起解析。"""
+        file_path = tmp_path / "formulas.xlsx"
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = "Data"
+        worksheet["A1"] = 1
+        worksheet["B1"] = 2
+        worksheet["C1"] = "=A1+B1"
+        worksheet["D1"] = "=TODAY()"
+        worksheet["D1"].number_format = "yyyy-mm-dd"
+        worksheet["E1"] = "=A1>B1"
+        workbook.save(file_path)
+
+        # openpyxl 不写入缓存值，这里手动注入 <v>，模拟 Excel 保存后的文件
+        patched_path = tmp_path / "formulas_cached.xlsx"
+        with zipfile.ZipFile(file_path) as zin, zipfile.ZipFile(patched_path, "w") as zout:
+            for item in zin.infolist():
+                data = zin.read(item.filename)
+                if item.filename == "xl/worksheets/sheet1.xml":
+                    text = data.decode("utf-8")
+                    text = text.replace("<f>A1+B1</f><v />", "<f>A1+B1</f><v>3</v>")
+                    text = text.replace("<f>TODAY()</f><v />", "<f>TODAY()</f><v>45292</v>")
+                    text = text.replace('<c r="E1"><f>A1&gt;B1</f><v />', '<c r="E1" t="b"><f>A1&gt;B1</f><v>0</v>')
+                    data = text.encode("utf-8")
+                zout.writestr(item, data)
+
+        with patch('openpyxl.load_workbook', wraps=openpyxl.load_workbook) as spy_load:
+            sheets = XlsxParser().parse(str(patched_path))
+            assert spy_load.call_count == 1
+
+        cells = sheets[0].rows[0].cells
+        assert cells[2].value == 3
+        assert cells[2].formula == "=A1+B1"
+        assert cells[3].value.year == 2024
+        assert cells[3].formula == "=TODAY()"
+        assert cells[4].value is False
 
     @patch('src.parsers.xlsx_parser.XlsxParser._fix_excel_styles', return_value="fixed.xlsx")
     def test_load_failure_and_fix(self, mock_fix):
@@ -277,7 +404,11 @@ class TestXlsxParser:
                 with patch('src.parsers.xls_parser.XlsParser.parse', return_value=[]):
                     parser.parse("dummy.xlsx")
                     # 验证修复函数被调用
-                    mock_fix.assert_called_once_with("dummy.xlsx")
+                    mock_fix.assert_called_once()
+                    # 修复副本写入缓存目录而不是原文件旁
+                    source, target = mock_fix.call_args.args
+                    assert source == "dummy.xlsx"
+                    assert "repaired" in target and not target.endswith("_fixed.xlsx")
                     # 验证代码尝试加载了修复后的文件
                     mock_load_workbook.assert_any_call("fixed.xlsx", data_only=False, keep_vba=False, keep_links=False)
 
@@ -291,7 +422,7 @@ class TestXlsxParser:
             
             sheets = parser.parse("dummy.xlsx")
             
-            mock_xls_parser_instance.parse.assert_called_once_with("dummy.xlsx")
+            mock_xls_parser_instance.parse.assert_called_once_with("dummy.xlsx", None)
             assert sheets[0].name == "xls_sheet"
 
     def test_xlsx_parser_streaming_support(self):
@@ -326,8 +457,8 @@ class TestXlsxParser:
              patch.object(parser, '_extract_chart_data', return_value={'type': 'bar'}):
             sheets = parser.parse("dummy.xlsx")
             # 修复断言，确保在有图表时，charts列表不为空
-            assert len(sheets[0].charts) > 0, "图表列表不应为空"
-            assert sheets[0].charts[0].name == "My Chart"
+            assert len(sheets[0].get_charts()) > 0, "图表列表不应为空"
+            assert sheets[0].get_charts()[0].name == "My Chart"
 
     @patch('openpyxl.load_workbook')
     def test_extract_images(self, mock_load_workbook, mock_openpyxl_workbook, mock_openpyxl_worksheet):
@@ -349,8 +480,8 @@ class TestXlsxParser:
         parser = XlsxParser()
         sheets = parser.parse("dummy.xlsx")
         
-        assert len(sheets[0].charts) == 1, "应从工作表中提取一个图片作为图表对象"
-        chart = sheets[0].charts[0]
+        assert len(sheets[0].get_charts()) == 1, "应从工作表中提取一个图片作为图表对象"
+        chart = sheets[0].get_charts()[0]
         assert chart.type == "image", "图表类型应为 'image'"
         
         # 增加健壮性检查，确保 chart_data 和 position 不是 None
@@ -616,8 +747,10 @@ class TestXlsxRowProviderEdgeCases:
             with pytest.raises(IndexError, match="Row index 10 out of range"):
                 provider.get_row(10)
 
-            # 验证workbook被关闭
-            mock_workbook.close.assert_called()
+            # 句柄在提供者关闭时才释放
+            mock_workbook.close.assert_not_called()
+            provider.close()
+            mock_workbook.close.assert_called_once()
 
     def test_get_row_with_general_exception_handling(self):
         """
@@ -630,7 +763,7 @@ class TestXlsxRowProviderEdgeCases:
         mock_worksheet = MagicMock()
         mock_worksheet.max_row = 5
         mock_worksheet.max_column = 3
-        mock_worksheet.cell.side_effect = RuntimeError("Cell access error")
+        mock_worksheet.iter_rows.side_effect = RuntimeError("Cell access error")
 
         mock_workbook = MagicMock()
         mock_workbook.active = mock_worksheet
@@ -642,8 +775,9 @@ class TestXlsxRowProviderEdgeCases:
             with pytest.raises(RuntimeError, match="获取XLSX行数据失败"):
                 provider.get_row(0)
 
-            # 验证workbook被关闭
-            mock_workbook.close.assert_called()
+            # 句柄在提供者关闭时才释放
+            provider.close()
+            mock_workbook.close.assert_called_once()
 
 class TestXlsxParserAdditionalCoverage:
     """测试XlsxParser的额外覆盖情况。"""
@@ -735,8 +869,8 @@ def test_xlsx_row_provider_get_row_runtime_error():
         mock_worksheet.max_column = 2
         mock_workbook.active = mock_worksheet
 
-        # 模拟cell方法抛出非IndexError异常
-        mock_worksheet.cell.side_effect = ValueError("单元格访问错误")
+        # 模拟逐行读取抛出非IndexError异常
+        mock_worksheet.iter_rows.side_effect = ValueError("单元格访问错误")
         mock_load.return_value = mock_workbook
 
         provider = XlsxRowProvider("test.xlsx")
@@ -887,7 +1021,11 @@ def test_xlsx_parser_parse_with_fill_style_error():
         sheets = parser.parse("test.xlsx")
 
         # 验证修复方法被调用
-        mock_fix.assert_called_once_with("test.xlsx")
+        mock_fix.assert_called_once()
+        # 修复副本写入缓存目录而不是原文件旁
+        source, target = mock_fix.call_args.args
+        assert source == "test.xlsx"
+        assert "repaired" in target and not target.endswith("_fixed.xlsx")
 
         # 验证解析成功
         assert len(sheets) == 1
@@ -1080,7 +1218,7 @@ def test_xlsx_parser_fix_excel_styles_no_styles_xml():
                     # 应该使用XLS解析器作为回退
                     assert len(sheets) == 1
                     assert sheets[0].name == "XLS_Fallback"
-                    mock_xls_instance.parse.assert_called_once_with("test.xlsx")
+                    mock_xls_instance.parse.assert_called_once_with("test.xlsx", None)
 
     def test_xlsx_parser_image_extraction_attribute_error(self):
         """
@@ -1390,7 +1528,7 @@ class TestXlsxParserStreamingAndEdgeCases:
         mock_worksheet.iter_rows.return_value = []
 
         # 测试空工作表的处理
-        sheet_data = parser._parse_sheet(mock_worksheet, mock_worksheet)
+        sheet_data = parser._parse_sheet(mock_worksheet)
 
         # 应该返回有效的Sheet对象，即使是空的
         assert sheet_data.name == "EmptySheet"
@@ -2881,3 +3019,299 @@ class TestXlsxParserUncoveredCode:
                 except Exception:
                     # 抛出异常也是可接受的
                     pass
+
+
+class TestXlsxParserSheetSelection:
+    """测试只解析指定工作表。"""
+
+    @pytest.fixture
+    def multi_sheet_file(self, tmp_path):
+        """创建包含三个工作表的工作簿。"""
+        path = tmp_path / "multi.xlsx"
+        workbook = openpyxl.Workbook()
+        for idx, name in enumerate(["First", "Second", "Third"]):
+            worksheet = workbook.active if idx == 0 else workbook.create_sheet()
+            worksheet.title = name
+            worksheet.append([name, idx])
+            worksheet["C1"] = "=B1*2"
+        workbook.save(path)
+        return str(path)
+
+    def test_parse_only_requested_sheet(self, multi_sheet_file):
+        """测试指定工作表时只有该工作表的XML被解码，结果与完整解析一致。"""
+        with patch("openpyxl.reader.excel.WorksheetReader", wraps=WorksheetReader) as reader:
+            sheets = XlsxParser().parse(multi_sheet_file, "Second")
+
+        assert [sheet.name for sheet in sheets] == ["Second"]
+        assert reader.call_count == 1
+        full = XlsxParser().parse(multi_sheet_file)[1]
+        assert [[cell.value for cell in row.cells] for row in sheets[0].rows] == \
+            [[cell.value for cell in row.cells] for row in full.rows]
+        assert sheets[0].rows[0].cells[2].formula == "=B1*2"
+
+    def test_parse_missing_sheet_returns_empty_list(self, multi_sheet_file):
+        """测试指定的工作表不存在时返回空列表。"""
+        assert XlsxParser().parse(multi_sheet_file, "Missing") == []
+
+    def test_single_sheet_load_binds_local_names_to_requested_sheet(self, tmp_path):
+        """测试只加载一个工作表时，工作表级定义名称和打印区域只绑定到所属的工作表。"""
+        from openpyxl.workbook.defined_name import DefinedName
+
+        path = tmp_path / "local_names.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "First"
+        for name in ["Second", "Third"]:
+            worksheet = workbook.create_sheet(name)
+            worksheet.defined_names[f"{name}Local"] = DefinedName(f"{name}Local", attr_text=f"{name}!$A$1")
+            worksheet.print_area = "A1:B2"
+        workbook.save(path)
+
+        third = xlsx_parser._load_workbook(str(path), "Third")["Third"]
+        assert list(third.defined_names) == ["ThirdLocal"]
+        assert third.print_area == "'Third'!$A$1:$B$2"
+
+        first = xlsx_parser._load_workbook(str(path), "First")["First"]
+        assert list(first.defined_names) == []
+        assert not first.print_area
+
+    def test_get_sheet_names(self, multi_sheet_file):
+        """测试只读取工作簿目录获取工作表名称。"""
+        with patch("openpyxl.load_workbook") as mock_load:
+            assert XlsxParser().get_sheet_names(multi_sheet_file) == ["First", "Second", "Third"]
+        mock_load.assert_not_called()
+
+
+class TestXlsxParserCellRange:
+    """测试单元格范围下推。"""
+
+    @pytest.fixture
+    def range_file(self, tmp_path):
+        """创建包含样式、日期、公式和合并单元格的工作簿。"""
+        path = tmp_path / "range.xlsx"
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = "Data"
+        for row_idx in range(1, 21):
+            worksheet.append([f"r{row_idx}", row_idx, row_idx * 1.5, datetime(2024, 1, row_idx)])
+        worksheet["C3"].font = openpyxl.styles.Font(bold=True)
+        worksheet["B22"] = "=SUM(B1:B20)"
+        worksheet.merge_cells("A21:B21")
+        workbook.create_sheet("Other")["A1"] = "other"
+        workbook.save(path)
+        return str(path)
+
+    @staticmethod
+    def _cells(sheet):
+        return [[(cell.value, cell.formula, cell.style) for cell in row.cells] for row in sheet.rows]
+
+    @pytest.mark.parametrize("cell_range", [(0, 0, 3, 3), (1, 1, 25, 10), (21, 1, 21, 1),
+                                            (40, 0, 50, 2), (0, 9, 3, 12)])
+    def test_range_matches_projected_full_parse(self, range_file, cell_range):
+        """测试范围解析的结果与完整解析后截取一致。"""
+        parser = XlsxParser()
+        full = parser.parse(range_file, "Data")[0]
+
+        sheets = parser.parse(range_file, "Data", cell_range)
+
+        assert [sheet.name for sheet in sheets] == ["Data"]
+        assert self._cells(sheets[0]) == self._cells(project_sheet(full, cell_range))
+        assert sheets[0].merged_cells == []
+
+    def test_range_uses_read_only_workbook(self, range_file):
+        """测试范围解析不以完整模式加载工作簿，未指定工作表时返回所有工作表。"""
+        with patch("src.parsers.xlsx_parser._load_workbook") as mock_load:
+            sheets = XlsxParser().parse(range_file, None, (0, 0, 0, 0))
+        mock_load.assert_not_called()
+        assert [sheet.name for sheet in sheets] == ["Data", "Other"]
+        assert [[cell.value for cell in row.cells] for row in sheets[1].rows] == [["other"]]
+
+    def test_row_provider_col_range(self, range_file):
+        """测试行提供者只产出指定列，超出宽度的列补空单元格。"""
+        with XlsxRowProvider(range_file, "Data") as provider:
+            rows = list(provider.iter_rows(1, 2, col_range=(2, 5)))
+
+        assert [[cell.value for cell in row.cells] for row in rows] == [[3.0, datetime(2024, 1, 2), None, None],
+                                                                       [4.5, datetime(2024, 1, 3), None, None]]
+        assert rows[1].cells[0].style.bold is True
+
+
+class TestXlsxParserDeferredCharts:
+    """测试图表与图片的延迟提取。"""
+
+    def test_charts_extracted_on_first_access(self, tmp_path):
+        """测试解析时不提取图表，首次访问 get_charts 时才提取且只提取一次。"""
+        path = tmp_path / "chart.xlsx"
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        for row in [["x", "y"], [1, 2], [2, 4]]:
+            worksheet.append(row)
+        chart = openpyxl.chart.BarChart()
+        chart.add_data(openpyxl.chart.Reference(worksheet, min_col=2, min_row=1, max_row=3), titles_from_data=True)
+        worksheet.add_chart(chart, "D2")
+        workbook.save(path)
+        parser = XlsxParser()
+
+        with patch.object(parser, "_extract_charts", wraps=parser._extract_charts) as mock_charts:
+            sheet = parser.parse(str(path))[0]
+            mock_charts.assert_not_called()
+
+            charts = sheet.get_charts()
+            sheet.get_charts()
+
+        mock_charts.assert_called_once()
+        assert len(charts) == 1
+        assert charts[0].type == "bar"
+
+
+class TestXlsxParserLoadStrategyMemo:
+    """测试问题文件加载方式的记忆。"""
+
+    def test_repeated_parse_skips_failed_attempts(self, tmp_path):
+        """测试首选加载方式失败后，同一文件的后续解析直接使用成功的加载方式。"""
+        path = tmp_path / "data_only.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["a", 1])
+        workbook.save(path)
+        real_load = xlsx_parser._load_workbook
+        calls = []
+
+        def flaky_load(file_path, sheet_name=None, **kwargs):
+            calls.append(kwargs)
+            if not kwargs.get("data_only"):
+                raise ValueError("formula mode not supported")
+            return real_load(file_path, sheet_name, **kwargs)
+
+        with patch("src.parsers.xlsx_parser.get_repair_cache", return_value=RepairCache(tmp_path / "repaired")), \
+             patch("src.parsers.xlsx_parser._load_workbook", side_effect=flaky_load):
+            first = XlsxParser().parse(str(path))
+            assert len(calls) == 2
+            second = XlsxParser().parse(str(path))
+
+        assert len(calls) == 3
+        assert calls[-1]["data_only"] is True
+        assert [[c.value for c in r.cells] for r in first[0].rows] == \
+            [[c.value for c in r.cells] for r in second[0].rows] == [["a", 1]]
+
+
+class TestXlsxParserSparseSheets:
+    """测试格式范围很大而数据很少的工作表使用稀疏存储。"""
+
+    @pytest.fixture
+    def formatted_workbook(self, tmp_path):
+        """40列的填充色延伸到第300行，只有少数单元格有值。"""
+        from openpyxl.styles import Font, PatternFill
+
+        path = tmp_path / "formatted.xlsx"
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.append(["名称", "值"])
+        worksheet.append(["a", 1])
+        worksheet["C5"] = "=B2*2"
+        fill = PatternFill("solid", fgColor="FFFF00")
+        for row in range(1, 301):
+            worksheet.cell(row, 40).fill = fill
+        worksheet.cell(3, 10).font = Font(bold=True)
+        worksheet.merge_cells("E7:F8")
+        workbook.save(path)
+        return path
+
+    def _parse(self, path, density):
+        from src.unified_config import UnifiedConfig
+
+        # 保留只有格式的尾部行列，否则工作表被裁剪到真实使用范围
+        config = UnifiedConfig(sparse_sheet_density=density, trim_used_range=False)
+        with patch("src.parsers.xlsx_parser.get_config", return_value=config):
+            return XlsxParser().parse(str(path))[0]
+
+    def test_sparse_sheet_matches_dense_output(self, formatted_workbook):
+        """测试稀疏工作表的单元格、JSON与HTML输出和稠密解析结果一致。"""
+        from src.converters.html_converter import HTMLConverter
+        from src.core_service import CoreService
+        from src.models.sparse_sheet import SparseSheet
+
+        sparse = self._parse(formatted_workbook, 0.1)
+        dense = self._parse(formatted_workbook, 0)
+
+        assert isinstance(sparse, SparseSheet) and not isinstance(dense, SparseSheet)
+        assert (sparse.row_count, sparse.column_count) == (300, 40)
+        assert sparse.count_stored_cells() == 5
+        assert sparse.sparse_rows[3].runs == sparse.sparse_rows[299].runs
+
+        def cells(sheet):
+            return [[(cell.value, cell.style, cell.formula) for cell in row.cells] for row in sheet.iter_rows()]
+
+        assert cells(sparse) == cells(dense)
+        service = CoreService()
+        for range_string in (None, "A1:F10"):
+            assert service._sheet_to_json(sparse, range_string) == service._sheet_to_json(dense, range_string)
+        assert service._extract_full_data(sparse) == service._extract_full_data(dense)
+        converter = HTMLConverter()
+        assert converter._generate_html(sparse) == converter._generate_html(dense)
+        assert sparse._rows is None
+
+
+class TestXlsxParserUsedRange:
+    """测试工作表按真实使用范围裁剪只有格式的尾部行列。"""
+
+    @pytest.fixture
+    def formatted_file(self, tmp_path):
+        from openpyxl.styles import PatternFill
+
+        path = tmp_path / "used_range.xlsx"
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.append(["名称", "值"])
+        worksheet["C3"] = "=B1*2"
+        worksheet.merge_cells("D4:E5")
+        fill = PatternFill("solid", fgColor="FFFF00")
+        for row in range(1, 101):
+            worksheet.cell(row, 20).fill = fill
+        worksheet.cell(200, 1).fill = fill
+        workbook.save(path)
+        return path
+
+    def test_trailing_formatted_cells_are_trimmed(self, formatted_file):
+        """测试完整解析只保留到最后一个非空单元格和合并区域。"""
+        sheet = XlsxParser().parse(str(formatted_file))[0]
+        assert sheet.get_total_rows() == 5
+        assert {len(row.cells) for row in sheet.rows} == {5}
+        assert sheet.rows[2].cells[2].formula == "=B1*2"
+
+    def test_read_only_trusts_plausible_dimension(self, formatted_file):
+        """测试只读行提供者直接使用合理的 <dimension>，不扫描工作表XML。"""
+        with patch("src.parsers.xlsx_parser.read_used_range") as mock_scan:
+            with XlsxRowProvider(str(formatted_file)) as provider:
+                assert provider.get_total_rows() == 200
+                assert len(provider.get_row(0).cells) == 20
+        mock_scan.assert_not_called()
+
+    def test_read_only_trims_inflated_dimension(self, formatted_file):
+        """测试格式延伸到最后一行时只读行提供者扫描一次XML，裁剪到真实使用范围。"""
+        from openpyxl.styles import PatternFill
+        from openpyxl.xml.constants import MAX_ROW
+
+        workbook = openpyxl.load_workbook(formatted_file)
+        workbook.active.cell(MAX_ROW, 1).fill = PatternFill("solid", fgColor="FFFF00")
+        workbook.save(formatted_file)
+
+        with patch("src.parsers.xlsx_parser.read_used_range",
+                   side_effect=xlsx_parser.read_used_range) as mock_scan:
+            with XlsxRowProvider(str(formatted_file)) as provider:
+                assert provider.get_total_rows() == 5
+                rows = list(provider.iter_rows())
+            with XlsxRowProvider(str(formatted_file)) as provider:
+                assert provider.get_total_rows() == 5
+        assert mock_scan.call_count == 1
+        assert [len(row.cells) for row in rows] == [5] * 5
+        assert [cell.value for cell in rows[0].cells] == ["名称", "值", None, None, None]
+
+    def test_trim_can_be_disabled(self, formatted_file):
+        """测试关闭 trim_used_range 配置后保留只有格式的行列。"""
+        from src.unified_config import UnifiedConfig
+
+        with patch("src.parsers.xlsx_parser.get_config", return_value=UnifiedConfig(trim_used_range=False)):
+            sheet = XlsxParser().parse(str(formatted_file))[0]
+            with XlsxRowProvider(str(formatted_file)) as provider:
+                assert provider.get_total_rows() == 200
+        assert sheet.get_total_rows() == 200
+        assert len(sheet.rows[0].cells) == 20
@@ -25,6 +25,28 @@ def test_reader_initialization_streaming(mock_get_parser, mock_parser):
     assert reader._lazy_sheet is not None
     assert reader._regular_sheet is None
 
+def test_reader_exit_closes_lazy_sheet(mock_parser):
+    """测试退出上下文时关闭懒加载工作表，释放工作簿句柄。"""
+    with patch('src.streaming.streaming_table_reader.ParserFactory.get_parser', return_value=mock_parser):
+        with StreamingTableReader("dummy.xlsx") as reader:
+            lazy_sheet = reader._lazy_sheet
+    lazy_sheet.close.assert_called_once()
+
+def test_get_info_with_estimated_rows(mock_parser, tmp_path):
+    """测试 estimate_rows 为True时使用懒加载工作表的估算行数，不获取精确行数。"""
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Header1,Header2\n", encoding="utf-8")
+    lazy_sheet = mock_parser.create_lazy_sheet.return_value
+    lazy_sheet.estimate_total_rows.return_value = 5000
+
+    reader = StreamingTableReader(str(file_path), parser=mock_parser)
+    info = reader.get_info(estimate_rows=True)
+
+    assert info['total_rows'] == 5000
+    assert info['total_columns'] == 2
+    lazy_sheet.get_total_rows.assert_not_called()
+    assert reader.get_info()['total_rows'] == 100
+
 def test_iter_chunks(mock_parser):
     """Test iterating through chunks."""
     with patch('src.streaming.streaming_table_reader.ParserFactory.get_parser', return_value=mock_parser):
@@ -5,7 +5,11 @@ import xlwt
 from unittest.mock import MagicMock, patch, mock_open, PropertyMock
 from pathlib import Path
 from datetime import datetime, date
+from src.cache.sheet_cache import reset_sheet_cache
 from src.core_service import CoreService
+from src.parsers.xlsx_parser import XlsxParser
+from src.parsers.xlsx_native_parser import XlsxNativeParser
+from src.models.columnar_sheet import ColumnarSheetBuilder
 from src.models.table_model import Sheet, Row, Cell, Style
 from src.exceptions import FileNotFoundError
 
@@ -50,6 +54,21 @@ class TestCoreService:
         assert len(results) == 1
         assert Path(results[0]['output_path']).exists()
 
+    def test_same_content_csv_files_keep_own_sheet_names(self, core_service_instance, tmp_path):
+        """测试内容相同的 CSV 文件各自以文件名作为工作表名，不共用缓存中的名称。"""
+        alpha = tmp_path / "alpha.csv"
+        beta = tmp_path / "beta.csv"
+        for path in (alpha, beta):
+            path.write_text("id,name\n1,Alice\n", encoding="utf-8")
+
+        assert core_service_instance.parse_sheet(str(alpha))['sheet_name'] == "alpha"
+        assert core_service_instance.parse_sheet(str(beta))['sheet_name'] == "beta"
+
+        output_path = tmp_path / "beta.html"
+        results = core_service_instance.convert_to_html(str(beta), str(output_path))
+        assert results[0]['sheet_name'] == "beta"
+        assert "<title>Table: beta</title>" in output_path.read_text(encoding="utf-8")
+
     def test_apply_changes_normal(self, core_service_instance, tmp_path):
         """测试 apply_changes 方法的正常应用修改功能。"""
         file_path = tmp_path / "test.xlsx"
@@ -242,12 +261,34 @@ class TestCoreService:
         # 使用mock来模拟空文件的情况
         with patch.object(core_service_instance.parser_factory, 'get_parser') as mock_get_parser:
             mock_parser = MagicMock()
-            mock_parser.parse.return_value = []  # 返回空的工作表列表
+            mock_parser.get_sheet_names.return_value = []  # 工作簿目录中没有工作表
             mock_get_parser.return_value = mock_parser
 
             with patch('src.core_service.validate_file_input', return_value=(Path(file_path), None)):
                 with pytest.raises(ValueError, match="文件中没有找到任何工作表"):
                     core_service_instance.parse_sheet(str(file_path))
+            mock_parser.parse.assert_not_called()
+
+    @pytest.mark.parametrize("method", ["parse_sheet", "parse_sheet_optimized"])
+    def test_parse_without_sheet_name_parses_only_first_sheet(self, core_service_instance, tmp_path, method):
+        """测试未指定工作表时只解析目录中的第一个工作表。"""
+        file_path = tmp_path / "two_sheets.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "First"
+        workbook.active.append(["a", "b"])
+        workbook.create_sheet("Second").append(["x", "y"])
+        workbook.save(file_path)
+
+        with patch("src.core_service.get_sheet_cache", return_value=None), \
+                patch.object(XlsxParser, 'parse', autospec=True, side_effect=XlsxParser.parse) as mock_parse, \
+                patch.object(XlsxNativeParser, 'parse', autospec=True,
+                      side_effect=XlsxNativeParser.parse) as mock_native_parse:
+            result = getattr(core_service_instance, method)(str(file_path))
+
+        parse_calls = mock_parse.call_args_list + mock_native_parse.call_args_list
+        assert len(parse_calls) == 1
+        assert parse_calls[0].kwargs["sheet_name"] == "First"
+        assert result["sheet_name"] == "First"
 
     def test_parse_sheet_with_range(self, core_service_instance, tmp_path):
         """测试使用范围字符串解析。"""
@@ -268,6 +309,25 @@ class TestCoreService:
         assert len(result['headers']) == 3
         assert len(result['rows']) == 2  # 不包括表头行
 
+    def test_parse_sheet_range_pushdown(self, core_service_instance, tmp_path):
+        """测试范围下推给解析器后，结果与在完整工作表上提取范围一致。"""
+        file_path = tmp_path / "pushdown.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        for i in range(10):
+            sheet.append([f"R{i}C{j}" for j in range(6)])
+        workbook.save(file_path)
+        full_sheet = XlsxParser().parse(str(file_path))[0]
+
+        with patch.object(XlsxParser, "parse", wraps=XlsxParser().parse) as mock_parse:
+            result = core_service_instance.parse_sheet(str(file_path), range_string="B3:D5")
+
+        assert mock_parse.call_args.kwargs["cell_range"] == (2, 1, 4, 3)
+        expected = core_service_instance._extract_range_data(full_sheet, 2, 1, 4, 3)
+        assert result["headers"] == expected["headers"] == ["R2C1", "R2C2", "R2C3"]
+        assert result["rows"] == expected["rows"]
+        assert result["range"] == "B3:D5"
+
     def test_parse_sheet_invalid_range(self, core_service_instance, tmp_path):
         """测试无效的范围字符串。"""
         file_path = tmp_path / "test.xlsx"
@@ -300,6 +360,45 @@ class TestCoreService:
         assert 'metadata' in result
         assert result['metadata']['total_rows'] == 3
 
+    def test_parse_sheet_optimized_engine_selection(self, core_service_instance, tmp_path):
+        """测试不需要样式时自动使用native引擎，显式指定engine时以参数为准。"""
+        file_path = tmp_path / "test.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["ID", "Name"])
+        workbook.active.append([1, "Alice"])
+        workbook.save(file_path)
+
+        with patch.object(core_service_instance.parser_factory, 'get_parser',
+                          wraps=core_service_instance.parser_factory.get_parser) as mock_get_parser:
+            result = core_service_instance.parse_sheet_optimized(str(file_path))
+            assert mock_get_parser.call_args.kwargs["engine"] == "native"
+            assert result['preview_rows'] == [[1, "Alice"]]
+
+            core_service_instance.parse_sheet_optimized(str(file_path), include_styles=True)
+            assert mock_get_parser.call_args.kwargs["engine"] is None
+
+            core_service_instance.parse_sheet_optimized(str(file_path), engine="default")
+            assert mock_get_parser.call_args.kwargs["engine"] == "default"
+
+    def test_parse_sheet_optimized_same_result_with_cached_default_sheet(self, core_service_instance, tmp_path):
+        """测试原生引擎命中默认解析器缓存的结果时，响应与未命中缓存时相同。"""
+        file_path = tmp_path / "styled.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["ID", str(tmp_path)])
+        workbook.active.append([1, "Alice"])
+        workbook.active["A1"].font = openpyxl.styles.Font(bold=True)
+        workbook.save(file_path)
+
+        cold = core_service_instance.parse_sheet_optimized(str(file_path), include_full_data=True)
+        reset_sheet_cache()
+        core_service_instance.convert_to_html(str(file_path), str(tmp_path / "styled.html"))
+        warm = core_service_instance.parse_sheet_optimized(str(file_path), include_full_data=True)
+
+        assert warm == cold
+        assert cold['metadata']['has_styles'] is None
+        styled = core_service_instance.parse_sheet_optimized(str(file_path), include_styles=True)
+        assert styled['metadata']['has_styles'] is True
+
     def test_parse_sheet_optimized_with_full_data(self, core_service_instance, tmp_path):
         """测试 parse_sheet_optimized 返回完整数据。"""
         file_path = tmp_path / "test.xlsx"
@@ -391,6 +490,65 @@ class TestCoreService:
         assert len(results) == 1
         assert "Sheet2" in results[0]['output_path']
 
+    def test_parse_sheet_parses_only_requested_sheet(self, core_service_instance, tmp_path):
+        """测试指定工作表时只解析该工作表，不存在时列出全部可用工作表。"""
+        file_path = tmp_path / "multi.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "Sheet1"
+        workbook.active.append(["A", "B"])
+        workbook.create_sheet("Sheet2").append(["X", "Y"])
+        workbook.save(file_path)
+
+        # 其他测试可能生成内容相同的工作簿，绕过按内容共享的工作表缓存
+        with patch("src.parsers.xlsx_parser.XlsxParser.parse", autospec=True,
+                   side_effect=XlsxParser.parse) as mock_parse, \
+                patch("src.core_service.get_sheet_cache", return_value=None):
+            result = core_service_instance.parse_sheet(str(file_path), sheet_name="Sheet2")
+
+        assert result["sheet_name"] == "Sheet2"
+        assert mock_parse.call_args.kwargs["sheet_name"] == "Sheet2"
+        with pytest.raises(ValueError, match=r"可用工作表: \['Sheet1', 'Sheet2'\]"):
+            core_service_instance.parse_sheet_optimized(str(file_path), sheet_name="Missing")
+
+    def test_convert_to_html_parallel_workers(self, core_service_instance, tmp_path):
+        """测试配置多个进程时多工作表工作簿交给进程池转换，进程池不可用时回退串行。"""
+        file_path = tmp_path / "multi.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "Sheet1"
+        workbook.create_sheet("Sheet2")
+        workbook.save(file_path)
+        output_path = str(tmp_path / "out.html")
+
+        with patch("src.core_service.get_config") as mock_get_config, \
+             patch("src.core_service.convert_sheets_in_parallel", return_value=["parallel"]) as mock_parallel:
+            mock_get_config.return_value.get_parallel_sheet_workers.return_value = 4
+            assert core_service_instance.convert_to_html(str(file_path), output_path) == ["parallel"]
+            mock_parallel.assert_called_once_with(str(file_path), ["Sheet1", "Sheet2"], output_path, 4,
+                                                  header_rows=1, config=mock_get_config.return_value,
+                                                  parser_class=XlsxParser)
+
+            mock_parallel.side_effect = OSError("no semaphores")
+            results = core_service_instance.convert_to_html(str(file_path), output_path)
+        assert [result["sheet_name"] for result in results] == ["Sheet1", "Sheet2"]
+
+    def test_convert_to_html_parallel_skipped_when_cached(self, core_service_instance, tmp_path):
+        """测试整个工作簿的解析结果已在工作表缓存中时直接渲染，不交给进程池重新解析。"""
+        file_path = tmp_path / "multi.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "Sheet1"
+        workbook.create_sheet("Sheet2")
+        workbook.save(file_path)
+
+        with patch("src.core_service.get_config") as mock_get_config, \
+             patch("src.core_service.convert_sheets_in_parallel") as mock_parallel, \
+             patch("src.core_service.get_sheet_cache") as mock_get_sheet_cache:
+            mock_get_config.return_value.get_parallel_sheet_workers.return_value = 4
+            mock_get_sheet_cache.return_value.get.return_value = XlsxParser().parse(str(file_path))
+            results = core_service_instance.convert_to_html(str(file_path), str(tmp_path / "out.html"))
+
+        mock_parallel.assert_not_called()
+        assert [result["sheet_name"] for result in results] == ["Sheet1", "Sheet2"]
+
     def test_convert_to_html_nonexistent_sheet(self, core_service_instance, tmp_path):
         """测试转换不存在的工作表到HTML。"""
         file_path = tmp_path / "test.xlsx"
@@ -819,14 +977,14 @@ class TestCoreService:
         assert result["Number"] == "number"
         assert result["Mixed"] == "mixed"
 
-    def test_parse_sheet_with_empty_target_sheet(self, core_service_instance, tmp_path):
-        """测试解析空的目标工作表。"""
+    def test_parse_sheet_with_missing_target_sheet(self, core_service_instance, tmp_path):
+        """测试解析结果中没有目录里的第一个工作表。"""
         file_path = tmp_path / "test.xlsx"
 
-        # 模拟解析器返回None的目标工作表
         with patch.object(core_service_instance.parser_factory, 'get_parser') as mock_get_parser:
             mock_parser = MagicMock()
-            mock_parser.parse.return_value = [None]  # 返回包含None的工作表列表
+            mock_parser.get_sheet_names.return_value = ["Sheet1"]
+            mock_parser.parse.return_value = []
             mock_get_parser.return_value = mock_parser
 
             with patch('src.core_service.validate_file_input', return_value=(Path(file_path), None)):
@@ -835,10 +993,8 @@ class TestCoreService:
                     mock_cache.return_value = mock_cache_instance
                     mock_cache_instance.get.return_value = None
 
-                    result = core_service_instance.parse_sheet(str(file_path))
-
-                    assert result['sheet_name'] == "Empty"
-                    assert result['total_rows'] == 0
+                    with pytest.raises(ValueError, match="工作表 'Sheet1' 不存在"):
+                        core_service_instance.parse_sheet(str(file_path))
 
     def test_parse_sheet_with_empty_rows(self, core_service_instance, tmp_path):
         """测试解析有工作表但无行数据的情况。"""
@@ -849,6 +1005,7 @@ class TestCoreService:
 
         with patch.object(core_service_instance.parser_factory, 'get_parser') as mock_get_parser:
             mock_parser = MagicMock()
+            mock_parser.get_sheet_names.return_value = ["EmptySheet"]
             mock_parser.parse.return_value = [empty_sheet]
             mock_get_parser.return_value = mock_parser
 
@@ -906,6 +1063,31 @@ class TestCoreService:
         assert result['size_info']['processing_mode'] == "summary"
         assert 'suggested_ranges' in result
 
+    def test_columnar_sheet_json_matches_row_sheet(self, core_service_instance):
+        """测试列式工作表生成的JSON与相同数据的普通Sheet一致，且不需要转换为Row/Cell对象。"""
+        bold = Style(bold=True)
+        data = [["名称", "数量", "日期"], ["苹果", 3, datetime(2024, 1, 2)], ["香蕉", None], ["苹果", 2.5, True]]
+        builder = ColumnarSheetBuilder()
+        plain_rows = []
+        for row_idx, values in enumerate(data):
+            styles = [bold if row_idx % 2 else None for _ in values]
+            builder.append_row(values, styles)
+            plain_rows.append(Row(cells=[Cell(value=value, style=style) for value, style in zip(values, styles)]))
+        columnar = builder.build("水果")
+        plain = Sheet(name="水果", rows=plain_rows)
+        service = core_service_instance
+
+        assert service._calculate_data_size(columnar) == service._calculate_data_size(plain) == 11
+        assert service._extract_full_data(columnar) == service._extract_full_data(plain)
+        assert service._extract_simplified_data(columnar, 11) == service._extract_simplified_data(plain, 11)
+        assert service._extract_sample_data(columnar, 11) == service._extract_sample_data(plain, 11)
+        assert service._generate_summary(columnar) == service._generate_summary(plain)
+        assert service._extract_range_data(columnar, 1, 0, 3, 2, include_styles=True) == \
+            service._extract_range_data(plain, 1, 0, 3, 2, include_styles=True)
+        assert service._extract_optimized_data(columnar, include_full_data=True, include_styles=True) == \
+            service._extract_optimized_data(plain, include_full_data=True, include_styles=True)
+        assert columnar._rows is None
+
     def test_extract_full_data_single_row(self, core_service_instance):
         """测试提取只有一行数据的完整数据。"""
         cells = [Cell(value=f"Cell{j}") for j in range(3)]
@@ -958,7 +1140,7 @@ class TestCoreService:
 
         with patch.object(core_service_instance.parser_factory, 'get_parser') as mock_get_parser:
             mock_parser = MagicMock()
-            mock_parser.parse.return_value = []  # 返回空的工作表列表
+            mock_parser.get_sheet_names.return_value = []  # 工作簿目录中没有工作表
             mock_get_parser.return_value = mock_parser
 
             with patch('src.core_service.validate_file_input', return_value=(Path(file_path), None)):
@@ -1105,8 +1287,8 @@ class TestCoreService:
 
         result = core_service_instance._analyze_data_types(sheet, headers)
 
-        # 布尔值在Python中是int的子类，所以会被识别为number
-        assert result["BoolCol"] == "number"
+        # 布尔值虽然是int的子类，但先于数值判断，识别为boolean
+        assert result["BoolCol"] == "boolean"
 
     def test_generate_summary_data_types_analysis(self, core_service_instance):
         """测试生成摘要时的数据类型分析。"""
@@ -1245,12 +1427,14 @@ class TestCoreService:
                     Row(cells=[Cell(value="A"), Cell(value="B")]),
                     Row(cells=[Cell(value=1), Cell(value=2)])
                 ], merged_cells=[])
+                mock_parser.get_sheet_names.return_value = ["TestSheet", "Other"]
                 mock_parser.parse.return_value = [mock_sheet]
                 mock_get_parser.return_value = mock_parser
 
                 result = core_service_instance._parse_sheet_streaming(str(file_path))
 
                 assert result['sheet_name'] == "TestSheet"
+                mock_parser.parse.assert_called_once_with(str(file_path), sheet_name="TestSheet", cell_range=None)
 
     def test_parse_sheet_streaming_with_sheet_name_fallback(self, core_service_instance, tmp_path):
         """测试流式解析失败时使用指定工作表名称回退。"""
@@ -1291,7 +1475,7 @@ class TestCoreService:
         with patch('src.core_service.StreamingTableReader', side_effect=Exception("Streaming failed")):
             with patch.object(core_service_instance.parser_factory, 'get_parser') as mock_get_parser:
                 mock_parser = MagicMock()
-                mock_parser.parse.return_value = []  # 空文件
+                mock_parser.get_sheet_names.return_value = []  # 空文件
                 mock_get_parser.return_value = mock_parser
 
                 with pytest.raises(ValueError, match="文件中没有找到任何工作表"):
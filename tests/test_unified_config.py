@@ -231,7 +231,47 @@ def test_config_validation_errors():
     # 测试disk_cache_format无效值
     config = UnifiedConfig()
     config.disk_cache_format = 'invalid_format'
-    with pytest.raises(ValueError, match="disk_cache_format must be 'pickle' or 'parquet'"):
+    with pytest.raises(ValueError, match="disk_cache_format must be 'pickle', 'arrow' or 'parquet'"):
+        config.validate()
+
+    # 测试parallel_sheet_workers < 0
+    config = UnifiedConfig()
+    config.parallel_sheet_workers = -1
+    with pytest.raises(ValueError, match="parallel_sheet_workers must be non-negative"):
+        config.validate()
+
+    # 测试行块缓存配置
+    config = UnifiedConfig()
+    config.row_block_cache_size_mb = -1
+    with pytest.raises(ValueError, match="row_block_cache_size_mb must be non-negative"):
+        config.validate()
+
+    config = UnifiedConfig()
+    config.row_block_size_rows = 0
+    with pytest.raises(ValueError, match="row_block_size_rows must be positive"):
+        config.validate()
+
+    # 测试工作表缓存配置
+    config = UnifiedConfig()
+    config.sheet_cache_size_mb = -1
+    with pytest.raises(ValueError, match="sheet_cache_size_mb must be non-negative"):
+        config.validate()
+
+    # 测试稀疏工作表配置
+    config = UnifiedConfig()
+    config.sparse_sheet_density = 1.5
+    with pytest.raises(ValueError, match="sparse_sheet_density must be between 0 and 1"):
+        config.validate()
+
+    config = UnifiedConfig()
+    config.sparse_sheet_min_cells = -1
+    with pytest.raises(ValueError, match="sparse_sheet_min_cells must be non-negative"):
+        config.validate()
+
+    # 测试parallel_csv_workers < 0
+    config = UnifiedConfig()
+    config.parallel_csv_workers = -1
+    with pytest.raises(ValueError, match="parallel_csv_workers must be non-negative"):
         config.validate()
 
     # 测试文件大小阈值顺序错误
@@ -418,3 +458,19 @@ def test_config_manager_singleton_behavior():
     # 验证配置对象的属性
     assert config1.cache_max_entries == 512
     # config2可能是独立的实例，这取决于实际实现
+
+
+def test_get_parallel_sheet_workers():
+    """测试并行进程数：默认串行，0 解析为CPU核心数。"""
+    assert UnifiedConfig().get_parallel_sheet_workers() == 1
+    assert UnifiedConfig(parallel_sheet_workers=3).get_parallel_sheet_workers() == 3
+    with patch('os.cpu_count', return_value=6):
+        assert UnifiedConfig(parallel_sheet_workers=0).get_parallel_sheet_workers() == 6
+
+
+def test_get_parallel_csv_workers():
+    """测试CSV并行进程数：默认串行，0 解析为CPU核心数。"""
+    assert UnifiedConfig().get_parallel_csv_workers() == 1
+    assert UnifiedConfig(parallel_csv_workers=3).get_parallel_csv_workers() == 3
+    with patch('os.cpu_count', return_value=6):
+        assert UnifiedConfig(parallel_csv_workers=0).get_parallel_csv_workers() == 6
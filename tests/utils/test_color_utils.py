@@ -562,9 +562,7 @@ class TestApplySmartColorMatchingEdgeCases:
         """
 
         # 创建一个没有背景色的样式
-        style = Style()
-        style.background_color = None
-        style.font_color = "#FF0000"
+        style = Style(background_color=None, font_color="#FF0000")
 
         result = apply_smart_color_matching(style)
 
@@ -580,9 +578,10 @@ class TestApplySmartColorMatchingEdgeCases:
         """
 
         # 创建一个浅色背景、有浅色字体的样式（对比度不足）
-        style = Style()
-        style.background_color = "#FFFFFF"  # 白色背景（浅色）
-        style.font_color = "#CCCCCC"  # 浅灰色字体（对比度不足）
+        style = Style(
+            background_color="#FFFFFF",  # 白色背景（浅色）
+            font_color="#CCCCCC"  # 浅灰色字体（对比度不足）
+        )
 
         result = apply_smart_color_matching(style)
 
@@ -0,0 +1,66 @@
+"""
+CSV字节扫描工具测试。
+"""
+
+import csv
+
+import pytest
+
+from src.utils.csv_scanner import count_csv_records, estimate_csv_records, sniff_encoding
+
+
+def _csv_reader_count(path):
+    with open(path, mode='r', encoding='utf-8') as f:
+        return sum(1 for _ in csv.reader(f))
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "a,b",
+    "a,b\n",
+    "a,b\r\nc,d\r\n",
+    "a\n\nb\n",
+    'a,"多行\n文本"\nb,c',
+    'a,"引号""转义\n"\n"",x\n',
+    '"未结束\n的引号',
+    'a,"b"',
+])
+def test_count_matches_csv_reader(tmp_path, content):
+    """测试按字节计数的结果与 csv.reader 逐条读取一致。"""
+    path = tmp_path / "data.csv"
+    path.write_bytes(content.encode("utf-8"))
+
+    assert count_csv_records(str(path)) == _csv_reader_count(path)
+
+
+@pytest.mark.parametrize("content", ['a,b"c\nd', '"a"b\nc', 'a\rb\rc', ' "a\nb"'])
+def test_count_returns_none_when_bytes_are_ambiguous(tmp_path, content):
+    """测试不规范的引号或单独的回车符无法按字节确定记录边界时返回 None。"""
+    path = tmp_path / "data.csv"
+    path.write_bytes(content.encode("utf-8"))
+
+    assert count_csv_records(str(path)) is None
+
+
+def test_estimate_csv_records(tmp_path):
+    """测试小文件精确计数，大文件按采样估算。"""
+    path = tmp_path / "data.csv"
+    path.write_text("".join(f"{idx},值{idx % 10}\n" for idx in range(20000)), encoding="utf-8")
+
+    assert estimate_csv_records(str(path)) == 20000
+    assert estimate_csv_records(str(path), sample_size=1024, sample_count=4) == pytest.approx(20000, rel=0.1)
+
+    empty = tmp_path / "empty.csv"
+    empty.write_bytes(b"")
+    assert estimate_csv_records(str(empty), sample_size=0) == 0
+
+
+def test_sniff_encoding(tmp_path):
+    """测试按文件开头的字节判断编码，采样截断的多字节字符不视为错误。"""
+    utf8 = tmp_path / "utf8.csv"
+    utf8.write_text("名称,数量\n" * 10, encoding="utf-8")
+    gbk = tmp_path / "gbk.csv"
+    gbk.write_bytes("名称,数量\n".encode("gbk"))
+
+    assert sniff_encoding(str(utf8), sample_size=4) == "utf-8"
+    assert sniff_encoding(str(gbk)) == "gbk"
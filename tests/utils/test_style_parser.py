@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, PropertyMock, patch
 from src.utils.style_parser import (
+    StyleCache,
     extract_style,
     extract_cell_value,
     extract_fill_color,
@@ -632,3 +633,60 @@ class TestStyleToDict:
 
         # 默认样式应该返回空字典（所有值都是默认值）
         assert result == {}
+
+
+class TestStyleCache:
+    """测试按样式索引共享Style实例的样式缓存。"""
+
+    @pytest.fixture
+    def styled_worksheet(self):
+        """创建两种格式交替出现、部分单元格带超链接和批注的工作表。"""
+        from openpyxl import Workbook
+        from openpyxl.comments import Comment
+        from openpyxl.styles import Font
+
+        workbook = Workbook()
+        worksheet = workbook.active
+        for row_idx in range(1, 5):
+            worksheet.cell(row=row_idx, column=1, value="bold").font = Font(bold=True)
+            worksheet.cell(row=row_idx, column=2, value="red").font = Font(color="FFFF0000")
+        worksheet["A3"].hyperlink = "https://example.com"
+        worksheet["A4"].comment = Comment("note", "tester")
+        return worksheet
+
+    def test_same_style_id_shares_instance(self, styled_worksheet):
+        """测试相同格式的单元格得到同一个Style实例，且与逐个提取的结果一致。"""
+        cache = StyleCache()
+        first = extract_style(styled_worksheet["A1"], cache)
+        second = extract_style(styled_worksheet["A2"], cache)
+        other = extract_style(styled_worksheet["B1"], cache)
+
+        assert first is second
+        assert first is not other
+        assert first == extract_style(styled_worksheet["A1"])
+        assert other == extract_style(styled_worksheet["B1"])
+
+    def test_hyperlink_and_comment_are_overlaid(self, styled_worksheet):
+        """测试超链接和批注叠加在共享样式之上，不影响共享实例。"""
+        cache = StyleCache()
+        shared = extract_style(styled_worksheet["A1"], cache)
+        linked = extract_style(styled_worksheet["A3"], cache)
+        commented = extract_style(styled_worksheet["A4"], cache)
+
+        assert linked.hyperlink == "https://example.com"
+        assert commented.comment == "note"
+        assert linked.bold and commented.bold
+        assert shared.hyperlink is None and shared.comment is None
+        assert linked == extract_style(styled_worksheet["A3"])
+
+    def test_cells_without_style_id_are_not_cached(self, mock_cell_factory):
+        """测试无法获取样式索引的单元格（如模拟对象）每次都完整提取。"""
+        cache = StyleCache()
+        font = MagicMock(bold=True, italic=False, underline=None, size=11, name="Arial", color=None)
+        cell = mock_cell_factory(has_style=True, font=font)
+
+        style = extract_style(cell, cache)
+
+        assert style.bold is True
+        assert len(cache) == 0
+        assert extract_style(mock_cell_factory(), cache) == Style()
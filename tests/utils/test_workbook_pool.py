@@ -0,0 +1,81 @@
+"""
+工作簿句柄池测试。
+"""
+
+import os
+from unittest.mock import MagicMock
+
+from src.utils.workbook_pool import WorkbookPool
+
+
+def _make_pool(max_size=4):
+    opener = MagicMock(side_effect=lambda path: MagicMock(name=f"handle:{path}"))
+    return WorkbookPool(opener, max_size=max_size), opener
+
+
+def test_acquire_reuses_handle_for_same_file(tmp_path):
+    """测试同一文件（修改时间未变）的多次获取共享同一句柄。"""
+    path = tmp_path / "a.xlsx"
+    path.write_bytes(b"data")
+    pool, opener = _make_pool()
+
+    key1, handle1 = pool.acquire(str(path))
+    key2, handle2 = pool.acquire(str(path))
+    assert handle1 is handle2 and key1 == key2
+    opener.assert_called_once_with(str(path))
+
+    pool.release(key1, handle1)
+    pool.release(key2, handle2)
+    handle1.close.assert_not_called()
+    assert len(pool) == 1
+
+
+def test_modified_file_gets_new_handle(tmp_path):
+    """测试文件修改后按新的修改时间重新打开，旧的空闲句柄被关闭。"""
+    path = tmp_path / "a.xlsx"
+    path.write_bytes(b"data")
+    pool, opener = _make_pool()
+
+    key1, handle1 = pool.acquire(str(path))
+    pool.release(key1, handle1)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    key2, handle2 = pool.acquire(str(path))
+    assert handle2 is not handle1
+    assert opener.call_count == 2
+    handle1.close.assert_called_once()
+    assert len(pool) == 1
+
+
+def test_idle_handles_evicted_beyond_capacity(tmp_path):
+    """测试超出容量时关闭最久未使用的空闲句柄，正在使用的句柄不受影响。"""
+    pool, _ = _make_pool(max_size=1)
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.xlsx"
+        path.write_bytes(b"data")
+        paths.append(str(path))
+
+    key_a, handle_a = pool.acquire(paths[0])
+    key_b, handle_b = pool.acquire(paths[1])
+    handle_a.close.assert_not_called()
+
+    pool.release(key_a, handle_a)
+    handle_a.close.assert_called_once()
+    pool.release(key_b, handle_b)
+    handle_b.close.assert_not_called()
+
+    pool.clear()
+    handle_b.close.assert_called_once()
+    assert len(pool) == 0
+
+
+def test_missing_file_is_not_pooled():
+    """测试无法获取修改时间的路径不进入池，归还时直接关闭。"""
+    pool, opener = _make_pool()
+    key, handle = pool.acquire("missing.xlsx")
+    assert key is None
+    assert len(pool) == 0
+    pool.release(key, handle)
+    handle.close.assert_called_once()
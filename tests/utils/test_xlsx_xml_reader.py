@@ -0,0 +1,119 @@
+"""
+XLSX 底层 XML 读取工具测试。
+"""
+
+import io
+import zipfile
+
+import openpyxl
+import pytest
+
+from src.utils.xlsx_xml_reader import (
+    cast_number,
+    decode_cached_value,
+    get_sheet_xml_paths,
+    read_formula_cached_values,
+    read_shared_strings,
+    read_used_range,
+)
+
+
+@pytest.fixture
+def formula_workbook(tmp_path):
+    """创建包含公式且手动注入缓存值的XLSX文件。"""
+    source = tmp_path / "source.xlsx"
+    workbook = openpyxl.Workbook()
+    first = workbook.active
+    first.title = "First"
+    first["A1"] = "text"
+    first["B1"] = "=A1&\"!\""
+    second = workbook.create_sheet("Second Sheet")
+    second["A1"] = 10
+    second["A2"] = "=A1*2"
+    second["A3"] = "=A1/4"
+    workbook.save(source)
+
+    target = tmp_path / "cached.xlsx"
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(target, "w") as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = data.replace(b'<c r="B1"><f>', b'<c r="B1" t="str"><f>')
+                data = data.replace(b"<v />", b"<v>text!</v>")
+            elif item.filename == "xl/worksheets/sheet2.xml":
+                data = data.replace(b"<f>A1*2</f><v />", b"<f>A1*2</f><v>20</v>")
+                data = data.replace(b"<f>A1/4</f><v />", b"<f>A1/4</f><v>2.5</v>")
+            zout.writestr(item, data)
+    return target
+
+
+def test_get_sheet_xml_paths(formula_workbook):
+    """测试工作表名称到XML路径的解析保持工作簿顺序。"""
+    with zipfile.ZipFile(formula_workbook) as archive:
+        paths = get_sheet_xml_paths(archive)
+    assert list(paths) == ["First", "Second Sheet"]
+    assert paths["Second Sheet"] == "xl/worksheets/sheet2.xml"
+
+
+def test_read_formula_cached_values(formula_workbook):
+    """测试只收集公式单元格的缓存值，并按类型解码。"""
+    assert read_formula_cached_values(str(formula_workbook), "First") == {(1, 2): "text!"}
+    assert read_formula_cached_values(str(formula_workbook), "Second Sheet") == {(2, 1): 20, (3, 1): 2.5}
+
+
+def test_read_formula_cached_values_missing_sheet_or_file(formula_workbook, tmp_path):
+    """测试工作表不存在或文件无效时返回空字典而不是抛出异常。"""
+    assert read_formula_cached_values(str(formula_workbook), "Nope") == {}
+    broken = tmp_path / "broken.xlsx"
+    broken.write_bytes(b"not a zip")
+    assert read_formula_cached_values(str(broken), "First") == {}
+
+
+def test_read_shared_strings(tmp_path):
+    """测试共享字符串表的读取，富文本片段拼接为纯文本。"""
+    path = tmp_path / "shared.xlsx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"/>')
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="sharedStrings.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>'
+            '</Relationships>'
+        )
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<si><t>plain</t></si><si><r><t>ri</t></r><r><t>ch</t></r></si></sst>'
+        )
+    with zipfile.ZipFile(path) as archive:
+        assert read_shared_strings(archive) == ["plain", "rich"]
+
+
+def test_decode_cached_value():
+    """测试各单元格类型的缓存值解码。"""
+    assert decode_cached_value(None, "n") is None
+    assert decode_cached_value("3", None) == 3
+    assert decode_cached_value("1e3", "n") == 1000.0
+    assert decode_cached_value("1", "b") is True
+    assert decode_cached_value("0", "b") is False
+    assert decode_cached_value("#DIV/0!", "e") == "#DIV/0!"
+    assert decode_cached_value("1", "s", ["a", "b"]) == "b"
+    assert decode_cached_value("9", "s", ["a"]) == "9"
+    assert cast_number("2.0") == 2.0 and isinstance(cast_number("2"), int)
+
+
+def test_read_used_range():
+    """测试使用范围只计入有值、公式、内联字符串的单元格和合并区域，不计入只有样式的单元格。"""
+    xml = (
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<dimension ref="A1:Z500"/><sheetData>'
+        '<row r="1"><c r="A1"><v>1</v></c><c r="Z1" s="2"/></row>'
+        '<row r="2"><c r="C2"><f>A1*2</f></c></row>'
+        '<row r="3"><c r="B3" t="inlineStr"><is><t>x</t></is></c></row>'
+        '<row r="500"><c r="A500" s="2"/></row>'
+        '</sheetData><mergeCells><mergeCell ref="D4:E6"/></mergeCells></worksheet>'
+    )
+    assert read_used_range(io.BytesIO(xml.encode())) == (500, 26, 6, 5)
+    assert read_used_range(io.BytesIO(b'<worksheet><sheetData/></worksheet>')) == (0, 0, 0, 0)
+    assert read_used_range(io.BytesIO(b'<worksheet>')) is None